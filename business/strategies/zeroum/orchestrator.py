@@ -5,16 +5,22 @@ from __future__ import annotations
 import json
 import logging
 import re
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from framework.config import get_settings
 from framework.core.context import AgentContext, RunConfig
+from framework.core.exceptions import BatchPendingError
 from framework.orchestration.graph import OrchestrationGraph
-from framework.io.workspace import WorkspaceManager
+from framework.io.atomic import atomic_write_text
+from framework.io.workspace import StreamingArtifactWriter, WorkspaceManager
+from framework.io.archive import ArchiveStats
 from framework.io.package import PackageService
 from framework.io.knowledge import StrategyKnowledgeManager
 from framework.observability import MetricsCollector, TracingManager
 from framework.llm.factory import build_llm
+from framework.llm.batch import BatchRunReport, BatchSession, run_batch
 
 # Importar registry de subagentes
 from business.strategies.zeroum.subagents.registry import SubagentRegistry
@@ -64,6 +70,7 @@ class ZeroUmOrchestrator:
         )
         self.metrics = MetricsCollector()
         self.tracing = TracingManager()
+        self.archive_future: Optional["Future[ArchiveStats]"] = None
 
     def run(self, config: Optional[RunConfig] = None) -> Dict[str, Any]:
         """
@@ -95,6 +102,8 @@ class ZeroUmOrchestrator:
 
             # Executar grafo
             final_state = graph.execute(initial_state={})
+            if isinstance(final_state.get("_error"), BatchPendingError):
+                raise final_state["_error"]
 
             # Registrar métricas
             elapsed = self.metrics.stop_timer("zeroum_strategy")
@@ -113,6 +122,38 @@ class ZeroUmOrchestrator:
             if self.tracing.is_enabled:
                 self.tracing.end_trace()
 
+    @classmethod
+    def run_batch(
+        cls,
+        contexts: Sequence[Tuple[str, str]],
+        session: BatchSession,
+        base_path: Optional[Path] = None,
+        config: Optional[RunConfig] = None,
+        poll_interval: float = 60.0,
+    ) -> BatchRunReport:
+        """
+        Executa a estratégia para vários contextos em modo batch.
+
+        As chamadas LLM de todos os contextos são coletadas e submetidas em
+        jobs de batch; cada rodada reexecuta os contextos pendentes servindo
+        do cache as respostas já recebidas.
+
+        Args:
+            contexts: Pares (context_name, context_description)
+            session: Sessão de batch com o backend configurado
+            base_path: Caminho base (padrão: raiz do repositório)
+            config: Configuração de execução (opcional)
+            poll_interval: Intervalo entre consultas ao backend (segundos)
+
+        Returns:
+            BatchRunReport com o resultado de ``run()`` por índice do contexto
+        """
+        def _run(item: Tuple[str, str]) -> Dict[str, Any]:
+            name, description = item
+            return cls(name, description, base_path=base_path).run(config)
+
+        return run_batch(contexts, _run, session, poll_interval=poll_interval)
+
     def _collect_context(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Prepara workspace para execução da estratégia.
@@ -398,6 +439,9 @@ Responda APENAS com um JSON válido no seguinte formato:
             logger.info("━" * 80)
             return manifest
 
+        except BatchPendingError:
+            # Modo batch: a etapa será retomada quando o job for concluído
+            raise
         except Exception as exc:
             logger.error(f"Erro ao executar subagente {subagent_name}: {exc}")
             return {
@@ -536,7 +580,14 @@ Responda APENAS com um JSON válido no seguinte formato:
 
     def _write_consolidated(self, manifests: List[Dict[str, Any]]) -> Path:
         """
-        Escreve relatório consolidado.
+        Escreve relatório consolidado em streaming.
+
+        O cabeçalho e as seções são gravados à medida que são gerados e o
+        conteúdo de cada artefato é copiado em chunks, sem carregar os
+        artefatos em memória. Com AGENTS_CONSOLIDATED_MAX_ARTIFACT_BYTES,
+        cada artefato é truncado no limite. Um índice com os offsets (em
+        bytes) de cada seção e artefato é salvo em
+        ``_pipeline/00-consolidado-toc.json``.
 
         Args:
             manifests: Lista de manifestos dos subagentes
@@ -544,101 +595,152 @@ Responda APENAS com um JSON válido no seguinte formato:
         Returns:
             Caminho do arquivo consolidado
         """
-        lines = [
-            f"# Consolidado: {self.strategy_name}",
-            f"## Contexto: {self.context.context_name}",
-            "",
-            self.context.context_description or "Sem descrição adicional.",
-            "",
-        ]
+        consolidated_path = self.context.workspace_root / "00-consolidado.MD"
+        max_bytes = get_settings(validate=False).consolidated_max_artifact_bytes or None
+        toc: Dict[str, Any] = {
+            "consolidated": str(consolidated_path),
+            "max_artifact_bytes": max_bytes,
+            "sections": [],
+            "artifacts": [],
+        }
+
+        # Escrita atômica: leitores nunca encontram o consolidado truncado
+        with StreamingArtifactWriter(consolidated_path, flush_each_chunk=False) as stream:
+            first_line = True
+
+            def emit(line: str) -> None:
+                nonlocal first_line
+                stream.write(line if first_line else "\n" + line)
+                first_line = False
+
+            for line in (
+                f"# Consolidado: {self.strategy_name}",
+                f"## Contexto: {self.context.context_name}",
+                "",
+                self.context.context_description or "Sem descrição adicional.",
+                "",
+            ):
+                emit(line)
+
+            if not manifests:
+                emit("Nenhum processo executado nesta rodada.")
 
-        if not manifests:
-            lines.append("Nenhum processo executado nesta rodada.")
-        else:
             for manifest in manifests:
                 process = manifest.get("process", "desconhecido")
                 status = manifest.get("status", "desconhecido")
-                lines.extend([
-                    f"## Processo {process}",
-                    f"- Status: {status}",
-                ])
-
-                metrics = manifest.get("metrics") or {}
-                if metrics:
-                    duration = metrics.get("total_duration_seconds")
-                    tokens = metrics.get("total_tokens")
-                    cost = metrics.get("total_cost")
-                    metric_lines: List[str] = []
-                    if duration is not None:
-                        metric_lines.append(f"{duration:.2f}s")
-                    if tokens is not None:
-                        metric_lines.append(f"{tokens} tokens")
-                    if cost is not None:
-                        metric_lines.append(f"USD {cost}")
-                    if metric_lines:
-                        lines.append(f"- Métricas: {', '.join(metric_lines)}")
-
-                todos = manifest.get("todos_summary") or {}
-                if todos:
-                    total = todos.get("total")
-                    completed = todos.get("completed")
-                    pending = todos.get("pending")
-                    progress = todos.get("progress_percentage")
-                    summary = []
-                    if completed is not None and total is not None:
-                        summary.append(f"{completed}/{total} completos")
-                    if pending is not None:
-                        summary.append(f"{pending} pendentes")
-                    if progress is not None:
-                        summary.append(f"{progress:.0f}% do plano")
-                    if summary:
-                        lines.append(f"- TODOs: {', '.join(summary)}")
-
-                notes = manifest.get("notes", "")
-                if notes:
-                    lines.append(f"- Notas: {notes}")
+                toc["sections"].append({"process": process, "status": status, "offset": stream.bytes_written + 1})
+                for line in self._manifest_summary_lines(manifest):
+                    emit(line)
 
                 artifacts = manifest.get("artifacts", [])
                 if artifacts:
-                    lines.append("")
-                    lines.append("### Artefatos")
+                    emit("")
+                    emit("### Artefatos")
                     for artifact in artifacts:
                         artifact_path = Path(artifact)
-                        artifact_name = artifact_path.name
-                        lines.append(f"- {artifact_name}")
-                        if artifact_path.exists():
-                            try:
-                                content = artifact_path.read_text(encoding="utf-8").strip()
-                            except OSError:
-                                content = ""
-                            if content:
-                                lines.append("")
-                                lines.append(content)
-                                lines.append("")
-                        else:
-                            lines.append(f"  (arquivo não encontrado em {artifact_path})")
-                lines.append("")
-
-        content = "\n".join(lines)
-
-        # Usar workspace manager para escrever
-        consolidated_path = self.context.workspace_root / "00-consolidado.MD"
-        # Garantir que o diretório pai existe
-        consolidated_path.parent.mkdir(parents=True, exist_ok=True)
-        consolidated_path.write_text(content, encoding="utf-8")
+                        emit(f"- {artifact_path.name}")
+                        if not artifact_path.exists():
+                            emit(f"  (arquivo não encontrado em {artifact_path})")
+                            continue
+                        try:
+                            copied = stream.write_file(
+                                artifact_path,
+                                max_bytes=max_bytes,
+                                strip=True,
+                                prefix="\n\n",
+                            )
+                        except OSError:
+                            continue
+                        if copied.offset is None:
+                            continue
+                        if copied.truncated:
+                            stream.write(
+                                f"\n\n[... artefato truncado em {max_bytes} de "
+                                f"{copied.source_bytes} bytes ...]"
+                            )
+                        emit("")
+                        toc["artifacts"].append({
+                            "process": process,
+                            "name": artifact_path.name,
+                            "path": str(artifact_path),
+                            "offset": copied.offset,
+                            "length": copied.length,
+                            "truncated": copied.truncated,
+                            "source_bytes": copied.source_bytes,
+                        })
+                emit("")
+
+        toc["total_bytes"] = consolidated_path.stat().st_size
+        toc_path = self.workspace.get_pipeline_folder() / "00-consolidado-toc.json"
+        atomic_write_text(toc_path, json.dumps(toc, indent=2, ensure_ascii=False))
 
         return consolidated_path
 
+    @staticmethod
+    def _manifest_summary_lines(manifest: Dict[str, Any]) -> List[str]:
+        """Linhas de resumo (status, métricas, TODOs, notas) de um manifesto."""
+        lines = [
+            f"## Processo {manifest.get('process', 'desconhecido')}",
+            f"- Status: {manifest.get('status', 'desconhecido')}",
+        ]
+
+        metrics = manifest.get("metrics") or {}
+        if metrics:
+            duration = metrics.get("total_duration_seconds")
+            tokens = metrics.get("total_tokens")
+            cost = metrics.get("total_cost")
+            metric_lines: List[str] = []
+            if duration is not None:
+                metric_lines.append(f"{duration:.2f}s")
+            if tokens is not None:
+                metric_lines.append(f"{tokens} tokens")
+            if cost is not None:
+                metric_lines.append(f"USD {cost}")
+            if metric_lines:
+                lines.append(f"- Métricas: {', '.join(metric_lines)}")
+
+        todos = manifest.get("todos_summary") or {}
+        if todos:
+            total = todos.get("total")
+            completed = todos.get("completed")
+            pending = todos.get("pending")
+            progress = todos.get("progress_percentage")
+            summary = []
+            if completed is not None and total is not None:
+                summary.append(f"{completed}/{total} completos")
+            if pending is not None:
+                summary.append(f"{pending} pendentes")
+            if progress is not None:
+                summary.append(f"{progress:.0f}% do plano")
+            if summary:
+                lines.append(f"- TODOs: {', '.join(summary)}")
+
+        notes = manifest.get("notes", "")
+        if notes:
+            lines.append(f"- Notas: {notes}")
+        return lines
+
     def _package_artifacts(self) -> Path:
         """
         Empacota todos os artefatos do workspace.
 
+        Com ``AGENTS_PACKAGE_BACKGROUND=true`` o pacote é atualizado em
+        background e o caminho final é retornado imediatamente; use
+        ``wait_for_archive()`` para aguardar a conclusão.
+
         Returns:
             Caminho do arquivo ZIP
         """
         output_stem = f"{self.context.context_name}_{self.strategy_name}_outputs"
         target_path = self.context.workspace_root / output_stem
 
+        if get_settings(validate=False).package_background:
+            self.archive_future = self.package_service.create_archive_async(
+                source_dir=self.context.workspace_root,
+                output_path=target_path,
+            )
+            return self.package_service.archive_path_for(target_path)
+
         archive_path = self.package_service.create_archive(
             source_dir=self.context.workspace_root,
             output_path=target_path,
@@ -646,3 +748,17 @@ Responda APENAS com um JSON válido no seguinte formato:
 
         return archive_path
 
+    def wait_for_archive(self, timeout: Optional[float] = None) -> Optional[ArchiveStats]:
+        """
+        Aguarda o empacotamento em background (se houver).
+
+        Args:
+            timeout: Tempo máximo de espera (segundos)
+
+        Returns:
+            ArchiveStats do empacotamento ou None se nada estava pendente
+        """
+        if self.archive_future is None:
+            return None
+        return self.archive_future.result(timeout=timeout)
+
@@ -309,8 +309,7 @@ Produza um consolidado executivo do checkout com:
 Dados:
 {json.dumps(data, ensure_ascii=False, indent=2)}
 """
-        content = self.invoke_llm(prompt)
-        return self.save_document("00-consolidado-checkout.MD", content)
+        return self.stream_llm_to_document(prompt, "00-consolidado-checkout.MD")
 
     def _fill_data_templates(self, results: Dict[str, Any]) -> None:
         context = self._build_template_context(results)
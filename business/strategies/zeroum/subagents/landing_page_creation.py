@@ -302,8 +302,7 @@ Gere um consolidado executivo da criação da landing contendo:
 Dados:
 {json.dumps(data, ensure_ascii=False, indent=2)}
 """
-        content = self.invoke_llm(prompt)
-        return self.save_document("00-consolidado-landing.MD", content)
+        return self.stream_llm_to_document(prompt, "00-consolidado-landing.MD")
 
     def _fill_data_templates(self, results: Dict[str, Any]) -> None:
         """Preenche templates oficiais usando os dados da execução."""
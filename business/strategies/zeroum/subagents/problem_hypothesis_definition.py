@@ -440,9 +440,7 @@ Estrutura desejada:
 
 Tudo em português, sem tabelas.
 """
-        content = self.invoke_llm(prompt)
-        path = self.save_document("00-consolidado-hipotese.MD", content)
-        return path
+        return self.stream_llm_to_document(prompt, "00-consolidado-hipotese.MD")
 
     def _fill_data_templates(self, results: Dict[str, Any]) -> None:
         """Preenche templates oficiais do processo."""
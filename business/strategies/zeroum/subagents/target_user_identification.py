@@ -412,9 +412,7 @@ Exija o seguinte formato:
 ## 4. Recomendações imediatas
 ## 5. Próximas ações com responsáveis
 """
-        content = self.invoke_llm(template)
-        path = self.save_document("00-consolidado-usuarios.MD", content)
-        return path
+        return self.stream_llm_to_document(template, "00-consolidado-usuarios.MD")
 
     def _fill_data_templates(self, results: Dict[str, Any]) -> None:
         """Preenche templates oficiais do processo."""
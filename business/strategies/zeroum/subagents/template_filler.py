@@ -4,12 +4,34 @@ Utilitário para preencher templates de `_DATA` usando contexto gerado pelos sub
 
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 from pathlib import Path
 from textwrap import dedent
 from typing import Any, List, Optional, Sequence
 
+from framework.config import get_settings
+from framework.io.atomic import atomic_write_text
 from framework.llm.factory import build_llm
+from framework.llm.prompts import PromptLayout, load_global_directives
+from framework.llm.semantic_cache import SemanticCache
+
+_FILLER_ROLE = dedent(
+    """
+    Você é um especialista operacional que executa processos seguindo AGENTS.MD.
+    Use o contexto fornecido para preencher o template como se estivesse preenchendo manualmente um formulário.
+    """
+).strip()
+
+_FILLER_RULES = dedent(
+    """
+    - Preserve a mesma estrutura, títulos e listas.
+    - Substitua marcadores vazios por frases completas e específicas.
+    - Mantenha o texto 100% em português e sem tabelas adicionais.
+    - Caso um campo não faça sentido, registre 'Não informado' em vez de deixar em branco.
+    - Não explique o que fez; apenas devolva o template preenchido.
+    """
+).strip()
 
 
 @dataclass
@@ -32,11 +54,14 @@ class ProcessTemplateFiller:
         output_dir: Path,
         strategy_name: str = "ZeroUm",
         llm: Optional[Any] = None,
+        semantic_cache: Optional[SemanticCache] = None,
     ) -> None:
         self.process_code = process_code
         self.output_dir = output_dir
         self.strategy_name = strategy_name
         self.llm = llm or build_llm()
+        # Opt-in: preenchimentos para contextos quase idênticos reaproveitam a resposta
+        self.semantic_cache = semantic_cache
 
         # __file__ = business/strategies/zeroum/subagents/template_filler.py
         # parents[0] = subagents/
@@ -79,53 +104,58 @@ class ProcessTemplateFiller:
             )
 
         template_text = template_path.read_text(encoding="utf-8")
-        prompt = self._build_prompt(template_text, context, task)
-
-        response = self.llm.invoke(prompt)
-        content = getattr(response, "content", None)
-        if isinstance(content, list):  # langchain às vezes retorna lista
-            filled_text = "\n".join(
-                part.get("text", "") if isinstance(part, dict) else str(part)
-                for part in content
-            )
-        else:
-            filled_text = content if isinstance(content, str) else str(response)
+        layout = self._build_prompt(template_text, context, task)
+
+        filled_text = None
+        # O template já fica no namespace; a similaridade compara só a parte
+        # variável (contexto + instruções). Comparar o sufixo inteiro deixaria
+        # o corpo do template dominar e misturaria contextos de clientes distintos.
+        template_digest = hashlib.sha256(template_text.encode("utf-8")).hexdigest()[:16]
+        namespace = f"{self.process_code}/{task.template}@{template_digest}:{layout.prefix_fingerprint}"
+        cache_text = f"{context}\n\n{task.instructions.strip()}"
+        if self.semantic_cache is not None:
+            filled_text = self.semantic_cache.lookup(cache_text, namespace=namespace)
+
+        if filled_text is None:
+            response = self.llm.invoke(layout.to_messages())
+            content = getattr(response, "content", None)
+            if isinstance(content, list):  # langchain às vezes retorna lista
+                filled_text = "\n".join(
+                    part.get("text", "") if isinstance(part, dict) else str(part)
+                    for part in content
+                )
+            else:
+                filled_text = content if isinstance(content, str) else str(response)
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(cache_text, filled_text, namespace=namespace)
 
         output_rel = Path(task.output_name or task.template)
         output_path = self.output_dir / output_rel
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(filled_text.strip() + "\n", encoding="utf-8")
+        atomic_write_text(output_path, filled_text.strip() + "\n")
         return output_path
 
     @staticmethod
-    def _build_prompt(template_text: str, context: str, task: TemplateTask) -> str:
+    def _build_prompt(template_text: str, context: str, task: TemplateTask) -> PromptLayout:
+        """
+        Monta o prompt com o conteúdo estável (papel, diretrizes, regras) no
+        prefixo e o contexto da execução seguido do template no sufixo.
+
+        O contexto vem antes do template porque é o mesmo para todas as
+        tarefas de ``fill_templates``, estendendo o prefixo reaproveitável.
+        """
         custom_instructions = task.instructions.strip() or (
             "Complete todos os campos com dados específicos da execução. "
             "Nunca deixe traços em branco; use 'Não informado' apenas se realmente não houver dado."
         )
-        return dedent(
-            f"""
-            Você é um especialista operacional que executa processos seguindo AGENTS.MD.
-            Use o contexto a seguir para preencher o template como se estivesse preenchendo manualmente um formulário.
-
-            ## Contexto consolidado
-            {context.strip()}
-
-            ## Instruções
-            {custom_instructions}
-
-            ## Template base
-            {template_text.strip()}
-
-            Regras:
-            - Preserve a mesma estrutura, títulos e listas.
-            - Substitua marcadores vazios por frases completas e específicas.
-            - Mantenha o texto 100% em português e sem tabelas adicionais.
-            - Caso um campo não faça sentido, registre 'Não informado' em vez de deixar em branco.
-            - Não explique o que fez; apenas devolva o template preenchido.
-            """
-        ).strip()
+        layout = PromptLayout()
+        layout.add_static("", _FILLER_ROLE)
+        if get_settings(validate=False).prompt_global_directives:
+            layout.add_static("Diretrizes globais", load_global_directives())
+        layout.add_static("Regras", _FILLER_RULES)
+        layout.add_variable("Contexto consolidado", context)
+        layout.add_variable("Template base", template_text)
+        layout.add_variable("Instruções", custom_instructions)
+        return layout
 
 
 __all__ = ["ProcessTemplateFiller", "TemplateTask"]
-
@@ -398,8 +398,7 @@ Crie um consolidado da rodada de entrevistas com:
 Dados:
 {interviews_json}
 """
-        content = self.invoke_llm(prompt)
-        return self.save_document("00-consolidado-entrevistas.MD", content)
+        return self.stream_llm_to_document(prompt, "00-consolidado-entrevistas.MD")
 
     def _fill_data_templates(self, results: Dict[str, Any]) -> None:
         """Preenche templates oficiais com o contexto gerado."""
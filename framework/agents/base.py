@@ -11,15 +11,30 @@ Fornece funcionalidade comum para todos os agentes, incluindo:
 from __future__ import annotations
 
 import logging
+import time
+import uuid
 from pathlib import Path
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Union
 
+from framework.config import get_settings
+from framework.core.exceptions import LLMResponseError
+from framework.llm.batch import get_active_batch_session
 from framework.llm.factory import build_llm
+from framework.llm.prompts import PromptLayout, load_global_directives
+from framework.llm.semantic_cache import SemanticCache, get_semantic_cache
+from framework.llm.tokens import get_token_counter, throttle_tokens
 from framework.tools import AgentType, get_tools
+from framework.io.aio import run_io
 from framework.io.knowledge import ProcessKnowledgeManager
+from framework.io.atomic import atomic_write_text
+from framework.io.workspace import StreamingArtifactWriter
+from framework.observability.monitoring import MonitoringManager
 
 logger = logging.getLogger(__name__)
 
+# Intervalo mínimo entre atualizações de progresso de streaming no monitoramento
+STREAM_REPORT_INTERVAL_MS = 500.0
+
 
 class BaseAgent:
     """
@@ -147,6 +162,27 @@ class BaseAgent:
         """
         return self._process_knowledge or ""
 
+    def build_prompt_layout(self, base_prompt: str) -> PromptLayout:
+        """
+        Monta o prompt separando prefixo estável e sufixo variável.
+
+        O prefixo (diretrizes globais + conhecimento do processo) é idêntico
+        entre as chamadas do mesmo processo e vem primeiro, permitindo que
+        o provedor reaproveite o cache de prompt. A tarefa fica no sufixo.
+
+        Args:
+            base_prompt: Tarefa/prompt específico da chamada
+
+        Returns:
+            PromptLayout pronto para ``to_messages()`` ou ``to_text()``
+        """
+        layout = PromptLayout()
+        if get_settings(validate=False).prompt_global_directives:
+            layout.add_static("DIRETRIZES GLOBAIS", load_global_directives())
+        layout.add_static("CONHECIMENTO DO PROCESSO", self.process_knowledge)
+        layout.add_variable("TAREFA" if layout.static_sections else "", base_prompt)
+        return layout
+
     def get_enhanced_prompt(self, base_prompt: str) -> str:
         """
         Enriquece um prompt com o conhecimento do processo.
@@ -155,7 +191,7 @@ class BaseAgent:
             base_prompt: Prompt base a ser enriquecido
 
         Returns:
-            Prompt enriquecido com conhecimento do processo
+            Prompt enriquecido (prefixo estável seguido da tarefa)
 
         Example:
             prompt = self.get_enhanced_prompt('''
@@ -166,42 +202,251 @@ class BaseAgent:
                 - Preço: {price}
             ''')
         """
-        if not self.process_knowledge:
-            return base_prompt
+        return self.build_prompt_layout(base_prompt).to_text()
 
-        enhanced = f"""
-# CONHECIMENTO DO PROCESSO
+    def invoke_llm(
+        self,
+        prompt: str,
+        enhance_with_knowledge: bool = True,
+        semantic_cache: Union[bool, SemanticCache] = False,
+    ) -> str:
+        """
+        Invoca o LLM com um prompt, opcionalmente enriquecido com conhecimento.
 
-{self.process_knowledge}
+        Args:
+            prompt: Prompt a enviar
+            enhance_with_knowledge: Se True, adiciona conhecimento do processo ao prompt
+            semantic_cache: Opt-in para chamadas de baixo risco (resumos, etc.):
+                True usa o cache semântico global; também aceita uma instância.
+                Prompts quase idênticos no mesmo processo/modelo reaproveitam
+                a resposta armazenada.
 
-{'='*80}
+        Returns:
+            Resposta do LLM como string
+        """
+        cache = self._resolve_semantic_cache(semantic_cache)
+        namespace = self._semantic_namespace(enhance_with_knowledge)
+        if cache is not None:
+            cached = cache.lookup(prompt, namespace=namespace)
+            if cached is not None:
+                return cached
 
-# TAREFA
+        payload = self._prepare_payload(prompt, enhance_with_knowledge)
+        response = self.llm.invoke(payload)
 
-{base_prompt}
-"""
-        return enhanced
+        # Extrair conteúdo da resposta
+        content = getattr(response, "content", response)
+        text = self._content_to_text(content, separator="\n").strip()
+        if cache is not None:
+            cache.store(prompt, text, namespace=namespace)
+        return text
+
+    async def ainvoke_llm(
+        self,
+        prompt: str,
+        enhance_with_knowledge: bool = True,
+        semantic_cache: Union[bool, SemanticCache] = False,
+    ) -> str:
+        """
+        Versão assíncrona de ``invoke_llm``.
 
-    def invoke_llm(self, prompt: str, enhance_with_knowledge: bool = True) -> str:
+        Preflight, throttling e cache semântico rodam no pool de I/O; a
+        chamada ao modelo usa ``llm.ainvoke`` quando disponível, então a
+        espera pelo LLM não ocupa threads e se sobrepõe ao I/O de outras
+        corrotinas.
+
+        Example:
+            resumo, riscos = await asyncio.gather(
+                self.ainvoke_llm(prompt_resumo),
+                self.ainvoke_llm(prompt_riscos),
+            )
         """
-        Invoca o LLM com um prompt, opcionalmente enriquecido com conhecimento.
+        cache = self._resolve_semantic_cache(semantic_cache)
+        namespace = self._semantic_namespace(enhance_with_knowledge)
+        if cache is not None:
+            cached = await run_io(cache.lookup, prompt, namespace=namespace)
+            if cached is not None:
+                return cached
+
+        payload = await run_io(self._prepare_payload, prompt, enhance_with_knowledge)
+        ainvoke = getattr(self.llm, "ainvoke", None)
+        if callable(ainvoke):
+            response = await ainvoke(payload)
+        else:
+            response = await run_io(self.llm.invoke, payload)
+
+        content = getattr(response, "content", response)
+        text = self._content_to_text(content, separator="\n").strip()
+        if cache is not None:
+            await run_io(cache.store, prompt, text, namespace=namespace)
+        return text
+
+    @staticmethod
+    def _resolve_semantic_cache(semantic_cache: Union[bool, SemanticCache]) -> Optional[SemanticCache]:
+        """Converte o argumento ``semantic_cache`` em uma instância (ou None)."""
+        if semantic_cache is True:
+            return get_semantic_cache()
+        if isinstance(semantic_cache, SemanticCache):
+            return semantic_cache
+        return None
+
+    def _semantic_namespace(self, enhance_with_knowledge: bool) -> str:
+        """Namespace do cache semântico (processo, modelo e modo do prompt)."""
+        return (
+            f"{self.strategy_name}/{self.process_name}:{self._llm_model_name()}:"
+            f"{'knowledge' if enhance_with_knowledge else 'raw'}"
+        )
+
+    def stream_llm_to_document(
+        self,
+        prompt: str,
+        filename: str,
+        in_data_dir: bool = False,
+        enhance_with_knowledge: bool = True,
+    ) -> Path:
+        """
+        Invoca o LLM em modo streaming gravando os chunks direto no documento.
+
+        O documento é escrito incrementalmente em um arquivo parcial e
+        publicado atomicamente ao final, com a mesma normalização de
+        ``save_document`` (sem espaços nas bordas e newline final). O
+        progresso (chunks e tokens/s) é reportado ao MonitoringManager
+        enquanto a geração acontece.
 
         Args:
             prompt: Prompt a enviar
+            filename: Nome do arquivo de destino
+            in_data_dir: Se True, salva em _DATA/, senão em raiz do processo
             enhance_with_knowledge: Se True, adiciona conhecimento do processo ao prompt
 
         Returns:
-            Resposta do LLM como string
+            Path do arquivo salvo
+
+        Raises:
+            LLMResponseError: Se o stream terminar sem nenhum conteúdo (o
+                documento não é criado)
+
+        Example:
+            path = self.stream_llm_to_document(prompt, "00-consolidado.MD")
         """
-        if enhance_with_knowledge:
-            prompt = self.get_enhanced_prompt(prompt)
+        stream = getattr(self.llm, "stream", None)
+        if not callable(stream):
+            content = self.invoke_llm(prompt, enhance_with_knowledge=enhance_with_knowledge)
+            return self.save_document(filename, content, in_data_dir=in_data_dir)
+
+        payload = self._prepare_payload(prompt, enhance_with_knowledge)
+        path = (self.data_dir if in_data_dir else self.process_dir) / filename
+        monitoring = MonitoringManager.get_instance()
+        stream_id = str(uuid.uuid4())
+        agent_context = {"subagent": self.process_name, "strategy": self.strategy_name}
+
+        chunks = 0
+        chars = 0
+        pending_whitespace = ""
+        has_text = False
+        last_report_ms = 0.0
+        started = time.monotonic()
+
+        try:
+            with StreamingArtifactWriter(path) as writer:
+                for chunk in stream(payload):
+                    text = self._content_to_text(getattr(chunk, "content", chunk))
+                    if not text:
+                        continue
+                    chunks += 1
+                    chars += len(text)
+
+                    # Descartar espaços iniciais e segurar espaços finais até
+                    # saber se ainda há conteúdo (equivalente a strip()).
+                    if not has_text:
+                        text = text.lstrip()
+                        if not text:
+                            continue
+                        has_text = True
+                    body = text.rstrip()
+                    if body:
+                        writer.write(pending_whitespace + body)
+                        pending_whitespace = text[len(body):]
+                    else:
+                        pending_whitespace += text
+
+                    elapsed_ms = (time.monotonic() - started) * 1000
+                    if elapsed_ms - last_report_ms >= STREAM_REPORT_INTERVAL_MS:
+                        monitoring.record_stream_progress(
+                            stream_id, chunks, chars, elapsed_ms,
+                            agent_context=agent_context, target=str(path),
+                        )
+                        last_report_ms = elapsed_ms
+
+                if not has_text:
+                    # Sem conteúdo: nada é publicado (o parcial é descartado)
+                    raise LLMResponseError(
+                        f"Streaming do LLM não retornou conteúdo para {filename}",
+                        expected="texto do documento",
+                    )
+                writer.write("\n")
+
+            elapsed_ms = (time.monotonic() - started) * 1000
+            snapshot = monitoring.record_stream_progress(
+                stream_id, chunks, chars, elapsed_ms,
+                agent_context=agent_context, target=str(path),
+            )
+        finally:
+            monitoring.finish_stream(stream_id)
 
-        response = self.llm.invoke(prompt)
+        logger.info(
+            f"Documento salvo via streaming: {path} "
+            f"({chunks} chunks, {snapshot.get('tokens_per_second', 0.0)} tokens/s)"
+        )
+        return path
 
-        # Extrair conteúdo da resposta
-        content = getattr(response, "content", response)
+    def _prepare_payload(self, prompt: str, enhance_with_knowledge: bool) -> Any:
+        """
+        Monta o payload da chamada e executa o preflight de tamanho.
 
-        # Normalizar resposta (pode vir como lista ou string)
+        Conta os tokens de input localmente, avisa ou trunca conforme
+        ``AGENTS_PROMPT_PREFLIGHT`` quando o prompt se aproxima da janela de
+        contexto do modelo, e aplica o limite ``AGENTS_LLM_TOKENS_PER_MINUTE``.
+        Com uma ``BatchSession`` ativa nada é enviado agora, então o limite
+        por minuto não é consumido.
+        """
+        payload: Any = prompt
+        if enhance_with_knowledge:
+            payload = self.build_prompt_layout(prompt).to_messages()
+
+        settings = get_settings(validate=False)
+        if settings.prompt_preflight == "off":
+            return payload
+
+        model = self._llm_model_name()
+        result = get_token_counter().preflight(
+            payload,
+            model,
+            max_output_tokens=getattr(self.llm, "max_tokens", None) or 4_096,
+            policy=settings.prompt_preflight,
+        )
+        logger.info(
+            f"Preflight {self.process_name or 'agente'}: {result.input_tokens} tokens de input "
+            f"para {model} ({result.usage_ratio:.1%} do orçamento)"
+        )
+        if get_active_batch_session() is None:
+            throttle_tokens(result.input_tokens, settings.llm_tokens_per_minute)
+
+        if result.action == "truncated":
+            return result.messages
+        return payload
+
+    def _llm_model_name(self) -> str:
+        """Nome do modelo configurado no LLM (ou o padrão das settings)."""
+        for attr in ("model_name", "model"):
+            value = getattr(self.llm, attr, None)
+            if isinstance(value, str) and value:
+                return value
+        return get_settings(validate=False).llm_model
+
+    @staticmethod
+    def _content_to_text(content: Any, separator: str = "") -> str:
+        """Normaliza conteúdo de resposta/chunk do LLM (lista ou string) em texto."""
         if isinstance(content, list):
             parts = []
             for chunk in content:
@@ -209,9 +454,8 @@ class BaseAgent:
                     parts.append(chunk["text"])
                 else:
                     parts.append(str(chunk))
-            return "\n".join(parts).strip()
-
-        return str(content).strip()
+            return separator.join(parts)
+        return str(content)
 
     def setup_directories(self, additional_dirs: Optional[List[str]] = None) -> None:
         """
@@ -252,10 +496,19 @@ class BaseAgent:
         else:
             path = self.process_dir / filename
 
-        path.write_text(content.strip() + "\n", encoding="utf-8")
+        atomic_write_text(path, content.strip() + "\n")
         logger.info(f"Documento salvo: {path}")
         return path
 
+    async def asave_document(self, filename: str, content: str, in_data_dir: bool = False) -> Path:
+        """
+        Versão assíncrona de ``save_document`` (executa no pool de I/O).
+
+        Example:
+            path = await self.asave_document("01-resultado.MD", content)
+        """
+        return await run_io(self.save_document, filename, content, in_data_dir)
+
     def read_document(self, path: Path) -> str:
         """
         Lê um documento com tratamento de erro.
@@ -275,6 +528,10 @@ class BaseAgent:
             logger.warning(f"Erro ao ler {path}: {e}")
             return ""
 
+    async def aread_document(self, path: Path) -> str:
+        """Versão assíncrona de ``read_document`` (executa no pool de I/O)."""
+        return await run_io(self.read_document, path)
+
     def format_list(self, items: List[Any], separator: str = ", ") -> str:
         """
         Formata uma lista para uso em prompts.
@@ -123,6 +123,118 @@ class Settings:
     )
     """Pular validação de variáveis secretas (apenas para desenvolvimento)"""
 
+    # ========================================================================
+    # I/O Configuration
+    # ========================================================================
+
+    io_durability: str = field(
+        default_factory=lambda: os.getenv("AGENTS_IO_DURABILITY", "file")
+    )
+    """Durabilidade das escritas atômicas: 'none', 'file' ou 'full'"""
+
+    io_workers: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_IO_WORKERS", "8"))
+    )
+    """Threads do pool de I/O usado pelas variantes assíncronas (awrite_*, aread_*)"""
+
+    run_index_path: Optional[str] = field(
+        default_factory=lambda: os.getenv("AGENTS_RUN_INDEX_PATH") or None
+    )
+    """Arquivo SQLite do índice de execuções (vazio = desabilitado)"""
+
+    cas_enabled: bool = field(
+        default_factory=lambda: os.getenv("AGENTS_CAS_ENABLED", "false").lower() == "true"
+    )
+    """Gravar artefatos no armazenamento por conteúdo (drive/.cas) com hardlinks"""
+
+    package_background: bool = field(
+        default_factory=lambda: os.getenv("AGENTS_PACKAGE_BACKGROUND", "false").lower() == "true"
+    )
+    """Empacotar artefatos em background ao final da execução"""
+
+    package_format: str = field(
+        default_factory=lambda: os.getenv("AGENTS_PACKAGE_FORMAT", "zip")
+    )
+    """Formato do pacote final: 'zip' (incremental) ou 'tar.zst' (requer zstandard)"""
+
+    package_workers: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_PACKAGE_WORKERS", "0"))
+    )
+    """Threads de compressão do pacote (0 = automático, 1 = sequencial)"""
+
+    consolidated_max_artifact_bytes: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_CONSOLIDATED_MAX_ARTIFACT_BYTES", "0"))
+    )
+    """Limite de bytes por artefato no consolidado (0 = sem limite)"""
+
+    # ========================================================================
+    # Execution Configuration
+    # ========================================================================
+
+    shell_worker_enabled: bool = field(
+        default_factory=lambda: os.getenv("AGENTS_SHELL_WORKER", "false").lower() == "true"
+    )
+    """Executar comandos em um shell persistente por thread (opt-in; padrão: subprocess)"""
+
+    command_output_max_bytes: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_COMMAND_OUTPUT_MAX_BYTES", str(64 * 1024)))
+    )
+    """Bytes retidos por stream (stdout/stderr): metade do início e metade do fim da saída"""
+
+    command_output_kill_bytes: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_COMMAND_OUTPUT_KILL_BYTES", str(32 * 1024 * 1024)))
+    )
+    """Saída total que encerra o comando antes do fim (0 = sem limite)"""
+
+    git_backend: str = field(
+        default_factory=lambda: os.getenv("AGENTS_GIT_BACKEND", "auto")
+    )
+    """Backend das ferramentas git: auto (dulwich se instalado), dulwich ou cli"""
+
+    git_status_ttl: float = field(
+        default_factory=lambda: float(os.getenv("AGENTS_GIT_STATUS_TTL", "10"))
+    )
+    """Idade máxima (segundos) do git status em cache"""
+
+    test_workers: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_TEST_WORKERS", "0"))
+    )
+    """Processos pytest em paralelo na ferramenta run_tests (0 = min(4, CPUs))"""
+
+    test_command: str = field(
+        default_factory=lambda: os.getenv("AGENTS_TEST_COMMAND", "pytest")
+    )
+    """Comando que invoca o pytest do projeto testado"""
+
+    sandbox_profile: str = field(
+        default_factory=lambda: os.getenv("AGENTS_SANDBOX_PROFILE", "default")
+    )
+    """Perfil de limites de recursos dos comandos: default, strict ou unrestricted"""
+
+    # ========================================================================
+    # Prompt Configuration
+    # ========================================================================
+
+    prompt_global_directives: bool = field(
+        default_factory=lambda: os.getenv("AGENTS_PROMPT_GLOBAL_DIRECTIVES", "true").lower() == "true"
+    )
+    """Incluir models/global-directives.MD no prefixo estável dos prompts"""
+
+    prompt_preflight: str = field(
+        default_factory=lambda: os.getenv("AGENTS_PROMPT_PREFLIGHT", "warn")
+    )
+    """Preflight de tamanho de prompt: 'warn', 'truncate' ou 'off'"""
+
+    llm_tokens_per_minute: int = field(
+        default_factory=lambda: int(os.getenv("AGENTS_LLM_TOKENS_PER_MINUTE", "0"))
+    )
+    """Limite local de tokens de input por minuto (0 = desabilitado)"""
+
+    rate_limit_dir: Optional[str] = field(
+        default_factory=lambda: os.getenv("AGENTS_RATE_LIMIT_DIR") or None
+    )
+    """Pasta de estado compartilhado dos rate limiters entre processos (vazio = por processo)"""
+
     # ========================================================================
     # Monitoring Configuration
     # ========================================================================
@@ -190,6 +302,33 @@ class Settings:
                 reason=f"Valores válidos: {', '.join(valid_modes)}",
             )
 
+        # Validar durabilidade de I/O
+        valid_durability = ["none", "file", "full"]
+        if self.io_durability not in valid_durability:
+            raise InvalidConfigError(
+                "AGENTS_IO_DURABILITY",
+                self.io_durability,
+                reason=f"Valores válidos: {', '.join(valid_durability)}",
+            )
+
+        # Validar formato de pacote
+        valid_formats = ["zip", "tar.zst"]
+        if self.package_format not in valid_formats:
+            raise InvalidConfigError(
+                "AGENTS_PACKAGE_FORMAT",
+                self.package_format,
+                reason=f"Valores válidos: {', '.join(valid_formats)}",
+            )
+
+        # Validar preflight de prompt
+        valid_preflight = ["warn", "truncate", "off"]
+        if self.prompt_preflight not in valid_preflight:
+            raise InvalidConfigError(
+                "AGENTS_PROMPT_PREFLIGHT",
+                self.prompt_preflight,
+                reason=f"Valores válidos: {', '.join(valid_preflight)}",
+            )
+
         # Validar temperatura
         if not 0.0 <= self.llm_temperature <= 2.0:
             raise InvalidConfigError(
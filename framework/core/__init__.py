@@ -13,6 +13,7 @@ from framework.core.decorators import (
 )
 from framework.core.exceptions import (
     AgentError,
+    BatchPendingError,
     ConfigurationError,
     InvalidConfigError,
     LLMError,
@@ -48,6 +49,7 @@ __all__ = [
     "InvalidConfigError",
     "LLMError",
     "LLMInvocationError",
+    "BatchPendingError",
     "ProcessError",
     "ProcessExecutionError",
     "StrategyError",
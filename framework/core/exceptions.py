@@ -116,6 +116,22 @@ class LLMResponseError(LLMError):
         super().__init__(message, details)
 
 
+class BatchPendingError(LLMError):
+    """
+    Chamada LLM enfileirada para execução em batch; resultado ainda indisponível.
+
+    Interrompe a etapa atual para que ela seja retomada quando o job de
+    batch for concluído.
+    """
+
+    def __init__(self, request_id: str, model: Optional[str] = None) -> None:
+        details = {"request_id": request_id}
+        if model:
+            details["model"] = model
+        super().__init__("Chamada LLM aguardando resultado de batch", details)
+        self.request_id = request_id
+
+
 # ============================================================================
 # Process Errors
 # ============================================================================
@@ -283,6 +299,7 @@ __all__ = [
     "LLMError",
     "LLMInvocationError",
     "LLMResponseError",
+    "BatchPendingError",
     # Process
     "ProcessError",
     "ProcessNotFoundError",
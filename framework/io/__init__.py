@@ -4,8 +4,18 @@ Módulo de I/O do framework.
 Gerencia operações de leitura/escrita de artefatos, manifestos e workspace.
 """
 
-from framework.io.workspace import WorkspaceManager
+from framework.io.aio import gather_io, get_io_executor, run_io, run_sync
+from framework.io.atomic import (
+    AtomicWriteTransaction,
+    atomic_write_bytes,
+    atomic_write_text,
+)
+from framework.io.cas import ContentStore
+from framework.io.sequence import SequenceAllocator, get_sequence_allocator
+from framework.io.workspace import StreamingArtifactWriter, WorkspaceManager
 from framework.io.manifest import ManifestStore
+from framework.io.run_index import RunIndex, RunRecord, get_run_index
+from framework.io.archive import ArchiveStats, IncrementalArchiver
 from framework.io.package import PackageService
 from framework.io.knowledge import (
     KnowledgeLoader,
@@ -15,8 +25,24 @@ from framework.io.knowledge import (
 
 __all__ = [
     "WorkspaceManager",
+    "run_io",
+    "run_sync",
+    "gather_io",
+    "get_io_executor",
+    "StreamingArtifactWriter",
+    "AtomicWriteTransaction",
+    "atomic_write_bytes",
+    "atomic_write_text",
+    "SequenceAllocator",
+    "ContentStore",
+    "get_sequence_allocator",
     "ManifestStore",
+    "RunIndex",
+    "RunRecord",
+    "get_run_index",
     "PackageService",
+    "IncrementalArchiver",
+    "ArchiveStats",
     "KnowledgeLoader",
     "StrategyKnowledgeManager",
     "ProcessKnowledgeManager",
@@ -0,0 +1,142 @@
+"""
+Camada assíncrona para o I/O de workspace.
+
+As operações de arquivo do framework (``WorkspaceManager``, ``ManifestStore``,
+``KnowledgeLoader``, ``BaseAgent.save_document``) são bloqueantes. Em
+orquestrações com asyncio, executá-las direto no event loop congela as
+demais corrotinas, inclusive as que aguardam o LLM.
+
+Este módulo oferece:
+
+- ``get_io_executor``: pool de threads dedicado ao I/O de arquivos
+  (``AGENTS_IO_WORKERS``), separado do pool padrão do loop
+- ``run_io``: executa uma função bloqueante nesse pool e aguarda o
+  resultado, preservando ``contextvars``
+- ``gather_io``: várias chamadas bloqueantes em paralelo, na ordem dada
+- ``run_sync``: adaptador para chamar corrotinas a partir de código
+  síncrono, com ou sem event loop rodando na thread atual
+
+As variantes ``a*`` das classes de I/O (``awrite_artifact``, ``aread``,
+``aload_files``, ``asave_document``...) delegam para os métodos síncronos
+via ``run_io``, portanto têm exatamente a mesma semântica (atomicidade,
+erros, numeração).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, List, Optional, Tuple, TypeVar
+
+from framework.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_guard = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Retorna o pool de threads de I/O do processo (criado sob demanda)."""
+    global _executor
+    with _executor_guard:
+        if _executor is None:
+            workers = get_settings(validate=False).io_workers
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="agents-io")
+            logger.debug(f"Pool de I/O criado com {max(1, workers)} threads")
+        return _executor
+
+
+def shutdown_io_executor(wait: bool = True) -> None:
+    """Encerra o pool de I/O (um novo é criado na próxima chamada)."""
+    global _executor
+    with _executor_guard:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown_io_executor)
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executa ``func(*args, **kwargs)`` no pool de I/O sem bloquear o loop.
+
+    Exceções são propagadas como na chamada síncrona.
+
+    Example:
+        >>> path = await run_io(manager.write_artifact, folder, "resumo", content)
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_io_executor(), call)
+
+
+async def gather_io(calls: Iterable[Tuple[Callable[..., Any], Tuple[Any, ...]]]) -> List[Any]:
+    """
+    Executa várias chamadas bloqueantes em paralelo no pool de I/O.
+
+    Args:
+        calls: Pares ``(função, argumentos)``
+
+    Returns:
+        Resultados na mesma ordem das chamadas
+    """
+    return list(await asyncio.gather(*(run_io(func, *args) for func, args in calls)))
+
+
+def run_sync(awaitable: Awaitable[T] | Coroutine[Any, Any, T]) -> T:
+    """
+    Executa uma corrotina a partir de código síncrono.
+
+    Sem event loop na thread atual, usa ``asyncio.run``. Dentro de um loop
+    (código síncrono chamado por um handler async), roda a corrotina em uma
+    thread auxiliar com loop próprio e aguarda o resultado — bloqueia o
+    chamador, mas não gera ``RuntimeError`` de loop já em execução.
+
+    Example:
+        >>> content = run_sync(loader.aload_files(["knowledge.MD"]))
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_as_coroutine(awaitable))
+
+    result: List[Any] = []
+    error: List[BaseException] = []
+    context = contextvars.copy_context()
+
+    def _runner() -> None:
+        try:
+            result.append(context.run(asyncio.run, _as_coroutine(awaitable)))
+        except BaseException as exc:  # noqa: BLE001 - repassada ao chamador
+            error.append(exc)
+
+    thread = threading.Thread(target=_runner, name="agents-run-sync", daemon=True)
+    thread.start()
+    thread.join()
+    if error:
+        raise error[0]
+    return result[0]
+
+
+async def _as_coroutine(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+__all__ = [
+    "gather_io",
+    "get_io_executor",
+    "run_io",
+    "run_sync",
+    "shutdown_io_executor",
+]
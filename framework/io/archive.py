@@ -0,0 +1,674 @@
+"""
+Empacotamento incremental de artefatos em ZIP.
+
+Em vez de apagar e recriar o pacote a cada execução, o ``IncrementalArchiver``
+mantém ao lado do ZIP um índice (``<pacote>.zip.index.json``) com
+``(tamanho, mtime, sha256)`` de cada entrada e, na próxima execução:
+
+- Arquivos inalterados (mesmo tamanho/mtime, ou mesmo hash) não são relidos
+  nem recomprimidos
+- Arquivos novos são anexados ao final do ZIP (modo ``a``)
+- Arquivos alterados/removidos saem do diretório central; os bytes antigos
+  viram espaço morto, e o pacote é compactado (reconstruído) quando o espaço
+  morto passa de ``compaction_ratio`` do tamanho total
+- Arquivos são lidos em chunks (hash e compressão no mesmo passe)
+- Formatos já comprimidos (imagens, vídeos, zips, ...) são armazenados sem
+  recompressão (``ZIP_STORED``)
+
+Se o ZIP não corresponder ao índice (removido, editado, escrita interrompida),
+o pacote é reconstruído do zero em um temporário e publicado atomicamente.
+
+Com ``workers > 1``, entradas grandes são comprimidas em paralelo (cada uma
+com seu próprio deflate, em threads — ``zlib`` libera o GIL) e gravadas em
+ordem no ZIP. Para transferências internas, ``write_tar_zst`` gera um
+``.tar.zst`` (requer o pacote opcional ``zstandard``). Ambos reportam a
+vazão em MB/s em ``ArchiveStats``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from framework.io.atomic import (
+    DURABILITY_NONE,
+    atomic_write_text,
+    create_temp_file,
+    publish_temp_file,
+    resolve_durability,
+)
+from framework.io.cas import CAS_DIRNAME
+from framework.io.sequence import SEQUENCE_FILENAME
+
+try:  # pragma: no cover - dependência opcional
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".index.json"
+INDEX_VERSION = 1
+
+# Extensões cujo conteúdo já é comprimido: recomprimir só gasta CPU
+COMPRESSED_EXTENSIONS: FrozenSet[str] = frozenset({
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".rar",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".m4a", ".ogg", ".mp4", ".mov", ".avi", ".mkv", ".webm",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".woff", ".woff2",
+})
+
+# Arquivos internos do framework que não fazem parte do pacote
+EXCLUDED_NAMES: FrozenSet[str] = frozenset({SEQUENCE_FILENAME})
+
+# Temporários de escrita atômica/streaming (ver framework.io.atomic)
+_TEMP_SUFFIXES = (".tmp", ".part")
+
+# Cabeçalho local fixo de uma entrada ZIP (sem nome/extra)
+_LOCAL_HEADER_SIZE = 30
+
+# Entradas comprimidas em paralelo ficam em memória até este tamanho
+_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class ArchiveStats:
+    """Resumo de uma atualização de pacote."""
+
+    archive: Path
+    mode: str = "unchanged"
+    added: int = 0
+    replaced: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    bytes_read: int = 0
+    archive_bytes: int = 0
+    dead_bytes: int = 0
+    workers: int = 1
+    duration_seconds: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return self.mode != "unchanged"
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """Vazão de entrada (MB lidos por segundo)."""
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.bytes_read / (1024 * 1024) / self.duration_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "archive": str(self.archive),
+            "mode": self.mode,
+            "added": self.added,
+            "replaced": self.replaced,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "bytes_read": self.bytes_read,
+            "archive_bytes": self.archive_bytes,
+            "dead_bytes": self.dead_bytes,
+            "workers": self.workers,
+            "duration_seconds": self.duration_seconds,
+            "throughput_mb_s": round(self.throughput_mb_s, 2),
+        }
+
+
+@dataclass
+class _SourceFile:
+    path: Path
+    arcname: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class _CompressedEntry:
+    zinfo: zipfile.ZipInfo
+    data: IO[bytes]
+    sha256: str
+
+
+class IncrementalArchiver:
+    """
+    Mantém um ZIP sincronizado com uma pasta, reescrevendo apenas o que mudou.
+
+    Example:
+        >>> archiver = IncrementalArchiver()
+        >>> stats = archiver.update(Path("drive/Ctx"), Path("drive/Ctx/Ctx_outputs.zip"))
+        >>> stats.mode, stats.added, stats.unchanged
+        ('append', 1, 42)
+    """
+
+    def __init__(
+        self,
+        compresslevel: int = 6,
+        compaction_ratio: float = 0.5,
+        chunk_size: int = 1024 * 1024,
+        stored_extensions: FrozenSet[str] = COMPRESSED_EXTENSIONS,
+        durability: Optional[str] = None,
+        workers: int = 1,
+        parallel_threshold: int = 4 * 1024 * 1024,
+    ) -> None:
+        """
+        Args:
+            compresslevel: Nível de compressão deflate (0-9)
+            compaction_ratio: Fração de espaço morto que dispara reconstrução
+            chunk_size: Tamanho dos chunks de leitura (bytes)
+            stored_extensions: Extensões gravadas sem compressão
+            durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+            workers: Threads de compressão (0 = automático, 1 = sequencial)
+            parallel_threshold: Bytes a comprimir a partir dos quais o modo
+                paralelo compensa o overhead
+        """
+        self.compresslevel = compresslevel
+        self.compaction_ratio = compaction_ratio
+        self.chunk_size = chunk_size
+        self.stored_extensions = frozenset(ext.lower() for ext in stored_extensions)
+        self.durability = durability
+        self.workers = resolve_workers(workers)
+        self.parallel_threshold = parallel_threshold
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def index_path_for(archive_path: Path) -> Path:
+        """Caminho do índice lateral do pacote."""
+        return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+    def update(self, source_dir: Path, archive_path: Path) -> ArchiveStats:
+        """
+        Sincroniza o ZIP com o conteúdo atual da pasta.
+
+        Args:
+            source_dir: Pasta a empacotar
+            archive_path: Caminho do ZIP (com extensão)
+
+        Returns:
+            ArchiveStats da atualização
+        """
+        source_dir = Path(source_dir)
+        archive_path = Path(archive_path)
+        with self._lock_for(archive_path):
+            started = time.perf_counter()
+            stats = self._update(source_dir, archive_path)
+            stats.duration_seconds = round(time.perf_counter() - started, 4)
+            stats.archive_bytes = archive_path.stat().st_size
+
+        logger.info(
+            f"Pacote {archive_path.name}: {stats.mode} "
+            f"(+{stats.added} ~{stats.replaced} -{stats.removed} ={stats.unchanged}, "
+            f"{stats.throughput_mb_s:.1f} MB/s, {stats.workers} worker(s))"
+        )
+        return stats
+
+    def submit(self, source_dir: Path, archive_path: Path) -> "Future[ArchiveStats]":
+        """
+        Agenda ``update`` em background.
+
+        As atualizações são serializadas em uma única thread de
+        empacotamento; o processo aguarda as pendentes antes de encerrar.
+
+        Returns:
+            Future com ArchiveStats
+        """
+        return submit_background(self.update, source_dir, archive_path)
+
+    # ------------------------------------------------------------------
+    # Implementação
+    # ------------------------------------------------------------------
+
+    def _lock_for(self, archive_path: Path) -> threading.Lock:
+        key = archive_path.resolve()
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _update(self, source_dir: Path, archive_path: Path) -> ArchiveStats:
+        stats = ArchiveStats(archive=archive_path)
+        index_path = self.index_path_for(archive_path)
+        sources = scan_sources(source_dir, {archive_path.resolve(), index_path.resolve()})
+        index = self._load_index(archive_path, index_path)
+
+        if index is None:
+            stats.mode = "rebuild"
+            stats.added = len(sources)
+            entries = self._rebuild(archive_path, sources, stats)
+            self._save_index(archive_path, index_path, entries, dead_bytes=0)
+            return stats
+
+        entries: Dict[str, Dict[str, object]] = index["entries"]
+        to_write: List[_SourceFile] = []
+        replaced: List[str] = []
+        touched = False
+        for source in sources.values():
+            entry = entries.get(source.arcname)
+            if entry is None:
+                to_write.append(source)
+                stats.added += 1
+            elif entry["size"] == source.size and entry["mtime_ns"] == source.mtime_ns:
+                stats.unchanged += 1
+            elif entry["size"] == source.size and self._hash(source.path, stats) == entry["sha256"]:
+                # Apenas tocado (mtime mudou, conteúdo igual)
+                entry["mtime_ns"] = source.mtime_ns
+                touched = True
+                stats.unchanged += 1
+            else:
+                to_write.append(source)
+                replaced.append(source.arcname)
+                stats.replaced += 1
+        removed = [name for name in entries if name not in sources]
+        stats.removed = len(removed)
+
+        if not to_write and not removed:
+            if touched:
+                self._save_index(archive_path, index_path, entries, index["dead_bytes"])
+            stats.dead_bytes = index["dead_bytes"]
+            return stats
+
+        archive_size = archive_path.stat().st_size
+        dropped_bytes = sum(entries[name]["span"] for name in replaced + removed)
+        dead_bytes = index["dead_bytes"] + dropped_bytes
+        if dead_bytes > archive_size * self.compaction_ratio:
+            stats.mode = "compact"
+            entries = self._rebuild(archive_path, sources, stats)
+            self._save_index(archive_path, index_path, entries, dead_bytes=0)
+            return stats
+
+        stats.mode = "append"
+        with zipfile.ZipFile(archive_path, "a") as zf:
+            for name in replaced + removed:
+                # Remove apenas do diretório central: os bytes antigos viram espaço morto
+                info = zf.NameToInfo.pop(name, None)
+                if info is not None:
+                    zf.filelist.remove(info)
+                entries.pop(name, None)
+            if removed and not to_write:
+                # Força a reescrita do diretório central ao fechar
+                zf._didModify = True
+            entries.update(self._write_entries(zf, to_write, stats))
+        self._sync(archive_path)
+
+        stats.dead_bytes = dead_bytes
+        self._save_index(archive_path, index_path, entries, dead_bytes)
+        return stats
+
+    def _rebuild(
+        self,
+        archive_path: Path,
+        sources: Dict[str, _SourceFile],
+        stats: ArchiveStats,
+    ) -> Dict[str, Dict[str, object]]:
+        """Reconstrói o ZIP em um temporário e o publica atomicamente."""
+        level = resolve_durability(self.durability)
+        entries: Dict[str, Dict[str, object]] = {}
+        fd, tmp_path = create_temp_file(archive_path)
+        try:
+            with os.fdopen(fd, "w+b") as handle:
+                with zipfile.ZipFile(handle, "w") as zf:
+                    entries = self._write_entries(zf, list(sources.values()), stats)
+                handle.flush()
+                if level != DURABILITY_NONE:
+                    os.fsync(handle.fileno())
+            publish_temp_file(tmp_path, archive_path, level)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return entries
+
+    def _write_entries(
+        self,
+        zf: zipfile.ZipFile,
+        sources: List[_SourceFile],
+        stats: ArchiveStats,
+    ) -> Dict[str, Dict[str, object]]:
+        """Grava as entradas (em paralelo quando o volume compensa)."""
+        to_deflate = sum(s.size for s in sources if not self._is_stored(s))
+        if self.workers > 1 and len(sources) > 1 and to_deflate >= self.parallel_threshold:
+            stats.workers = self.workers
+            return self._write_entries_parallel(zf, sources, stats)
+        return {source.arcname: self._write_entry(zf, source, stats) for source in sources}
+
+    def _write_entries_parallel(
+        self,
+        zf: zipfile.ZipFile,
+        sources: List[_SourceFile],
+        stats: ArchiveStats,
+    ) -> Dict[str, Dict[str, object]]:
+        """
+        Comprime entradas em um pool de threads e as grava em ordem.
+
+        A janela de tarefas em andamento é limitada para que o volume
+        comprimido aguardando gravação não cresça sem limite.
+        """
+        entries: Dict[str, Dict[str, object]] = {}
+        pending: Deque[Tuple[_SourceFile, Future]] = deque()
+        remaining = iter(sources)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="deflate") as pool:
+            def fill() -> None:
+                while len(pending) < self.workers * 2:
+                    source = next(remaining, None)
+                    if source is None:
+                        return
+                    pending.append((source, pool.submit(self._compress_entry, source)))
+
+            try:
+                fill()
+                while pending:
+                    source, future = pending.popleft()
+                    compressed = future.result()
+                    fill()
+                    with compressed.data:
+                        _write_precompressed(zf, compressed.zinfo, compressed.data, self.chunk_size)
+                    stats.bytes_read += source.size
+                    entries[source.arcname] = {
+                        "size": source.size,
+                        "mtime_ns": source.mtime_ns,
+                        "sha256": compressed.sha256,
+                        "span": _entry_span(compressed.zinfo),
+                    }
+            except BaseException:
+                for _, future in pending:
+                    future.cancel()
+                raise
+        return entries
+
+    def _compress_entry(self, source: _SourceFile) -> _CompressedEntry:
+        """Lê e comprime uma entrada isoladamente (executado no pool)."""
+        zinfo = self._zinfo_for(source)
+        stored = zinfo.compress_type == zipfile.ZIP_STORED
+        compressor = None if stored else zlib.compressobj(self.compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        digest = hashlib.sha256()
+        crc = 0
+        file_size = 0
+        spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+        try:
+            with open(source.path, "rb") as src:
+                while True:
+                    chunk = src.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    crc = zlib.crc32(chunk, crc)
+                    file_size += len(chunk)
+                    spool.write(chunk if compressor is None else compressor.compress(chunk))
+            if compressor is not None:
+                spool.write(compressor.flush())
+        except BaseException:
+            spool.close()
+            raise
+
+        zinfo.file_size = file_size
+        zinfo.CRC = crc
+        zinfo.compress_size = spool.tell()
+        spool.seek(0)
+        return _CompressedEntry(zinfo=zinfo, data=spool, sha256=digest.hexdigest())
+
+    def _is_stored(self, source: _SourceFile) -> bool:
+        return source.path.suffix.lower() in self.stored_extensions
+
+    def _zinfo_for(self, source: _SourceFile) -> zipfile.ZipInfo:
+        zinfo = zipfile.ZipInfo.from_file(source.path, source.arcname)
+        if self._is_stored(source):
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zinfo._compresslevel = self.compresslevel
+        return zinfo
+
+    def _write_entry(self, zf: zipfile.ZipFile, source: _SourceFile, stats: ArchiveStats) -> Dict[str, object]:
+        """Comprime a entrada em streaming, calculando o hash no mesmo passe."""
+        zinfo = self._zinfo_for(source)
+
+        digest = hashlib.sha256()
+        with open(source.path, "rb") as src, zf.open(zinfo, "w") as dest:
+            while True:
+                chunk = src.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                dest.write(chunk)
+                stats.bytes_read += len(chunk)
+
+        return {
+            "size": source.size,
+            "mtime_ns": source.mtime_ns,
+            "sha256": digest.hexdigest(),
+            "span": _entry_span(zinfo),
+        }
+
+    def _hash(self, path: Path, stats: ArchiveStats) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            while True:
+                chunk = handle.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                stats.bytes_read += len(chunk)
+        return digest.hexdigest()
+
+    def _load_index(self, archive_path: Path, index_path: Path) -> Optional[Dict[str, object]]:
+        """Carrega o índice; None se ausente ou inconsistente com o ZIP."""
+        if not archive_path.exists() or not index_path.exists():
+            return None
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            st = archive_path.stat()
+            if (
+                index.get("version") != INDEX_VERSION
+                or index.get("archive_size") != st.st_size
+                or index.get("archive_mtime_ns") != st.st_mtime_ns
+            ):
+                logger.info(f"Índice de {archive_path.name} desatualizado; reconstruindo pacote")
+                return None
+            return index
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Índice de pacote inválido ({index_path}): {exc}")
+            return None
+
+    def _save_index(
+        self,
+        archive_path: Path,
+        index_path: Path,
+        entries: Dict[str, Dict[str, object]],
+        dead_bytes: int,
+    ) -> None:
+        st = archive_path.stat()
+        payload = {
+            "version": INDEX_VERSION,
+            "archive_size": st.st_size,
+            "archive_mtime_ns": st.st_mtime_ns,
+            "dead_bytes": dead_bytes,
+            "entries": entries,
+        }
+        atomic_write_text(index_path, json.dumps(payload, ensure_ascii=False), durability=self.durability)
+
+    def _sync(self, archive_path: Path) -> None:
+        if resolve_durability(self.durability) == DURABILITY_NONE:
+            return
+        fd = os.open(str(archive_path), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def write_tar_zst(
+    source_dir: Path,
+    target: Path,
+    level: int = 3,
+    threads: int = 0,
+    durability: Optional[str] = None,
+) -> ArchiveStats:
+    """
+    Empacota a pasta em ``.tar.zst`` (escrita atômica, sempre completa).
+
+    Mais rápido que ZIP/deflate para transferências internas, mas não
+    incremental e menos portátil para usuários finais.
+
+    Args:
+        source_dir: Pasta a empacotar
+        target: Caminho do arquivo (ex: ``.../Ctx_outputs.tar.zst``)
+        level: Nível de compressão zstd
+        threads: Threads do zstd (0 = automático)
+        durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+
+    Returns:
+        ArchiveStats (modo ``rebuild``)
+
+    Raises:
+        ImportError: Se o pacote ``zstandard`` não estiver instalado
+    """
+    if zstandard is None:
+        raise ImportError(
+            "zstandard é necessário para pacotes .tar.zst. Instale com: pip install zstandard"
+        )
+
+    source_dir = Path(source_dir)
+    target = Path(target)
+    level_name = resolve_durability(durability)
+    workers = resolve_workers(threads)
+    stats = ArchiveStats(archive=target, mode="rebuild", workers=workers)
+    sources = scan_sources(source_dir, {target.resolve()})
+    started = time.perf_counter()
+
+    compressor = zstandard.ZstdCompressor(level=level, threads=workers if workers > 1 else 0)
+    fd, tmp_path = create_temp_file(target)
+    try:
+        with os.fdopen(fd, "w+b") as handle:
+            with compressor.stream_writer(handle, closefd=False) as writer:
+                with tarfile.open(fileobj=writer, mode="w|") as tar:
+                    for source in sources.values():
+                        tarinfo = tar.gettarinfo(str(source.path), arcname=source.arcname)
+                        with open(source.path, "rb") as src:
+                            tar.addfile(tarinfo, src)
+                        stats.bytes_read += tarinfo.size
+                        stats.added += 1
+            handle.flush()
+            if level_name != DURABILITY_NONE:
+                os.fsync(handle.fileno())
+        publish_temp_file(tmp_path, target, level_name)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    stats.duration_seconds = round(time.perf_counter() - started, 4)
+    stats.archive_bytes = target.stat().st_size
+    logger.info(
+        f"Pacote {target.name}: {stats.added} arquivos, "
+        f"{stats.throughput_mb_s:.1f} MB/s, {workers} thread(s)"
+    )
+    return stats
+
+
+def scan_sources(source_dir: Path, excluded: Iterable[Path] = ()) -> Dict[str, _SourceFile]:
+    """Lista os arquivos a empacotar, em ordem determinística."""
+    excluded = set(excluded)
+    sources: Dict[str, _SourceFile] = {}
+    for root, dirs, files in os.walk(source_dir):
+        # O CAS guarda blobs já presentes no workspace via hardlink
+        dirs[:] = sorted(d for d in dirs if d != CAS_DIRNAME)
+        root_path = Path(root)
+        for name in sorted(files):
+            if _is_excluded(name):
+                continue
+            path = root_path / name
+            if path.resolve() in excluded:
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            arcname = path.relative_to(source_dir).as_posix()
+            sources[arcname] = _SourceFile(path, arcname, st.st_size, st.st_mtime_ns)
+    return sources
+
+
+def resolve_workers(workers: int) -> int:
+    """Resolve o número de workers (0 = automático, limitado a 8)."""
+    if workers > 0:
+        return workers
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _write_precompressed(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: IO[bytes], chunk_size: int) -> None:
+    """
+    Grava no ZIP uma entrada já comprimida (CRC e tamanhos preenchidos).
+
+    Replica o que ``ZipFile.writestr`` faz internamente, mas copiando o
+    conteúdo comprimido em chunks em vez de recomprimi-lo.
+    """
+    with zf._lock:
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        zf.fp.write(zinfo.FileHeader(zip64))
+        shutil.copyfileobj(data, zf.fp, chunk_size)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+
+
+def _is_excluded(name: str) -> bool:
+    if name in EXCLUDED_NAMES or name.endswith(".zip" + INDEX_SUFFIX):
+        return True
+    return name.startswith(".") and name.endswith(_TEMP_SUFFIXES)
+
+
+def _entry_span(zinfo: zipfile.ZipInfo) -> int:
+    """Bytes ocupados pela entrada no corpo do ZIP (aproximado)."""
+    descriptor = 16 if zinfo.flag_bits & 0x08 else 0
+    return (
+        _LOCAL_HEADER_SIZE
+        + len(zinfo.filename.encode("utf-8"))
+        + len(zinfo.extra)
+        + zinfo.compress_size
+        + descriptor
+    )
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_guard = threading.Lock()
+
+
+def submit_background(fn: Callable[..., ArchiveStats], *args: Any) -> "Future[ArchiveStats]":
+    """
+    Executa um empacotamento na thread de background.
+
+    Os empacotamentos são serializados; o processo aguarda os pendentes
+    antes de encerrar.
+    """
+    global _executor
+    with _executor_guard:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="package")
+    return _executor.submit(fn, *args)
+
+
+__all__ = [
+    "ArchiveStats",
+    "COMPRESSED_EXTENSIONS",
+    "IncrementalArchiver",
+    "resolve_workers",
+    "scan_sources",
+    "submit_background",
+    "write_tar_zst",
+]
@@ -0,0 +1,266 @@
+"""
+Escrita atômica e durável de arquivos.
+
+Toda escrita passa por um arquivo temporário na mesma pasta do destino,
+que só é renomeado (``os.replace``) para o nome final depois de escrito por
+completo. Um crash no meio da escrita deixa, no pior caso, um ``.tmp``
+órfão — nunca um artefato truncado.
+
+Níveis de durabilidade (``AGENTS_IO_DURABILITY``):
+
+- ``none``: apenas rename atômico (sem fsync); mais rápido
+- ``file``: fsync do arquivo antes do rename (padrão)
+- ``full``: fsync do arquivo e do diretório após o rename
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from framework.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_NONE = "none"
+DURABILITY_FILE = "file"
+DURABILITY_FULL = "full"
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_FILE, DURABILITY_FULL)
+
+TEMP_SUFFIX = ".tmp"
+
+# mkstemp cria arquivos com modo 0600; artefatos publicados seguem o umask
+# do processo, como ``Path.write_text`` faria.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+def resolve_durability(durability: Optional[str] = None) -> str:
+    """
+    Resolve o nível de durabilidade (argumento ou ``AGENTS_IO_DURABILITY``).
+
+    Raises:
+        ValueError: Se o nível for desconhecido
+    """
+    level = durability or get_settings(validate=False).io_durability
+    if level not in DURABILITY_LEVELS:
+        raise ValueError(
+            f"Durabilidade '{level}' inválida. Valores válidos: {', '.join(DURABILITY_LEVELS)}"
+        )
+    return level
+
+
+def fsync_directory(directory: Path) -> None:
+    """Faz fsync de um diretório para persistir renames (no-op onde não suportado)."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:  # pragma: no cover - ex: Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - sistemas de arquivos sem suporte
+        pass
+    finally:
+        os.close(fd)
+
+
+def create_temp_file(target: Path, suffix: str = TEMP_SUFFIX) -> Tuple[int, Path]:
+    """
+    Cria arquivo temporário oculto na mesma pasta do destino.
+
+    Returns:
+        Tupla (file descriptor, caminho temporário)
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.",
+        suffix=suffix,
+        dir=str(target.parent),
+    )
+    if hasattr(os, "fchmod"):
+        os.fchmod(fd, _FILE_MODE)
+    return fd, Path(tmp_name)
+
+
+def publish_temp_file(tmp_path: Path, target: Path, durability: str, sync_dir: bool = True) -> None:
+    """
+    Renomeia o temporário para o destino final.
+
+    Args:
+        tmp_path: Arquivo temporário já escrito (e sincronizado, se aplicável)
+        target: Caminho final
+        durability: Nível de durabilidade resolvido
+        sync_dir: Se False, o fsync do diretório fica a cargo do chamador
+    """
+    os.replace(tmp_path, target)
+    if sync_dir and durability == DURABILITY_FULL:
+        fsync_directory(target.parent)
+
+
+def _write_temp(target: Path, data: bytes, durability: str) -> Path:
+    fd, tmp_path = create_temp_file(target)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            if durability != DURABILITY_NONE:
+                os.fsync(handle.fileno())
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    return tmp_path
+
+
+def _discard(tmp_path: Path) -> None:
+    try:
+        tmp_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def atomic_write_bytes(target: Path, data: bytes, durability: Optional[str] = None) -> Path:
+    """
+    Escreve bytes de forma atômica.
+
+    Args:
+        target: Caminho final
+        data: Conteúdo
+        durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+
+    Returns:
+        Path do arquivo escrito
+
+    Raises:
+        OSError: Se a escrita falhar (o destino original permanece intacto)
+    """
+    target = Path(target)
+    level = resolve_durability(durability)
+    tmp_path = _write_temp(target, data, level)
+    try:
+        publish_temp_file(tmp_path, target, level)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    return target
+
+
+def atomic_write_text(
+    target: Path,
+    content: str,
+    encoding: str = "utf-8",
+    durability: Optional[str] = None,
+) -> Path:
+    """
+    Escreve texto de forma atômica (equivalente atômico de ``Path.write_text``).
+
+    Args:
+        target: Caminho final
+        content: Texto
+        encoding: Encoding (padrão: utf-8)
+        durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+
+    Returns:
+        Path do arquivo escrito
+    """
+    return atomic_write_bytes(target, content.encode(encoding), durability=durability)
+
+
+class AtomicWriteTransaction:
+    """
+    Agrupa escritas atômicas para publicá-las juntas.
+
+    Cada arquivo é escrito (e sincronizado) em um temporário assim que é
+    adicionado; ``commit()`` faz apenas os renames e um único fsync por
+    diretório afetado. Se a transação for abortada, nenhum destino é
+    alterado.
+
+    Example:
+        >>> with AtomicWriteTransaction() as tx:
+        ...     tx.write_text(folder / "01-a.MD", "...")
+        ...     tx.write_text(folder / "02-b.MD", "...")
+    """
+
+    def __init__(self, durability: Optional[str] = None) -> None:
+        self.durability = resolve_durability(durability)
+        self._staged: Dict[Path, Path] = {}
+        self.committed: List[Path] = []
+
+    @property
+    def pending_paths(self) -> List[Path]:
+        """Destinos aguardando commit."""
+        return list(self._staged)
+
+    def write_bytes(self, target: Path, data: bytes) -> Path:
+        """Prepara a escrita de bytes; o destino só muda no commit."""
+        return self.stage(target, _write_temp(target, data, self.durability))
+
+    def write_text(self, target: Path, content: str, encoding: str = "utf-8") -> Path:
+        """Prepara a escrita de texto; o destino só muda no commit."""
+        return self.write_bytes(target, content.encode(encoding))
+
+    def stage(self, target: Path, tmp_path: Path) -> Path:
+        """
+        Registra um temporário já preparado pelo chamador (ex: hardlink do
+        CAS) para ser renomeado para ``target`` no commit.
+        """
+        target = Path(target)
+        previous = self._staged.pop(target, None)
+        if previous is not None:
+            _discard(previous)
+        self._staged[target] = Path(tmp_path)
+        return target
+
+    def commit(self) -> List[Path]:
+        """
+        Publica todos os arquivos preparados.
+
+        Returns:
+            Lista de caminhos publicados
+        """
+        directories = set()
+        try:
+            while self._staged:
+                target, tmp_path = next(iter(self._staged.items()))
+                publish_temp_file(tmp_path, target, self.durability, sync_dir=False)
+                del self._staged[target]
+                directories.add(target.parent)
+                self.committed.append(target)
+        finally:
+            if self.durability != DURABILITY_NONE:
+                for directory in directories:
+                    fsync_directory(directory)
+        logger.debug(f"Transação de escrita publicou {len(self.committed)} arquivos")
+        return list(self.committed)
+
+    def rollback(self) -> None:
+        """Descarta os temporários sem alterar os destinos."""
+        for tmp_path in self._staged.values():
+            _discard(tmp_path)
+        self._staged.clear()
+
+    def __enter__(self) -> AtomicWriteTransaction:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+__all__ = [
+    "AtomicWriteTransaction",
+    "DURABILITY_FILE",
+    "DURABILITY_FULL",
+    "DURABILITY_NONE",
+    "atomic_write_bytes",
+    "atomic_write_text",
+    "create_temp_file",
+    "fsync_directory",
+    "publish_temp_file",
+    "resolve_durability",
+]
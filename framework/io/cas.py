@@ -0,0 +1,260 @@
+"""
+Armazenamento de artefatos endereçado por conteúdo (CAS).
+
+Artefatos idênticos (templates preenchidos com "Não informado", READMEs
+copiados, ...) são gravados uma única vez em ``drive/.cas/blobs/`` pelo
+seu sha256; o workspace recebe um hardlink para o blob. Assim:
+
+- O espaço em disco de conteúdos repetidos é pago uma vez
+- Saídas idênticas são detectadas comparando digests, sem reler arquivos
+- Leitores continuam vendo arquivos comuns nos caminhos de sempre
+
+Blobs são somente-leitura: artefatos são sempre substituídos (rename de um
+novo arquivo), nunca editados no lugar, para não alterar o conteúdo de
+outros links. Onde hardlinks não são suportados (outro sistema de arquivos,
+permissões), o artefato é copiado — correto, mas sem deduplicação.
+
+Um blob sem links fora do CAS (``st_nlink == 1``) não é mais referenciado
+e é removido por ``ContentStore.gc``.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import logging
+import os
+import secrets
+import shutil
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from framework.io.atomic import (
+    DURABILITY_NONE,
+    atomic_write_bytes,
+    publish_temp_file,
+    resolve_durability,
+)
+
+logger = logging.getLogger(__name__)
+
+CAS_DIRNAME = ".cas"
+
+_BLOB_MODE = 0o444
+# Erros de os.link que indicam "hardlink indisponível aqui" (usar cópia)
+_LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES}
+
+
+@dataclass
+class CasPutResult:
+    """Resultado de ``ContentStore.put_bytes``."""
+
+    digest: str
+    blob_path: Path
+    size: int
+    deduplicated: bool
+
+
+@dataclass
+class CasGCResult:
+    """Resultado de ``ContentStore.gc``."""
+
+    scanned: int = 0
+    removed: int = 0
+    bytes_freed: int = 0
+
+
+class ContentStore:
+    """
+    Blobs imutáveis endereçados por sha256, com materialização via hardlink.
+
+    Example:
+        >>> cas = ContentStore(Path("drive/.cas"))
+        >>> result = cas.put_bytes(b"Nao informado")
+        >>> cas.materialize(result.digest, Path("drive/Ctx/00-P/01-resumo.MD"))
+        >>> cas.gc()
+    """
+
+    def __init__(self, root: Path, durability: Optional[str] = None) -> None:
+        """
+        Args:
+            root: Pasta do CAS (ex: ``drive/.cas``)
+            durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+        """
+        self.root = Path(root)
+        self.blobs_root = self.root / "blobs"
+        self.durability = durability
+        self.dedup_hits = 0
+        self.link_fallbacks = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_drive(cls, drive_root: Path) -> ContentStore:
+        """CAS padrão de uma pasta ``drive/``."""
+        return cls(Path(drive_root) / CAS_DIRNAME)
+
+    @staticmethod
+    def digest_bytes(data: bytes) -> str:
+        """sha256 (hex) do conteúdo."""
+        return hashlib.sha256(data).hexdigest()
+
+    def blob_path(self, digest: str) -> Path:
+        """Caminho do blob (fan-out de 2 caracteres)."""
+        return self.blobs_root / digest[:2] / digest[2:]
+
+    def contains(self, digest: str) -> bool:
+        """Indica se o conteúdo já está armazenado."""
+        return self.blob_path(digest).exists()
+
+    def put_bytes(self, data: bytes) -> CasPutResult:
+        """
+        Armazena o conteúdo (se ainda não existir).
+
+        Returns:
+            CasPutResult com digest e se o conteúdo já existia
+        """
+        digest = self.digest_bytes(data)
+        blob = self.blob_path(digest)
+        if blob.exists():
+            try:
+                # Renova o mtime para que o GC não remova o blob antes do link
+                os.utime(blob)
+            except FileNotFoundError:
+                return self.put_bytes(data)
+            with self._lock:
+                self.dedup_hits += 1
+            return CasPutResult(digest, blob, len(data), deduplicated=True)
+
+        # Escritores concorrentes do mesmo conteúdo produzem o mesmo blob:
+        # o último rename vence sem efeito observável.
+        atomic_write_bytes(blob, data, durability=self.durability)
+        os.chmod(blob, _BLOB_MODE)
+        return CasPutResult(digest, blob, len(data), deduplicated=False)
+
+    def put_text(self, content: str, encoding: str = "utf-8") -> CasPutResult:
+        """Armazena texto (ver ``put_bytes``)."""
+        return self.put_bytes(content.encode(encoding))
+
+    def link_to_temp(self, digest: str, target: Path) -> Path:
+        """
+        Cria, ao lado do destino, um temporário que aponta para o blob.
+
+        O chamador publica o temporário com rename (ver
+        ``AtomicWriteTransaction.stage``). Sem suporte a hardlink, o
+        temporário é uma cópia do blob.
+
+        Returns:
+            Caminho do temporário
+        """
+        blob = self.blob_path(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            tmp_path = target.with_name(f".{target.name}.{secrets.token_hex(4)}.tmp")
+            try:
+                os.link(blob, tmp_path)
+                return tmp_path
+            except FileExistsError:
+                continue
+            except OSError as exc:
+                if exc.errno not in _LINK_FALLBACK_ERRNOS:
+                    raise
+                break
+
+        with self._lock:
+            self.link_fallbacks += 1
+        logger.debug(f"Hardlink indisponível para {target}; copiando blob")
+        shutil.copyfile(blob, tmp_path)
+        if resolve_durability(self.durability) != DURABILITY_NONE:
+            fd = os.open(str(tmp_path), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return tmp_path
+
+    def materialize(self, digest: str, target: Path) -> Path:
+        """
+        Publica o blob em ``target`` (substituição atômica).
+
+        Returns:
+            Path do destino
+        """
+        target = Path(target)
+        tmp_path = self.link_to_temp(digest, target)
+        try:
+            publish_temp_file(tmp_path, target, resolve_durability(self.durability))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return target
+
+    def iter_blobs(self) -> Iterator[Path]:
+        """Itera sobre todos os blobs armazenados."""
+        if not self.blobs_root.exists():
+            return
+        for fanout in os.scandir(self.blobs_root):
+            if not fanout.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(fanout.path):
+                if entry.is_file(follow_symlinks=False) and not entry.name.startswith("."):
+                    yield Path(entry.path)
+
+    def gc(self, grace_seconds: float = 3600.0, dry_run: bool = False) -> CasGCResult:
+        """
+        Remove blobs não referenciados por nenhum workspace.
+
+        Um blob sem outros hardlinks (``st_nlink == 1``) não é mais usado.
+        Blobs mais novos que ``grace_seconds`` são preservados, pois podem
+        ter acabado de ser gravados e ainda não linkados.
+
+        Args:
+            grace_seconds: Idade mínima (s) para remoção
+            dry_run: Apenas contabiliza, sem remover
+
+        Returns:
+            CasGCResult
+        """
+        result = CasGCResult()
+        cutoff = time.time() - grace_seconds
+        for blob in self.iter_blobs():
+            result.scanned += 1
+            try:
+                st = blob.stat()
+            except FileNotFoundError:
+                continue
+            if st.st_nlink > 1 or st.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                try:
+                    blob.unlink()
+                except FileNotFoundError:
+                    continue
+            result.removed += 1
+            result.bytes_freed += st.st_size
+
+        logger.info(
+            f"GC do CAS: {result.removed}/{result.scanned} blobs removidos "
+            f"({result.bytes_freed} bytes){' [dry-run]' if dry_run else ''}"
+        )
+        return result
+
+    @staticmethod
+    def is_shared(path: Path) -> bool:
+        """Indica se o arquivo compartilha conteúdo com outros (hardlink)."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return stat.S_ISREG(st.st_mode) and st.st_nlink > 1
+
+
+__all__ = [
+    "CAS_DIRNAME",
+    "CasGCResult",
+    "CasPutResult",
+    "ContentStore",
+]
@@ -11,8 +11,40 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+from framework.io.aio import gather_io, run_io
+
 logger = logging.getLogger(__name__)
 
+# Arquivos padrão de conhecimento {arquivo: título}
+STRATEGY_KNOWLEDGE_FILES: Dict[str, str] = {
+    "knowledge.MD": "Base de Conhecimento",
+    "process-analysis.md": "Análise de Processos",
+    "README.MD": "Visão Geral da Estratégia",
+    "tasks.MD": "Checklist Operacional"
+}
+
+PROCESS_KNOWLEDGE_FILES: Dict[str, str] = {
+    "knowledge.MD": "Base de Conhecimento do Processo",
+    "process.MD": "Definição do Processo",
+    "tasks.MD": "Checklist Operacional",
+    "validator.MD": "Critérios de Validação",
+    "README.MD": "Visão Geral"
+}
+
+
+def _as_title_map(
+    files: Union[List[str], List[Path], Dict[str, str]]
+) -> Dict[str, Optional[str]]:
+    """Normaliza lista de caminhos ou dicionário {caminho: título}."""
+    if isinstance(files, list):
+        return {str(f): None for f in files}
+    return dict(files)
+
+
+def _consolidate(contents: List[Optional[str]]) -> str:
+    """Junta os conteúdos carregados (ignorando falhas) sob o cabeçalho padrão."""
+    return "# CONHECIMENTO DA ESTRATÉGIA\n\n" + "".join(c for c in contents if c)
+
 
 class KnowledgeLoader:
     """
@@ -101,19 +133,32 @@ class KnowledgeLoader:
                 "process-analysis.md": "Análise de Processos"
             })
         """
-        knowledge_content = "# CONHECIMENTO DA ESTRATÉGIA\n\n"
+        # Carregar cada arquivo
+        contents = [self.load_file(path, title) for path, title in _as_title_map(files).items()]
+        return _consolidate(contents)
 
-        # Se for lista, converter para dicionário
-        if isinstance(files, list):
-            files = {str(f): None for f in files}
+    async def aload_file(
+        self,
+        file_path: Union[str, Path],
+        title: Optional[str] = None
+    ) -> Optional[str]:
+        """Versão assíncrona de ``load_file``."""
+        return await run_io(self.load_file, file_path, title)
 
-        # Carregar cada arquivo
-        for file_path, title in files.items():
-            content = self.load_file(file_path, title)
-            if content:
-                knowledge_content += content
+    async def aload_files(
+        self,
+        files: Union[List[str], List[Path], Dict[str, str]]
+    ) -> str:
+        """
+        Versão assíncrona de ``load_files``.
 
-        return knowledge_content
+        Os arquivos são lidos em paralelo no pool de I/O; o texto
+        consolidado mantém a ordem de ``files``.
+        """
+        contents = await gather_io(
+            (self.load_file, (path, title)) for path, title in _as_title_map(files).items()
+        )
+        return _consolidate(contents)
 
     def load_strategy_knowledge(
         self,
@@ -141,12 +186,7 @@ class KnowledgeLoader:
 
         # Arquivos padrão se não especificado
         if knowledge_files is None:
-            knowledge_files = {
-                "knowledge.MD": "Base de Conhecimento",
-                "process-analysis.md": "Análise de Processos",
-                "README.MD": "Visão Geral da Estratégia",
-                "tasks.MD": "Checklist Operacional"
-            }
+            knowledge_files = STRATEGY_KNOWLEDGE_FILES
 
         # Atualizar base_path temporariamente para a estratégia
         original_base = self.base_path
@@ -159,6 +199,20 @@ class KnowledgeLoader:
             # Restaurar base_path original
             self.base_path = original_base
 
+    async def aload_strategy_knowledge(
+        self,
+        strategy_name: str,
+        knowledge_files: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Versão assíncrona de ``load_strategy_knowledge``.
+
+        Usa um loader próprio da estratégia em vez de trocar ``base_path``
+        temporariamente, para permitir chamadas concorrentes.
+        """
+        loader = KnowledgeLoader(self.base_path / strategy_name)
+        return await loader.aload_files(knowledge_files or STRATEGY_KNOWLEDGE_FILES)
+
     @classmethod
     def load_from_paths(
         cls,
@@ -223,14 +277,11 @@ class StrategyKnowledgeManager:
         Returns:
             Conhecimento consolidado
         """
-        default_files = {
-            "knowledge.MD": "Base de Conhecimento",
-            "process-analysis.md": "Análise de Processos",
-            "README.MD": "Visão Geral da Estratégia",
-            "tasks.MD": "Checklist Operacional"
-        }
+        return self.loader.load_files(STRATEGY_KNOWLEDGE_FILES)
 
-        return self.loader.load_files(default_files)
+    async def aload_default_knowledge(self) -> str:
+        """Versão assíncrona de ``load_default_knowledge``."""
+        return await self.loader.aload_files(STRATEGY_KNOWLEDGE_FILES)
 
     def load_custom_knowledge(self, files: Dict[str, str]) -> str:
         """
@@ -302,15 +353,11 @@ class ProcessKnowledgeManager:
         Returns:
             Conhecimento consolidado
         """
-        default_files = {
-            "knowledge.MD": "Base de Conhecimento do Processo",
-            "process.MD": "Definição do Processo",
-            "tasks.MD": "Checklist Operacional",
-            "validator.MD": "Critérios de Validação",
-            "README.MD": "Visão Geral"
-        }
-
-        return self.loader.load_files(default_files)
+        return self.loader.load_files(PROCESS_KNOWLEDGE_FILES)
+
+    async def aload_default_knowledge(self) -> str:
+        """Versão assíncrona de ``load_default_knowledge``."""
+        return await self.loader.aload_files(PROCESS_KNOWLEDGE_FILES)
 
     def load_custom_knowledge(self, files: Dict[str, str]) -> str:
         """
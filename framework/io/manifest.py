@@ -7,12 +7,18 @@ Persistência de metadados de execução em formato JSON.
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from framework.core.context import AgentContext
 from framework.core.exceptions import FileOperationError
+from framework.io.aio import run_io
+from framework.io.atomic import atomic_write_text
+from framework.io.run_index import RunIndex, get_run_index
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -21,14 +27,21 @@ class ManifestStore:
     Armazena e recupera manifestos de execução em formato JSON.
 
     Manifestos são salvos em drive/<context>/_pipeline/ e contêm
-    metadados sobre processos executados.
+    metadados sobre processos executados. Quando um ``RunIndex`` está
+    configurado (argumento ou ``AGENTS_RUN_INDEX_PATH``), cada escrita
+    também atualiza o índice SQLite de execuções.
     """
 
     base_folder: Path
+    index: Optional[RunIndex] = None
+    context_name: Optional[str] = None
+    strategy_name: Optional[str] = None
 
     def __post_init__(self) -> None:
-        """Garante que o diretório base existe."""
+        """Garante que o diretório base existe e resolve o índice global."""
         self.base_folder.mkdir(parents=True, exist_ok=True)
+        if self.index is None:
+            self.index = get_run_index()
 
     @classmethod
     def from_context(cls, context: AgentContext) -> ManifestStore:
@@ -42,7 +55,11 @@ class ManifestStore:
             ManifestStore configurado para o contexto
         """
         pipeline_folder = context.workspace_root / "_pipeline"
-        return cls(base_folder=pipeline_folder)
+        return cls(
+            base_folder=pipeline_folder,
+            context_name=context.context_name,
+            strategy_name=context.strategy_name,
+        )
 
     def path_for(self, manifest_name: str) -> Path:
         """
@@ -73,8 +90,7 @@ class ManifestStore:
         try:
             target = self.path_for(manifest_name)
             content = json.dumps(payload, indent=2, ensure_ascii=False)
-            target.write_text(content, encoding="utf-8")
-            return target
+            atomic_write_text(target, content)
         except Exception as exc:
             raise FileOperationError(
                 operation="write",
@@ -83,6 +99,24 @@ class ManifestStore:
                 original_error=exc,
             ) from exc
 
+        self._update_index(target, payload)
+        return target
+
+    def _update_index(self, target: Path, payload: Dict[str, Any]) -> None:
+        """Atualiza o índice de execuções; falhas não invalidam o manifesto."""
+        if self.index is None:
+            return
+        try:
+            self.index.record(
+                target,
+                payload,
+                context=self.context_name,
+                strategy=self.strategy_name,
+            )
+        except Exception as exc:
+            # O manifesto em disco é a fonte da verdade (RunIndex.rebuild)
+            logger.warning(f"Falha ao indexar manifesto {target}: {exc}")
+
     def read(self, manifest_name: str) -> Dict[str, Any]:
         """
         Lê um manifesto de JSON.
@@ -172,6 +206,42 @@ class ManifestStore:
                 original_error=exc,
             ) from exc
 
+        self._remove_from_index(target)
+
+    def _remove_from_index(self, target: Path) -> None:
+        """Remove o manifesto do índice; falhas não invalidam a remoção."""
+        if self.index is None:
+            return
+        try:
+            self.index.remove(target)
+        except Exception as exc:
+            # O índice volta a refletir o disco com RunIndex.rebuild
+            logger.warning(f"Falha ao remover manifesto {target} do índice: {exc}")
+
+    # ------------------------------------------------------------------
+    # Variantes assíncronas (mesma semântica, executadas no pool de I/O)
+    # ------------------------------------------------------------------
+
+    async def awrite(self, manifest_name: str, payload: Dict[str, Any]) -> Path:
+        """Versão assíncrona de ``write``."""
+        return await run_io(self.write, manifest_name, payload)
+
+    async def aread(self, manifest_name: str) -> Dict[str, Any]:
+        """Versão assíncrona de ``read``."""
+        return await run_io(self.read, manifest_name)
+
+    async def aexists(self, manifest_name: str) -> bool:
+        """Versão assíncrona de ``exists``."""
+        return await run_io(self.exists, manifest_name)
+
+    async def alist_manifests(self, pattern: str = "*-manifest.json") -> List[str]:
+        """Versão assíncrona de ``list_manifests``."""
+        return await run_io(self.list_manifests, pattern)
+
+    async def adelete(self, manifest_name: str) -> None:
+        """Versão assíncrona de ``delete``."""
+        await run_io(self.delete, manifest_name)
+
 
 # =============================================================================
 # Função de compatibilidade (compatibilidade com código antigo)
@@ -196,9 +266,7 @@ class ManifestHandler:
 
     def write(self, manifest_name: str, payload: Dict[str, Any]) -> Path:
         target = self.path_for(manifest_name)
-        target.write_text(
-            json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
+        atomic_write_text(target, json.dumps(payload, indent=2, ensure_ascii=False))
         return target
 
     def read(self, manifest_name: str) -> Dict[str, Any]:
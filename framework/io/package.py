@@ -1,17 +1,26 @@
 """
 Empacotamento de artefatos em arquivos compactados.
 
-Cria arquivos ZIP com os artefatos gerados durante a execução.
+Cria arquivos ZIP com os artefatos gerados durante a execução. Os pacotes
+são atualizados de forma incremental (ver ``framework.io.archive``): apenas
+arquivos novos ou alterados são comprimidos a cada execução.
 """
 
 from __future__ import annotations
 
-import shutil
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Optional
 
+from framework.config import get_settings
 from framework.core.context import AgentContext
 from framework.core.exceptions import FileOperationError
+from framework.io.archive import (
+    ArchiveStats,
+    IncrementalArchiver,
+    submit_background,
+    write_tar_zst,
+)
 
 
 class PackageService:
@@ -22,14 +31,16 @@ class PackageService:
     durante a execução de estratégias e processos.
     """
 
-    def __init__(self, context: AgentContext):
+    def __init__(self, context: AgentContext, archiver: Optional[IncrementalArchiver] = None):
         """
         Inicializa o serviço de empacotamento.
 
         Args:
             context: Contexto do agente
+            archiver: Empacotador incremental (padrão: global do processo)
         """
         self.context = context
+        self.archiver = archiver or get_archiver()
 
     def package_strategy_artifacts(
         self, output_name: Optional[str] = None
@@ -54,16 +65,9 @@ class PackageService:
         archive_path = strategy_folder / archive_name
 
         try:
-            # Remove arquivo existente se houver
             zip_path = archive_path.with_suffix(".zip")
-            if zip_path.exists():
-                zip_path.unlink()
-
-            # Cria o arquivo ZIP
-            result = shutil.make_archive(
-                str(archive_path), "zip", root_dir=str(strategy_folder)
-            )
-            return Path(result)
+            self.archiver.update(strategy_folder, zip_path)
+            return zip_path
         except Exception as exc:
             raise FileOperationError(
                 operation="package",
@@ -102,16 +106,9 @@ class PackageService:
         archive_path = process_folder.parent / archive_name
 
         try:
-            # Remove arquivo existente se houver
             zip_path = archive_path.with_suffix(".zip")
-            if zip_path.exists():
-                zip_path.unlink()
-
-            # Cria o arquivo ZIP
-            result = shutil.make_archive(
-                str(archive_path), "zip", root_dir=str(process_folder)
-            )
-            return Path(result)
+            self.archiver.update(process_folder, zip_path)
+            return zip_path
         except Exception as exc:
             raise FileOperationError(
                 operation="package",
@@ -148,16 +145,9 @@ class PackageService:
         archive_path = output_dir / output_name
 
         try:
-            # Remove arquivo existente se houver
             zip_path = archive_path.with_suffix(".zip")
-            if zip_path.exists():
-                zip_path.unlink()
-
-            # Cria o arquivo ZIP
-            result = shutil.make_archive(
-                str(archive_path), "zip", root_dir=str(folder)
-            )
-            return Path(result)
+            self.archiver.update(folder, zip_path)
+            return zip_path
         except Exception as exc:
             raise FileOperationError(
                 operation="package",
@@ -166,22 +156,98 @@ class PackageService:
                 original_error=exc,
             ) from exc
 
-    def create_archive(self, source_dir: Path, output_path: Path) -> Path:
+    def create_archive(
+        self,
+        source_dir: Path,
+        output_path: Path,
+        archive_format: Optional[str] = None,
+    ) -> Path:
         """
-        Compatibilidade com código legado: cria ZIP para uma pasta arbitrária.
+        Compatibilidade com código legado: cria pacote para uma pasta arbitrária.
 
         Args:
             source_dir: Pasta a ser empacotada
-            output_path: Caminho base (sem .zip) do arquivo de saída
+            output_path: Caminho base (sem extensão) do arquivo de saída
+            archive_format: 'zip' ou 'tar.zst' (padrão: AGENTS_PACKAGE_FORMAT)
 
         Returns:
-            Path do arquivo ZIP criado
+            Path do pacote criado
+        """
+        return self.archive_folder(source_dir, output_path, archive_format).archive
+
+    def archive_folder(
+        self,
+        source_dir: Path,
+        output_path: Path,
+        archive_format: Optional[str] = None,
+    ) -> ArchiveStats:
+        """
+        Empacota uma pasta no formato escolhido, retornando estatísticas
+        (incluindo vazão em MB/s).
+
+        Args:
+            source_dir: Pasta a ser empacotada
+            output_path: Caminho base (sem extensão) do arquivo de saída
+            archive_format: 'zip' (incremental) ou 'tar.zst'
+                (padrão: AGENTS_PACKAGE_FORMAT)
+
+        Returns:
+            ArchiveStats do empacotamento
+
+        Raises:
+            FileNotFoundError: Se a pasta não existir
+            FileOperationError: Se houver erro ao criar o pacote
+        """
+        if not source_dir.is_dir():
+            raise FileNotFoundError(f"Pasta não encontrada: {source_dir}")
+
+        archive_format = archive_format or get_settings(validate=False).package_format
+        target = self.archive_path_for(output_path, archive_format)
+        try:
+            if archive_format == "tar.zst":
+                return write_tar_zst(source_dir, target, threads=self.archiver.workers)
+            return self.archiver.update(source_dir, target)
+        except Exception as exc:
+            raise FileOperationError(
+                operation="package",
+                path=str(target),
+                reason=f"Falha ao empacotar pasta '{source_dir}'",
+                original_error=exc,
+            ) from exc
+
+    def create_archive_async(
+        self,
+        source_dir: Path,
+        output_path: Path,
+        archive_format: Optional[str] = None,
+    ) -> "Future[ArchiveStats]":
         """
-        return self.package_custom_folder(
-            folder=source_dir,
-            output_name=output_path.name,
-            output_dir=output_path.parent,
-        )
+        Agenda ``archive_folder`` em background e retorna imediatamente.
+
+        Args:
+            source_dir: Pasta a ser empacotada
+            output_path: Caminho base (sem extensão) do arquivo de saída
+            archive_format: 'zip' ou 'tar.zst' (padrão: AGENTS_PACKAGE_FORMAT)
+
+        Returns:
+            Future com ArchiveStats (o pacote fica em ``archive_path_for(output_path)``)
+
+        Raises:
+            FileNotFoundError: Se a pasta não existir
+        """
+        if not source_dir.is_dir():
+            raise FileNotFoundError(f"Pasta não encontrada: {source_dir}")
+        return submit_background(self.archive_folder, source_dir, output_path, archive_format)
+
+    @staticmethod
+    def archive_path_for(output_path: Path, archive_format: Optional[str] = None) -> Path:
+        """Caminho final do pacote para o formato informado."""
+        archive_format = archive_format or get_settings(validate=False).package_format
+        if archive_format == "tar.zst":
+            return output_path.with_name(output_path.name + ".tar.zst")
+        if archive_format != "zip":
+            raise ValueError(f"Formato de pacote desconhecido: {archive_format}")
+        return output_path.with_suffix(".zip")
 
 
 # =============================================================================
@@ -208,18 +274,24 @@ def package_artifacts(
     strategy_folder.mkdir(parents=True, exist_ok=True)
 
     archive_name = output_name or f"{strategy_name}AgentOutputs"
-    archive_path = strategy_folder / archive_name
+    zip_path = (strategy_folder / archive_name).with_suffix(".zip")
+    get_archiver().update(strategy_folder, zip_path)
+    return zip_path
+
+
+_default_archiver: Optional[IncrementalArchiver] = None
 
-    if archive_path.with_suffix(".zip").exists():
-        archive_path.with_suffix(".zip").unlink()
 
-    result = shutil.make_archive(
-        str(archive_path), "zip", root_dir=str(strategy_folder)
-    )
-    return Path(result)
+def get_archiver() -> IncrementalArchiver:
+    """Retorna o empacotador incremental global do processo."""
+    global _default_archiver
+    if _default_archiver is None:
+        _default_archiver = IncrementalArchiver(workers=get_settings(validate=False).package_workers)
+    return _default_archiver
 
 
 __all__ = [
     "PackageService",
+    "get_archiver",
     "package_artifacts",  # deprecated
 ]
@@ -0,0 +1,445 @@
+"""
+Índice local (SQLite) de execuções e manifestos.
+
+Os manifestos JSON em ``drive/<context>/_pipeline/`` continuam sendo a fonte
+da verdade; este índice é uma visão derivada que evita varrer e parsear
+milhares de workspaces para responder perguntas operacionais como
+"execuções com falha na última semana" ou "custo médio por processo".
+
+Cada ``ManifestStore.write`` atualiza a linha da execução e seus artefatos em
+uma única transação. Se o índice se perder, ``RunIndex.rebuild`` o recria a
+partir dos manifestos existentes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from framework.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    manifest_path TEXT PRIMARY KEY,
+    context TEXT,
+    strategy TEXT,
+    process TEXT,
+    status TEXT,
+    started_at TEXT,
+    completed_at TEXT,
+    updated_at TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_runs_process ON runs (process);
+CREATE INDEX IF NOT EXISTS idx_runs_context ON runs (context);
+CREATE TABLE IF NOT EXISTS artifacts (
+    manifest_path TEXT NOT NULL REFERENCES runs (manifest_path) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    PRIMARY KEY (manifest_path, path)
+);
+"""
+
+# Aliases aceitos para métricas (manifestos e resumo do MonitoringManager)
+_METRIC_ALIASES = {
+    "input_tokens": ("input_tokens", "total_input_tokens"),
+    "output_tokens": ("output_tokens", "total_output_tokens"),
+    "total_tokens": ("total_tokens",),
+    "cost_usd": ("cost_usd", "total_cost_usd", "cost"),
+}
+
+Timestamp = Union[datetime, str]
+
+
+@dataclass
+class RunRecord:
+    """Linha do índice de execuções."""
+
+    manifest_path: str
+    context: Optional[str]
+    strategy: Optional[str]
+    process: Optional[str]
+    status: Optional[str]
+    started_at: Optional[str]
+    completed_at: Optional[str]
+    updated_at: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    cost_usd: float = 0.0
+    error: Optional[str] = None
+    artifacts: List[str] = field(default_factory=list)
+
+
+class RunIndex:
+    """
+    Índice SQLite de execuções, seguro para múltiplas threads e processos.
+
+    Cada operação abre sua própria conexão (SQLite serializa escritores via
+    lock de arquivo), então a mesma instância pode ser compartilhada.
+
+    Example:
+        >>> index = RunIndex(Path("drive/.run-index.sqlite"))
+        >>> index.failed_runs(since=datetime.now() - timedelta(days=7))
+        >>> index.average_cost_by_process()
+    """
+
+    def __init__(self, db_path: Path, timeout: float = 30.0) -> None:
+        """
+        Args:
+            db_path: Caminho do arquivo SQLite (criado se não existir)
+            timeout: Tempo máximo (s) aguardando lock de escrita
+        """
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(str(self.db_path), timeout=self.timeout)) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            # Transação implícita: commit ao sair, rollback em exceção
+            with conn:
+                yield conn
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        manifest_path: Path,
+        payload: Dict[str, Any],
+        context: Optional[str] = None,
+        strategy: Optional[str] = None,
+    ) -> RunRecord:
+        """
+        Insere ou atualiza a execução descrita por um manifesto.
+
+        Args:
+            manifest_path: Caminho do manifesto (chave da execução)
+            payload: Conteúdo do manifesto
+            context: Nome do contexto (padrão: payload ou pasta do workspace)
+            strategy: Nome da estratégia (padrão: payload)
+
+        Returns:
+            RunRecord gravado
+        """
+        record = _record_from_payload(Path(manifest_path), payload, context, strategy)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO runs (
+                    manifest_path, context, strategy, process, status,
+                    started_at, completed_at, updated_at,
+                    input_tokens, output_tokens, total_tokens, cost_usd, error, payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    record.manifest_path,
+                    record.context,
+                    record.strategy,
+                    record.process,
+                    record.status,
+                    record.started_at,
+                    record.completed_at,
+                    record.updated_at,
+                    record.input_tokens,
+                    record.output_tokens,
+                    record.total_tokens,
+                    record.cost_usd,
+                    record.error,
+                    json.dumps(payload, ensure_ascii=False, default=str),
+                ),
+            )
+            conn.execute("DELETE FROM artifacts WHERE manifest_path = ?", (record.manifest_path,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO artifacts (manifest_path, path) VALUES (?, ?)",
+                [(record.manifest_path, path) for path in record.artifacts],
+            )
+        return record
+
+    def remove(self, manifest_path: Path) -> None:
+        """Remove a execução (e seus artefatos) do índice."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM runs WHERE manifest_path = ?", (str(manifest_path),))
+
+    def rebuild(self, drive_root: Path, pattern: str = "*/_pipeline/*-manifest.json") -> int:
+        """
+        Recria o índice a partir dos manifestos em disco (varredura completa).
+
+        Args:
+            drive_root: Pasta ``drive/``
+            pattern: Glob dos manifestos relativo a ``drive_root``
+
+        Returns:
+            Número de manifestos indexados
+        """
+        count = 0
+        with self._connect() as conn:
+            conn.execute("DELETE FROM runs")
+        for manifest_path in sorted(Path(drive_root).glob(pattern)):
+            try:
+                payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning(f"Manifesto ignorado na reindexação ({manifest_path}): {exc}")
+                continue
+            self.record(manifest_path, payload)
+            count += 1
+        logger.info(f"Índice de execuções reconstruído com {count} manifestos")
+        return count
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def query_runs(
+        self,
+        status: Optional[str] = None,
+        context: Optional[str] = None,
+        strategy: Optional[str] = None,
+        process: Optional[str] = None,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        limit: Optional[int] = None,
+    ) -> List[RunRecord]:
+        """
+        Lista execuções filtradas, das mais recentes para as mais antigas.
+
+        O período é comparado com ``completed_at`` (ou ``started_at``/
+        ``updated_at`` quando ausente).
+
+        Returns:
+            Lista de RunRecord
+        """
+        where, params = _build_filters(status, context, strategy, process, since, until)
+        sql = f"SELECT * FROM runs {where} ORDER BY {_RUN_TIME} DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+            artifacts = self._artifacts_for(conn, [row["manifest_path"] for row in rows])
+        return [_row_to_record(row, artifacts.get(row["manifest_path"], [])) for row in rows]
+
+    def failed_runs(self, since: Optional[Timestamp] = None, **filters: Any) -> List[RunRecord]:
+        """Execuções com status ``failed`` (opcionalmente a partir de ``since``)."""
+        return self.query_runs(status="failed", since=since, **filters)
+
+    def average_cost_by_process(
+        self,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        strategy: Optional[str] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Custo e tokens médios agrupados por processo.
+
+        Returns:
+            ``{processo: {"runs", "avg_cost_usd", "total_cost_usd", "avg_total_tokens"}}``
+        """
+        where, params = _build_filters(None, None, strategy, None, since, until)
+        sql = f"""
+            SELECT process,
+                   COUNT(*) AS runs,
+                   AVG(cost_usd) AS avg_cost_usd,
+                   SUM(cost_usd) AS total_cost_usd,
+                   AVG(total_tokens) AS avg_total_tokens
+            FROM runs {where}
+            GROUP BY process
+            ORDER BY process
+        """
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return {
+            row["process"]: {
+                "runs": row["runs"],
+                "avg_cost_usd": round(row["avg_cost_usd"] or 0.0, 6),
+                "total_cost_usd": round(row["total_cost_usd"] or 0.0, 6),
+                "avg_total_tokens": round(row["avg_total_tokens"] or 0.0, 2),
+            }
+            for row in rows
+        }
+
+    def status_counts(self, since: Optional[Timestamp] = None) -> Dict[str, int]:
+        """Número de execuções por status."""
+        where, params = _build_filters(None, None, None, None, since, None)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT status, COUNT(*) AS runs FROM runs {where} GROUP BY status", params
+            ).fetchall()
+        return {row["status"]: row["runs"] for row in rows}
+
+    def runs_for_artifact(self, artifact_path: str) -> List[str]:
+        """Manifestos que referenciam o artefato informado."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT manifest_path FROM artifacts WHERE path = ? ORDER BY manifest_path",
+                (artifact_path,),
+            ).fetchall()
+        return [row["manifest_path"] for row in rows]
+
+    @staticmethod
+    def _artifacts_for(conn: sqlite3.Connection, manifest_paths: List[str]) -> Dict[str, List[str]]:
+        result: Dict[str, List[str]] = {}
+        # Limite de parâmetros do SQLite: consultar em blocos
+        for start in range(0, len(manifest_paths), 500):
+            chunk = manifest_paths[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT manifest_path, path FROM artifacts WHERE manifest_path IN ({placeholders}) "
+                "ORDER BY rowid",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                result.setdefault(row["manifest_path"], []).append(row["path"])
+        return result
+
+
+_RUN_TIME = "COALESCE(completed_at, started_at, updated_at)"
+
+
+def _timestamp(value: Optional[Timestamp]) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _build_filters(
+    status: Optional[str],
+    context: Optional[str],
+    strategy: Optional[str],
+    process: Optional[str],
+    since: Optional[Timestamp],
+    until: Optional[Timestamp],
+) -> tuple:
+    clauses: List[str] = []
+    params: List[Any] = []
+    for column, value in (("status", status), ("context", context), ("strategy", strategy), ("process", process)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append(f"{_RUN_TIME} >= ?")
+        params.append(_timestamp(since))
+    if until is not None:
+        clauses.append(f"{_RUN_TIME} < ?")
+        params.append(_timestamp(until))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def _metric(payload: Dict[str, Any], name: str) -> float:
+    sources = [payload.get("metrics"), payload.get("usage"), payload]
+    for source in sources:
+        if not isinstance(source, dict):
+            continue
+        for alias in _METRIC_ALIASES[name]:
+            value = source.get(alias)
+            if isinstance(value, (int, float)):
+                return value
+    return 0
+
+
+def _artifact_paths(payload: Dict[str, Any]) -> List[str]:
+    paths: List[str] = []
+    for item in payload.get("artifacts") or []:
+        if isinstance(item, dict):
+            item = item.get("path")
+        if item:
+            paths.append(str(item))
+    return paths
+
+
+def _record_from_payload(
+    manifest_path: Path,
+    payload: Dict[str, Any],
+    context: Optional[str],
+    strategy: Optional[str],
+) -> RunRecord:
+    # Manifestos ficam em drive/<context>/_pipeline/
+    default_context = manifest_path.parent.parent.name if manifest_path.parent.name == "_pipeline" else None
+    return RunRecord(
+        manifest_path=str(manifest_path),
+        context=context or payload.get("context") or default_context,
+        strategy=strategy or payload.get("strategy"),
+        process=payload.get("process") or manifest_path.name.replace("-manifest.json", ""),
+        status=payload.get("status"),
+        started_at=_timestamp(payload.get("started_at") or None),
+        completed_at=_timestamp(payload.get("completed_at") or None),
+        updated_at=datetime.now().isoformat(),
+        input_tokens=int(_metric(payload, "input_tokens")),
+        output_tokens=int(_metric(payload, "output_tokens")),
+        total_tokens=int(_metric(payload, "total_tokens")),
+        cost_usd=float(_metric(payload, "cost_usd")),
+        error=payload.get("error"),
+        artifacts=_artifact_paths(payload),
+    )
+
+
+def _row_to_record(row: sqlite3.Row, artifacts: List[str]) -> RunRecord:
+    return RunRecord(
+        manifest_path=row["manifest_path"],
+        context=row["context"],
+        strategy=row["strategy"],
+        process=row["process"],
+        status=row["status"],
+        started_at=row["started_at"],
+        completed_at=row["completed_at"],
+        updated_at=row["updated_at"],
+        input_tokens=row["input_tokens"],
+        output_tokens=row["output_tokens"],
+        total_tokens=row["total_tokens"],
+        cost_usd=row["cost_usd"],
+        error=row["error"],
+        artifacts=artifacts,
+    )
+
+
+_default_index: Optional[RunIndex] = None
+_default_index_guard = threading.Lock()
+
+
+def get_run_index() -> Optional[RunIndex]:
+    """
+    Retorna o índice global configurado por ``AGENTS_RUN_INDEX_PATH``.
+
+    Returns:
+        RunIndex ou None se o índice estiver desabilitado
+    """
+    global _default_index
+    path = get_settings(validate=False).run_index_path
+    if not path:
+        return None
+    with _default_index_guard:
+        if _default_index is None or _default_index.db_path != Path(path):
+            _default_index = RunIndex(Path(path))
+        return _default_index
+
+
+__all__ = [
+    "RunIndex",
+    "RunRecord",
+    "get_run_index",
+]
@@ -0,0 +1,140 @@
+"""
+Alocação O(1) de prefixos numéricos (01-, 02-, ...) para artefatos.
+
+Cada pasta mantém o último número alocado em um arquivo oculto
+(``.artifact-seq``). A alocação lê e incrementa esse valor sob lock:
+
+- ``threading.Lock`` por pasta protege threads do mesmo processo
+- ``fcntl.flock`` no próprio sidecar protege processos concorrentes
+
+A pasta só é varrida uma vez, quando o sidecar ainda não existe (ou está
+corrompido), para inicializar a sequência a partir dos artefatos atuais.
+Números alocados e não utilizados (ex: transação abortada) deixam lacunas,
+nunca colisões.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:  # pragma: no cover - indisponível no Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_FILENAME = ".artifact-seq"
+
+_PREFIX_RE = re.compile(r"^(\d+)-")
+
+
+class SequenceAllocator:
+    """
+    Alocador de sequências numéricas por pasta, seguro entre threads e processos.
+
+    Example:
+        >>> allocator = SequenceAllocator()
+        >>> allocator.allocate(Path("drive/Ctx/ZeroUm/00-Process"))
+        1
+    """
+
+    def __init__(self) -> None:
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def allocate(self, folder: Path) -> int:
+        """
+        Reserva o próximo número da pasta.
+
+        Args:
+            folder: Pasta dos artefatos
+
+        Returns:
+            Número reservado (1, 2, ...)
+        """
+        with self._locked(folder) as handle:
+            value = self._read(folder, handle) + 1
+            self._write(folder, handle, value)
+            return value
+
+    def observe(self, folder: Path, number: int) -> None:
+        """
+        Registra um número usado explicitamente (ex: ``write_numbered_artifact``)
+        para que alocações futuras não o reutilizem.
+        """
+        with self._locked(folder) as handle:
+            current = self._read(folder, handle)
+            if number > current:
+                self._write(folder, handle, number)
+
+    def current(self, folder: Path) -> int:
+        """Último número alocado na pasta (0 se nenhum)."""
+        with self._locked(folder) as handle:
+            return self._read(folder, handle)
+
+    @contextmanager
+    def _locked(self, folder: Path) -> Iterator[int]:
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        with self._locks_guard:
+            lock = self._locks.setdefault(folder, threading.Lock())
+
+        with lock:
+            fd = os.open(str(folder / SEQUENCE_FILENAME), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield fd
+            finally:
+                # Fechar o descritor libera o flock
+                os.close(fd)
+
+    def _read(self, folder: Path, fd: int) -> int:
+        os.lseek(fd, 0, os.SEEK_SET)
+        raw = os.read(fd, 64).strip()
+        if raw.isdigit():
+            return int(raw)
+
+        # Sidecar novo ou corrompido: inicializar varrendo a pasta uma única vez.
+        # O disco é a fonte da verdade: uma pasta apagada e recriada recomeça
+        # a partir dos artefatos que ela contém.
+        highest = 0
+        for entry in os.scandir(folder):
+            match = _PREFIX_RE.match(entry.name)
+            if match:
+                highest = max(highest, int(match.group(1)))
+        logger.debug(f"Sequência de {folder} inicializada em {highest}")
+        return highest
+
+    def _write(self, folder: Path, fd: int, value: int) -> None:
+        data = f"{value}\n".encode("ascii")
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, data)
+
+
+_default_allocator: Optional[SequenceAllocator] = None
+_default_allocator_guard = threading.Lock()
+
+
+def get_sequence_allocator() -> SequenceAllocator:
+    """Retorna o alocador global do processo."""
+    global _default_allocator
+    with _default_allocator_guard:
+        if _default_allocator is None:
+            _default_allocator = SequenceAllocator()
+        return _default_allocator
+
+
+__all__ = [
+    "SEQUENCE_FILENAME",
+    "SequenceAllocator",
+    "get_sequence_allocator",
+]
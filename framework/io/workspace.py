@@ -7,12 +7,28 @@ usando AgentContext para determinar caminhos.
 
 from __future__ import annotations
 
+import codecs
+import os
 import re
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import IO, Dict, Iterator, Optional
 
+from framework.config import get_settings
 from framework.core.context import AgentContext
 from framework.core.exceptions import FileOperationError
+from framework.io.aio import run_io
+from framework.io.atomic import (
+    DURABILITY_NONE,
+    AtomicWriteTransaction,
+    atomic_write_text,
+    create_temp_file,
+    publish_temp_file,
+    resolve_durability,
+)
+from framework.io.cas import ContentStore
+from framework.io.sequence import SEQUENCE_FILENAME, SequenceAllocator, get_sequence_allocator
 
 
 class WorkspaceManager:
@@ -23,14 +39,85 @@ class WorkspaceManager:
     e manter a estrutura padrão do workspace.
     """
 
-    def __init__(self, context: AgentContext):
+    def __init__(
+        self,
+        context: AgentContext,
+        sequence: Optional[SequenceAllocator] = None,
+        cas: Optional[ContentStore] = None,
+    ):
         """
         Inicializa o gerenciador de workspace.
 
         Args:
             context: Contexto do agente
+            sequence: Alocador de prefixos numéricos (padrão: alocador global)
+            cas: Armazenamento por conteúdo (padrão: ``drive/.cas`` se
+                AGENTS_CAS_ENABLED=true, senão desabilitado)
         """
         self.context = context
+        self.sequence = sequence or get_sequence_allocator()
+        if cas is None and get_settings(validate=False).cas_enabled:
+            cas = ContentStore.for_drive(context.workspace_root.parent)
+        self.cas = cas
+        self.artifact_digests: Dict[Path, str] = {}
+        self._transaction: Optional[AtomicWriteTransaction] = None
+
+    @contextmanager
+    def transaction(self, durability: Optional[str] = None) -> Iterator[AtomicWriteTransaction]:
+        """
+        Agrupa as escritas de artefatos de uma etapa em um único commit.
+
+        Dentro do bloco, ``write_artifact`` e ``write_numbered_artifact``
+        preparam os arquivos em temporários; todos são publicados juntos ao
+        final (com um único fsync por diretório). Se o bloco falhar, nenhum
+        artefato é publicado. Transações aninhadas reutilizam a externa.
+
+        Args:
+            durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+
+        Example:
+            >>> with manager.transaction():
+            ...     manager.write_artifact(folder, "resumo", resumo)
+            ...     manager.write_artifact(folder, "plano", plano)
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+
+        tx = AtomicWriteTransaction(durability)
+        self._transaction = tx
+        try:
+            with tx:
+                yield tx
+        finally:
+            self._transaction = None
+
+    def _write_text(self, target: Path, content: str) -> None:
+        """Escreve atomicamente ou prepara na transação ativa."""
+        if self.cas is not None:
+            self._write_via_cas(target, content)
+        elif self._transaction is not None:
+            self._transaction.write_text(target, content)
+        else:
+            atomic_write_text(target, content)
+
+    def _write_via_cas(self, target: Path, content: str) -> None:
+        """Grava o conteúdo no CAS e publica um hardlink em ``target``."""
+        result = self.cas.put_text(content)
+        if self._transaction is not None:
+            self._transaction.stage(target, self.cas.link_to_temp(result.digest, target))
+        else:
+            self.cas.materialize(result.digest, target)
+        self.artifact_digests[target] = result.digest
+
+    def digest_of(self, path: Path) -> Optional[str]:
+        """
+        Digest (sha256) de um artefato escrito por este gerenciador.
+
+        Permite detectar saídas idênticas sem reler arquivos; retorna None
+        para caminhos desconhecidos (ou com o CAS desabilitado).
+        """
+        return self.artifact_digests.get(Path(path))
 
     def ensure_workspace_root(self) -> Path:
         """
@@ -144,7 +231,11 @@ class WorkspaceManager:
         self, folder: Path, slug: str, extension: str = ".MD"
     ) -> Path:
         """
-        Calcula o próximo nome numerado (01-, 02-, etc.) dentro da pasta.
+        Reserva o próximo nome numerado (01-, 02-, etc.) dentro da pasta.
+
+        O número vem do alocador de sequência da pasta (O(1), seguro entre
+        threads e processos), então duas etapas concorrentes nunca recebem
+        o mesmo prefixo. Cada chamada consome um número.
 
         Args:
             folder: Pasta onde o arquivo será criado
@@ -158,17 +249,8 @@ class WorkspaceManager:
             >>> manager.next_prefixed_name(Path("/path"), "problem-hypothesis")
             PosixPath('/path/01-problem-hypothesis.MD')
         """
-        folder.mkdir(parents=True, exist_ok=True)
-
-        pattern = re.compile(r"^(\d{2})-", re.IGNORECASE)
-        highest = 0
-        for item in folder.iterdir():
-            match = pattern.match(item.name)
-            if match:
-                highest = max(highest, int(match.group(1)))
-
+        next_index = self.sequence.allocate(folder)
         slugified = re.sub(r"[^a-z0-9]+", "-", slug.lower()).strip("-")
-        next_index = highest + 1
         filename = f"{next_index:02d}-{slugified}{extension}"
         return folder / filename
 
@@ -196,7 +278,7 @@ class WorkspaceManager:
         """
         try:
             target = self.next_prefixed_name(folder, slug, extension)
-            target.write_text(content, encoding="utf-8")
+            self._write_text(target, content)
             return target
         except Exception as exc:
             raise FileOperationError(
@@ -243,7 +325,8 @@ class WorkspaceManager:
             slugified = re.sub(r"[^a-z0-9]+", "-", slug.lower()).strip("-")
             filename = f"{number:02d}-{slugified}{extension}"
             target = folder / filename
-            target.write_text(content, encoding="utf-8")
+            self._write_text(target, content)
+            self.sequence.observe(folder, number)
             return target
         except Exception as exc:
             raise FileOperationError(
@@ -279,6 +362,26 @@ class WorkspaceManager:
                 original_error=exc,
             ) from exc
 
+    def open_artifact_stream(self, target: Path) -> StreamingArtifactWriter:
+        """
+        Abre um artefato para escrita incremental (streaming).
+
+        Os chunks são gravados em um arquivo temporário na mesma pasta e o
+        artefato só aparece em ``target`` quando o stream é finalizado.
+
+        Args:
+            target: Caminho final do artefato
+
+        Returns:
+            StreamingArtifactWriter pronto para uso como context manager
+
+        Example:
+            >>> with manager.open_artifact_stream(folder / "03-copy.MD") as stream:
+            ...     for chunk in chunks:
+            ...         stream.write(chunk)
+        """
+        return StreamingArtifactWriter(target)
+
     def list_artifacts(
         self, folder: Optional[Path] = None, pattern: str = "*"
     ) -> list[Path]:
@@ -305,7 +408,247 @@ class WorkspaceManager:
         if not folder.exists():
             return []
 
-        return sorted(folder.glob(pattern))
+        return sorted(p for p in folder.glob(pattern) if p.name != SEQUENCE_FILENAME)
+
+    # ------------------------------------------------------------------
+    # Variantes assíncronas (mesma semântica, executadas no pool de I/O)
+    # ------------------------------------------------------------------
+
+    async def awrite_artifact(
+        self, folder: Path, slug: str, content: str, extension: str = ".MD"
+    ) -> Path:
+        """Versão assíncrona de ``write_artifact``."""
+        return await run_io(self.write_artifact, folder, slug, content, extension)
+
+    async def awrite_numbered_artifact(
+        self,
+        number: int,
+        slug: str,
+        content: str,
+        folder: Optional[Path] = None,
+        extension: str = ".MD",
+    ) -> Path:
+        """Versão assíncrona de ``write_numbered_artifact``."""
+        return await run_io(self.write_numbered_artifact, number, slug, content, folder, extension)
+
+    async def aread_artifact(self, path: Path) -> str:
+        """Versão assíncrona de ``read_artifact``."""
+        return await run_io(self.read_artifact, path)
+
+    async def alist_artifacts(
+        self, folder: Optional[Path] = None, pattern: str = "*"
+    ) -> list[Path]:
+        """Versão assíncrona de ``list_artifacts``."""
+        return await run_io(self.list_artifacts, folder, pattern)
+
+
+@dataclass
+class StreamCopyResult:
+    """Resultado de ``StreamingArtifactWriter.write_file``."""
+
+    offset: Optional[int] = None
+    length: int = 0
+    truncated: bool = False
+    source_bytes: int = 0
+
+
+class StreamingArtifactWriter:
+    """
+    Escreve um artefato em chunks e o publica de forma atômica ao final.
+
+    O conteúdo é gravado em ``.<nome>.part`` na mesma pasta do destino;
+    ``commit()`` faz flush/fsync e renomeia para o nome final, de modo que
+    leitores nunca encontram o artefato truncado. Em caso de erro dentro
+    do bloco ``with``, o arquivo temporário é descartado.
+    """
+
+    def __init__(
+        self,
+        target: Path,
+        encoding: str = "utf-8",
+        durability: Optional[str] = None,
+        flush_each_chunk: bool = True,
+    ) -> None:
+        """
+        Inicializa o writer.
+
+        Args:
+            target: Caminho final do artefato
+            encoding: Encoding do texto (padrão: utf-8)
+            durability: 'none', 'file' ou 'full' (padrão: AGENTS_IO_DURABILITY)
+            flush_each_chunk: Flush a cada chunk (progresso visível para
+                leitores); desative para cópias em massa
+        """
+        self.target = Path(target)
+        self.encoding = encoding
+        self.durability = resolve_durability(durability)
+        self.flush_each_chunk = flush_each_chunk
+        self.bytes_written = 0
+        self.chunks_written = 0
+        self._tmp_path: Optional[Path] = None
+        self._handle: Optional[IO[str]] = None
+
+    @property
+    def partial_path(self) -> Optional[Path]:
+        """Caminho do arquivo parcial enquanto o stream está aberto."""
+        return self._tmp_path
+
+    def open(self) -> StreamingArtifactWriter:
+        """
+        Cria o arquivo temporário de destino.
+
+        Raises:
+            FileOperationError: Se não conseguir criar o arquivo temporário
+        """
+        try:
+            fd, self._tmp_path = create_temp_file(self.target, suffix=".part")
+            self._handle = os.fdopen(fd, "w", encoding=self.encoding)
+            return self
+        except Exception as exc:
+            raise FileOperationError(
+                operation="stream",
+                path=str(self.target),
+                reason="Falha ao abrir artefato para streaming",
+                original_error=exc,
+            ) from exc
+
+    def write(self, chunk: str) -> int:
+        """
+        Escreve um chunk e faz flush para que leitores vejam o progresso.
+
+        Args:
+            chunk: Texto a anexar
+
+        Returns:
+            Número de bytes escritos
+        """
+        if self._handle is None:
+            self.open()
+        assert self._handle is not None
+        if not chunk:
+            return 0
+        self._handle.write(chunk)
+        if self.flush_each_chunk:
+            self._handle.flush()
+        size = len(chunk.encode(self.encoding))
+        self.bytes_written += size
+        self.chunks_written += 1
+        return size
+
+    def write_file(
+        self,
+        source: Path,
+        max_bytes: Optional[int] = None,
+        strip: bool = False,
+        prefix: str = "",
+        chunk_size: int = 64 * 1024,
+    ) -> StreamCopyResult:
+        """
+        Copia um arquivo de texto (UTF-8) em chunks, sem carregá-lo inteiro.
+
+        Args:
+            source: Arquivo de origem
+            max_bytes: Limite de bytes lidos da origem (None = sem limite);
+                o corte respeita fronteiras de caracteres UTF-8
+            strip: Remove espaços em branco no início e no fim do conteúdo
+            prefix: Texto escrito antes do conteúdo, apenas se houver conteúdo
+            chunk_size: Tamanho dos chunks de leitura
+
+        Returns:
+            StreamCopyResult com offset/tamanho (bytes) do conteúdo no destino
+
+        Raises:
+            OSError: Se a origem não puder ser aberta
+        """
+        result = StreamCopyResult(source_bytes=os.stat(source).st_size)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        remaining = max_bytes
+        pending = ""
+        started = False
+
+        with open(source, "rb") as handle:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                raw = handle.read(size)
+                if not raw:
+                    break
+                if remaining is not None:
+                    remaining -= len(raw)
+                # Bytes de um caractere incompleto ficam retidos no decoder
+                text = decoder.decode(raw)
+                if strip:
+                    if not started:
+                        text = text.lstrip()
+                    text = pending + text
+                    stripped = text.rstrip()
+                    pending = text[len(stripped):]
+                    text = stripped
+                if not text:
+                    continue
+                if not started:
+                    self.write(prefix)
+                    result.offset = self.bytes_written
+                    started = True
+                result.length += self.write(text)
+
+            if remaining is not None and remaining <= 0 and handle.read(1):
+                result.truncated = True
+            elif not strip and started:
+                result.length += self.write(decoder.decode(b"", final=True))
+
+        return result
+
+    def commit(self) -> Path:
+        """
+        Finaliza o stream e publica o artefato atomicamente.
+
+        Returns:
+            Path do artefato final
+
+        Raises:
+            FileOperationError: Se houver erro ao finalizar o arquivo
+        """
+        if self._handle is None:
+            self.open()
+        assert self._handle is not None and self._tmp_path is not None
+        try:
+            self._handle.flush()
+            if self.durability != DURABILITY_NONE:
+                os.fsync(self._handle.fileno())
+            self._handle.close()
+            publish_temp_file(self._tmp_path, self.target, self.durability)
+        except Exception as exc:
+            self.abort()
+            raise FileOperationError(
+                operation="stream",
+                path=str(self.target),
+                reason="Falha ao finalizar artefato em streaming",
+                original_error=exc,
+            ) from exc
+        self._handle = None
+        self._tmp_path = None
+        return self.target
+
+    def abort(self) -> None:
+        """Descarta o arquivo parcial sem tocar no artefato de destino."""
+        if self._handle is not None and not self._handle.closed:
+            self._handle.close()
+        if self._tmp_path is not None:
+            try:
+                self._tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+        self._handle = None
+        self._tmp_path = None
+
+    def __enter__(self) -> StreamingArtifactWriter:
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
 
 
 # =============================================================================
@@ -361,6 +704,7 @@ def ensure_process_folder(context_name: str, process_code: str, base_path: Path)
 
 __all__ = [
     "WorkspaceManager",
+    "StreamingArtifactWriter",
     "ensure_strategy_folder",  # deprecated
     "ensure_process_folder",  # deprecated
 ]
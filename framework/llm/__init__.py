@@ -6,10 +6,26 @@ Gerencia a criação, configuração e execução de Large Language Models.
 
 from framework.llm.factory import build_llm, create_llm_with_tracing
 from framework.llm.adapters import DeepAgent, create_deep_agent
+from framework.llm.batch import (
+    BatchSession,
+    LocalFileBatchBackend,
+    OpenAIBatchBackend,
+    run_batch,
+)
+from framework.llm.prompts import PromptLayout, load_global_directives
+from framework.llm.semantic_cache import SemanticCache, get_semantic_cache
 
 __all__ = [
     "build_llm",
     "create_llm_with_tracing",
     "DeepAgent",
     "create_deep_agent",
+    "BatchSession",
+    "LocalFileBatchBackend",
+    "OpenAIBatchBackend",
+    "run_batch",
+    "PromptLayout",
+    "load_global_directives",
+    "SemanticCache",
+    "get_semantic_cache",
 ]
@@ -0,0 +1,545 @@
+"""
+Modo batch para execuções offline em massa.
+
+Em vez de uma chamada interativa por prompt, as chamadas LLM feitas durante
+uma execução são coletadas em arquivos de job, submetidas a um backend de
+batch e, quando os resultados chegam, as etapas são reexecutadas consumindo
+as respostas já prontas.
+
+Fluxo (replay determinístico):
+
+1. Com uma ``BatchSession`` ativa, ``build_llm()`` devolve um ``BatchLLM``.
+2. Cada ``invoke()`` calcula a chave do request (modelo + parâmetros +
+   mensagens). Se já houver resultado armazenado, ele é devolvido; senão o
+   request é enfileirado e ``BatchPendingError`` interrompe a etapa.
+3. ``run_batch()`` executa todos os contextos, submete os requests pendentes
+   de uma vez, aguarda o backend e repete até todos concluírem.
+
+Cada rodada avança todos os contextos em uma chamada dependente, então uma
+noite com centenas de contextos vira poucas submissões em massa. Prompts
+idênticos entre contextos são deduplicados pela chave.
+
+Example:
+    >>> backend = LocalFileBatchBackend(Path("drive/_batch"), responder=fake)
+    >>> session = BatchSession(Path("drive/_batch"), backend)
+    >>> report = run_batch(contexts, lambda ctx: run_context(ctx), session)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    runtime_checkable,
+)
+
+from framework.core.exceptions import BatchPendingError
+from framework.io.atomic import atomic_write_text
+from framework.llm.tokens import normalize_messages
+
+try:  # pragma: no cover - dependência opcional
+    import openai
+except ImportError:  # pragma: no cover
+    openai = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Limite de requests por arquivo de job da API de batch da OpenAI
+MAX_REQUESTS_PER_JOB = 50_000
+
+_ROLE_MAP = {
+    "system": "system",
+    "human": "user",
+    "user": "user",
+    "ai": "assistant",
+    "assistant": "assistant",
+}
+
+_active_session: ContextVar[Optional["BatchSession"]] = ContextVar(
+    "framework_batch_session", default=None
+)
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """Request de chat completion coletado para execução em batch."""
+
+    custom_id: str
+    body: Dict[str, Any]
+
+    def to_jsonl(self) -> str:
+        """Serializa no formato de linha da API de batch."""
+        return json.dumps(
+            {
+                "custom_id": self.custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": self.body,
+            },
+            ensure_ascii=False,
+        )
+
+
+@dataclass
+class BatchMessage:
+    """Resposta servida pelo ``BatchLLM`` (compatível com ``.content``)."""
+
+    content: str
+
+
+@runtime_checkable
+class BatchBackend(Protocol):
+    """
+    Protocolo para backends de execução em batch.
+
+    Implementações recebem requests, devolvem um identificador de job e
+    expõem status e resultados por ``custom_id``.
+    """
+
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        """Submete requests e retorna o id do job."""
+        ...
+
+    def poll(self, job_id: str) -> str:
+        """Retorna 'completed', 'in_progress' ou 'failed'."""
+        ...
+
+    def fetch(self, job_id: str) -> Dict[str, str]:
+        """Retorna o conteúdo gerado por ``custom_id``."""
+        ...
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+def parse_batch_output(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    Converte linhas de saída no formato da API de batch em ``{custom_id: texto}``.
+
+    Linhas com erro ou sem conteúdo são ignoradas (e registradas em log), de
+    modo que o request volte a ser enfileirado na próxima rodada.
+    """
+    results: Dict[str, str] = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code", 200) != 200:
+            logger.warning(f"Request de batch {custom_id} falhou: {record.get('error') or response}")
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            logger.warning(f"Request de batch {custom_id} sem conteúdo na resposta")
+            continue
+        results[custom_id] = content or ""
+    return results
+
+
+class LocalFileBatchBackend:
+    """
+    Backend baseado em arquivos locais, para testes e execuções desconectadas.
+
+    Cada job gera ``jobs/<id>.input.jsonl``. O job é considerado concluído
+    quando ``jobs/<id>.output.jsonl`` existir — escrito imediatamente pelo
+    ``responder`` (se informado) ou por um processo externo.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        responder: Optional[Callable[[BatchRequest], str]] = None,
+    ) -> None:
+        """
+        Args:
+            root: Diretório base dos jobs
+            responder: Função que produz a resposta de cada request (opcional)
+        """
+        self.jobs_dir = Path(root) / "jobs"
+        self.responder = responder
+
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        input_path = self.jobs_dir / f"{job_id}.input.jsonl"
+        input_path.write_text(
+            "".join(request.to_jsonl() + "\n" for request in requests),
+            encoding="utf-8",
+        )
+
+        if self.responder is not None:
+            lines = []
+            for request in requests:
+                lines.append(json.dumps({
+                    "custom_id": request.custom_id,
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {
+                            "role": "assistant",
+                            "content": self.responder(request),
+                        }}]},
+                    },
+                }, ensure_ascii=False))
+            # Atômico: poll() usa a existência do arquivo como sinal de conclusão
+            atomic_write_text(self._output_path(job_id), "\n".join(lines) + "\n")
+
+        return job_id
+
+    def poll(self, job_id: str) -> str:
+        return "completed" if self._output_path(job_id).exists() else "in_progress"
+
+    def fetch(self, job_id: str) -> Dict[str, str]:
+        output_path = self._output_path(job_id)
+        with output_path.open("r", encoding="utf-8") as handle:
+            return parse_batch_output(handle)
+
+    def _output_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.output.jsonl"
+
+
+class OpenAIBatchBackend:
+    """Backend que usa a API de batch da OpenAI (desconto de ~50% no custo)."""
+
+    _FAILED_STATUSES = {"failed", "expired", "cancelled", "cancelling"}
+
+    def __init__(self, client: Optional[Any] = None, completion_window: str = "24h") -> None:
+        """
+        Args:
+            client: Cliente ``openai.OpenAI`` (criado automaticamente se omitido)
+            completion_window: Janela de conclusão do job
+
+        Raises:
+            RuntimeError: Se o pacote ``openai`` não estiver instalado
+        """
+        if client is None:
+            if openai is None:
+                raise RuntimeError(
+                    "Pacote 'openai' não encontrado. Instale-o para usar OpenAIBatchBackend."
+                )
+            client = openai.OpenAI()
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        payload = "".join(request.to_jsonl() + "\n" for request in requests).encode("utf-8")
+        uploaded = self.client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def poll(self, job_id: str) -> str:
+        status = self.client.batches.retrieve(job_id).status
+        if status == "completed":
+            return "completed"
+        if status in self._FAILED_STATUSES:
+            return "failed"
+        return "in_progress"
+
+    def fetch(self, job_id: str) -> Dict[str, str]:
+        batch = self.client.batches.retrieve(job_id)
+        if not batch.output_file_id:
+            return {}
+        text = self.client.files.content(batch.output_file_id).text
+        return parse_batch_output(text.splitlines())
+
+
+# =============================================================================
+# Sessão e LLM
+# =============================================================================
+
+
+class BatchSession:
+    """
+    Coleta requests pendentes e armazena resultados de batch.
+
+    Resultados são persistidos em ``<root>/results.jsonl`` (append-only), de
+    modo que uma execução interrompida pode ser retomada sem resubmeter o
+    que já foi respondido.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        backend: BatchBackend,
+        max_requests_per_job: int = MAX_REQUESTS_PER_JOB,
+    ) -> None:
+        """
+        Args:
+            root: Diretório de trabalho da sessão (ex: drive/_batch)
+            backend: Backend de execução
+            max_requests_per_job: Máximo de requests por arquivo de job
+        """
+        self.root = Path(root)
+        self.backend = backend
+        self.max_requests_per_job = max_requests_per_job
+        self.results_path = self.root / "results.jsonl"
+        self.pending: Dict[str, BatchRequest] = {}
+        self.results: Dict[str, str] = self._load_results()
+
+    @contextmanager
+    def activate(self) -> Iterator["BatchSession"]:
+        """Ativa a sessão: ``build_llm()`` passa a devolver ``BatchLLM``."""
+        token = _active_session.set(self)
+        try:
+            yield self
+        finally:
+            _active_session.reset(token)
+
+    def wrap(self, config: Mapping[str, Any]) -> "BatchLLM":
+        """Cria um ``BatchLLM`` com os parâmetros de um config de ``build_llm``."""
+        params: Dict[str, Any] = {}
+        for key in ("temperature", "max_tokens"):
+            if config.get(key) is not None:
+                params[key] = config[key]
+        model = config.get("model") or config.get("model_name")
+        if not model:
+            from framework.config import get_settings
+
+            model = get_settings(validate=False).llm_model
+        return BatchLLM(self, model=model, params=params)
+
+    def resolve(self, request: BatchRequest) -> str:
+        """Retorna o resultado do request ou o enfileira e levanta ``BatchPendingError``."""
+        if request.custom_id in self.results:
+            return self.results[request.custom_id]
+        self.pending.setdefault(request.custom_id, request)
+        raise BatchPendingError(request.custom_id, model=request.body.get("model"))
+
+    def submit_pending(self) -> List[str]:
+        """Submete os requests pendentes em um ou mais jobs."""
+        requests = list(self.pending.values())
+        self.pending.clear()
+        job_ids = []
+        for start in range(0, len(requests), self.max_requests_per_job):
+            chunk = requests[start:start + self.max_requests_per_job]
+            job_id = self.backend.submit(chunk)
+            logger.info(f"Job de batch {job_id} submetido com {len(chunk)} requests")
+            job_ids.append(job_id)
+        return job_ids
+
+    def wait(
+        self,
+        job_ids: Sequence[str],
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, str]:
+        """
+        Aguarda a conclusão dos jobs.
+
+        Returns:
+            Status final por job ('completed' ou 'failed')
+
+        Raises:
+            TimeoutError: Se ``timeout`` for excedido
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        statuses: Dict[str, str] = {}
+        remaining = list(job_ids)
+        while remaining:
+            for job_id in list(remaining):
+                status = self.backend.poll(job_id)
+                if status in ("completed", "failed"):
+                    statuses[job_id] = status
+                    remaining.remove(job_id)
+            if not remaining:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Jobs de batch não concluídos: {remaining}")
+            time.sleep(poll_interval)
+        return statuses
+
+    def collect(self, job_ids: Sequence[str]) -> int:
+        """Baixa e persiste resultados dos jobs. Retorna quantos foram armazenados."""
+        collected: Dict[str, str] = {}
+        for job_id in job_ids:
+            collected.update(self.backend.fetch(job_id))
+        new = {key: value for key, value in collected.items() if key not in self.results}
+        if new:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.results_path.open("a", encoding="utf-8") as handle:
+                for key, value in new.items():
+                    handle.write(json.dumps({"custom_id": key, "content": value}, ensure_ascii=False) + "\n")
+            self.results.update(new)
+        return len(new)
+
+    def _load_results(self) -> Dict[str, str]:
+        if not self.results_path.exists():
+            return {}
+        results: Dict[str, str] = {}
+        with self.results_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    results[record["custom_id"]] = record["content"]
+        return results
+
+
+class BatchLLM:
+    """
+    Substituto de chat model que resolve chamadas via ``BatchSession``.
+
+    Aceita os mesmos formatos de entrada usados no framework: string, lista
+    de tuplas ``(role, conteúdo)`` ou mensagens LangChain.
+    """
+
+    def __init__(self, session: BatchSession, model: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self.session = session
+        self.model = model
+        self.params = params or {}
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> BatchMessage:
+        return BatchMessage(content=self.session.resolve(self.build_request(prompt)))
+
+    def stream(self, prompt: Any, **kwargs: Any) -> Iterator[BatchMessage]:
+        yield self.invoke(prompt, **kwargs)
+
+    def build_request(self, prompt: Any) -> BatchRequest:
+        """Normaliza o prompt e calcula a chave determinística do request."""
+        body = {"model": self.model, "messages": _to_openai_messages(prompt), **self.params}
+        digest = hashlib.sha256(
+            json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return BatchRequest(custom_id=f"req-{digest[:32]}", body=body)
+
+
+def _to_openai_messages(prompt: Any) -> List[Dict[str, str]]:
+    return [
+        {"role": _ROLE_MAP.get(role, "user"), "content": content}
+        for role, content in normalize_messages(prompt)
+    ]
+
+
+def get_active_batch_session() -> Optional[BatchSession]:
+    """Retorna a ``BatchSession`` ativa no contexto atual (se houver)."""
+    return _active_session.get()
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+
+@dataclass
+class BatchRunReport:
+    """Resultado de uma execução em batch."""
+
+    results: Dict[int, Any] = field(default_factory=dict)
+    errors: Dict[int, str] = field(default_factory=dict)
+    rounds: int = 0
+    jobs: List[str] = field(default_factory=list)
+    submitted_requests: int = 0
+
+    @property
+    def completed(self) -> int:
+        return len(self.results)
+
+
+def run_batch(
+    items: Sequence[Any],
+    runner: Callable[[Any], Any],
+    session: BatchSession,
+    max_rounds: int = 100,
+    poll_interval: float = 60.0,
+    timeout: Optional[float] = None,
+) -> BatchRunReport:
+    """
+    Executa ``runner`` para cada item em rodadas até todos concluírem.
+
+    Em cada rodada os itens pendentes são reexecutados com a sessão ativa;
+    os requests coletados são submetidos juntos e a rodada seguinte começa
+    quando o backend devolve os resultados.
+
+    Args:
+        items: Itens a executar (ex: contextos)
+        runner: Função que executa um item (deve ser determinística nos prompts)
+        session: Sessão de batch
+        max_rounds: Limite de rodadas (proteção contra prompts não determinísticos)
+        poll_interval: Intervalo entre consultas de status (segundos)
+        timeout: Tempo máximo de espera por rodada (segundos)
+
+    Returns:
+        BatchRunReport com resultados por índice do item
+
+    Raises:
+        RuntimeError: Se ``max_rounds`` for atingido com itens pendentes
+    """
+    report = BatchRunReport()
+    pending = list(range(len(items)))
+
+    while pending:
+        if report.rounds >= max_rounds:
+            raise RuntimeError(
+                f"Execução em batch não convergiu após {max_rounds} rodadas "
+                f"({len(pending)} itens pendentes)"
+            )
+        report.rounds += 1
+
+        waiting = []
+        with session.activate():
+            for index in pending:
+                try:
+                    report.results[index] = runner(items[index])
+                except BatchPendingError:
+                    waiting.append(index)
+                except Exception as exc:
+                    logger.error(f"Item {index} falhou na execução em batch: {exc}")
+                    report.errors[index] = str(exc)
+
+        pending = waiting
+        if not pending:
+            break
+
+        report.submitted_requests += len(session.pending)
+        job_ids = session.submit_pending()
+        report.jobs.extend(job_ids)
+        statuses = session.wait(job_ids, poll_interval=poll_interval, timeout=timeout)
+        stored = session.collect([job for job, status in statuses.items() if status == "completed"])
+        logger.info(
+            f"Rodada {report.rounds}: {len(pending)} itens aguardando, {stored} resultados recebidos"
+        )
+        if stored == 0:
+            raise RuntimeError("Jobs de batch concluídos sem novos resultados; abortando execução")
+
+    return report
+
+
+__all__ = [
+    "BatchBackend",
+    "BatchLLM",
+    "BatchMessage",
+    "BatchRequest",
+    "BatchRunReport",
+    "BatchSession",
+    "LocalFileBatchBackend",
+    "OpenAIBatchBackend",
+    "get_active_batch_session",
+    "parse_batch_output",
+    "run_batch",
+]
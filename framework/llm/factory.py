@@ -10,6 +10,7 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional
 
 from framework.config import get_settings
+from framework.llm.batch import get_active_batch_session
 
 try:  # pragma: no cover - dependência opcional
     from langchain_openai import ChatOpenAI
@@ -46,6 +47,7 @@ def build_llm(config: Optional[Mapping[str, Any]] = None) -> Any:
             - observability: configurações para callbacks automáticos
             - callbacks: callbacks adicionais definidos manualmente
             - builder: função customizada para construir LLM
+            - interactive: se True, ignora uma BatchSession ativa
 
     Returns:
         Instância compatível com LangChain pronta para uso
@@ -59,6 +61,12 @@ def build_llm(config: Optional[Mapping[str, Any]] = None) -> Any:
         >>> llm = build_llm({"provider": "openai", "observability": {"langsmith": True}})
     """
     cfg: MutableMapping[str, Any] = dict(config or {})
+
+    # Em modo batch as chamadas são coletadas em jobs em vez de executadas
+    batch_session = get_active_batch_session()
+    if batch_session is not None and not cfg.get("interactive"):
+        return batch_session.wrap(cfg)
+
     provider = str(cfg.get("provider", "openai")).lower()
 
     if provider not in {"openai", "openai_compat", "openai-compatible"}:
@@ -0,0 +1,136 @@
+"""
+Montagem de prompts em layout amigável ao cache de prefixo dos provedores.
+
+Provedores como OpenAI e Anthropic reaproveitam o processamento de prefixos
+idênticos entre chamadas (prompt caching). Para isso o conteúdo estável
+(diretrizes globais, conhecimento do processo, regras) precisa vir sempre
+primeiro e byte a byte igual, enquanto o conteúdo variável (tarefa,
+contexto da execução) fica no final.
+
+``PromptLayout`` separa explicitamente as duas partes e as emite como
+mensagens estruturadas (``system`` + ``human``) nessa ordem.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# __file__ = framework/llm/prompts.py -> parents[2] = raiz do repositório
+GLOBAL_DIRECTIVES_PATH = Path(__file__).resolve().parents[2] / "models" / "global-directives.MD"
+
+SECTION_SEPARATOR = "\n\n" + "=" * 80 + "\n\n"
+
+
+@lru_cache(maxsize=8)
+def _read_directives(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8").strip()
+
+
+def load_global_directives(path: Optional[Path] = None) -> str:
+    """
+    Carrega as diretrizes globais compartilhadas por todos os agentes.
+
+    O conteúdo é mantido em cache enquanto o arquivo não mudar, garantindo
+    que o prefixo estável seja idêntico entre chamadas.
+
+    Args:
+        path: Caminho alternativo do arquivo (padrão: models/global-directives.MD)
+
+    Returns:
+        Conteúdo das diretrizes ou string vazia se o arquivo não existir
+    """
+    target = Path(path) if path else GLOBAL_DIRECTIVES_PATH
+    try:
+        mtime_ns = target.stat().st_mtime_ns
+    except OSError:
+        logger.debug(f"Diretrizes globais não encontradas em {target}")
+        return ""
+    return _read_directives(str(target), mtime_ns)
+
+
+@dataclass
+class PromptLayout:
+    """
+    Prompt dividido em prefixo estável e sufixo variável.
+
+    Attributes:
+        static_sections: Seções (título, corpo) que se repetem entre chamadas
+        variable_sections: Seções (título, corpo) específicas da chamada
+
+    Example:
+        layout = PromptLayout()
+        layout.add_static("DIRETRIZES GLOBAIS", load_global_directives())
+        layout.add_static("CONHECIMENTO DO PROCESSO", knowledge)
+        layout.add_variable("TAREFA", prompt)
+        llm.invoke(layout.to_messages())
+    """
+
+    static_sections: List[Tuple[str, str]] = field(default_factory=list)
+    variable_sections: List[Tuple[str, str]] = field(default_factory=list)
+
+    def add_static(self, title: str, body: str) -> "PromptLayout":
+        """Adiciona seção ao prefixo estável (ignorada se vazia)."""
+        if body and body.strip():
+            self.static_sections.append((title, body.strip()))
+        return self
+
+    def add_variable(self, title: str, body: str) -> "PromptLayout":
+        """Adiciona seção ao sufixo variável (ignorada se vazia)."""
+        if body and body.strip():
+            self.variable_sections.append((title, body.strip()))
+        return self
+
+    @property
+    def prefix(self) -> str:
+        """Texto do prefixo estável."""
+        return self._render(self.static_sections)
+
+    @property
+    def suffix(self) -> str:
+        """Texto do sufixo variável."""
+        return self._render(self.variable_sections)
+
+    @property
+    def prefix_fingerprint(self) -> str:
+        """Hash curto do prefixo, útil para verificar estabilidade entre chamadas."""
+        return hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()[:16]
+
+    def to_messages(self) -> List[Tuple[str, str]]:
+        """
+        Emite o prompt como mensagens no formato aceito por chat models LangChain.
+
+        Returns:
+            Lista ``[("system", prefixo), ("human", sufixo)]``; a mensagem de
+            sistema é omitida quando não há conteúdo estável.
+        """
+        messages: List[Tuple[str, str]] = []
+        if self.static_sections:
+            messages.append(("system", self.prefix))
+        messages.append(("human", self.suffix))
+        return messages
+
+    def to_text(self) -> str:
+        """Emite o prompt como texto único, preservando a ordem prefixo → sufixo."""
+        if not self.static_sections:
+            return self.suffix
+        return self.prefix + SECTION_SEPARATOR + self.suffix
+
+    @staticmethod
+    def _render(sections: List[Tuple[str, str]]) -> str:
+        return "\n\n".join(
+            f"# {title}\n\n{body}" if title else body for title, body in sections
+        )
+
+
+__all__ = [
+    "GLOBAL_DIRECTIVES_PATH",
+    "PromptLayout",
+    "load_global_directives",
+]
@@ -0,0 +1,276 @@
+"""
+Cache semântico de respostas para chamadas LLM de baixo risco.
+
+Contextos com descrições quase idênticas (mesmo produto, redação levemente
+diferente) não se beneficiam de cache por hash exato. Este módulo adiciona
+uma camada opcional que:
+
+1. Normaliza o texto variável do prompt
+2. Tenta um acerto exato (hash) e, se não houver,
+3. Gera um embedding local e busca o vizinho mais próximo acima de um
+   limiar de similaridade em um índice em memória, restrito às entradas
+   com os mesmos fatos (números e nomes próprios, ver ``fact_fingerprint``)
+
+O uso é estritamente opt-in por ponto de chamada (ex: preenchimento de
+templates, resumos). Use um ``namespace`` por ponto de chamada/modelo para
+que respostas de tarefas diferentes nunca se misturem.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from framework.observability.monitoring import MonitoringManager
+
+logger = logging.getLogger(__name__)
+
+EmbeddingFunction = Callable[[str], Sequence[float]]
+
+DEFAULT_DIMENSIONS = 1024
+DEFAULT_THRESHOLD = 0.95
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza texto para comparação (caixa, acentos e espaços)."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WHITESPACE_RE.sub(" ", without_accents).strip()
+
+
+def fact_fingerprint(text: str) -> str:
+    """
+    Digest dos fatos do texto: palavras com dígitos ou iniciadas em
+    maiúscula (preços, quantidades, nomes de produto), na ordem em que
+    aparecem.
+
+    Em textos longos, trocar só esses campos quase não muda o embedding;
+    exigir o mesmo digest impede que o vizinho semântico devolva a resposta
+    de outro produto ou preço.
+    """
+    facts = [
+        normalize_text(word)
+        for word in _WORD_RE.findall(text)
+        if word[0].isupper() or any(ch.isdigit() for ch in word)
+    ]
+    return hashlib.sha256("\x1f".join(facts).encode("utf-8")).hexdigest()
+
+
+def hashed_ngram_embedding(text: str, dimensions: int = DEFAULT_DIMENSIONS, n: int = 3) -> List[float]:
+    """
+    Embedding local sem dependências: n-gramas de caracteres e palavras
+    projetados por hashing em um vetor de tamanho fixo, normalizado (L2).
+
+    Args:
+        text: Texto já normalizado
+        dimensions: Tamanho do vetor
+        n: Tamanho dos n-gramas de caracteres
+
+    Returns:
+        Vetor unitário
+    """
+    vector = [0.0] * dimensions
+    padded = f" {text} "
+    for i in range(max(len(padded) - n + 1, 1)):
+        vector[zlib.crc32(padded[i:i + n].encode("utf-8")) % dimensions] += 1.0
+    for word in _WORD_RE.findall(text):
+        vector[zlib.crc32(b"w:" + word.encode("utf-8")) % dimensions] += 2.0
+
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0:
+        return vector
+    return [value / norm for value in vector]
+
+
+@dataclass
+class _Entry:
+    namespace: str
+    digest: str
+    facts: str
+    vector: Sequence[float]
+    response: str
+
+
+@dataclass
+class SemanticCacheStats:
+    """Contadores de uso do cache."""
+
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.exact_hits + self.semantic_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.exact_hits + self.semantic_hits) / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class SemanticCache:
+    """
+    Índice vetorial em memória com busca por força bruta (cosseno).
+
+    Example:
+        >>> cache = SemanticCache(threshold=0.95)
+        >>> cache.store("resuma o produto X", "resumo...", namespace="resumo")
+        >>> cache.lookup("Resuma o produto  X!", namespace="resumo")
+        'resumo...'
+    """
+
+    def __init__(
+        self,
+        embed: Optional[EmbeddingFunction] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = 2048,
+        name: str = "semantic_cache",
+    ) -> None:
+        """
+        Args:
+            embed: Função de embedding (padrão: hashed_ngram_embedding).
+                Deve retornar vetores normalizados (L2).
+            threshold: Similaridade mínima (cosseno) para considerar acerto
+            max_entries: Máximo de entradas (LRU)
+            name: Nome usado nas métricas de monitoramento
+        """
+        self.embed = embed or hashed_ngram_embedding
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.name = name
+        self.stats = SemanticCacheStats()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, text: str, namespace: str = "default") -> Optional[str]:
+        """
+        Busca resposta para o texto (acerto exato ou vizinho semântico).
+
+        O vizinho semântico só é considerado entre entradas com o mesmo
+        ``fact_fingerprint``.
+
+        Returns:
+            Resposta armazenada ou None
+        """
+        normalized = normalize_text(text)
+        digest = self._digest(normalized)
+        facts = fact_fingerprint(text)
+
+        with self._lock:
+            entry = self._entries.get((namespace, digest))
+            if entry is not None:
+                self._entries.move_to_end((namespace, digest))
+                self.stats.exact_hits += 1
+                self._report("exact_hit", 1.0)
+                return entry.response
+
+            candidates = [
+                e for e in self._entries.values() if e.namespace == namespace and e.facts == facts
+            ]
+
+        if candidates:
+            vector = self.embed(normalized)
+            best, similarity = self._nearest(vector, candidates)
+            if best is not None and similarity >= self.threshold:
+                with self._lock:
+                    self.stats.semantic_hits += 1
+                    if (namespace, best.digest) in self._entries:
+                        self._entries.move_to_end((namespace, best.digest))
+                self._report("semantic_hit", similarity)
+                logger.debug(f"Cache semântico ({namespace}): acerto com similaridade {similarity:.3f}")
+                return best.response
+
+        with self._lock:
+            self.stats.misses += 1
+        self._report("miss", 0.0)
+        return None
+
+    def store(self, text: str, response: str, namespace: str = "default") -> None:
+        """Armazena a resposta associada ao texto."""
+        normalized = normalize_text(text)
+        entry = _Entry(
+            namespace=namespace,
+            digest=self._digest(normalized),
+            facts=fact_fingerprint(text),
+            vector=self.embed(normalized),
+            response=response,
+        )
+        with self._lock:
+            self._entries[(namespace, entry.digest)] = entry
+            self._entries.move_to_end((namespace, entry.digest))
+            self.stats.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove todas as entradas e zera as métricas."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = SemanticCacheStats()
+
+    @staticmethod
+    def _digest(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _nearest(vector: Sequence[float], candidates: List[_Entry]) -> Tuple[Optional[_Entry], float]:
+        best: Optional[_Entry] = None
+        best_score = -1.0
+        for entry in candidates:
+            score = sum(a * b for a, b in zip(vector, entry.vector))
+            if score > best_score:
+                best, best_score = entry, score
+        return best, best_score
+
+    def _report(self, outcome: str, similarity: float) -> None:
+        MonitoringManager.get_instance().record_cache_lookup(self.name, outcome, similarity)
+
+
+_default_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Retorna o cache semântico global do processo."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SemanticCache()
+    return _default_cache
+
+
+__all__ = [
+    "EmbeddingFunction",
+    "SemanticCache",
+    "SemanticCacheStats",
+    "fact_fingerprint",
+    "get_semantic_cache",
+    "hashed_ngram_embedding",
+    "normalize_text",
+]
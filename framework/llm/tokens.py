@@ -0,0 +1,310 @@
+"""
+Contagem local de tokens e preflight de tamanho de prompt.
+
+Permite conhecer o tamanho do input antes de chamar o provedor:
+
+- Tokenizer plugável por prefixo de modelo, com cache por modelo
+- ``tiktoken`` quando instalado; heurística rápida (caracteres/token) caso contrário
+- Preflight contra a janela de contexto do modelo (avisar ou truncar)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from framework.security.controls import RateLimiter, default_rate_limit_store
+
+try:  # pragma: no cover - dependência opcional
+    import tiktoken
+except ImportError:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Janelas de contexto (tokens) por prefixo de modelo; o prefixo mais longo vence
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4-32k": 32_768,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4": 200_000,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Overhead de formatação por mensagem e para o início da resposta (formato chat OpenAI)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+TRUNCATION_MARKER = "\n\n[... conteúdo truncado para caber na janela de contexto ...]\n\n"
+
+Message = Tuple[str, str]
+
+
+class Tokenizer(Protocol):
+    """Protocolo mínimo de tokenizer."""
+
+    def count(self, text: str) -> int:
+        """Conta tokens do texto."""
+        ...
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Retorna o prefixo do texto com no máximo ``max_tokens`` tokens."""
+        ...
+
+
+class HeuristicTokenizer:
+    """Estimativa rápida baseada em caracteres por token (sem dependências)."""
+
+    def __init__(self, chars_per_token: float = 4.0) -> None:
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return text[: int(max_tokens * self.chars_per_token)]
+
+
+class TiktokenTokenizer:
+    """Contagem exata para modelos OpenAI via ``tiktoken``."""
+
+    def __init__(self, model: str) -> None:
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+def _default_factory(model: str) -> Tokenizer:
+    if tiktoken is not None:
+        try:
+            return TiktokenTokenizer(model)
+        except Exception as exc:  # pragma: no cover - falha ao baixar encoding
+            logger.debug(f"tiktoken indisponível para {model}: {exc}")
+    return HeuristicTokenizer()
+
+
+@dataclass
+class PreflightResult:
+    """Resultado do preflight de um prompt."""
+
+    model: str
+    input_tokens: int
+    context_window: int
+    reserved_output_tokens: int
+    action: str = "ok"
+    messages: List[Message] = field(default_factory=list)
+
+    @property
+    def budget(self) -> int:
+        """Tokens disponíveis para o input."""
+        return self.context_window - self.reserved_output_tokens
+
+    @property
+    def usage_ratio(self) -> float:
+        return self.input_tokens / self.budget if self.budget > 0 else 1.0
+
+
+class TokenCounter:
+    """
+    Serviço de contagem de tokens com tokenizers em cache por modelo.
+
+    Example:
+        >>> counter = TokenCounter()
+        >>> counter.count_messages([("system", "..."), ("human", "...")], "gpt-4o-mini")
+    """
+
+    def __init__(self) -> None:
+        self._factories: List[Tuple[str, Callable[[str], Tokenizer]]] = []
+        self._tokenizers: Dict[str, Tokenizer] = {}
+        self._lock = threading.Lock()
+
+    def register_tokenizer(self, model_prefix: str, factory: Callable[[str], Tokenizer]) -> None:
+        """Registra tokenizer customizado para modelos com o prefixo informado."""
+        with self._lock:
+            self._factories.append((model_prefix, factory))
+            self._factories.sort(key=lambda item: len(item[0]), reverse=True)
+            self._tokenizers.clear()
+
+    def get_tokenizer(self, model: str) -> Tokenizer:
+        """Retorna (e mantém em cache) o tokenizer do modelo."""
+        tokenizer = self._tokenizers.get(model)
+        if tokenizer is not None:
+            return tokenizer
+        with self._lock:
+            if model not in self._tokenizers:
+                factory = next(
+                    (f for prefix, f in self._factories if model.startswith(prefix)),
+                    _default_factory,
+                )
+                self._tokenizers[model] = factory(model)
+            return self._tokenizers[model]
+
+    def count_text(self, text: str, model: str) -> int:
+        return self.get_tokenizer(model).count(text)
+
+    def count_messages(self, messages: Any, model: str) -> int:
+        """Conta tokens de um prompt (string ou lista de mensagens), incluindo overhead."""
+        normalized = normalize_messages(messages)
+        tokenizer = self.get_tokenizer(model)
+        total = TOKENS_PER_REPLY
+        for role, content in normalized:
+            total += TOKENS_PER_MESSAGE + tokenizer.count(role) + tokenizer.count(content)
+        return total
+
+    @staticmethod
+    def context_window(model: str) -> int:
+        """Janela de contexto conhecida do modelo (prefixo mais longo)."""
+        matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+        if not matches:
+            return DEFAULT_CONTEXT_WINDOW
+        return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+    def preflight(
+        self,
+        messages: Any,
+        model: str,
+        max_output_tokens: int = 4_096,
+        policy: str = "warn",
+        warn_ratio: float = 0.9,
+    ) -> PreflightResult:
+        """
+        Verifica o tamanho do prompt contra a janela de contexto do modelo.
+
+        Args:
+            messages: Prompt (string ou lista de mensagens)
+            model: Nome do modelo
+            max_output_tokens: Tokens reservados para a resposta
+            policy: 'warn' (apenas registra) ou 'truncate' (corta o maior
+                conteúdo variável preservando início e fim)
+            warn_ratio: Fração do orçamento a partir da qual emitir aviso
+
+        Returns:
+            PreflightResult com contagem, ação tomada e mensagens finais
+        """
+        normalized = normalize_messages(messages)
+        tokens = self.count_messages(normalized, model)
+        result = PreflightResult(
+            model=model,
+            input_tokens=tokens,
+            context_window=self.context_window(model),
+            reserved_output_tokens=max_output_tokens,
+            messages=normalized,
+        )
+
+        if tokens > result.budget and policy == "truncate":
+            result.messages = self._truncate(normalized, tokens - result.budget, model)
+            result.input_tokens = self.count_messages(result.messages, model)
+            result.action = "truncated"
+            logger.warning(
+                f"Prompt truncado de {tokens} para {result.input_tokens} tokens "
+                f"(janela {result.context_window} de {model})"
+            )
+        elif tokens >= result.budget * warn_ratio:
+            result.action = "warn"
+            logger.warning(
+                f"Prompt com {tokens} tokens ocupa {result.usage_ratio:.0%} do orçamento "
+                f"de input de {model} ({result.budget} tokens)"
+            )
+        return result
+
+    def _truncate(self, messages: List[Message], excess: int, model: str) -> List[Message]:
+        """Remove ``excess`` tokens do meio da maior mensagem não-system."""
+        candidates = [i for i, (role, _) in enumerate(messages) if role != "system"]
+        if not candidates:
+            candidates = list(range(len(messages)))
+        tokenizer = self.get_tokenizer(model)
+        index = max(candidates, key=lambda i: len(messages[i][1]))
+        role, content = messages[index]
+
+        keep = max(tokenizer.count(content) - excess - tokenizer.count(TRUNCATION_MARKER), 0)
+        head = tokenizer.truncate(content, keep // 2)
+        tail_budget = keep - keep // 2
+        reversed_tail = tokenizer.truncate(content[len(head):][::-1], tail_budget)
+        truncated = head + TRUNCATION_MARKER + reversed_tail[::-1]
+
+        result = list(messages)
+        result[index] = (role, truncated)
+        return result
+
+
+def normalize_messages(messages: Any) -> List[Message]:
+    """Converte string, tuplas ou mensagens LangChain em ``[(role, conteúdo)]``."""
+    if isinstance(messages, str):
+        return [("human", messages)]
+    normalized: List[Message] = []
+    for item in messages:
+        if isinstance(item, (tuple, list)):
+            role, content = item
+        else:
+            role, content = getattr(item, "type", "human"), getattr(item, "content", item)
+        normalized.append((str(role), content if isinstance(content, str) else str(content)))
+    return normalized
+
+
+_default_counter: Optional[TokenCounter] = None
+_token_limiter: Optional[RateLimiter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """Retorna o contador global de tokens."""
+    global _default_counter
+    if _default_counter is None:
+        _default_counter = TokenCounter()
+    return _default_counter
+
+
+def throttle_tokens(tokens: int, tokens_per_minute: int, operation_type: str = "llm_input_tokens") -> float:
+    """
+    Bloqueia até que ``tokens`` caibam no limite local de tokens por minuto.
+
+    Args:
+        tokens: Estimativa de tokens de input da chamada
+        tokens_per_minute: Limite por minuto (0 desabilita)
+        operation_type: Chave do limitador
+
+    Returns:
+        Tempo total esperado (segundos)
+    """
+    global _token_limiter
+    if tokens_per_minute <= 0:
+        return 0.0
+    if _token_limiter is None or _token_limiter.max_per_minute != tokens_per_minute:
+        _token_limiter = RateLimiter(max_per_minute=tokens_per_minute, store=default_rate_limit_store())
+
+    # A capacidade é reservada de uma vez; chamadas concorrentes recebem
+    # horários sucessivos em vez de disputar em loop
+    delay = _token_limiter.reserve(operation_type, cost=tokens) or 0.0
+    if delay > 0:
+        logger.info(f"Limite de {tokens_per_minute} tokens/min atingido; aguardando {delay:.1f}s")
+        time.sleep(delay)
+    return delay
+
+
+__all__ = [
+    "HeuristicTokenizer",
+    "MODEL_CONTEXT_WINDOWS",
+    "PreflightResult",
+    "TiktokenTokenizer",
+    "TokenCounter",
+    "Tokenizer",
+    "get_token_counter",
+    "normalize_messages",
+    "throttle_tokens",
+]
@@ -14,6 +14,9 @@ from langchain_core.outputs import LLMResult
 from langchain_core.messages import BaseMessage
 import time
 
+from framework.config import get_settings
+from framework.llm.tokens import get_token_counter, normalize_messages
+
 from .monitoring import MonitoringManager
 
 
@@ -38,6 +41,8 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
         super().__init__()
         self.agent_context = agent_context or {}
         self._call_start_times: Dict[str, float] = {}
+        self._first_token_times: Dict[str, float] = {}
+        self._input_sizes: Dict[str, Dict[str, Any]] = {}
         self._monitoring = MonitoringManager.get_instance()
 
     def on_llm_start(
@@ -57,6 +62,7 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
 
         # Registrar início do timer
         self._call_start_times[str(run_id)] = time.time()
+        self._record_input_size(str(run_id), [("human", p) for p in prompts], serialized, kwargs)
 
     def on_chat_model_start(
         self,
@@ -75,6 +81,45 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
 
         # Registrar início do timer
         self._call_start_times[str(run_id)] = time.time()
+        flat = [message for batch in messages for message in batch]
+        self._record_input_size(str(run_id), flat, serialized, kwargs)
+
+    def _record_input_size(
+        self,
+        run_id: str,
+        messages: List[Any],
+        serialized: Optional[Dict[str, Any]],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Estima localmente o tamanho do input (tokens e caracteres) da chamada."""
+        params = kwargs.get("invocation_params") or {}
+        model = (
+            params.get("model")
+            or params.get("model_name")
+            or ((serialized or {}).get("kwargs") or {}).get("model_name")
+            or get_settings(validate=False).llm_model
+        )
+        normalized = normalize_messages(messages)
+        self._input_sizes[run_id] = {
+            "prompt_tokens_estimate": get_token_counter().count_messages(normalized, model),
+            "prompt_chars": sum(len(content) for _, content in normalized),
+            "message_count": len(normalized),
+        }
+
+    def on_llm_new_token(
+        self,
+        token: str,
+        *,
+        run_id: Any,
+        parent_run_id: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Chamado a cada token recebido em streaming."""
+        if not MonitoringManager.is_enabled():
+            return
+
+        # Registrar apenas o primeiro token (time-to-first-token)
+        self._first_token_times.setdefault(str(run_id), time.time())
 
     def on_llm_end(
         self,
@@ -93,9 +138,14 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
 
         # Calcular latência
         latency_ms = 0.0
+        first_token_ms: Optional[float] = None
+        first_token_at = self._first_token_times.pop(run_id_str, None)
+        input_data = self._input_sizes.pop(run_id_str, {})
         if run_id_str in self._call_start_times:
-            latency_ms = (time.time() - self._call_start_times[run_id_str]) * 1000
-            del self._call_start_times[run_id_str]
+            started_at = self._call_start_times.pop(run_id_str)
+            latency_ms = (time.time() - started_at) * 1000
+            if first_token_at is not None:
+                first_token_ms = (first_token_at - started_at) * 1000
 
         # Extrair informações da resposta
         if not response.generations:
@@ -111,16 +161,26 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
         input_tokens = token_usage.get('prompt_tokens', 0)
         output_tokens = token_usage.get('completion_tokens', 0)
         total_tokens = token_usage.get('total_tokens', input_tokens + output_tokens)
+        cached_input_tokens = self._extract_cached_tokens(token_usage, generation)
 
         # Calcular custo (estimativa baseada em modelo)
         model_name = llm_output.get('model_name', 'unknown')
-        cost_usd = self._estimate_cost(model_name, input_tokens, output_tokens)
+        cost_usd = self._estimate_cost(
+            model_name, input_tokens, output_tokens, cached_input_tokens=cached_input_tokens
+        )
 
         # Calcular tokens/segundo
         tokens_per_second = 0.0
         if latency_ms > 0:
             tokens_per_second = (output_tokens / latency_ms) * 1000
 
+        performance: Dict[str, Any] = {
+            "latency_ms": round(latency_ms, 2),
+            "tokens_per_second": round(tokens_per_second, 2),
+        }
+        if first_token_ms is not None:
+            performance["time_to_first_token_ms"] = round(first_token_ms, 2)
+
         # Extrair tool calls se existirem
         tools_available = []
         tools_called = []
@@ -147,9 +207,7 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
                 "temperature": llm_output.get('temperature'),
                 "max_tokens": llm_output.get('max_tokens'),
             },
-            input_data={
-                "prompt_length": len(str(kwargs.get('prompts', ['']))),
-            },
+            input_data=input_data,
             output_data={
                 "content": output_text[:1000],  # Primeiros 1000 chars
                 "content_length": len(output_text),
@@ -159,12 +217,10 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "total_tokens": total_tokens,
+                "cached_input_tokens": cached_input_tokens,
                 "cost_usd": cost_usd,
             },
-            performance={
-                "latency_ms": round(latency_ms, 2),
-                "tokens_per_second": round(tokens_per_second, 2),
-            },
+            performance=performance,
             tools={
                 "tools_available": tools_available,
                 "tools_called": tools_called,
@@ -189,6 +245,8 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
 
         # Calcular latência até o erro
         latency_ms = 0.0
+        self._first_token_times.pop(run_id_str, None)
+        self._input_sizes.pop(run_id_str, None)
         if run_id_str in self._call_start_times:
             latency_ms = (time.time() - self._call_start_times[run_id_str]) * 1000
             del self._call_start_times[run_id_str]
@@ -208,10 +266,37 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
             }
         )
 
-    def _estimate_cost(self, model_name: str, input_tokens: int, output_tokens: int) -> float:
+    @staticmethod
+    def _extract_cached_tokens(token_usage: Dict[str, Any], generation: Any) -> int:
+        """
+        Extrai tokens de input servidos pelo cache de prompt do provedor.
+
+        Suporta o formato OpenAI (``prompt_tokens_details.cached_tokens``) e
+        o ``usage_metadata`` padronizado do LangChain
+        (``input_token_details.cache_read``).
+        """
+        details = token_usage.get('prompt_tokens_details') or {}
+        cached = details.get('cached_tokens') if isinstance(details, dict) else None
+        if cached is None:
+            message = getattr(generation, 'message', None)
+            usage_metadata = getattr(message, 'usage_metadata', None) or {}
+            input_details = usage_metadata.get('input_token_details') or {}
+            cached = input_details.get('cache_read')
+        return int(cached or 0)
+
+    def _estimate_cost(
+        self,
+        model_name: str,
+        input_tokens: int,
+        output_tokens: int,
+        cached_input_tokens: int = 0,
+    ) -> float:
         """
         Estima custo baseado no modelo e tokens.
 
+        Tokens de input servidos do cache de prompt são cobrados com desconto
+        de 50% (política da OpenAI).
+
         Preços aproximados (USD por 1M tokens) - atualizar conforme necessário:
         - gpt-4o: $2.50 input, $10.00 output
         - gpt-4o-mini: $0.15 input, $0.60 output
@@ -244,7 +329,8 @@ class MonitoringCallbackHandler(BaseCallbackHandler):
             output_cost_per_1m = 10.00
 
         # Calcular custo total
-        input_cost = (input_tokens / 1_000_000) * input_cost_per_1m
+        cached = min(cached_input_tokens, input_tokens)
+        input_cost = ((input_tokens - cached) + cached * 0.5) / 1_000_000 * input_cost_per_1m
         output_cost = (output_tokens / 1_000_000) * output_cost_per_1m
 
         return round(input_cost + output_cost, 6)
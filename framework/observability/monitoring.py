@@ -15,6 +15,15 @@ from typing import Any, Dict, List, Optional
 from pathlib import Path
 import json
 from contextlib import contextmanager
+from contextvars import ContextVar
+
+# call_id da ferramenta em execução (usado para associar progresso de saída)
+_current_tool_call: ContextVar[Optional[str]] = ContextVar("current_tool_call", default=None)
+
+
+def current_tool_call_id() -> Optional[str]:
+    """Retorna o call_id da ferramenta monitorada em execução (ou None)."""
+    return _current_tool_call.get()
 
 
 @dataclass
@@ -108,6 +117,11 @@ class MonitoringManager:
         self.current_llm_call_id: Optional[str] = None
         self.current_agent_execution_id: Optional[str] = None
         self._start_times: Dict[str, float] = {}
+        self.active_streams: Dict[str, Dict[str, Any]] = {}
+        self.active_tool_outputs: Dict[str, Dict[str, Any]] = {}
+        self.tool_resources: Dict[str, Dict[str, Any]] = {}
+        self._tool_call_names: Dict[str, str] = {}
+        self.cache_stats: Dict[str, Dict[str, Any]] = {}
 
     @classmethod
     def get_instance(cls) -> 'MonitoringManager':
@@ -169,10 +183,18 @@ class MonitoringManager:
         execution_ms: Optional[float] = None,
         agent_context: Optional[Dict[str, Any]] = None,
         security_info: Optional[Dict[str, Any]] = None,
+        call_id: Optional[str] = None,
+        output: Optional[Dict[str, Any]] = None,
+        resources: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         Registra uma execução de ferramenta.
 
+        Args:
+            call_id: Id pré-alocado (o mesmo usado no progresso de saída)
+            output: Estatísticas finais de saída (ver ``record_tool_output``)
+            resources: Recursos consumidos (ver ``record_tool_resources``)
+
         Returns:
             call_id do evento
         """
@@ -185,6 +207,12 @@ class MonitoringManager:
         # Sanitizar resultado
         sanitized_result = self._sanitize_result(tool_result)
 
+        performance: Dict[str, Any] = {"execution_ms": execution_ms}
+        if output:
+            performance["output"] = output
+        if resources:
+            performance["resources"] = resources
+
         event = ToolCallEvent(
             parent_llm_call_id=self.current_llm_call_id,
             agent_context=agent_context or {},
@@ -195,11 +223,11 @@ class MonitoringManager:
                 "success": success,
                 "error": error,
             },
-            performance={
-                "execution_ms": execution_ms,
-            },
+            performance=performance,
             security=security_info or {},
         )
+        if call_id:
+            event.call_id = call_id
 
         self.events.append(event)
         return event.call_id
@@ -235,6 +263,172 @@ class MonitoringManager:
         self.current_agent_execution_id = event.execution_id
         return event.execution_id
 
+    def record_stream_progress(
+        self,
+        stream_id: str,
+        chunks: int,
+        chars: int,
+        elapsed_ms: float,
+        agent_context: Optional[Dict[str, Any]] = None,
+        target: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Atualiza o snapshot ao vivo de uma geração em streaming.
+
+        Cada chunk de streaming corresponde aproximadamente a um token,
+        então ``tokens_per_second`` é calculado a partir dos chunks recebidos.
+
+        Returns:
+            Snapshot atualizado do stream
+        """
+        if not self._enabled:
+            return {}
+
+        tokens_per_second = (chunks / elapsed_ms) * 1000 if elapsed_ms > 0 else 0.0
+        snapshot = self.active_streams.setdefault(stream_id, {
+            "stream_id": stream_id,
+            "agent_context": agent_context or {},
+            "target": target,
+            "started_at": datetime.utcnow().isoformat() + "Z",
+        })
+        snapshot.update({
+            "chunks": chunks,
+            "chars": chars,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "tokens_per_second": round(tokens_per_second, 2),
+        })
+        return snapshot
+
+    def finish_stream(self, stream_id: str) -> Dict[str, Any]:
+        """
+        Remove um stream da lista de ativos.
+
+        Returns:
+            Último snapshot registrado (vazio se o stream não existir)
+        """
+        return self.active_streams.pop(stream_id, {})
+
+    def get_active_streams(self) -> List[Dict[str, Any]]:
+        """Retorna snapshots dos streams em andamento."""
+        return [dict(snapshot) for snapshot in self.active_streams.values()]
+
+    def record_tool_output(
+        self,
+        call_id: str,
+        stdout_bytes: int,
+        stderr_bytes: int,
+        dropped_bytes: int,
+        elapsed_ms: float,
+        last_line: str = "",
+        terminated: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Atualiza o snapshot ao vivo da saída de uma ferramenta em execução.
+
+        Chamado periodicamente enquanto um comando produz saída, para que a
+        interface acompanhe comandos longos antes do ``ToolCallEvent`` final.
+
+        Args:
+            call_id: Id da chamada (``current_tool_call_id()``)
+            stdout_bytes: Bytes lidos de stdout até agora
+            stderr_bytes: Bytes lidos de stderr até agora
+            dropped_bytes: Bytes descartados (fora do início/fim retidos)
+            elapsed_ms: Tempo desde o início do comando
+            last_line: Última linha de saída (prévia)
+            terminated: Comando encerrado por exceder o limite de saída
+
+        Returns:
+            Snapshot atualizado
+        """
+        if not self._enabled:
+            return {}
+
+        snapshot = self.active_tool_outputs.setdefault(call_id, {
+            "call_id": call_id,
+            "tool": self._tool_call_names.get(call_id),
+            "started_at": datetime.utcnow().isoformat() + "Z",
+        })
+        snapshot.update({
+            "stdout_bytes": stdout_bytes,
+            "stderr_bytes": stderr_bytes,
+            "dropped_bytes": dropped_bytes,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "last_line": last_line,
+            "terminated": terminated,
+        })
+        return snapshot
+
+    def finish_tool_output(self, call_id: str) -> Dict[str, Any]:
+        """
+        Remove a saída de uma ferramenta da lista de ativas.
+
+        Returns:
+            Último snapshot registrado (vazio se não houve saída)
+        """
+        self._tool_call_names.pop(call_id, None)
+        return self.active_tool_outputs.pop(call_id, {})
+
+    def record_tool_resources(self, call_id: str, usage: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Acumula os recursos de um comando executado por uma ferramenta.
+
+        Uma chamada pode executar vários comandos (ex.: shards de testes):
+        tempos de CPU e parede são somados e o pico de RSS é o maior.
+
+        Args:
+            call_id: Id da chamada (``current_tool_call_id()``)
+            usage: ``cpu_user_s``, ``cpu_system_s``, ``max_rss_kb``,
+                ``wall_s`` e ``agent`` (ver ``framework.security.sandbox``)
+
+        Returns:
+            Totais acumulados da chamada
+        """
+        if not self._enabled:
+            return {}
+
+        totals = self.tool_resources.setdefault(call_id, {
+            "commands": 0,
+            "cpu_user_s": 0.0,
+            "cpu_system_s": 0.0,
+            "max_rss_kb": None,
+            "wall_s": 0.0,
+        })
+        totals["commands"] += 1
+        for key in ("cpu_user_s", "cpu_system_s", "wall_s"):
+            totals[key] = round(totals[key] + (usage.get(key) or 0.0), 3)
+        if usage.get("max_rss_kb") is not None:
+            totals["max_rss_kb"] = max(totals["max_rss_kb"] or 0, usage["max_rss_kb"])
+        for key in ("agent", "killed_by"):
+            if usage.get(key):
+                totals[key] = usage[key]
+        return totals
+
+    def get_active_tool_outputs(self) -> List[Dict[str, Any]]:
+        """Retorna snapshots das saídas de ferramentas em andamento."""
+        return [dict(snapshot) for snapshot in self.active_tool_outputs.values()]
+
+    def record_cache_lookup(self, cache_name: str, outcome: str, similarity: float = 0.0) -> None:
+        """
+        Registra o resultado de uma consulta a cache de respostas LLM.
+
+        Args:
+            cache_name: Nome do cache (ex: "semantic_cache")
+            outcome: "exact_hit", "semantic_hit" ou "miss"
+            similarity: Similaridade do vizinho encontrado (acertos semânticos)
+        """
+        if not self._enabled:
+            return
+
+        stats = self.cache_stats.setdefault(cache_name, {
+            "exact_hit": 0,
+            "semantic_hit": 0,
+            "miss": 0,
+            "similarity_sum": 0.0,
+        })
+        stats[outcome] = stats.get(outcome, 0) + 1
+        if outcome == "semantic_hit":
+            stats["similarity_sum"] += similarity
+
     @contextmanager
     def track_llm_call(self, call_id: str):
         """Context manager para rastrear uma chamada LLM."""
@@ -291,6 +485,7 @@ class MonitoringManager:
         total_input_tokens = sum(e.usage.get("input_tokens", 0) for e in llm_calls)
         total_output_tokens = sum(e.usage.get("output_tokens", 0) for e in llm_calls)
         total_tokens = sum(e.usage.get("total_tokens", 0) for e in llm_calls)
+        total_cached_tokens = sum(e.usage.get("cached_input_tokens", 0) for e in llm_calls)
         total_cost = sum(e.usage.get("cost_usd", 0) for e in llm_calls)
 
         # Agregar latências
@@ -300,6 +495,13 @@ class MonitoringManager:
         tool_latencies = [e.performance.get("execution_ms", 0) for e in tool_calls if e.performance.get("execution_ms")]
         avg_tool_latency = sum(tool_latencies) / len(tool_latencies) if tool_latencies else 0
 
+        # Tokens de input por agente/etapa (planejamento de capacidade)
+        input_tokens_by_agent: Dict[str, int] = {}
+        for e in llm_calls:
+            agent = e.agent_context.get("subagent") or e.agent_context.get("agent") or "unknown"
+            tokens = e.usage.get("input_tokens") or e.input_data.get("prompt_tokens_estimate", 0)
+            input_tokens_by_agent[agent] = input_tokens_by_agent.get(agent, 0) + tokens
+
         # Top tools usadas
         tool_usage = {}
         for e in tool_calls:
@@ -313,8 +515,11 @@ class MonitoringManager:
                 "total_input_tokens": total_input_tokens,
                 "total_output_tokens": total_output_tokens,
                 "total_tokens": total_tokens,
+                "total_cached_input_tokens": total_cached_tokens,
+                "cache_hit_ratio": round(total_cached_tokens / total_input_tokens, 4) if total_input_tokens else 0.0,
                 "total_cost_usd": round(total_cost, 4),
                 "avg_latency_ms": round(avg_llm_latency, 2),
+                "input_tokens_by_agent": input_tokens_by_agent,
             },
             "tool_calls": {
                 "count": len(tool_calls),
@@ -323,15 +528,39 @@ class MonitoringManager:
             },
             "agent_executions": {
                 "count": len(agent_executions),
-            }
+            },
+            "caches": self._cache_summary(),
         }
 
+    def _cache_summary(self) -> Dict[str, Any]:
+        summary = {}
+        for name, stats in self.cache_stats.items():
+            hits = stats["exact_hit"] + stats["semantic_hit"]
+            lookups = hits + stats["miss"]
+            summary[name] = {
+                "lookups": lookups,
+                "exact_hits": stats["exact_hit"],
+                "semantic_hits": stats["semantic_hit"],
+                "misses": stats["miss"],
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "avg_semantic_similarity": (
+                    round(stats["similarity_sum"] / stats["semantic_hit"], 4)
+                    if stats["semantic_hit"] else 0.0
+                ),
+            }
+        return summary
+
     def clear(self):
         """Limpa todos os eventos registrados."""
         self.events.clear()
         self.current_llm_call_id = None
         self.current_agent_execution_id = None
         self._start_times.clear()
+        self.active_streams.clear()
+        self.active_tool_outputs.clear()
+        self.tool_resources.clear()
+        self._tool_call_names.clear()
+        self.cache_stats.clear()
 
     def export_to_json(self, filepath: Path):
         """
@@ -395,9 +624,12 @@ def monitor_tool_call(func):
         bound_args.apply_defaults()
         tool_args = dict(bound_args.arguments)
 
-        # Iniciar timer
-        timer_id = f"tool_{tool_name}_{uuid.uuid4()}"
+        # Iniciar timer e expor o call_id para o progresso de saída
+        call_id = str(uuid.uuid4())
+        timer_id = f"tool_{tool_name}_{call_id}"
         mon.start_timer(timer_id)
+        mon._tool_call_names[call_id] = tool_name
+        token = _current_tool_call.set(call_id)
 
         success = True
         error = None
@@ -411,7 +643,12 @@ def monitor_tool_call(func):
             error = str(e)
             raise
         finally:
+            _current_tool_call.reset(token)
             execution_ms = mon.stop_timer(timer_id)
+            output = mon.finish_tool_output(call_id)
+            output.pop("call_id", None)
+            output.pop("tool", None)
+            resources = mon.tool_resources.pop(call_id, None)
 
             mon.record_tool_call(
                 tool_name=tool_name,
@@ -420,6 +657,9 @@ def monitor_tool_call(func):
                 success=success,
                 error=error,
                 execution_ms=execution_ms,
+                call_id=call_id,
+                output=output,
+                resources=resources,
             )
 
     return wrapper
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 
 from framework.config import get_settings
 from framework.core.protocols import TodoProvider
+from framework.io.atomic import atomic_write_text
 
 
 class TodoManager:
@@ -81,8 +82,7 @@ class TodoManager:
             }
         }
 
-        with open(todo_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        atomic_write_text(todo_path, json.dumps(data, indent=2, ensure_ascii=False))
 
     def add_todo(
         self,
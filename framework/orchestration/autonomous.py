@@ -16,7 +16,8 @@ from typing import Any, Dict, List, Optional
 
 from framework.core.context import AgentContext
 from framework.llm.factory import build_llm
-from framework.tools.registry import AgentType, get_tools
+from framework.security.sandbox import agent_scope
+from framework.tools.registry import AgentType, ToolRunMemo, get_tools
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +118,8 @@ class AutonomousAgent:
         self.task_description = task_description
         self.max_iterations = max_iterations
         self.enable_recovery = enable_recovery
+        # Commands run by this agent are accounted under this name
+        self.agent_name = f"autonomous:{context.context_name}"
 
         # Initialize LLM with all tools
         self.llm = build_llm({
@@ -124,8 +127,10 @@ class AutonomousAgent:
             "temperature": 0.3,  # Lower temp for more deterministic planning
         })
 
-        # Get all available tools (AUTONOMOUS has access to everything)
-        self.tools = get_tools(AgentType.AUTONOMOUS)
+        # Get all available tools (AUTONOMOUS has access to everything).
+        # Read-only results are memoized per run (reset in execute()).
+        self.tool_memo = ToolRunMemo()
+        self.tools = get_tools(AgentType.AUTONOMOUS, memo=self.tool_memo)
         logger.info(f"AutonomousAgent initialized with {len(self.tools)} tools")
         logger.info(f"Available tools: {[tool.name for tool in self.tools]}")
 
@@ -139,9 +144,22 @@ class AutonomousAgent:
         """
         Execute task autonomously.
 
+        Resource usage of the commands it runs is accounted to
+        ``self.agent_name`` (see ``framework.security.sandbox``). Each run
+        starts with an empty tool memo.
+
         Returns:
             TaskExecutionResult with success status and details
         """
+        self.tool_memo = ToolRunMemo()
+        self.tools = get_tools(AgentType.AUTONOMOUS, memo=self.tool_memo)
+        try:
+            with agent_scope(self.agent_name):
+                return self._execute()
+        finally:
+            logger.info(f"Tool memo: {self.tool_memo.stats()}")
+
+    def _execute(self) -> TaskExecutionResult:
         started_at = datetime.now()
         logger.info(f"Starting autonomous execution: {self.task_description}")
 
@@ -13,6 +13,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from framework.core.exceptions import BatchPendingError
+
 logger = logging.getLogger(__name__)
 
 
@@ -213,6 +215,11 @@ class OrchestrationGraph:
 
             try:
                 state = node.handler(state)
+            except BatchPendingError as exc:
+                # Não é falha: a etapa será retomada quando o batch concluir
+                logger.info(f"Nó '{node.name}' aguardando resultado de batch: {exc}")
+                state["_error"] = exc
+                break
             except Exception as exc:
                 logger.error(
                     f"Erro ao executar nó '{node.name}': {exc}", exc_info=True
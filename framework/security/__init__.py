@@ -1,10 +1,34 @@
 """Security controls and safety mechanisms for autonomous agents."""
 
+from framework.security.audit import AuditWriter, verify_audit_log
 from framework.security.controls import (
     CommandValidator,
+    FileRateLimitStore,
+    MemoryRateLimitStore,
     PathValidator,
     RateLimiter,
     SecurityConfig,
 )
+from framework.security.sandbox import (
+    ResourceAccountant,
+    SandboxProfile,
+    agent_scope,
+    get_resource_accountant,
+    get_sandbox_profile,
+)
 
-__all__ = ["SecurityConfig", "CommandValidator", "PathValidator", "RateLimiter"]
+__all__ = [
+    "SecurityConfig",
+    "CommandValidator",
+    "PathValidator",
+    "RateLimiter",
+    "MemoryRateLimitStore",
+    "FileRateLimitStore",
+    "AuditWriter",
+    "verify_audit_log",
+    "SandboxProfile",
+    "ResourceAccountant",
+    "agent_scope",
+    "get_resource_accountant",
+    "get_sandbox_profile",
+]
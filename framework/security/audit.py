@@ -0,0 +1,315 @@
+"""
+Buffered, tamper-evident audit log for security decisions.
+
+Validators hand entries to an ``AuditWriter``, which only appends them to an
+in-memory queue. A background thread drains the queue in batches and writes
+them as JSON lines, so auditing a command costs microseconds instead of an
+``open``/``write``/``close`` per call.
+
+Each record carries a sequence number, the hash of the previous record and
+its own hash (``sha256(prev + canonical JSON)``). Editing, removing or
+reordering lines breaks the chain, which ``verify_audit_log`` detects. The
+chain continues across size-based rotations (``audit.jsonl.1``, ``.2``, ...).
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = "0" * 64
+
+_TAIL_READ_BYTES = 64 * 1024
+
+
+def _canonical(record: Dict[str, Any]) -> str:
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def chain_hash(prev_hash: str, record: Dict[str, Any]) -> str:
+    """Hash of a record (without its ``hash`` field) chained to the previous one."""
+    return hashlib.sha256((prev_hash + _canonical(record)).encode("utf-8")).hexdigest()
+
+
+class AuditWriter:
+    """
+    Background JSONL writer with batching, rotation and a hash chain.
+
+    Example:
+        >>> writer = AuditWriter(Path("logs/audit.jsonl"))
+        >>> writer.write({"action": "ALLOWED", "command": "git status"})
+        >>> writer.flush()
+        >>> verify_audit_log(Path("logs/audit.jsonl")).ok
+        True
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        flush_interval: float = 0.5,
+        batch_size: int = 256,
+    ):
+        """
+        Initialize writer and start its background thread.
+
+        Args:
+            path: JSONL audit file
+            max_bytes: Rotate when the file grows past this size (0 disables)
+            backup_count: Rotated files to keep (``path.1`` ... ``path.N``)
+            flush_interval: Maximum seconds an entry waits in memory
+            batch_size: Pending entries that trigger an immediate flush
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.written = 0
+        self.rotations = 0
+
+        self._pending: Deque[Any] = deque()
+        self._wakeup = threading.Event()
+        self._io_lock = threading.Lock()
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, "ab")
+        self._size = self._handle.tell()
+        self._last_hash, self._seq = self._resume_chain()
+
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        """True after ``close()``; further entries are not written."""
+        return self._closed
+
+    @property
+    def last_hash(self) -> str:
+        """Hash of the last record written to disk."""
+        return self._last_hash
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry (non-blocking; written by the background thread)."""
+        self._pending.append(entry)
+        if self._closed:
+            self._drain()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every entry queued so far is on disk.
+
+        Returns:
+            False if the timeout expired first
+        """
+        if self._closed or not self._thread.is_alive():
+            self._drain()
+            return True
+        done = threading.Event()
+        self._pending.append(done)
+        self._wakeup.set()
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Flush pending entries and stop the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self._drain()
+        with self._io_lock:
+            self._handle.close()
+        try:
+            atexit.unregister(self.close)
+        except Exception:  # pragma: no cover - interpreter shutting down
+            pass
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._drain()
+            except Exception as e:  # pragma: no cover - disk errors
+                logger.error(f"Failed to write audit log {self.path}: {e}")
+
+    def _drain(self) -> None:
+        with self._io_lock:
+            if self._handle.closed:
+                if self._pending:
+                    dropped = sum(1 for item in self._pending if not isinstance(item, threading.Event))
+                    self._pending.clear()
+                    logger.warning(f"Audit writer for {self.path} is closed; dropped {dropped} entries")
+                return
+            lines: List[bytes] = []
+            while True:
+                try:
+                    item = self._pending.popleft()
+                except IndexError:
+                    break
+                if isinstance(item, threading.Event):
+                    self._write_lines(lines)
+                    lines = []
+                    item.set()
+                    continue
+                lines.append(self._seal(item))
+            self._write_lines(lines)
+
+    def _seal(self, entry: Dict[str, Any]) -> bytes:
+        """Add sequence and chain fields and serialize one record."""
+        self._seq += 1
+        record = dict(entry)
+        record["seq"] = self._seq
+        record["prev"] = self._last_hash
+        record["hash"] = self._last_hash = chain_hash(self._last_hash, record)
+        return (_canonical(record) + "\n").encode("utf-8")
+
+    def _write_lines(self, lines: List[bytes]) -> None:
+        if not lines:
+            return
+        data = b"".join(lines)
+        self._handle.write(data)
+        self._handle.flush()
+        self._size += len(data)
+        self.written += len(lines)
+        if self.max_bytes and self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        self._handle = open(self.path, "ab")
+        self._size = 0
+        self.rotations += 1
+
+    def _resume_chain(self) -> tuple[str, int]:
+        """Continue the chain from the last record of the file (or its last backup)."""
+        for candidate in (self.path, self.path.with_name(f"{self.path.name}.1")):
+            record = _last_record(candidate)
+            if record is not None:
+                return str(record.get("hash", GENESIS_HASH)), int(record.get("seq", 0))
+        return GENESIS_HASH, 0
+
+
+def _last_record(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            handle.seek(max(0, size - _TAIL_READ_BYTES))
+            tail = handle.read()
+    except OSError:
+        return None
+    for line in reversed(tail.splitlines()):
+        if line.strip():
+            try:
+                return json.loads(line)
+            except ValueError:
+                return None
+    return None
+
+
+@dataclass
+class AuditVerification:
+    """Result of ``verify_audit_log``."""
+
+    ok: bool
+    entries: int
+    last_hash: str
+    first_invalid_line: Optional[int] = None
+    reason: str = ""
+
+
+def verify_audit_log(path: Union[str, Path], prev_hash: Optional[str] = None) -> AuditVerification:
+    """
+    Check the hash chain of an audit file.
+
+    Args:
+        path: JSONL audit file
+        prev_hash: Expected ``prev`` of the first record (default: whatever
+            the first record claims, e.g. the end of a rotated file)
+
+    Returns:
+        AuditVerification (``first_invalid_line`` is 1-based)
+    """
+    expected = prev_hash
+    entries = 0
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                stored = record.pop("hash")
+            except (ValueError, KeyError):
+                return AuditVerification(False, entries, expected or "", number, "malformed record")
+            if expected is not None and record.get("prev") != expected:
+                return AuditVerification(False, entries, expected, number, "broken chain")
+            if chain_hash(str(record.get("prev")), record) != stored:
+                return AuditVerification(False, entries, expected or "", number, "hash mismatch")
+            expected = stored
+            entries += 1
+    return AuditVerification(True, entries, expected or GENESIS_HASH)
+
+
+_writers: Dict[Path, AuditWriter] = {}
+_writers_guard = threading.Lock()
+
+
+def get_audit_writer(path: Union[str, Path], **kwargs: Any) -> AuditWriter:
+    """
+    Shared writer for an audit file.
+
+    All validators auditing to the same file share one writer (and one hash
+    chain); ``kwargs`` only apply when the writer is created.
+    """
+    key = Path(path).resolve()
+    with _writers_guard:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = AuditWriter(key, **kwargs)
+        return writer
+
+
+def close_audit_writers() -> None:
+    """Flush and close every shared writer."""
+    with _writers_guard:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+__all__ = [
+    "AuditVerification",
+    "AuditWriter",
+    "GENESIS_HASH",
+    "chain_hash",
+    "close_audit_writers",
+    "get_audit_writer",
+    "verify_audit_log",
+]
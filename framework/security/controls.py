@@ -10,15 +10,30 @@ Provides validators, rate limiters, and safety checks for:
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import re
+import shlex
+import struct
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, TypeVar, Union
+
+try:  # pragma: no cover - unavailable on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from framework.security.audit import AuditWriter, get_audit_writer
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 @dataclass
 class SecurityConfig:
@@ -32,6 +47,10 @@ class SecurityConfig:
         require_confirmation_patterns: Patterns requiring user confirmation
         max_commands_per_minute: Rate limit for command execution
         enable_audit_log: Enable comprehensive audit logging
+        audit_log_path: JSONL audit file (buffered, hash-chained; None = memory only)
+        audit_max_bytes: Rotate the audit file past this size
+        audit_backup_count: Rotated audit files to keep
+        audit_tail_size: Audit entries kept in memory per validator
     """
 
     allowed_commands: Set[str] = field(default_factory=lambda: {
@@ -71,12 +90,130 @@ class SecurityConfig:
     max_commands_per_minute: int = 30
     enable_audit_log: bool = True
     audit_log_path: Optional[Path] = None
+    audit_max_bytes: int = 10 * 1024 * 1024
+    audit_backup_count: int = 5
+    audit_tail_size: int = 1000
+
+
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+
+def _audit_timestamp() -> str:
+    """Audit timestamp, formatted at most once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return _timestamp_cache[1]
+
+
+# Shell operators that start a new command (after shlex tokenization)
+_COMMAND_SEPARATORS = frozenset({"&&", "||", ";", "|", "&", "|&", ";;", ";&", "(", ")", "\n"})
+_SHELL_PUNCTUATION = "();<>|&\n"
+# Operator tokens that only redirect I/O (``>``, ``2>&1``, ``<<<``, ``&>>``)
+_REDIRECTION_RE = re.compile(r"^(?:[<>]{1,3}|[<>]&|&>>?|>\|)$")
+_ENV_ASSIGNMENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+# Command and process substitutions: ``$(...)``, ``<(...)``, ``>(...)`` and backticks
+_SUBSTITUTION_RE = re.compile(r"[$<>]\(([^()]*)\)|`([^`]*)`")
+
+
+def _trie_regex(patterns: List[str]) -> Optional[re.Pattern[str]]:
+    """
+    Compile literal patterns into one regex shaped like a prefix trie.
+
+    Alternatives sharing a prefix are factored (``rm -rf`` / ``rm -rf /``
+    become ``rm\\ \\-rf(?:\\ /)?``), so each position of the scanned text
+    costs at most one trie walk instead of one comparison per pattern.
+    """
+    trie: Dict[str, dict] = {}
+    for pattern in patterns:
+        if not pattern:
+            continue
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = f"(?:{body})?"
+        return body
+
+    if not trie:
+        return None
+    return re.compile(emit(trie))
+
+
+def split_shell_commands(command: str) -> List[List[str]]:
+    """
+    Tokenize a shell command line into its individual commands.
+
+    Chained commands (``&&``, ``||``, ``;``, pipes, newlines) and subshells
+    ``( ... )`` each become a separate token list, also when written without
+    spaces (``ls;(rm x)``). Command and process substitutions (``$(...)``,
+    backticks, ``<(...)``, ``>(...)``) are extracted first, even inside
+    quotes, and their contents are returned as commands of their own.
+
+    Raises:
+        ValueError: If the command cannot be tokenized (e.g. unbalanced quotes
+            or backticks)
+    """
+    commands: List[List[str]] = []
+    # Innermost substitutions first, so nested ones are all visited
+    match = _SUBSTITUTION_RE.search(command)
+    while match:
+        commands.extend(split_shell_commands(match.group(1) or match.group(2) or ""))
+        command = command[: match.start()] + "_" + command[match.end() :]
+        match = _SUBSTITUTION_RE.search(command)
+    if "`" in command:
+        raise ValueError("crase sem fechamento")
+
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=_SHELL_PUNCTUATION)
+    lexer.whitespace = " \t\r"
+    lexer.whitespace_split = True
+
+    current: List[str] = []
+    for token in lexer:
+        # shlex glues adjacent operators (``;(``, ``|(``, ``&&(``) into one
+        # token: anything that is not a plain redirection ends the command.
+        is_operator = token and all(char in _SHELL_PUNCTUATION for char in token)
+        if token in _COMMAND_SEPARATORS or token == "$" or (
+            is_operator and not _REDIRECTION_RE.match(token)
+        ):
+            if current:
+                commands.append(current)
+            current = []
+            continue
+        current.append(token)
+    if current:
+        commands.append(current)
+    return commands
+
+
+@dataclass(frozen=True)
+class _Verdict:
+    """Cached outcome of validating one command string."""
+
+    is_safe: bool
+    reason: str
+    confirmation_pattern: Optional[str]
 
 
 class CommandValidator:
     """
     Validates shell commands against security policies.
 
+    The policy is compiled once: dangerous and confirmation patterns become
+    trie-shaped regexes scanned in a single pass over the command, and the
+    whitelist becomes a frozenset looked up with the first word of every
+    chained command. Verdicts are kept in an LRU cache keyed by the command
+    string; audit entries are still recorded on every call. Call
+    ``reload_policy()`` after mutating ``config``.
+
     Example:
         >>> validator = CommandValidator(config)
         >>> is_safe, reason = validator.validate("git status")
@@ -84,48 +221,61 @@ class CommandValidator:
         True
     """
 
-    def __init__(self, config: Optional[SecurityConfig] = None):
+    def __init__(self, config: Optional[SecurityConfig] = None, cache_size: int = 1024):
         """
         Initialize validator.
 
         Args:
             config: Security configuration (default: SecurityConfig())
+            cache_size: Maximum number of cached verdicts (0 disables caching)
         """
         self.config = config or SecurityConfig()
-        self.audit_entries: List[Dict[str, str]] = []
+        self.audit_entries: Deque[Dict[str, str]] = deque(maxlen=self.config.audit_tail_size)
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._verdicts: OrderedDict[str, _Verdict] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._writer: Optional[AuditWriter] = None
+        self._writer_source: Optional[Path] = None
+        self.reload_policy()
+
+    def reload_policy(self) -> None:
+        """Recompile the policy from ``config`` and drop cached verdicts."""
+        config = self.config
+        self._dangerous = {p.lower(): p for p in config.dangerous_patterns}
+        self._dangerous_re = _trie_regex(list(self._dangerous))
+        self._confirmation = {p.lower(): p for p in config.require_confirmation_patterns}
+        self._confirmation_re = _trie_regex(list(self._confirmation))
+
+        allowed = [a.lower().strip() for a in config.allowed_commands if a.strip()]
+        self._allowed_words = frozenset(a for a in allowed if " " not in a)
+        self._allowed_prefixes = tuple(a.split() for a in allowed if " " in a)
+        self._allowed_list = ", ".join(sorted(config.allowed_commands))
+        with self._cache_lock:
+            self._verdicts.clear()
 
     def validate(self, command: str) -> tuple[bool, str]:
         """
         Validate command against security policy.
 
+        Every command in a chain (``&&``, ``;``, pipes, subshells) must start
+        with a whitelisted program, and the whole line must not contain a
+        dangerous pattern.
+
         Args:
             command: Shell command to validate
 
         Returns:
             Tuple of (is_safe, reason)
         """
-        command_lower = command.lower().strip()
-
-        # Check for dangerous patterns
-        for pattern in self.config.dangerous_patterns:
-            if pattern.lower() in command_lower:
-                reason = f"Comando contém padrão perigoso: {pattern}"
-                self._audit("BLOCKED", command, reason)
-                return False, reason
-
-        # Check if command starts with allowed prefix
-        command_first_word = command_lower.split()[0] if command_lower.split() else ""
-
-        for allowed in self.config.allowed_commands:
-            if command_first_word == allowed or command_lower.startswith(allowed + " "):
-                self._audit("ALLOWED", command, "Command in whitelist")
-                return True, "Comando permitido"
-
-        # Command not in whitelist
-        allowed_list = ", ".join(sorted(self.config.allowed_commands))
-        reason = f"Comando não está na whitelist. Permitidos: {allowed_list}"
-        self._audit("BLOCKED", command, reason)
-        return False, reason
+        verdict = self._verdict(command)
+        self._audit(
+            "ALLOWED" if verdict.is_safe else "BLOCKED",
+            command,
+            "Command in whitelist" if verdict.is_safe else verdict.reason,
+        )
+        return verdict.is_safe, verdict.reason
 
     def requires_confirmation(self, command: str) -> bool:
         """
@@ -137,44 +287,146 @@ class CommandValidator:
         Returns:
             True if confirmation required
         """
-        command_lower = command.lower()
+        pattern = self._verdict(command).confirmation_pattern
+        if pattern is None:
+            return False
+        self._audit("CONFIRMATION_REQUIRED", command, f"Matches pattern: {pattern}")
+        return True
+
+    def _verdict(self, command: str) -> _Verdict:
+        """Return the cached verdict for ``command`` (computing it on a miss)."""
+        with self._cache_lock:
+            verdict = self._verdicts.get(command)
+            if verdict is not None:
+                self._verdicts.move_to_end(command)
+                self.cache_hits += 1
+                return verdict
+            self.cache_misses += 1
+
+        verdict = self._evaluate(command)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._verdicts[command] = verdict
+                if len(self._verdicts) > self.cache_size:
+                    self._verdicts.popitem(last=False)
+        return verdict
+
+    def _evaluate(self, command: str) -> _Verdict:
+        """Compute the verdict: one regex scan per pattern set plus set lookups."""
+        command_lower = command.lower().strip()
+
+        confirmation = None
+        if self._confirmation_re is not None:
+            match = self._confirmation_re.search(command_lower)
+            if match:
+                confirmation = self._confirmation[match.group(0)]
 
-        for pattern in self.config.require_confirmation_patterns:
-            if pattern.lower() in command_lower:
-                self._audit("CONFIRMATION_REQUIRED", command, f"Matches pattern: {pattern}")
-                return True
+        problems: List[str] = []
+        if self._dangerous_re is not None:
+            match = self._dangerous_re.search(command_lower)
+            if match:
+                problems.append(f"Comando contém padrão perigoso: {self._dangerous[match.group(0)]}")
 
-        return False
+        try:
+            commands = split_shell_commands(command_lower)
+        except ValueError as exc:
+            return _Verdict(False, f"Comando malformado: {exc}", confirmation)
+
+        rejected = [name for name in (self._program(words) for words in commands) if name is not None]
+        if not commands:
+            rejected.append("")
+        if rejected:
+            names = ", ".join(repr(name) for name in dict.fromkeys(rejected))
+            if problems:
+                problems.append(f"também não está na whitelist ({names})")
+            else:
+                problems.append(
+                    f"Comando não está na whitelist ({names}). Permitidos: {self._allowed_list}"
+                )
+
+        if problems:
+            return _Verdict(False, "; ".join(problems), confirmation)
+        return _Verdict(True, "Comando permitido", confirmation)
+
+    def _program(self, words: List[str]) -> Optional[str]:
+        """Return the program name if it is not whitelisted, else None."""
+        index = 0
+        while index < len(words) and _ENV_ASSIGNMENT_RE.match(words[index]):
+            index += 1
+        words = words[index:]
+        if not words:
+            return None
+        if words[0] in self._allowed_words:
+            return None
+        for prefix in self._allowed_prefixes:
+            if words[: len(prefix)] == prefix:
+                return None
+        return words[0]
 
     def _audit(self, action: str, command: str, reason: str):
-        """Record audit entry."""
-        if self.config.enable_audit_log:
-            entry = {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "action": action,
-                "command": command,
-                "reason": reason,
-            }
-            self.audit_entries.append(entry)
-            logger.info(f"[AUDIT] {action}: {command} - {reason}")
-
-            # Write to audit file if configured
-            if self.config.audit_log_path:
-                try:
-                    with open(self.config.audit_log_path, "a", encoding="utf-8") as f:
-                        f.write(f"{entry['timestamp']} | {action} | {command} | {reason}\n")
-                except Exception as e:
-                    logger.error(f"Failed to write audit log: {e}")
+        """
+        Record audit entry.
+
+        The entry goes to a bounded in-memory tail and, if configured, to the
+        shared buffered writer of ``audit_log_path``; no file I/O happens here.
+        """
+        if not self.config.enable_audit_log:
+            return
+        entry = {
+            "timestamp": _audit_timestamp(),
+            "action": action,
+            "command": command,
+            "reason": reason,
+        }
+        self.audit_entries.append(entry)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[AUDIT] {action}: {command} - {reason}")
+
+        if self.config.audit_log_path:
+            try:
+                self._audit_writer().write(entry)
+            except Exception as e:
+                logger.error(f"Failed to write audit log: {e}")
+
+    def _audit_writer(self) -> AuditWriter:
+        path = self.config.audit_log_path
+        # The shared writer may have been closed (close_audit_writers, atexit)
+        if self._writer is None or self._writer.closed or self._writer_source != path:
+            self._writer = get_audit_writer(
+                path,
+                max_bytes=self.config.audit_max_bytes,
+                backup_count=self.config.audit_backup_count,
+            )
+            self._writer_source = path
+        return self._writer
 
     def get_audit_log(self) -> List[Dict[str, str]]:
-        """Get all audit entries."""
-        return self.audit_entries.copy()
+        """Get the most recent audit entries (up to ``audit_tail_size``)."""
+        return list(self.audit_entries)
+
+    def flush_audit_log(self) -> None:
+        """Block until queued audit entries are written to ``audit_log_path``."""
+        if self._writer is not None:
+            self._writer.flush()
+
+
+# Marker key for trie nodes that end a blocked path
+_BLOCKED = ""
 
 
 class PathValidator:
     """
     Validates file system paths against security policies.
 
+    Blocked paths are resolved once, at construction, into a trie of path
+    components, so checking a path costs one dict lookup per component. The
+    filesystem root is matched exactly: blocking ``/`` forbids operating on
+    the root itself, not on every path below it.
+
+    Input paths are resolved on every call: a cache of resolutions would
+    have to re-check each traversed component for symlink swaps, which costs
+    about as much as ``os.path.realpath`` itself.
+
     Example:
         >>> validator = PathValidator(config)
         >>> is_safe, reason = validator.validate("/home/user/file.txt")
@@ -182,6 +434,9 @@ class PathValidator:
         True
     """
 
+    IMPORTANT_NAMES = frozenset({".git", "node_modules", ".env", "venv", ".venv"})
+    PROJECT_MARKERS = frozenset({".git", "package.json", "pyproject.toml", "setup.py"})
+
     def __init__(self, config: Optional[SecurityConfig] = None):
         """
         Initialize validator.
@@ -190,6 +445,22 @@ class PathValidator:
             config: Security configuration
         """
         self.config = config or SecurityConfig()
+        self.reload_policy()
+
+    def reload_policy(self) -> None:
+        """Rebuild the blocked-path trie from ``config``."""
+        trie: Dict[str, dict] = {}
+        for blocked in self.config.blocked_paths:
+            for candidate in {Path(blocked).absolute(), Path(blocked).resolve()}:
+                node = trie
+                for part in candidate.parts:
+                    node = node.setdefault(part, {})
+                node[_BLOCKED] = blocked
+        self._blocked_trie = trie
+
+    def resolve(self, path: str) -> Path:
+        """Resolve ``path``, following symlinks."""
+        return Path(os.path.realpath(path))
 
     def validate(self, path: str) -> tuple[bool, str]:
         """
@@ -202,16 +473,21 @@ class PathValidator:
             Tuple of (is_safe, reason)
         """
         try:
-            path_obj = Path(path).resolve()
+            path_obj = self.resolve(path)
         except Exception as e:
             return False, f"Invalid path: {e}"
-
-        # Check if path is in blocked list
-        for blocked in self.config.blocked_paths:
-            blocked_path = Path(blocked).resolve()
-
-            # Check exact match or parent match
-            if path_obj == blocked_path or blocked_path in path_obj.parents:
+        return self._check_resolved(path_obj)
+
+    def _check_resolved(self, path_obj: Path) -> tuple[bool, str]:
+        # Check exact match or parent match against the blocked-path trie
+        parts = path_obj.parts
+        node = self._blocked_trie
+        for depth, part in enumerate(parts, start=1):
+            node = node.get(part)
+            if node is None:
+                break
+            blocked = node.get(_BLOCKED)
+            if blocked is not None and (depth == len(parts) or depth > 1):
                 return False, f"Path is blocked: {blocked}"
 
         # Additional check: prevent accessing system directories
@@ -231,20 +507,25 @@ class PathValidator:
         Returns:
             Tuple of (is_safe, reason)
         """
+        try:
+            path_obj = self.resolve(path)
+        except Exception as e:
+            return False, f"Invalid path: {e}"
+        return self._check_write(path_obj)
+
+    def _check_write(self, path_obj: Path) -> tuple[bool, str]:
         # First, check basic validation
-        is_safe, reason = self.validate(path)
+        is_safe, reason = self._check_resolved(path_obj)
         if not is_safe:
             return is_safe, reason
 
         try:
-            path_obj = Path(path).resolve()
-
             # Check if trying to write to root or system dirs
             if path_obj.parent == Path("/"):
                 return False, "Cannot write to root directory"
 
-            # Check if path exists and is a directory
-            if path_obj.exists() and path_obj.is_dir():
+            # Check if path exists and is a directory (single stat)
+            if os.path.isdir(path_obj):
                 return False, "Cannot write to existing directory (specify file path)"
 
             return True, "Path safe for writing"
@@ -263,31 +544,31 @@ class PathValidator:
         Returns:
             Tuple of (is_safe, reason)
         """
+        try:
+            path_obj = self.resolve(path)
+        except Exception as e:
+            return False, f"Invalid path: {e}"
+        return self._check_delete(path_obj, path, recursive)
+
+    def _check_delete(self, path_obj: Path, path: str, recursive: bool) -> tuple[bool, str]:
         # Basic validation
-        is_safe, reason = self.validate(path)
+        is_safe, reason = self._check_resolved(path_obj)
         if not is_safe:
             return is_safe, reason
 
         try:
-            path_obj = Path(path).resolve()
-
             # Prevent deleting important directories even if not in blocked list
-            important_dirs = [
-                ".git",
-                "node_modules",
-                ".env",
-                "venv",
-                ".venv",
-            ]
-
-            if path_obj.name in important_dirs:
+            if path_obj.name in self.IMPORTANT_NAMES:
                 return False, f"Cannot delete important directory: {path_obj.name}"
 
             # If recursive deletion, be extra careful
             if recursive:
-                # Prevent deleting entire project roots
-                markers = [".git", "package.json", "pyproject.toml", "setup.py"]
-                if any((path_obj / marker).exists() for marker in markers):
+                # Prevent deleting entire project roots (one listdir for all markers)
+                try:
+                    names = os.listdir(path_obj)
+                except (FileNotFoundError, NotADirectoryError):
+                    names = []
+                if not self.PROJECT_MARKERS.isdisjoint(names):
                     return False, "Cannot recursively delete project root"
 
                 # Warn about large recursive deletions
@@ -298,79 +579,314 @@ class PathValidator:
         except Exception as e:
             return False, f"Path validation error: {e}"
 
+    def validate_many(
+        self,
+        paths: List[str],
+        operation: str = "read",
+        recursive: bool = False,
+    ) -> Dict[str, tuple[bool, str]]:
+        """
+        Validate several paths at once.
+
+        Args:
+            paths: Paths to validate
+            operation: 'read', 'write' or 'delete'
+            recursive: For 'delete', whether deletion is recursive
+
+        Returns:
+            Dict mapping each input path to (is_safe, reason)
+
+        Raises:
+            ValueError: If operation is unknown
+        """
+        if operation not in ("read", "write", "delete"):
+            raise ValueError(f"Unknown operation: {operation}")
+
+        results: Dict[str, tuple[bool, str]] = {}
+        for path in paths:
+            if path in results:
+                continue
+            try:
+                path_obj = self.resolve(path)
+            except Exception as e:
+                results[path] = (False, f"Invalid path: {e}")
+                continue
+            if operation == "read":
+                results[path] = self._check_resolved(path_obj)
+            elif operation == "write":
+                results[path] = self._check_write(path_obj)
+            else:
+                results[path] = self._check_delete(path_obj, path, recursive)
+        return results
+
+
+class MemoryRateLimitStore:
+    """
+    In-process store of GCRA state (one float per key), guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clock() -> float:
+        """Monotonic clock (state is never shared outside the process)."""
+        return time.monotonic()
+
+    def update(self, key: str, fn: Callable[[Optional[float]], Tuple[Optional[float], _T]]) -> _T:
+        """Atomically replace the state of ``key`` with ``fn(state)[0]``; return ``fn(state)[1]``."""
+        with self._lock:
+            new_state, result = fn(self._tats.get(key))
+            if new_state is None:
+                self._tats.pop(key, None)
+            else:
+                self._tats[key] = new_state
+            return result
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            return self._tats.get(key)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._tats.clear()
+            else:
+                self._tats.pop(key, None)
+
+
+class FileRateLimitStore:
+    """
+    GCRA state shared by processes on one host: one 8-byte file per key,
+    updated under ``fcntl.flock``.
+
+    Example:
+        >>> store = FileRateLimitStore(Path("/tmp/agents-rate"))
+        >>> limiter = RateLimiter(max_per_minute=30, store=store)
+    """
+
+    _STATE = struct.Struct("<d")
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Args:
+            directory: Folder holding the per-key state files
+        """
+        if fcntl is None:  # pragma: no cover - Windows
+            raise RuntimeError("FileRateLimitStore requires fcntl (POSIX)")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clock() -> float:
+        """Wall clock, comparable across processes."""
+        return time.time()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return str(self.directory / f"{digest}.gcra")
+
+    def update(self, key: str, fn: Callable[[Optional[float]], Tuple[Optional[float], _T]]) -> _T:
+        """Atomically replace the state of ``key`` (see ``MemoryRateLimitStore.update``)."""
+        with self._lock:
+            fd = os.open(self._path(key), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                new_state, result = fn(self._read(fd))
+                data = self._STATE.pack(new_state) if new_state is not None else b""
+                os.ftruncate(fd, 0)
+                os.pwrite(fd, data, 0)
+                return result
+            finally:
+                # Closing the descriptor releases the flock
+                os.close(fd)
+
+    def get(self, key: str) -> Optional[float]:
+        try:
+            fd = os.open(self._path(key), os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            return self._read(fd)
+        finally:
+            os.close(fd)
+
+    def _read(self, fd: int) -> Optional[float]:
+        raw = os.pread(fd, self._STATE.size, 0)
+        if len(raw) != self._STATE.size:
+            return None
+        return self._STATE.unpack(raw)[0]
+
+    def reset(self, key: Optional[str] = None) -> None:
+        paths = [self._path(key)] if key is not None else [str(p) for p in self.directory.glob("*.gcra")]
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
 
 class RateLimiter:
     """
     Rate limiter for command execution and resource usage.
 
+    Implemented as GCRA (a token bucket expressed as a "theoretical arrival
+    time" per key): each check is O(1) in time and memory regardless of the
+    limit. Up to ``max_per_minute`` units may be used in a burst; capacity
+    then refills continuously. State lives in a store: in-process by default,
+    or ``FileRateLimitStore`` to share limits between worker processes.
+
+    Operations can carry a ``cost`` so the same limiter can budget weighted
+    resources (e.g. estimated LLM input tokens per minute).
+
     Example:
         >>> limiter = RateLimiter(max_per_minute=30)
         >>> if limiter.check_and_record("command_execution"):
         ...     execute_command()
         ... else:
         ...     print("Rate limit exceeded")
+        >>> limiter.acquire("command_execution", timeout=5.0)  # waits instead
+        True
     """
 
-    def __init__(self, max_per_minute: int = 30):
+    PERIOD = 60.0
+    # Float tolerance when a request exactly fills the bucket
+    _EPSILON = 1e-9
+
+    def __init__(
+        self,
+        max_per_minute: int = 30,
+        store: Optional[Union[MemoryRateLimitStore, FileRateLimitStore]] = None,
+    ):
         """
         Initialize rate limiter.
 
         Args:
-            max_per_minute: Maximum operations per minute
+            max_per_minute: Maximum operations (or total cost) per minute
+            store: GCRA state store (default: in-process)
         """
         self.max_per_minute = max_per_minute
-        self.operations: Dict[str, List[float]] = defaultdict(list)
+        self.store = store or MemoryRateLimitStore()
+
+    def _increment(self, cost: float) -> float:
+        return cost * self.PERIOD / self.max_per_minute
 
-    def check_and_record(self, operation_type: str) -> bool:
+    def reserve(
+        self, operation_type: str, cost: float = 1.0, timeout: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Reserve capacity, possibly in the future.
+
+        Args:
+            operation_type: Type of operation
+            cost: Weight of the operation
+            timeout: Maximum acceptable wait (None = any)
+
+        Returns:
+            Seconds the caller must wait before proceeding (0.0 = now), or
+            None if the wait would exceed ``timeout`` (nothing is reserved)
+        """
+        if self.max_per_minute <= 0:
+            return None
+        increment = self._increment(cost)
+
+        def apply(tat: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+            now = self.store.clock()
+            start = now if tat is None or tat < now else tat
+            # A single operation larger than the whole budget is allowed on an
+            # empty bucket, otherwise it could never run.
+            if start == now:
+                return start + increment, 0.0
+            wait = max(start + increment - self.PERIOD - now, 0.0)
+            if wait <= self._EPSILON:
+                return start + increment, 0.0
+            if timeout is not None and wait > timeout:
+                return tat, None
+            return start + increment, wait
+
+        return self.store.update(operation_type, apply)
+
+    def check_and_record(self, operation_type: str, cost: float = 1.0) -> bool:
         """
         Check if operation is within rate limit and record it.
 
         Args:
             operation_type: Type of operation (e.g., "command_execution")
+            cost: Weight of this operation (default: 1)
 
         Returns:
             True if within limit, False if exceeded
         """
-        now = time.time()
-        cutoff = now - 60  # 60 seconds ago
-
-        # Remove old operations
-        self.operations[operation_type] = [
-            ts for ts in self.operations[operation_type]
-            if ts > cutoff
-        ]
-
-        # Check if limit exceeded
-        if len(self.operations[operation_type]) >= self.max_per_minute:
+        if self.reserve(operation_type, cost, timeout=0.0) is None:
             logger.warning(
                 f"Rate limit exceeded for {operation_type}: "
-                f"{len(self.operations[operation_type])}/{self.max_per_minute} per minute"
+                f"{self.get_current_rate(operation_type):g}/{self.max_per_minute} per minute"
             )
             return False
+        return True
+
+    def acquire(self, operation_type: str, cost: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the operation fits the limit, then record it.
+
+        Capacity is reserved up front and the caller sleeps exactly until its
+        slot, so concurrent callers are served in order without polling.
+
+        Args:
+            operation_type: Type of operation
+            cost: Weight of the operation
+            timeout: Maximum seconds to wait (None = wait as long as needed)
 
-        # Record new operation
-        self.operations[operation_type].append(now)
+        Returns:
+            True once recorded, False if it would not fit within ``timeout``
+        """
+        wait = self.reserve(operation_type, cost, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
         return True
 
-    def get_current_rate(self, operation_type: str) -> int:
+    def time_until_available(self, operation_type: str, cost: float = 1.0) -> float:
         """
-        Get current operation count in last minute.
+        Seconds until an operation of ``cost`` would fit in the window.
 
         Args:
             operation_type: Type of operation
+            cost: Weight of the operation
 
         Returns:
-            Number of operations in last 60 seconds
+            0.0 if it fits now, otherwise the wait in seconds
+        """
+        tat = self.store.get(operation_type)
+        now = self.store.clock()
+        if tat is None or tat <= now:
+            return 0.0
+        wait = tat + self._increment(cost) - self.PERIOD - now
+        return wait if wait > self._EPSILON else 0.0
+
+    def get_current_rate(self, operation_type: str) -> float:
         """
-        now = time.time()
-        cutoff = now - 60
+        Get current usage in last minute.
+
+        Derived from the GCRA state, so it is the capacity still being
+        refilled (approximate, rounded to 2 decimals) rather than an exact
+        count of past operations.
 
-        self.operations[operation_type] = [
-            ts for ts in self.operations[operation_type]
-            if ts > cutoff
-        ]
+        Args:
+            operation_type: Type of operation
 
-        return len(self.operations[operation_type])
+        Returns:
+            Total cost in last 60 seconds (number of operations for unit cost)
+        """
+        tat = self.store.get(operation_type)
+        if tat is None or self.max_per_minute <= 0:
+            return 0.0
+        backlog = max(tat - self.store.clock(), 0.0)
+        return round(backlog * self.max_per_minute / self.PERIOD, 2)
 
     def reset(self, operation_type: Optional[str] = None):
         """
@@ -379,10 +895,7 @@ class RateLimiter:
         Args:
             operation_type: Specific operation to reset, or None for all
         """
-        if operation_type:
-            self.operations[operation_type] = []
-        else:
-            self.operations.clear()
+        self.store.reset(operation_type)
 
 
 # Global default instances
@@ -407,11 +920,21 @@ def get_path_validator() -> PathValidator:
     return _default_path_validator
 
 
+def default_rate_limit_store() -> Union[MemoryRateLimitStore, FileRateLimitStore]:
+    """Store for new limiters: shared on disk if AGENTS_RATE_LIMIT_DIR is set."""
+    from framework.config import get_settings
+
+    directory = get_settings(validate=False).rate_limit_dir
+    if directory and fcntl is not None:
+        return FileRateLimitStore(Path(directory))
+    return MemoryRateLimitStore()
+
+
 def get_rate_limiter() -> RateLimiter:
     """Get global default rate limiter."""
     global _default_rate_limiter
     if _default_rate_limiter is None:
-        _default_rate_limiter = RateLimiter()
+        _default_rate_limiter = RateLimiter(store=default_rate_limit_store())
     return _default_rate_limiter
 
 
@@ -420,7 +943,11 @@ __all__ = [
     "CommandValidator",
     "PathValidator",
     "RateLimiter",
+    "MemoryRateLimitStore",
+    "FileRateLimitStore",
+    "default_rate_limit_store",
     "get_command_validator",
     "get_path_validator",
     "get_rate_limiter",
+    "split_shell_commands",
 ]
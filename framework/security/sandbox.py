@@ -0,0 +1,439 @@
+"""
+Resource-limited sandbox profiles for spawned commands.
+
+A wall-clock timeout does not stop a runaway script from eating every CPU
+and all memory of a shared worker host. A ``SandboxProfile`` is applied to
+every process the execution tools spawn (the persistent shell worker, the
+``Popen`` fallback, test shards):
+
+- ``resource`` limits: CPU seconds, open files, processes and, in the
+  ``strict`` profile only, address space
+- lower CPU priority (``nice``) and I/O priority (``ioprio_set``, Linux)
+
+Resource usage of each command (CPU time, peak RSS when known) is
+accounted per agent without cgroups (``ResourceAccountant``) and attached
+to the current tool-call event of the ``MonitoringManager``.
+
+Example:
+    >>> profile = get_sandbox_profile("strict")
+    >>> subprocess.Popen(cmd, preexec_fn=profile.preexec_fn())
+    >>> with agent_scope("autonomous:Ctx"):
+    ...     run_shell_command("pytest -q")
+    >>> get_resource_accountant().snapshot()["autonomous:Ctx"]["cpu_s"]
+    3.42
+"""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+import os
+import platform
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:  # pragma: no cover - unavailable on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+from framework.observability.monitoring import MonitoringManager, current_tool_call_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENT = "default"
+
+# ioprio_set(2): classes and syscall numbers per architecture
+IOPRIO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_SYSCALLS = {
+    "x86_64": 251,
+    "amd64": 251,
+    "aarch64": 30,
+    "arm64": 30,
+    "i386": 289,
+    "i686": 289,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "s390x": 282,
+}
+
+_current_agent: ContextVar[str] = ContextVar("sandbox_agent", default=DEFAULT_AGENT)
+
+
+@dataclass(frozen=True)
+class SandboxProfile:
+    """
+    Limits and priorities applied to spawned commands.
+
+    ``None`` leaves the corresponding limit untouched. Limits never exceed
+    the current hard limit of the agent process.
+
+    Attributes:
+        name: Profile name
+        cpu_seconds: RLIMIT_CPU (the kernel sends SIGXCPU when exceeded)
+        address_space_bytes: RLIMIT_AS (allocations beyond it fail). It
+            counts reserved virtual memory, not memory in use: runtimes that
+            reserve large ranges up front (V8/node and WebAssembly, Go, the
+            JVM, sanitizer builds) fail even when they use little memory, so
+            only the ``strict`` profile sets it
+        open_files: RLIMIT_NOFILE
+        max_processes: RLIMIT_NPROC (counted per user, not per command)
+        nice: Niceness increment (0 = same priority as the agent)
+        ionice_class: ``"best-effort"``, ``"idle"`` or None
+        ionice_level: Priority inside the class (0 highest, 7 lowest)
+    """
+
+    name: str
+    cpu_seconds: Optional[int] = None
+    address_space_bytes: Optional[int] = None
+    open_files: Optional[int] = None
+    max_processes: Optional[int] = None
+    nice: int = 0
+    ionice_class: Optional[str] = None
+    ionice_level: int = 7
+
+    @property
+    def unrestricted(self) -> bool:
+        return self.rlimits() == [] and not self.nice and self.ionice_class is None
+
+    def rlimits(self) -> List[Tuple[int, int]]:
+        """``(resource, value)`` pairs enforced by this profile."""
+        if resource is None:
+            return []
+        pairs = [
+            (getattr(resource, "RLIMIT_CPU", None), self.cpu_seconds),
+            (getattr(resource, "RLIMIT_AS", None), self.address_space_bytes),
+            (getattr(resource, "RLIMIT_NOFILE", None), self.open_files),
+            (getattr(resource, "RLIMIT_NPROC", None), self.max_processes),
+        ]
+        return [(limit, value) for limit, value in pairs if limit is not None and value is not None]
+
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """
+        Function applying the profile in a freshly forked child.
+
+        Everything is resolved in the parent: the returned function only makes
+        system calls (no imports, locks or logging), which is what makes
+        ``preexec_fn`` safe enough in a threaded process.
+
+        Returns:
+            None when there is nothing to apply (or the platform lacks support)
+        """
+        if os.name != "posix" or self.unrestricted:
+            return None
+        limits = []
+        for limit, value in self.rlimits():
+            _, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            # CPU: SIGXCPU at the soft limit, SIGKILL one second later
+            ceiling = value + 1 if limit == getattr(resource, "RLIMIT_CPU", None) else value
+            if hard != resource.RLIM_INFINITY:
+                ceiling = min(ceiling, hard)
+            limits.append((limit, (value, ceiling)))
+        nice = self.nice
+        ioprio = _ioprio_setter(self.ionice_class, self.ionice_level)
+        setrlimit = resource.setrlimit if resource is not None else None
+
+        def apply() -> None:
+            for limit, value in limits:
+                try:
+                    setrlimit(limit, value)
+                except (ValueError, OSError):
+                    pass
+            if nice:
+                try:
+                    os.nice(nice)
+                except OSError:
+                    pass
+            if ioprio is not None:
+                ioprio()
+
+        return apply
+
+
+def _ioprio_setter(io_class: Optional[str], level: int) -> Optional[Callable[[], None]]:
+    """Bind ``ioprio_set(IOPRIO_WHO_PROCESS, 0, prio)`` via ctypes (Linux only)."""
+    if io_class is None or not platform.system() == "Linux":
+        return None
+    number = _IOPRIO_SYSCALLS.get(platform.machine().lower())
+    if number is None or io_class not in IOPRIO_CLASSES:
+        return None
+    try:
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (OSError, AttributeError):  # pragma: no cover - exotic libc
+        return None
+    prio = (IOPRIO_CLASSES[io_class] << _IOPRIO_CLASS_SHIFT) | max(0, min(7, level))
+
+    def apply() -> None:
+        syscall(number, _IOPRIO_WHO_PROCESS, 0, prio)
+
+    return apply
+
+
+_profiles: Dict[str, SandboxProfile] = {
+    "unrestricted": SandboxProfile(name="unrestricted"),
+    "default": SandboxProfile(
+        name="default",
+        cpu_seconds=600,
+        # No RLIMIT_AS: node/npm (whitelisted), Go and the JVM reserve large
+        # virtual ranges and would fail to start under it. No RLIMIT_NPROC:
+        # it counts every process of the user, so on a busy host it would
+        # make fork fail in commands that start only a few processes
+        open_files=4096,
+        nice=5,
+        ionice_class="best-effort",
+        ionice_level=7,
+    ),
+    "strict": SandboxProfile(
+        name="strict",
+        cpu_seconds=120,
+        address_space_bytes=2 * 1024**3,
+        open_files=256,
+        max_processes=256,
+        nice=10,
+        ionice_class="idle",
+    ),
+}
+
+
+def register_sandbox_profile(profile: SandboxProfile) -> None:
+    """Add or replace a named profile."""
+    _profiles[profile.name] = profile
+
+
+def get_sandbox_profile(name: Optional[str] = None) -> SandboxProfile:
+    """
+    Named profile (default: ``AGENTS_SANDBOX_PROFILE``).
+
+    Raises:
+        KeyError: If the profile does not exist
+    """
+    if name is None:
+        from framework.config import get_settings
+
+        name = get_settings(validate=False).sandbox_profile
+    try:
+        return _profiles[name]
+    except KeyError:
+        raise KeyError(f"Unknown sandbox profile: {name} (available: {', '.join(sorted(_profiles))})") from None
+
+
+# ----------------------------------------------------------------------
+# Accounting
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class ResourceUsage:
+    """Resources consumed by one command."""
+
+    cpu_user_s: float = 0.0
+    cpu_system_s: float = 0.0
+    max_rss_kb: Optional[int] = None
+    wall_s: float = 0.0
+
+    @property
+    def cpu_s(self) -> float:
+        return self.cpu_user_s + self.cpu_system_s
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cpu_user_s": round(self.cpu_user_s, 3),
+            "cpu_system_s": round(self.cpu_system_s, 3),
+            "max_rss_kb": self.max_rss_kb,
+            "wall_s": round(self.wall_s, 3),
+        }
+
+
+def wait_with_rusage(process: subprocess.Popen, timeout: Optional[float] = None) -> Tuple[int, ResourceUsage]:
+    """
+    Reap ``process`` with ``wait4`` to get its resource usage.
+
+    ``process.returncode`` is set as ``Popen.wait`` would.
+
+    Raises:
+        subprocess.TimeoutExpired: If it does not exit within ``timeout``
+    """
+    if not hasattr(os, "wait4") or process.returncode is not None:
+        return process.wait(timeout), ResourceUsage()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.0005
+    while True:
+        try:
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG if deadline is not None else 0)
+        except ChildProcessError:
+            # Reaped elsewhere (e.g. Popen's own bookkeeping)
+            return process.wait(), ResourceUsage()
+        if pid:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return process.returncode, ResourceUsage(
+                cpu_user_s=usage.ru_utime,
+                cpu_system_s=usage.ru_stime,
+                # Linux reports kilobytes, macOS bytes
+                max_rss_kb=usage.ru_maxrss // 1024 if platform.system() == "Darwin" else usage.ru_maxrss,
+            )
+        if time.monotonic() >= deadline:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def children_cpu_times(pid: int) -> Optional[Tuple[float, float]]:
+    """
+    CPU seconds (user, system) of the reaped children of ``pid`` (Linux).
+
+    Used for commands run by the persistent shell, whose children are not
+    ours to ``wait4``.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as handle:
+            data = handle.read()
+    except OSError:
+        return None
+    # Fields after the ")" closing the command name; cutime/cstime are 16/17
+    fields = data[data.rfind(b")") + 2 :].split()
+    try:
+        return int(fields[13]) / _CLOCK_TICKS, int(fields[14]) / _CLOCK_TICKS
+    except (IndexError, ValueError):
+        return None
+
+
+@dataclass
+class AgentUsage:
+    """Accumulated resources of one agent."""
+
+    commands: int = 0
+    cpu_s: float = 0.0
+    max_rss_kb: Optional[int] = None
+    wall_s: float = 0.0
+    limit_kills: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "commands": self.commands,
+            "cpu_s": round(self.cpu_s, 3),
+            "max_rss_kb": self.max_rss_kb,
+            "wall_s": round(self.wall_s, 3),
+            "limit_kills": self.limit_kills,
+        }
+
+
+class ResourceAccountant:
+    """
+    Per-agent totals of command resource usage (no cgroups required).
+
+    The agent is taken from ``agent_scope``; commands outside any scope are
+    accounted to ``"default"``.
+    """
+
+    def __init__(self) -> None:
+        self._usage: Dict[str, AgentUsage] = {}
+        self._lock = threading.Lock()
+
+    def record(self, usage: ResourceUsage, agent: Optional[str] = None, killed_by_limit: bool = False) -> str:
+        """Add one command's usage; returns the agent it was accounted to."""
+        agent = agent or _current_agent.get()
+        with self._lock:
+            totals = self._usage.setdefault(agent, AgentUsage())
+            totals.commands += 1
+            totals.cpu_s += usage.cpu_s
+            totals.wall_s += usage.wall_s
+            if usage.max_rss_kb is not None:
+                totals.max_rss_kb = max(totals.max_rss_kb or 0, usage.max_rss_kb)
+            if killed_by_limit:
+                totals.limit_kills += 1
+        return agent
+
+    def usage(self, agent: str) -> AgentUsage:
+        with self._lock:
+            return replace(self._usage.get(agent, AgentUsage()))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {agent: totals.to_dict() for agent, totals in self._usage.items()}
+
+    def reset(self, agent: Optional[str] = None) -> None:
+        with self._lock:
+            if agent is None:
+                self._usage.clear()
+            else:
+                self._usage.pop(agent, None)
+
+
+_accountant = ResourceAccountant()
+
+
+def get_resource_accountant() -> ResourceAccountant:
+    """Process-wide accountant."""
+    return _accountant
+
+
+def current_agent() -> str:
+    """Agent commands are currently accounted to."""
+    return _current_agent.get()
+
+
+@contextmanager
+def agent_scope(agent: str) -> Iterator[str]:
+    """Account commands run inside the block to ``agent``."""
+    token = _current_agent.set(agent)
+    try:
+        yield agent
+    finally:
+        _current_agent.reset(token)
+
+
+def killed_by_cpu_limit(returncode: int) -> bool:
+    """True for SIGXCPU, directly (-24) or as reported by a shell (152)."""
+    sigxcpu = getattr(signal, "SIGXCPU", None)
+    return sigxcpu is not None and returncode in (-sigxcpu, 128 + sigxcpu)
+
+
+def record_command_usage(usage: ResourceUsage, returncode: int = 0) -> Dict[str, Any]:
+    """
+    Account ``usage`` to the current agent and attach it to the current
+    tool-call event.
+
+    Returns:
+        The usage as a dict (with the agent name)
+    """
+    killed = killed_by_cpu_limit(returncode)
+    agent = _accountant.record(usage, killed_by_limit=killed)
+    data = usage.to_dict()
+    data["agent"] = agent
+    if killed:
+        data["killed_by"] = "cpu_limit"
+
+    call_id = current_tool_call_id()
+    if call_id and MonitoringManager.is_enabled():
+        MonitoringManager.get_instance().record_tool_resources(call_id, data)
+    return data
+
+
+__all__ = [
+    "AgentUsage",
+    "ResourceAccountant",
+    "ResourceUsage",
+    "SandboxProfile",
+    "agent_scope",
+    "children_cpu_times",
+    "current_agent",
+    "get_resource_accountant",
+    "get_sandbox_profile",
+    "killed_by_cpu_limit",
+    "record_command_usage",
+    "register_sandbox_profile",
+    "wait_with_rusage",
+]
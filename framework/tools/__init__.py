@@ -6,20 +6,28 @@ Gerencia o registro e disponibilização de ferramentas para agentes.
 
 from framework.tools.registry import (
     AgentType,
+    ToolEffect,
     ToolRegistry,
+    ToolRunMemo,
+    get_tool_policy,
     get_tools,
     get_tools_for_agent,
     get_tools_for_agent_type,
+    memoize_tools,
     validate_tool_name,
     validate_tool_names,
 )
 
 __all__ = [
     "AgentType",
+    "ToolEffect",
     "ToolRegistry",
+    "ToolRunMemo",
+    "get_tool_policy",
     "get_tools",
     "get_tools_for_agent",
     "get_tools_for_agent_type",
+    "memoize_tools",
     "validate_tool_name",
     "validate_tool_names",
 ]
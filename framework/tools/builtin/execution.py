@@ -15,6 +15,9 @@ from typing import List, Optional
 from langchain_core.tools import StructuredTool
 
 from ...observability.monitoring import monitor_tool_call
+from ..git import GitCommandError, get_git_repository, mark_worktree_changed
+from ..testing import get_test_runner
+from ..worker import run_shell_command
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +108,9 @@ def _run_command(
         check: Raise exception on non-zero exit (default: False)
 
     Returns:
-        Command output (stdout + stderr)
+        Command output (stdout + stderr); long streams keep only their first
+        and last bytes (AGENTS_COMMAND_OUTPUT_MAX_BYTES) with a note of what
+        was dropped
 
     Raises:
         ValueError: If command is not safe
@@ -123,22 +128,22 @@ def _run_command(
         logger.info(f"  Diretório: {cwd}")
 
     try:
-        result = subprocess.run(
-            command,
-            cwd=cwd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=check,
-        )
-
-        output = result.stdout
-        if result.stderr:
-            output += f"\n[STDERR]\n{result.stderr}"
-
+        # Persistent per-thread shell; output streamed into bounded buffers
+        try:
+            result = run_shell_command(command, cwd=cwd, timeout=timeout)
+        finally:
+            # Any command may touch the working tree
+            mark_worktree_changed()
+
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, command, output=result.stdout, stderr=result.stderr
+            )
+
+        if result.output_limited:
+            logger.warning("Comando encerrado: saída excedeu o limite de bytes")
         logger.info(f"Comando concluído (exit code: {result.returncode})")
-        return output
+        return result.output()
 
     except subprocess.TimeoutExpired as e:
         logger.error(f"Comando excedeu timeout de {timeout}s")
@@ -160,9 +165,10 @@ def _git_status(cwd: Optional[str] = None) -> str:
         cwd: Repository directory (default: current)
 
     Returns:
-        Git status output
+        Short status (branch header plus one ``XY path`` line per change),
+        cached until the working tree changes
     """
-    return _run_command("git status", cwd=cwd)
+    return get_git_repository(cwd).status().render()
 
 
 @monitor_tool_call
@@ -171,14 +177,13 @@ def _git_diff(file: Optional[str] = None, cwd: Optional[str] = None) -> str:
     Show git diff.
 
     Args:
-        file: Specific file to diff (default: all changes)
+        file: Specific file to diff, relative to ``cwd`` (default: all changes)
         cwd: Repository directory (default: current)
 
     Returns:
         Git diff output
     """
-    command = f"git diff {file}" if file else "git diff"
-    return _run_command(command, cwd=cwd)
+    return get_git_repository(cwd).diff(file, cwd=cwd)
 
 
 @monitor_tool_call
@@ -187,14 +192,18 @@ def _git_add(files: List[str], cwd: Optional[str] = None) -> str:
     Add files to git staging area.
 
     Args:
-        files: List of file paths to add
+        files: List of file paths to add, relative to ``cwd``
         cwd: Repository directory (default: current)
 
     Returns:
-        Command output
+        Status after staging (git's output if staging failed)
     """
-    files_str = " ".join(files)
-    return _run_command(f"git add {files_str}", cwd=cwd)
+    repo = get_git_repository(cwd)
+    try:
+        repo.add(files, cwd=cwd)
+    except GitCommandError as e:
+        return e.result.output()
+    return repo.status().render()
 
 
 @monitor_tool_call
@@ -207,11 +216,33 @@ def _git_commit(message: str, cwd: Optional[str] = None) -> str:
         cwd: Repository directory (default: current)
 
     Returns:
-        Commit output
+        Short hash and subject of the new commit (git's output if nothing
+        was committed, e.g. nothing staged)
+    """
+    try:
+        return get_git_repository(cwd).commit(message).oneline()
+    except GitCommandError as e:
+        return e.result.output()
+
+
+@monitor_tool_call
+def _git_stage_commit(files: List[str], message: str, cwd: Optional[str] = None) -> str:
+    """
+    Stage files and commit them in one call.
+
+    Args:
+        files: List of file paths to add, relative to ``cwd``
+        message: Commit message
+        cwd: Repository directory (default: current)
+
+    Returns:
+        Short hash and subject of the new commit (git's output if nothing
+        was committed)
     """
-    # Escape quotes in message
-    safe_message = message.replace('"', '\\"')
-    return _run_command(f'git commit -m "{safe_message}"', cwd=cwd)
+    try:
+        return get_git_repository(cwd).stage_commit(files, message, cwd=cwd).oneline()
+    except GitCommandError as e:
+        return e.result.output()
 
 
 @monitor_tool_call
@@ -224,9 +255,9 @@ def _git_log(limit: int = 10, cwd: Optional[str] = None) -> str:
         cwd: Repository directory (default: current)
 
     Returns:
-        Git log output
+        One ``<hash> <subject>`` line per commit
     """
-    return _run_command(f"git log --oneline -n {limit}", cwd=cwd)
+    return "\n".join(commit.oneline() for commit in get_git_repository(cwd).log(limit))
 
 
 @monitor_tool_call
@@ -287,6 +318,7 @@ def _rm(path: str, recursive: bool = False, force: bool = False) -> str:
             f"Remoção recursiva requer confirmação explícita (force=True): {path}"
         )
 
+    mark_worktree_changed()
     try:
         if path_obj.is_file():
             path_obj.unlink()
@@ -322,6 +354,7 @@ def _mv(source: str, dest: str) -> str:
     if not source_path.exists():
         raise ValueError(f"Path de origem não existe: {source}")
 
+    mark_worktree_changed()
     try:
         source_path.rename(dest_path)
         logger.info(f"Movido: {source} -> {dest}")
@@ -351,19 +384,35 @@ def _run_python(script_path: str, args: Optional[str] = None, cwd: Optional[str]
 
 
 @monitor_tool_call
-def _run_tests(test_path: Optional[str] = None, cwd: Optional[str] = None) -> str:
+def _run_tests(
+    test_path: Optional[str] = None,
+    cwd: Optional[str] = None,
+    workers: int = 0,
+    use_cache: bool = True,
+) -> str:
     """
-    Run pytest tests.
+    Run pytest tests in parallel shards.
 
     Args:
-        test_path: Specific test file/directory (default: all tests)
-        cwd: Working directory (default: current)
+        test_path: Specific test file/directory/node id (default: all tests)
+        cwd: Project root (default: current)
+        workers: Parallel pytest processes (default: AGENTS_TEST_WORKERS)
+        use_cache: Reuse results of test files whose code did not change
 
     Returns:
-        Test output
+        Summary (totals, failures with messages, slowest tests)
     """
-    command = f"pytest {test_path}" if test_path else "pytest"
-    return _run_command(command, cwd=cwd, timeout=120)
+    try:
+        result = get_test_runner(cwd).run(
+            [test_path] if test_path else None, workers=workers or None, use_cache=use_cache
+        )
+    finally:
+        mark_worktree_changed()
+    logger.info(
+        f"Testes: {result.passed} passed, {result.failed} failed, {result.errors} errors "
+        f"({result.cached_units}/{result.units} em cache)"
+    )
+    return result.render()
 
 
 # Create LangChain tools
@@ -408,6 +457,12 @@ git_commit_tool = StructuredTool.from_function(
     description="Create git commit with message. Example: git_commit('Add new feature')"
 )
 
+git_stage_commit_tool = StructuredTool.from_function(
+    _git_stage_commit,
+    name="git_stage_commit",
+    description="Stage files and commit them in one call. Example: git_stage_commit(['file1.py'], 'Add new feature')"
+)
+
 git_log_tool = StructuredTool.from_function(
     _git_log,
     name="git_log",
@@ -449,7 +504,12 @@ run_python_tool = StructuredTool.from_function(
 run_tests_tool = StructuredTool.from_function(
     _run_tests,
     name="run_tests",
-    description="Run pytest tests. Specify test_path for specific file/dir, or omit to run all tests."
+    description="""Run pytest tests in parallel and return a structured summary.
+
+    Specify test_path for a specific file/dir/node id, or omit to run all tests.
+    Results of test files whose code (and the project sources) did not change
+    are reused; pass use_cache=False to force a rerun.
+    """
 )
 
 
@@ -460,6 +520,7 @@ EXECUTION_TOOLS = [
     git_diff_tool,
     git_add_tool,
     git_commit_tool,
+    git_stage_commit_tool,
     git_log_tool,
     mkdir_tool,
     rm_tool,
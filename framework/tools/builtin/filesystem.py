@@ -5,12 +5,16 @@ from __future__ import annotations
 import os
 import re
 from pathlib import Path
-from typing import Iterable, List
+from typing import List, Optional
 
 from langchain_core.tools import StructuredTool
 
 from ... import BASE_PATH
+from ...io.atomic import atomic_write_text
 from ...observability.monitoring import monitor_tool_call
+from ..git import mark_worktree_changed
+from ..search import read_range
+from ..walker import get_search_engine
 
 
 @monitor_tool_call
@@ -31,18 +35,35 @@ def _ls(path: str = ".", recursive: bool = False) -> str:
 
 
 @monitor_tool_call
-def _read_file(path: str) -> str:
+def _read_file(
+    path: str,
+    offset: int = 0,
+    length: Optional[int] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    continuation_token: Optional[str] = None,
+) -> str:
     target = (BASE_PATH / path).resolve()
     if not target.exists() or not target.is_file():
         raise ValueError(f"Arquivo {path} não encontrado.")
-    return target.read_text(encoding="utf-8")
+    result = read_range(
+        target,
+        offset=offset,
+        length=length,
+        start_line=start_line,
+        end_line=end_line,
+        continuation_token=continuation_token,
+    )
+    return result.render()
 
 
 @monitor_tool_call
 def _write_file(path: str, content: str) -> str:
     target = (BASE_PATH / path).resolve()
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(content, encoding="utf-8")
+    # Substitui o arquivo em vez de editá-lo no lugar: artefatos do CAS
+    # são hardlinks compartilhados entre workspaces
+    atomic_write_text(target, content)
+    mark_worktree_changed()
     return str(target)
 
 
@@ -53,38 +74,39 @@ def _edit_file(path: str, pattern: str, replacement: str, count: int = 0) -> str
         raise ValueError(f"Arquivo {path} não encontrado.")
     text = target.read_text(encoding="utf-8")
     new_text, replaced = re.subn(pattern, replacement, text, count=count)
-    target.write_text(new_text, encoding="utf-8")
+    atomic_write_text(target, new_text)
+    mark_worktree_changed()
     return f"{replaced} ocorrências substituídas."
 
 
 @monitor_tool_call
-def _glob(pattern: str) -> str:
-    matches = sorted(str(p.relative_to(BASE_PATH)) for p in BASE_PATH.glob(pattern))
-    return "\n".join(matches)
+def _glob(pattern: str, max_results: int = 500, include_ignored: bool = False) -> str:
+    result = get_search_engine().glob(
+        pattern, BASE_PATH, limit=max_results, include_ignored=include_ignored
+    )
+    return result.render()
 
 
 @monitor_tool_call
-def _grep(pattern: str, path: str = ".") -> str:
+def _grep(
+    pattern: str,
+    path: str = ".",
+    ignore_case: bool = False,
+    max_results: int = 200,
+    continuation_token: Optional[str] = None,
+) -> str:
     target = (BASE_PATH / path).resolve()
-    files: Iterable[Path]
-    if target.is_dir():
-        files = target.rglob("*")
-    else:
-        files = [target]
-    regex = re.compile(pattern)
-    lines: List[str] = []
-    for file_path in files:
-        if not file_path.is_file():
-            continue
-        try:
-            content = file_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            continue
-        for idx, line in enumerate(content.splitlines(), start=1):
-            if regex.search(line):
-                rel = file_path.relative_to(BASE_PATH)
-                lines.append(f"{rel}:{idx}: {line}")
-    return "\n".join(lines)
+    if not target.exists():
+        raise ValueError(f"Caminho {path} não encontrado.")
+    result = get_search_engine().grep(
+        pattern,
+        target,
+        base=BASE_PATH,
+        max_results=max_results,
+        ignore_case=ignore_case,
+        continuation_token=continuation_token,
+    )
+    return result.render()
 
 
 LS_TOOL = StructuredTool.from_function(
@@ -96,7 +118,10 @@ LS_TOOL = StructuredTool.from_function(
 READ_FILE_TOOL = StructuredTool.from_function(
     _read_file,
     name="read_file",
-    description="Lê o conteúdo integral de um arquivo UTF-8.",
+    description=(
+        "Lê um arquivo UTF-8. Arquivos grandes são paginados: use offset/length "
+        "(bytes) ou start_line/end_line e continuation_token para continuar."
+    ),
 )
 
 WRITE_FILE_TOOL = StructuredTool.from_function(
@@ -114,13 +139,19 @@ EDIT_FILE_TOOL = StructuredTool.from_function(
 GLOB_TOOL = StructuredTool.from_function(
     _glob,
     name="glob",
-    description="Lista arquivos que correspondem a um padrão glob.",
+    description=(
+        "Lista arquivos que correspondem a um padrão glob (suporta **). Ignora "
+        ".gitignore, .venv, node_modules e afins, salvo include_ignored=True."
+    ),
 )
 
 GREP_TOOL = StructuredTool.from_function(
     _grep,
     name="grep",
-    description="Busca expressões regulares em arquivos.",
+    description=(
+        "Busca expressões regulares em arquivos (ignora binários, arquivos muito "
+        "grandes e caminhos do .gitignore). Resultados paginados: use continuation_token para continuar."
+    ),
 )
 
 
@@ -0,0 +1,305 @@
+"""
+Bounded capture of command output.
+
+Verbose commands (``pytest -v``, ``npm install``) can print megabytes; the
+execution tools must neither buffer all of it in memory nor return it to the
+LLM. This module reads output incrementally and keeps only:
+
+- the first ``head_bytes`` and the last ``tail_bytes`` of each stream
+  (``HeadTailBuffer``), with a count of the bytes dropped in between
+- live progress reported to the current tool-call event of the
+  ``MonitoringManager`` (bytes per stream, last line), throttled
+- an optional hard limit (``kill_after_bytes``) that terminates the command
+  early when it produces too much output
+
+``run_captured`` is the ``Popen``-based replacement for
+``subprocess.run(capture_output=True)``; it applies the sandbox profile and
+records the command's resource usage. ``PersistentShellWorker`` uses the
+same buffers for its streams.
+"""
+
+from __future__ import annotations
+
+import os
+import selectors
+import signal
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from ..observability.monitoring import MonitoringManager, current_tool_call_id
+from ..security.sandbox import (
+    ResourceUsage,
+    SandboxProfile,
+    get_sandbox_profile,
+    killed_by_cpu_limit,
+    record_command_usage,
+    wait_with_rusage,
+)
+
+DEFAULT_HEAD_BYTES = 32 * 1024
+DEFAULT_TAIL_BYTES = 32 * 1024
+PROGRESS_INTERVAL_S = 0.25
+
+_READ_CHUNK = 64 * 1024
+_PREVIEW_CHARS = 200
+
+
+class HeadTailBuffer:
+    """
+    Keeps the first ``head_bytes`` and last ``tail_bytes`` written.
+
+    Memory is bounded by ``head_bytes + 2 * tail_bytes`` regardless of how
+    much is written.
+
+    Example:
+        >>> buffer = HeadTailBuffer(head_bytes=4, tail_bytes=4)
+        >>> buffer.write(b"0123456789")
+        >>> buffer.text()
+        '0123\\n[... 2 bytes omitidos ...]\\n6789'
+    """
+
+    def __init__(self, head_bytes: int = DEFAULT_HEAD_BYTES, tail_bytes: int = DEFAULT_TAIL_BYTES) -> None:
+        self.head_bytes = max(0, head_bytes)
+        self.tail_bytes = max(0, tail_bytes)
+        self.total = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """Append output."""
+        if not data:
+            return
+        self.total += len(data)
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.tail_bytes:
+            self._tail += data
+            # Trim lazily (amortized O(1) per byte)
+            if len(self._tail) > 2 * self.tail_bytes:
+                del self._tail[: len(self._tail) - self.tail_bytes]
+
+    @property
+    def dropped(self) -> int:
+        """Bytes written but not retained."""
+        return self.total - len(self._head) - min(len(self._tail), self.tail_bytes)
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped > 0
+
+    def head(self) -> bytes:
+        return bytes(self._head)
+
+    def tail(self) -> bytes:
+        return bytes(self._tail[-self.tail_bytes :]) if self.tail_bytes else b""
+
+    def getvalue(self) -> bytes:
+        """Retained bytes (head followed by tail)."""
+        return self.head() + self.tail()
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Retained output as text, with a marker where bytes were dropped."""
+        if not self.truncated:
+            return self.getvalue().decode(encoding, errors="replace")
+        head = self.head().decode(encoding, errors="ignore")
+        tail = self.tail().decode(encoding, errors="ignore")
+        return f"{head}\n[... {self.dropped} bytes omitidos ...]\n{tail}"
+
+    def last_line(self) -> str:
+        """Last non-empty line seen (for live previews)."""
+        source = self._tail or self._head
+        lines = bytes(source[-4096:]).decode("utf-8", errors="ignore").rstrip().splitlines()
+        return lines[-1][-_PREVIEW_CHARS:] if lines else ""
+
+
+class OutputCapture:
+    """
+    stdout/stderr buffers plus limits and live progress of one command.
+    """
+
+    def __init__(
+        self,
+        head_bytes: int = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        kill_after_bytes: int = 0,
+        call_id: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            head_bytes: Bytes kept from the start of each stream
+            tail_bytes: Bytes kept from the end of each stream
+            kill_after_bytes: Total output that terminates the command (0 = never)
+            call_id: Tool call receiving progress (default: current tool call)
+        """
+        self.stdout = HeadTailBuffer(head_bytes, tail_bytes)
+        self.stderr = HeadTailBuffer(head_bytes, tail_bytes)
+        self.kill_after_bytes = kill_after_bytes
+        self.call_id = call_id if call_id is not None else current_tool_call_id()
+        self.started = time.monotonic()
+        self._last_report = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.stdout.total + self.stderr.total
+
+    @property
+    def limit_exceeded(self) -> bool:
+        return bool(self.kill_after_bytes) and self.total > self.kill_after_bytes
+
+    def write(self, stream: str, data: bytes) -> None:
+        """Append output of ``stream`` ('stdout' or 'stderr')."""
+        (self.stdout if stream == "stdout" else self.stderr).write(data)
+        now = time.monotonic()
+        if now - self._last_report >= PROGRESS_INTERVAL_S:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> Dict[str, object]:
+        """Push the current snapshot to the monitoring tool-call event."""
+        if not self.call_id or not MonitoringManager.is_enabled():
+            return {}
+        return MonitoringManager.get_instance().record_tool_output(
+            self.call_id,
+            stdout_bytes=self.stdout.total,
+            stderr_bytes=self.stderr.total,
+            dropped_bytes=self.stdout.dropped + self.stderr.dropped,
+            elapsed_ms=(time.monotonic() - self.started) * 1000,
+            last_line=self.stderr.last_line() if self.stderr.total and not self.stdout.total else self.stdout.last_line(),
+            terminated=self.limit_exceeded,
+        )
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a shell command (retained output only)."""
+
+    stdout: str
+    stderr: str
+    returncode: int
+    duration_s: float
+    timed_out: bool = False
+    stdout_dropped: int = 0
+    stderr_dropped: int = 0
+    output_limited: bool = False
+    via_worker: bool = True
+    resources: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_capture(
+        cls,
+        capture: OutputCapture,
+        returncode: int,
+        timed_out: bool = False,
+        via_worker: bool = True,
+        usage: Optional[ResourceUsage] = None,
+    ) -> CommandResult:
+        capture.report()
+        resources = None
+        if usage is not None:
+            usage.wall_s = time.monotonic() - capture.started
+            resources = record_command_usage(usage, returncode)
+        return cls(
+            stdout=capture.stdout.text(),
+            stderr=capture.stderr.text(),
+            returncode=returncode,
+            duration_s=time.monotonic() - capture.started,
+            timed_out=timed_out,
+            stdout_dropped=capture.stdout.dropped,
+            stderr_dropped=capture.stderr.dropped,
+            output_limited=capture.limit_exceeded,
+            via_worker=via_worker,
+            resources=resources,
+        )
+
+    def output(self) -> str:
+        """stdout followed by stderr, as returned by the execution tools."""
+        text = self.stdout
+        if self.stderr:
+            text += f"\n[STDERR]\n{self.stderr}"
+        if self.output_limited:
+            text += "\n[comando encerrado: limite de saída excedido]"
+        elif killed_by_cpu_limit(self.returncode):
+            text += "\n[comando encerrado: limite de CPU excedido]"
+        return text
+
+
+def run_captured(
+    command: str,
+    cwd: Optional[str] = None,
+    timeout: float = 30.0,
+    capture: Optional[OutputCapture] = None,
+    profile: Optional[SandboxProfile] = None,
+) -> CommandResult:
+    """
+    ``subprocess.run(shell=True)`` with incremental, bounded capture.
+
+    Args:
+        profile: Sandbox profile (default: ``AGENTS_SANDBOX_PROFILE``)
+
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeds ``timeout``
+    """
+    capture = capture or OutputCapture()
+    profile = profile or get_sandbox_profile()
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        shell=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+        preexec_fn=profile.preexec_fn(),
+    )
+    streams = {process.stdout.fileno(): "stdout", process.stderr.fileno(): "stderr"}
+    deadline = time.monotonic() + timeout
+    try:
+        with selectors.DefaultSelector() as selector:
+            for fd in streams:
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    usage = _kill_group(process)
+                    result = CommandResult.from_capture(
+                        capture, -signal.SIGKILL, timed_out=True, via_worker=False, usage=usage
+                    )
+                    raise subprocess.TimeoutExpired(command, timeout, output=result.stdout, stderr=result.stderr)
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, _READ_CHUNK)
+                    if not chunk:
+                        selector.unregister(key.fd)
+                        continue
+                    capture.write(streams[key.fd], chunk)
+                if capture.limit_exceeded:
+                    usage = _kill_group(process)
+                    return CommandResult.from_capture(capture, process.returncode, via_worker=False, usage=usage)
+        try:
+            returncode, usage = wait_with_rusage(process, max(deadline - time.monotonic(), 0.1))
+        except subprocess.TimeoutExpired:
+            _kill_group(process)
+            raise
+    finally:
+        process.stdout.close()
+        process.stderr.close()
+    return CommandResult.from_capture(capture, returncode, via_worker=False, usage=usage)
+
+
+def _kill_group(process: subprocess.Popen) -> ResourceUsage:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+    return wait_with_rusage(process)[1]
+
+
+__all__ = [
+    "CommandResult",
+    "HeadTailBuffer",
+    "OutputCapture",
+    "run_captured",
+]
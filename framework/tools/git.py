@@ -0,0 +1,518 @@
+"""
+Cached, in-process git repository handles for the git tools.
+
+Each ``git status``/``git log`` used to spawn ``git``, which re-reads the
+index and the refs. ``GitRepository`` keeps one handle per repository root:
+
+- With ``dulwich`` installed (optional), status, staging, commits and log
+  run in-process
+- Otherwise commands go through the persistent shell worker and commit
+  objects are read from a long-lived ``git cat-file --batch`` process
+  (``log`` and ``show`` spawn nothing)
+- ``status()`` is cached until something may have changed the working tree:
+  a write through this handle, a tool that writes files
+  (``mark_worktree_changed``), a change of the index or ``HEAD``, or
+  ``AGENTS_GIT_STATUS_TTL`` seconds
+- ``stage_commit`` stages and commits in one call
+- Path arguments are relative to the caller's ``cwd`` (as with ``git``
+  itself); commands run from that directory
+
+Example:
+    >>> repo = get_git_repository("/repo")
+    >>> print(repo.status().render())
+    ## main
+     M framework/tools/git.py
+    >>> repo.stage_commit(["framework/tools/git.py"], "Add git backend").sha
+    '3f2c...'
+"""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import logging
+import os
+import shlex
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from framework.config import get_settings
+from framework.core.exceptions import ToolExecutionError
+from framework.tools.capture import CommandResult
+from framework.tools.worker import run_shell_command
+
+try:  # pragma: no cover - optional dependency
+    from dulwich import porcelain as dulwich_porcelain
+    from dulwich.repo import Repo as DulwichRepo
+except ImportError:  # pragma: no cover - optional dependency
+    dulwich_porcelain = None
+    DulwichRepo = None
+
+logger = logging.getLogger(__name__)
+
+
+class GitCommandError(ToolExecutionError):
+    """A git command exited with a non-zero status."""
+
+    def __init__(self, command: str, result: CommandResult) -> None:
+        super().__init__("git", (result.stderr or result.stdout).strip() or command)
+        self.command = command
+        self.result = result
+
+
+_worktree_generation = 0
+_generation_lock = threading.Lock()
+
+
+def mark_worktree_changed() -> None:
+    """Invalidate cached status of every repository (a tool wrote files)."""
+    global _worktree_generation
+    with _generation_lock:
+        _worktree_generation += 1
+
+
+@dataclass
+class GitStatus:
+    """Working tree status (``git status --short --branch``)."""
+
+    branch: str
+    staged: List[Tuple[str, str]] = field(default_factory=list)
+    unstaged: List[Tuple[str, str]] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not (self.staged or self.unstaged or self.untracked)
+
+    def render(self) -> str:
+        """Short format: ``XY path`` lines under a ``## branch`` header."""
+        entries: Dict[str, List[str]] = {}
+        for code, path in self.staged:
+            entries.setdefault(path, [" ", " "])[0] = code
+        for code, path in self.unstaged:
+            entries.setdefault(path, [" ", " "])[1] = code
+        lines = [f"## {self.branch}"]
+        lines.extend(f"{x}{y} {path}" for path, (x, y) in sorted(entries.items()))
+        lines.extend(f"?? {path}" for path in sorted(self.untracked))
+        if self.clean:
+            lines.append("nothing to commit, working tree clean")
+        return "\n".join(lines)
+
+
+@dataclass
+class GitCommit:
+    """Commit summary."""
+
+    sha: str
+    summary: str
+    author: str = ""
+    timestamp: int = 0
+
+    def oneline(self) -> str:
+        return f"{self.sha[:7]} {self.summary}"
+
+
+class _CatFile:
+    """Persistent ``git cat-file --batch`` process."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._process: Optional[subprocess.Popen] = None
+
+    def read(self, spec: str) -> Optional[Tuple[str, str, bytes]]:
+        """Return ``(sha, type, content)`` of an object, or None if missing."""
+        process = self._ensure()
+        assert process.stdin and process.stdout
+        try:
+            process.stdin.write(spec.encode("utf-8") + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline()
+        except (BrokenPipeError, OSError) as exc:
+            self.close()
+            raise ToolExecutionError("git", f"cat-file interrompido: {exc}", exc) from exc
+        if not header:
+            self.close()
+            raise ToolExecutionError("git", "cat-file encerrou inesperadamente")
+        parts = header.split()
+        if len(parts) != 3:
+            return None  # "<spec> missing" / "ambiguous"
+        size = int(parts[2])
+        content = process.stdout.read(size)
+        process.stdout.read(1)  # trailing newline
+        return parts[0].decode("ascii"), parts[1].decode("ascii"), content
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        process.kill()
+        process.wait()
+
+    def _ensure(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+
+class GitRepository:
+    """
+    Handle to one repository, shared by the git tools.
+
+    Thread-safe: operations on the same repository are serialized.
+    """
+
+    def __init__(self, root: Union[str, Path], backend: Optional[str] = None, status_ttl: Optional[float] = None):
+        """
+        Args:
+            root: Repository root (directory containing ``.git``)
+            backend: ``"dulwich"`` or ``"cli"`` (default: dulwich if installed)
+            status_ttl: Maximum age of a cached status in seconds
+                (default: ``AGENTS_GIT_STATUS_TTL``)
+        """
+        self.root = Path(root).resolve()
+        settings = get_settings(validate=False)
+        if backend is None:
+            backend = settings.git_backend
+        if backend == "auto":
+            backend = "dulwich" if DulwichRepo is not None else "cli"
+        if backend == "dulwich" and DulwichRepo is None:
+            raise ToolExecutionError("git", "dulwich não está instalado")
+        self.backend = backend
+        self.status_ttl = settings.git_status_ttl if status_ttl is None else status_ttl
+        self.status_hits = 0
+        self.status_misses = 0
+        self._lock = threading.RLock()
+        self._status: Optional[GitStatus] = None
+        self._status_key: Optional[tuple] = None
+        self._status_time = 0.0
+        self._git_dir = _git_dir(self.root)
+        self._dulwich = DulwichRepo(str(self.root)) if backend == "dulwich" else None
+        self._cat_file = _CatFile(self.root) if backend == "cli" else None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def status(self) -> GitStatus:
+        """Working tree status (cached until something may have changed)."""
+        with self._lock:
+            key = self._state_key()
+            if (
+                self._status is not None
+                and key == self._status_key
+                and time.monotonic() - self._status_time < self.status_ttl
+            ):
+                self.status_hits += 1
+                return self._status
+            self.status_misses += 1
+            status = self._dulwich_status() if self._dulwich is not None else self._cli_status()
+            # Refresh may rewrite the index stat cache: key it after the read
+            self._status, self._status_key, self._status_time = status, self._state_key(), time.monotonic()
+            return status
+
+    def diff(self, path: Optional[str] = None, staged: bool = False, cwd: Optional[str] = None) -> str:
+        """
+        Unified diff of the working tree (or the index with ``staged``).
+
+        Args:
+            path: Limit the diff to this path (relative to ``cwd``)
+            cwd: Directory the command runs from (default: repository root)
+        """
+        command = "git diff --no-color"
+        if staged:
+            command += " --cached"
+        if path:
+            command += f" -- {shlex.quote(path)}"
+        return self._git(command, cwd)
+
+    def log(self, limit: int = 10, rev: str = "HEAD") -> List[GitCommit]:
+        """Commits reachable from ``rev``, newest first (like ``git log``)."""
+        with self._lock:
+            if self._dulwich is not None:
+                return self._dulwich_log(limit)
+            return self._cli_log(limit, rev)
+
+    def show(self, path: str, rev: str = "HEAD") -> Optional[str]:
+        """Content of ``path`` at ``rev`` (None if it does not exist there)."""
+        with self._lock:
+            if self._dulwich is not None:
+                return self._git_optional(f"git show {shlex.quote(f'{rev}:{path}')}")
+            obj = self._cat_file.read(f"{rev}:{path}")
+            if obj is None or obj[1] != "blob":
+                return None
+            return obj[2].decode("utf-8", errors="replace")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, paths: Sequence[str], cwd: Optional[str] = None) -> None:
+        """Stage ``paths`` (relative to ``cwd``, default: repository root)."""
+        with self._lock:
+            try:
+                if self._dulwich is not None:
+                    base = Path(cwd) if cwd else self.root
+                    dulwich_porcelain.add(self._dulwich, paths=[str((base / p).resolve()) for p in paths])
+                else:
+                    self._git("git add -- " + " ".join(shlex.quote(p) for p in paths), cwd)
+            finally:
+                self._invalidate()
+
+    def commit(self, message: str) -> GitCommit:
+        """Commit the index."""
+        with self._lock:
+            try:
+                if self._dulwich is not None:
+                    sha = dulwich_porcelain.commit(self._dulwich, message=message.encode("utf-8"))
+                    return GitCommit(sha.decode("ascii"), message.splitlines()[0] if message else "")
+                self._git(f"git commit --quiet -m {shlex.quote(message)}")
+                return self._cli_log(1, "HEAD")[0]
+            finally:
+                self._invalidate()
+
+    def stage_commit(self, paths: Sequence[str], message: str, cwd: Optional[str] = None) -> GitCommit:
+        """
+        Stage ``paths`` (relative to ``cwd``) and commit in one call.
+
+        On the CLI backend both steps run in a single worker round trip.
+        """
+        with self._lock:
+            if self._dulwich is not None:
+                self.add(paths, cwd)
+                return self.commit(message)
+            try:
+                files = " ".join(shlex.quote(p) for p in paths)
+                self._git(f"git add -- {files} && git commit --quiet -m {shlex.quote(message)}", cwd)
+                return self._cli_log(1, "HEAD")[0]
+            finally:
+                self._invalidate()
+
+    def close(self) -> None:
+        """Release the cat-file process."""
+        with self._lock:
+            if self._cat_file is not None:
+                self._cat_file.close()
+            if self._dulwich is not None:
+                self._dulwich.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _invalidate(self) -> None:
+        self._status = None
+
+    def _state_key(self) -> tuple:
+        """Cheap signature of the index, HEAD and tool writes."""
+        key: List[object] = [_worktree_generation]
+        for name in ("index", "HEAD"):
+            try:
+                stat = os.stat(self._git_dir / name)
+                key.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def _git(self, command: str, cwd: Optional[str] = None) -> str:
+        """
+        Run ``command`` from ``cwd`` (default: repository root).
+
+        Raises:
+            GitCommandError: If the command exits with a non-zero status
+        """
+        result = run_shell_command(command, cwd=str(cwd or self.root), timeout=60)
+        if result.returncode != 0:
+            raise GitCommandError(command, result)
+        return result.stdout
+
+    def _git_optional(self, command: str) -> Optional[str]:
+        result = run_shell_command(command, cwd=str(self.root), timeout=60)
+        return result.stdout if result.returncode == 0 else None
+
+    def _cli_status(self) -> GitStatus:
+        output = self._git("git status --porcelain=v1 -z --branch --untracked-files=all")
+        return parse_porcelain_status(output)
+
+    def _cli_log(self, limit: int, rev: str) -> List[GitCommit]:
+        head = self._cat_file.read(rev)
+        if head is None:
+            return []
+        commits: List[GitCommit] = []
+        seen = {head[0]}
+        # Newest committer date first, like git log's default order
+        queue = [_queue_item(head[0], head[2])]
+        while queue and len(commits) < limit:
+            _, sha, parsed = heapq.heappop(queue)
+            parents, commit = parsed
+            commits.append(GitCommit(sha, commit[0], commit[1], commit[2]))
+            for parent in parents:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                obj = self._cat_file.read(parent)
+                if obj is not None:
+                    heapq.heappush(queue, _queue_item(obj[0], obj[2]))
+        return commits
+
+    def _dulwich_status(self) -> GitStatus:  # pragma: no cover - optional dependency
+        raw = dulwich_porcelain.status(self._dulwich, untracked_files="all")
+        codes = {"add": "A", "delete": "D", "modify": "M"}
+        staged = [
+            (codes[kind], _decode(path)) for kind, paths in raw.staged.items() for path in paths
+        ]
+        unstaged = [("M", _decode(path)) for path in raw.unstaged]
+        try:
+            branch = _decode(dulwich_porcelain.active_branch(self._dulwich))
+        except (KeyError, IndexError):
+            branch = "HEAD (no branch)"
+        return GitStatus(branch, staged, unstaged, [_decode(path) for path in raw.untracked])
+
+    def _dulwich_log(self, limit: int) -> List[GitCommit]:  # pragma: no cover - optional dependency
+        try:
+            walker = self._dulwich.get_walker(max_entries=limit)
+        except KeyError:
+            return []
+        commits = []
+        for entry in walker:
+            commit = entry.commit
+            summary = commit.message.decode("utf-8", errors="replace").splitlines()
+            commits.append(
+                GitCommit(
+                    commit.id.decode("ascii"),
+                    summary[0] if summary else "",
+                    commit.author.decode("utf-8", errors="replace"),
+                    commit.commit_time,
+                )
+            )
+        return commits
+
+
+def parse_porcelain_status(output: str) -> GitStatus:
+    """Parse ``git status --porcelain=v1 -z --branch``."""
+    records = output.split("\0")
+    status = GitStatus(branch="HEAD (no branch)")
+    index = 0
+    while index < len(records):
+        record = records[index]
+        index += 1
+        if not record:
+            continue
+        if record.startswith("## "):
+            status.branch = record[3:].split("...")[0]
+            continue
+        x, y, path = record[0], record[1], record[3:]
+        if x in "RC":
+            index += 1  # original path of a rename/copy follows
+        if x == "?":
+            status.untracked.append(path)
+            continue
+        if x not in " !":
+            status.staged.append((x, path))
+        if y not in " !":
+            status.unstaged.append((y, path))
+    return status
+
+
+def _parse_commit(content: bytes) -> Tuple[List[str], Tuple[str, str, int]]:
+    header, _, message = content.partition(b"\n\n")
+    parents: List[str] = []
+    author = ""
+    timestamp = 0
+    for line in header.split(b"\n"):
+        if line.startswith(b"parent "):
+            parents.append(line[7:].decode("ascii"))
+        elif line.startswith(b"author "):
+            author = line[7:].rsplit(b" ", 2)[0].decode("utf-8", errors="replace")
+        elif line.startswith(b"committer "):
+            timestamp = int(line.rsplit(b" ", 2)[1])
+    lines = message.decode("utf-8", errors="replace").splitlines()
+    return parents, (lines[0] if lines else "", author, timestamp)
+
+
+def _queue_item(sha: str, content: bytes) -> tuple:
+    parents, commit = _parse_commit(content)
+    return (-commit[2], sha, (parents, commit))
+
+
+def _decode(value: Union[str, bytes]) -> str:
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else value
+
+
+def _git_dir(root: Path) -> Path:
+    """Resolve ``.git`` (a directory, or a ``gitdir:`` file for worktrees)."""
+    dot_git = root / ".git"
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            return (root / content[7:].strip()).resolve()
+    return dot_git
+
+
+def find_repository_root(path: Union[str, Path, None] = None) -> Optional[Path]:
+    """Nearest directory at or above ``path`` containing ``.git``."""
+    current = Path(path or os.getcwd()).resolve()
+    for candidate in (current, *current.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return None
+
+
+_repositories: Dict[Path, GitRepository] = {}
+_repositories_guard = threading.Lock()
+
+
+def get_git_repository(path: Union[str, Path, None] = None) -> GitRepository:
+    """
+    Shared handle of the repository containing ``path``.
+
+    Raises:
+        ToolExecutionError: If ``path`` is not inside a git repository
+    """
+    root = find_repository_root(path)
+    if root is None:
+        raise ToolExecutionError("git", f"não é um repositório git: {path or os.getcwd()}")
+    with _repositories_guard:
+        repo = _repositories.get(root)
+        if repo is None:
+            repo = _repositories[root] = GitRepository(root)
+        return repo
+
+
+def close_git_repositories() -> None:
+    """Close every shared handle."""
+    with _repositories_guard:
+        repos = list(_repositories.values())
+        _repositories.clear()
+    for repo in repos:
+        repo.close()
+
+
+atexit.register(close_git_repositories)
+
+
+__all__ = [
+    "GitCommandError",
+    "GitCommit",
+    "GitRepository",
+    "GitStatus",
+    "close_git_repositories",
+    "find_repository_root",
+    "get_git_repository",
+    "mark_worktree_changed",
+    "parse_porcelain_status",
+]
@@ -1,11 +1,42 @@
-"""Registry de ferramentas disponíveis para os agents."""
+"""
+Registry de ferramentas disponíveis para os agents.
+
+Também oferece memoização por execução (``ToolRunMemo``): cada ferramenta é
+classificada como pura, somente leitura ou mutante (``TOOL_POLICIES``).
+Resultados de ferramentas puras e de leitura são reaproveitados enquanto os
+argumentos forem os mesmos e os arquivos envolvidos não mudarem (mtime e
+tamanho); uma chamada mutante invalida as entradas cujos caminhos se
+sobrepõem aos dela.
+"""
 
 from __future__ import annotations
 
+import functools
+import inspect
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Iterable, List, Sequence, Set, Union
-
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from framework import BASE_PATH
 from framework.core.exceptions import InvalidConfigError
+from framework.observability.monitoring import MonitoringManager
 
 if TYPE_CHECKING:  # pragma: no cover
     from langchain_core.tools import BaseTool
@@ -18,8 +49,8 @@ else:
 # Import condicional das ferramentas builtin
 try:
     from framework.tools.builtin.content import CONTENT_TOOLS
-    from framework.tools.builtin.filesystem import FILE_SYSTEM_TOOLS, SEARCH_TOOLS
     from framework.tools.builtin.execution import EXECUTION_TOOLS
+    from framework.tools.builtin.filesystem import FILE_SYSTEM_TOOLS, SEARCH_TOOLS
 except ImportError:  # pragma: no cover - caso langchain não esteja instalado
     CONTENT_TOOLS = []  # type: ignore
     FILE_SYSTEM_TOOLS = []  # type: ignore
@@ -27,6 +58,9 @@ except ImportError:  # pragma: no cover - caso langchain não esteja instalado
     EXECUTION_TOOLS = []  # type: ignore
 
 
+logger = logging.getLogger(__name__)
+
+
 class AgentType(str, Enum):
     STRATEGY = "strategy"
     PROCESS = "process"
@@ -34,6 +68,247 @@ class AgentType(str, Enum):
     AUTONOMOUS = "autonomous"  # Full access to all tools including execution
 
 
+class ToolEffect(str, Enum):
+    PURE = "pure"  # resultado depende só dos argumentos
+    READ_ONLY = "read_only"  # lê arquivos/git, não altera nada
+    MUTATING = "mutating"  # altera arquivos, git ou executa código
+
+
+@dataclass(frozen=True)
+class ToolPolicy:
+    """
+    Efeito de uma ferramenta e os caminhos que ela lê ou altera.
+
+    Attributes:
+        effect: Classificação da ferramenta
+        path_args: Argumentos que contêm caminhos
+        base: Raiz dos caminhos relativos: "workspace" (BASE_PATH) ou "cwd"
+        default_path: Caminho usado quando nenhum argumento de caminho é
+            informado (None em uma ferramenta mutante = pode alterar qualquer coisa)
+        git: Lê ou altera o estado do git
+    """
+
+    effect: ToolEffect
+    path_args: Tuple[str, ...] = ()
+    base: str = "workspace"
+    default_path: Optional[str] = None
+    git: bool = False
+
+
+TOOL_POLICIES: Dict[str, ToolPolicy] = {
+    # Conteúdo
+    "markdown_summarizer": ToolPolicy(ToolEffect.PURE),
+    # Leitura
+    "ls": ToolPolicy(ToolEffect.READ_ONLY, ("path",), default_path="."),
+    "read_file": ToolPolicy(ToolEffect.READ_ONLY, ("path",)),
+    "glob": ToolPolicy(ToolEffect.READ_ONLY, default_path="."),
+    "grep": ToolPolicy(ToolEffect.READ_ONLY, ("path",), default_path="."),
+    "git_status": ToolPolicy(ToolEffect.READ_ONLY, ("cwd",), base="cwd", default_path=".", git=True),
+    "git_diff": ToolPolicy(ToolEffect.READ_ONLY, ("cwd",), base="cwd", default_path=".", git=True),
+    "git_log": ToolPolicy(ToolEffect.READ_ONLY, ("cwd",), base="cwd", default_path=".", git=True),
+    # Escrita
+    "write_file": ToolPolicy(ToolEffect.MUTATING, ("path",)),
+    "edit_file": ToolPolicy(ToolEffect.MUTATING, ("path",)),
+    "mkdir": ToolPolicy(ToolEffect.MUTATING, ("path",), base="cwd"),
+    "rm": ToolPolicy(ToolEffect.MUTATING, ("path",), base="cwd"),
+    "mv": ToolPolicy(ToolEffect.MUTATING, ("source", "dest"), base="cwd"),
+    "git_add": ToolPolicy(ToolEffect.MUTATING, ("cwd",), base="cwd", default_path=".", git=True),
+    "git_commit": ToolPolicy(ToolEffect.MUTATING, ("cwd",), base="cwd", default_path=".", git=True),
+    "git_stage_commit": ToolPolicy(ToolEffect.MUTATING, ("cwd",), base="cwd", default_path=".", git=True),
+    # Executam código arbitrário: invalidam tudo
+    "run_command": ToolPolicy(ToolEffect.MUTATING),
+    "run_python": ToolPolicy(ToolEffect.MUTATING),
+    "run_tests": ToolPolicy(ToolEffect.MUTATING),
+}
+
+# Ferramentas sem política são tratadas como mutantes (nunca em cache)
+_UNKNOWN_POLICY = ToolPolicy(ToolEffect.MUTATING)
+
+
+def get_tool_policy(tool_name: str) -> ToolPolicy:
+    """Política de uma ferramenta (mutante se desconhecida)."""
+    return TOOL_POLICIES.get(tool_name, _UNKNOWN_POLICY)
+
+
+@dataclass
+class _MemoEntry:
+    result: Any
+    paths: Tuple[str, ...]
+    stamps: Tuple[Any, ...]
+    git: bool
+
+
+class ToolRunMemo:
+    """
+    Cache de resultados de ferramentas válido durante uma execução de agente.
+
+    Example:
+        >>> memo = ToolRunMemo()
+        >>> tools = get_tools(AgentType.AUTONOMOUS, memo=memo)
+        >>> memo.stats()
+        {'hits': 0, 'misses': 0, 'invalidations': 0, 'entries': 0}
+    """
+
+    def __init__(self, max_entries: int = 256, base_path: Optional[Path] = None) -> None:
+        """
+        Args:
+            max_entries: Entradas mantidas (LRU)
+            base_path: Raiz dos caminhos das ferramentas de workspace
+                (padrão: BASE_PATH)
+        """
+        self.max_entries = max_entries
+        self.base_path = Path(base_path or BASE_PATH)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], _MemoEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def call(self, tool_name: str, args: Dict[str, Any], func: Callable[[], Any]) -> Any:
+        """
+        Executa ``func`` ou devolve o resultado memoizado.
+
+        Args:
+            tool_name: Nome da ferramenta (define a política)
+            args: Argumentos da chamada (já com defaults aplicados)
+            func: Chamada real da ferramenta
+        """
+        policy = get_tool_policy(tool_name)
+        if policy.effect == ToolEffect.MUTATING:
+            try:
+                return func()
+            finally:
+                # Mesmo com erro a ferramenta pode ter alterado algo
+                self._invalidate(policy, args)
+
+        key = (tool_name, _freeze(args))
+        paths = self._paths(policy, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamps == _stamps(entry.paths):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _record_lookup("exact_hit")
+                return entry.result
+        self.misses += 1
+        _record_lookup("miss")
+        # Carimbos antes da chamada: uma escrita concorrente invalida a entrada
+        stamps = _stamps(paths)
+        result = func()
+        with self._lock:
+            self._entries[key] = _MemoEntry(result, paths, stamps, policy.git)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def wrap(self, tool_name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Envolve a função de uma ferramenta com a memoização."""
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def memoized(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return self.call(tool_name, dict(bound.arguments), lambda: func(*args, **kwargs))
+
+        return memoized
+
+    def invalidate_all(self) -> None:
+        """Descarta todas as entradas."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
+
+    def _invalidate(self, policy: ToolPolicy, args: Dict[str, Any]) -> None:
+        paths = self._paths(policy, args)
+        if not paths:
+            self.invalidate_all()
+            return
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if (policy.git and entry.git) or _overlaps(entry.paths, paths)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def _paths(self, policy: ToolPolicy, args: Dict[str, Any]) -> Tuple[str, ...]:
+        base = self.base_path if policy.base == "workspace" else Path(os.getcwd())
+        values = [args.get(name) for name in policy.path_args]
+        values = [str(value) for value in values if value]
+        if not values and policy.default_path is not None:
+            values = [policy.default_path]
+        return tuple(os.path.realpath(os.path.join(base, value)) for value in values)
+
+
+def _freeze(value: Any) -> Any:
+    """Converte argumentos em chave hashable."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _stamps(paths: Sequence[str]) -> Tuple[Any, ...]:
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def _overlaps(first: Sequence[str], second: Sequence[str]) -> bool:
+    """True se algum caminho contém (ou é) algum caminho do outro lado."""
+    for a in first:
+        for b in second:
+            if a == b or a.startswith(b.rstrip(os.sep) + os.sep) or b.startswith(a.rstrip(os.sep) + os.sep):
+                return True
+    return False
+
+
+def _record_lookup(outcome: str) -> None:
+    if MonitoringManager.is_enabled():
+        MonitoringManager.get_instance().record_cache_lookup("tool_memo", outcome)
+
+
+def memoize_tools(tools: Sequence[BaseTool], memo: ToolRunMemo) -> List[BaseTool]:
+    """
+    Cópias das ferramentas cujas chamadas passam pelo ``memo``.
+
+    As ferramentas originais (compartilhadas entre agentes) não são alteradas.
+    """
+    wrapped: List[BaseTool] = []
+    for tool in tools:
+        func = getattr(tool, "func", None)
+        if func is None:
+            wrapped.append(tool)
+            continue
+        update = {"func": memo.wrap(tool.name, func)}
+        copy = tool.model_copy(update=update) if hasattr(tool, "model_copy") else tool.copy(update=update)
+        wrapped.append(copy)
+    return wrapped
+
+
 class ToolRegistry:
     FILE_SYSTEM: Sequence[BaseTool] = tuple(FILE_SYSTEM_TOOLS)
     SEARCH: Sequence[BaseTool] = tuple(SEARCH_TOOLS)
@@ -64,8 +339,9 @@ class ToolRegistry:
         return mapping[resolved]
 
     @classmethod
-    def get_tools(cls, agent_type: Union[AgentType, str]) -> List[BaseTool]:
-        return list(cls._tools_for(agent_type))
+    def get_tools(cls, agent_type: Union[AgentType, str], memo: Optional[ToolRunMemo] = None) -> List[BaseTool]:
+        tools = list(cls._tools_for(agent_type))
+        return memoize_tools(tools, memo) if memo is not None else tools
 
     @classmethod
     def get_tool_names(cls, agent_type: Union[AgentType, str]) -> List[str]:
@@ -97,8 +373,8 @@ class ToolRegistry:
         }
 
 
-def get_tools(agent_type: Union[AgentType, str]) -> List[BaseTool]:
-    return ToolRegistry.get_tools(agent_type)
+def get_tools(agent_type: Union[AgentType, str], memo: Optional[ToolRunMemo] = None) -> List[BaseTool]:
+    return ToolRegistry.get_tools(agent_type, memo=memo)
 
 
 def get_tools_for_agent_type(agent_type: Union[AgentType, str]) -> List[str]:
@@ -131,10 +407,16 @@ AGENT_TYPES = AgentType
 __all__ = [
     "AGENT_TYPES",
     "AgentType",
+    "TOOL_POLICIES",
+    "ToolEffect",
+    "ToolPolicy",
     "ToolRegistry",
+    "ToolRunMemo",
+    "get_tool_policy",
     "get_tools",
     "get_tools_for_agent",
     "get_tools_for_agent_type",
+    "memoize_tools",
     "validate_tool_name",
     "validate_tool_names",
 ]
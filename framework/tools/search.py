@@ -0,0 +1,463 @@
+"""
+Leitura paginada e busca em arquivos para as ferramentas de filesystem.
+
+Mantém memória e contexto limitados mesmo em repositórios grandes:
+
+- ``read_range``: leitura por faixa de bytes ou de linhas, com limite de
+  tamanho e corte em fronteira de caractere UTF-8
+- ``grep``: varredura via ``mmap`` (sem carregar o arquivo), com detecção
+  precoce de binários e limite de tamanho por arquivo
+- Resultados paginados: quando o limite é atingido, a resposta traz um
+  ``continuation_token`` opaco que retoma exatamente do ponto de parada
+
+Este módulo não depende de LangChain; ``framework.tools.builtin.filesystem``
+apenas o expõe como tools.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_BYTES = 256 * 1024
+DEFAULT_MAX_FILE_BYTES = 20 * 1024 * 1024
+DEFAULT_MAX_RESULTS = 200
+BINARY_SNIFF_BYTES = 8192
+MAX_LINE_CHARS = 500
+
+_LINE_SCAN_CHUNK = 1024 * 1024
+# Construções cujo significado em bytes difere do modo str linha a linha:
+# classes Unicode (\w, \b, ...), "." e classes negadas (casam um byte, não um
+# caractere, e atravessam "\n"), âncoras de fim ($, \Z, \A: "\r" e fim de
+# linha), escapes de código (\x, \u, \N, octal) e grupos especiais (?...)
+# exceto (?:...)
+_BYTES_UNSAFE_RE = re.compile(r"\\[wWbBdDsSAZxuUN0-7]|\.|\[\^|\$|\(\?(?!:)")
+# Com IGNORECASE, estas letras ASCII também casam caracteres não ASCII
+# (ſ, K de Kelvin, İ, ı), que a regex de bytes não encontra
+_CASEFOLD_UNSAFE_RE = re.compile(r"[iksIKS]")
+
+
+class InvalidContinuationTokenError(ValueError):
+    """Token de continuação malformado ou de outra consulta."""
+
+
+def encode_token(payload: Dict[str, Any]) -> str:
+    """Serializa o estado de paginação em um token opaco."""
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str, kind: str) -> Dict[str, Any]:
+    """
+    Lê um token gerado por ``encode_token``.
+
+    Raises:
+        InvalidContinuationTokenError: Se o token for inválido ou de outro tipo
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise InvalidContinuationTokenError(f"continuation_token inválido: {exc}") from exc
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise InvalidContinuationTokenError(
+            f"continuation_token não pertence a uma consulta '{kind}'"
+        )
+    return payload
+
+
+def is_binary(data: bytes) -> bool:
+    """Heurística do git: bytes nulos no início indicam arquivo binário."""
+    return b"\0" in data[:BINARY_SNIFF_BYTES]
+
+
+# =============================================================================
+# Leitura por faixa
+# =============================================================================
+
+
+@dataclass
+class ReadResult:
+    """Trecho lido de um arquivo."""
+
+    text: str
+    start_offset: int
+    end_offset: int
+    total_bytes: int
+    start_line: Optional[int] = None
+    next_token: Optional[str] = None
+
+    @property
+    def eof(self) -> bool:
+        return self.end_offset >= self.total_bytes
+
+    def render(self) -> str:
+        """Texto para o agente, com rodapé de paginação se houver mais conteúdo."""
+        if self.next_token is None:
+            return self.text
+        return (
+            f"{self.text}\n\n[... bytes {self.start_offset}-{self.end_offset} de {self.total_bytes}; "
+            f"continue com continuation_token={self.next_token}]"
+        )
+
+
+def read_range(
+    path: Path,
+    offset: int = 0,
+    length: Optional[int] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    max_bytes: int = DEFAULT_READ_BYTES,
+    continuation_token: Optional[str] = None,
+) -> ReadResult:
+    """
+    Lê parte de um arquivo UTF-8 sem carregá-lo inteiro.
+
+    Args:
+        path: Arquivo
+        offset: Byte inicial (ignorado se ``start_line`` for informado)
+        length: Quantidade de bytes a partir de ``offset``
+        start_line: Primeira linha (1-based, inclusive)
+        end_line: Última linha (inclusive)
+        max_bytes: Máximo de bytes por página
+        continuation_token: Token da página anterior (sobrepõe os demais)
+
+    Returns:
+        ReadResult (``next_token`` preenchido se a faixa não coube na página)
+    """
+    path = Path(path)
+    total = path.stat().st_size
+    limit: Optional[int] = None
+
+    if continuation_token:
+        state = decode_token(continuation_token, "read")
+        if state.get("p") != path.name:
+            raise InvalidContinuationTokenError("continuation_token pertence a outro arquivo")
+        offset, limit, start_line = state["o"], state.get("e"), None
+    elif length is not None:
+        limit = offset + length
+
+    if total == 0:
+        return ReadResult(text="", start_offset=0, end_offset=0, total_bytes=0, start_line=start_line)
+
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if start_line is not None:
+            offset = _offset_of_line(mm, start_line)
+            if end_line is not None:
+                limit = _offset_of_line(mm, end_line + 1)
+
+        start = _utf8_forward(mm, min(max(offset, 0), total))
+        end = min(limit if limit is not None else total, total, start + max_bytes)
+        if end < (limit if limit is not None else total):
+            # Página cheia: cortar na última quebra de linha, se houver
+            newline = mm.rfind(b"\n", start, end)
+            if newline >= start:
+                end = newline + 1
+        data = mm[start:end]
+
+    data = data[: _utf8_safe_length(data)]
+    end = start + len(data)
+    range_end = min(limit if limit is not None else total, total)
+    next_token = None
+    if end < range_end:
+        next_token = encode_token({"k": "read", "p": path.name, "o": end, "e": limit})
+
+    return ReadResult(
+        text=data.decode("utf-8", errors="replace"),
+        start_offset=start,
+        end_offset=end,
+        total_bytes=total,
+        start_line=start_line,
+        next_token=next_token,
+    )
+
+
+def _offset_of_line(mm: mmap.mmap, line: int) -> int:
+    """Offset do início da linha (1-based); tamanho do arquivo se não existir."""
+    if line <= 1:
+        return 0
+    remaining = line - 1
+    pos = 0
+    size = len(mm)
+    while pos < size:
+        chunk = mm[pos:pos + _LINE_SCAN_CHUNK]
+        count = chunk.count(b"\n")
+        if count < remaining:
+            remaining -= count
+            pos += len(chunk)
+            continue
+        index = -1
+        for _ in range(remaining):
+            index = chunk.find(b"\n", index + 1)
+        return pos + index + 1
+    return size
+
+
+def _utf8_forward(mm: mmap.mmap, offset: int) -> int:
+    """Avança o offset até o início de um caractere UTF-8."""
+    size = len(mm)
+    while offset < size and (mm[offset] & 0xC0) == 0x80:
+        offset += 1
+    return offset
+
+
+def _utf8_safe_length(data: bytes) -> int:
+    """Comprimento sem um caractere UTF-8 incompleto no final."""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            continue
+        if byte & 0x80 == 0:
+            return len(data)
+        needed = 2 if byte & 0xE0 == 0xC0 else 3 if byte & 0xF0 == 0xE0 else 4
+        return len(data) if back >= needed else len(data) - back
+    return len(data)
+
+
+# =============================================================================
+# Grep
+# =============================================================================
+
+
+@dataclass
+class GrepMatch:
+    """Linha que corresponde ao padrão."""
+
+    path: str
+    line_number: int
+    line: str
+
+    def render(self) -> str:
+        return f"{self.path}:{self.line_number}: {self.line}"
+
+
+@dataclass
+class GrepResult:
+    """Página de resultados de ``grep``."""
+
+    matches: List[GrepMatch] = field(default_factory=list)
+    files_scanned: int = 0
+    skipped_binary: int = 0
+    skipped_large: int = 0
+    next_token: Optional[str] = None
+
+    def render(self) -> str:
+        """Texto para o agente, com rodapé de paginação/arquivos ignorados."""
+        lines = [match.render() for match in self.matches]
+        notes = []
+        if self.skipped_binary:
+            notes.append(f"{self.skipped_binary} binários ignorados")
+        if self.skipped_large:
+            notes.append(f"{self.skipped_large} arquivos acima do limite de tamanho ignorados")
+        if self.next_token is not None:
+            notes.append(f"há mais resultados; continue com continuation_token={self.next_token}")
+        if notes:
+            lines.append(f"[... {'; '.join(notes)}]")
+        return "\n".join(lines)
+
+
+class _Pattern:
+    """
+    Regex de ``grep``, com busca direta nos bytes do mmap quando possível.
+
+    A regex de bytes só é usada se o padrão não tem construções que mudam de
+    significado fora do modo str (``_BYTES_UNSAFE_RE``), de modo que toda
+    linha com correspondência em str também é encontrada em bytes. Cada
+    linha candidata é confirmada com ``text_regex``, que é a referência.
+    """
+
+    def __init__(self, pattern: str, ignore_case: bool) -> None:
+        flags = re.IGNORECASE if ignore_case else 0
+        self.text_regex = re.compile(pattern, flags)
+        self.bytes_regex: Optional[re.Pattern] = None
+        if (
+            pattern.isascii()
+            and not _BYTES_UNSAFE_RE.search(pattern)
+            and not (ignore_case and _CASEFOLD_UNSAFE_RE.search(pattern))
+        ):
+            try:
+                self.bytes_regex = re.compile(pattern.encode("ascii"), flags | re.MULTILINE)
+            except re.error:
+                self.bytes_regex = None
+
+    def scan(self, mm: mmap.mmap, offset: int, line_number: int) -> Iterator[Tuple[int, int, int, str]]:
+        """
+        Itera sobre linhas com correspondência a partir de ``offset``.
+
+        Yields:
+            (número da linha, início da linha, fim da linha, texto da linha)
+        """
+        if self.bytes_regex is None:
+            yield from self._scan_lines(mm, offset, line_number)
+            return
+
+        pos = offset
+        size = len(mm)
+        while pos < size:
+            match = self.bytes_regex.search(mm, pos)
+            if match is None:
+                return
+            line_start = mm.rfind(b"\n", 0, match.start()) + 1
+            line_end = mm.find(b"\n", match.start())
+            if line_end < 0:
+                line_end = size
+            line_number += mm[pos:line_start].count(b"\n") if line_start > pos else 0
+            text = mm[line_start:line_end].rstrip(b"\r").decode("utf-8", errors="replace")
+            # Candidata: a correspondência em bytes pode atravessar linhas
+            if self.text_regex.search(text):
+                yield line_number, line_start, line_end, _truncate_line(text)
+            # Próxima busca a partir da linha seguinte (uma ocorrência por linha)
+            pos = line_end + 1
+            line_number += 1
+
+    def _scan_lines(self, mm: mmap.mmap, offset: int, line_number: int) -> Iterator[Tuple[int, int, int, str]]:
+        mm.seek(offset)
+        while True:
+            line_start = mm.tell()
+            raw = mm.readline()
+            if not raw:
+                return
+            text = _decode_line(raw.rstrip(b"\n"))
+            if self.text_regex.search(text):
+                yield line_number, line_start, line_start + len(raw.rstrip(b"\n")), text
+            line_number += 1
+
+
+def _decode_line(raw: bytes) -> str:
+    return _truncate_line(raw.rstrip(b"\r").decode("utf-8", errors="replace"))
+
+
+def _truncate_line(text: str) -> str:
+    if len(text) > MAX_LINE_CHARS:
+        return text[:MAX_LINE_CHARS] + "…"
+    return text
+
+
+def walk_order_key(relative: str) -> Tuple[Tuple[int, str], ...]:
+    """
+    Chave de ordenação do percurso (arquivos de uma pasta antes das subpastas,
+    ambos em ordem alfabética), usada para retomar buscas paginadas.
+    """
+    parts = relative.split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+
+def iter_files(root: Path) -> Iterator[Path]:
+    """Percorre a árvore em ``walk_order_key`` (arquivos antes de subpastas)."""
+    if root.is_file():
+        yield root
+        return
+    for current, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            yield Path(current) / name
+
+
+def grep(
+    pattern: str,
+    root: Path,
+    base: Optional[Path] = None,
+    max_results: int = DEFAULT_MAX_RESULTS,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    ignore_case: bool = False,
+    continuation_token: Optional[str] = None,
+    files: Optional[Iterator[Path]] = None,
+) -> GrepResult:
+    """
+    Busca uma regex nos arquivos de ``root`` (ou no próprio arquivo).
+
+    Args:
+        pattern: Expressão regular (sintaxe ``re``)
+        root: Pasta ou arquivo
+        base: Base dos caminhos exibidos (padrão: ``root``)
+        max_results: Máximo de linhas por página
+        max_file_bytes: Arquivos maiores são ignorados
+        ignore_case: Busca sem diferenciar maiúsculas/minúsculas
+        continuation_token: Token da página anterior
+        files: Iterador de arquivos já filtrado (padrão: ``iter_files(root)``)
+
+    Returns:
+        GrepResult (``next_token`` preenchido se houver mais resultados)
+    """
+    root = Path(root)
+    base = Path(base) if base is not None else (root if root.is_dir() else root.parent)
+    query = hashlib.sha1(f"{pattern}\0{ignore_case}\0{root}".encode("utf-8")).hexdigest()[:12]
+    matcher = _Pattern(pattern, ignore_case)
+
+    resume: Optional[Dict[str, Any]] = None
+    if continuation_token:
+        resume = decode_token(continuation_token, "grep")
+        if resume.get("q") != query:
+            raise InvalidContinuationTokenError("continuation_token pertence a outra busca")
+        resume_key = walk_order_key(resume["f"])
+
+    result = GrepResult()
+    for file_path in files if files is not None else iter_files(root):
+        relative = file_path.relative_to(base).as_posix()
+        offset, line_number = 0, 1
+        if resume is not None:
+            key = walk_order_key(relative)
+            if key < resume_key:
+                continue
+            if key == resume_key:
+                offset, line_number = resume["o"], resume["l"]
+            resume = None
+
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            continue
+        if size == 0 or offset >= size:
+            continue
+        if size > max_file_bytes:
+            result.skipped_large += 1
+            continue
+
+        try:
+            with open(file_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if is_binary(mm[:BINARY_SNIFF_BYTES]):
+                    result.skipped_binary += 1
+                    continue
+                result.files_scanned += 1
+                for number, _, line_end, text in matcher.scan(mm, offset, line_number):
+                    if len(result.matches) >= max_results:
+                        result.next_token = encode_token(
+                            {"k": "grep", "q": query, "f": relative, "o": _line_start(mm, line_end), "l": number}
+                        )
+                        return result
+                    result.matches.append(GrepMatch(relative, number, text))
+        except (OSError, ValueError) as exc:
+            logger.debug(f"grep: {file_path} ignorado ({exc})")
+            continue
+
+    return result
+
+
+def _line_start(mm: mmap.mmap, line_end: int) -> int:
+    return mm.rfind(b"\n", 0, line_end) + 1
+
+
+__all__ = [
+    "DEFAULT_MAX_FILE_BYTES",
+    "DEFAULT_MAX_RESULTS",
+    "DEFAULT_READ_BYTES",
+    "GrepMatch",
+    "GrepResult",
+    "InvalidContinuationTokenError",
+    "ReadResult",
+    "grep",
+    "is_binary",
+    "iter_files",
+    "read_range",
+    "walk_order_key",
+]
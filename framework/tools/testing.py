@@ -0,0 +1,576 @@
+"""
+Parallel pytest runs with structured, cached results for the test tool.
+
+``run_tests`` used to run the whole suite serially and hand the LLM raw
+pytest text. ``TestRunner``:
+
+- Expands the targets into units (test files or node ids) and splits them
+  into shards balanced by previous durations (file size on the first run).
+  Without targets it starts from the ``testpaths`` of the pytest config, and
+  directories are expanded with its ``python_files`` patterns
+- Runs each shard as its own pytest process, in parallel, with
+  ``--junitxml`` and bounded output capture
+- Parses the JUnit reports into ``TestCaseResult`` objects
+  (outcome, duration, failure message)
+- Caches each unit's results keyed by the hash of the unit's file, of the
+  pytest config, of the non-test files in the units' top-level directories
+  (conftest, helpers, data files), of every file of the root-level packages
+  they import (directly or through other imported packages) and of the
+  command; unchanged units are not rerun between agent steps. Files outside
+  those trees (run artifacts, scripts, docs) do not invalidate the cache
+
+The cache lives in ``<root>/.pytest_cache/agents/results.json``.
+
+Example:
+    >>> result = TestRunner("/repo").run(["tests"])
+    >>> result.failed, result.cached_units
+    (0, 12)
+    >>> print(result.render())
+"""
+
+from __future__ import annotations
+
+import configparser
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from framework.config import get_settings
+from framework.io.atomic import atomic_write_text
+from framework.tools.capture import OutputCapture, run_captured
+from framework.tools.walker import get_search_engine
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_RELATIVE_PATH = Path(".pytest_cache") / "agents" / "results.json"
+
+_FAILURE_CHARS = 1500
+
+DEFAULT_PYTHON_FILES = ("test_*.py", "*_test.py")
+
+# First file wins, as in pytest: (file name, section)
+_PYTEST_CONFIGS = (
+    ("pytest.ini", "pytest"),
+    (".pytest.ini", "pytest"),
+    ("pyproject.toml", "tool.pytest.ini_options"),
+    ("tox.ini", "pytest"),
+    ("setup.cfg", "tool:pytest"),
+)
+
+# Top-level name of ``import x.y`` / ``from x.y import z`` (absolute imports only)
+_IMPORT_RE = re.compile(
+    r"^[ \t]*(?:from[ \t]+([A-Za-z_]\w*)|import[ \t]+([A-Za-z_][\w., \t]*))", re.MULTILINE
+)
+
+
+def is_test_file(path: Path, patterns: Sequence[str] = DEFAULT_PYTHON_FILES) -> bool:
+    """Whether the file name matches pytest's ``python_files`` patterns."""
+    return path.suffix == ".py" and any(fnmatch.fnmatch(path.name, pattern) for pattern in patterns)
+
+
+def read_pytest_config(root: Union[str, Path]) -> Tuple[Optional[Path], Dict[str, List[str]]]:
+    """
+    Find the pytest config of ``root`` and read its list options.
+
+    Returns:
+        (config file or None, options such as ``testpaths`` and ``python_files``)
+    """
+    root = Path(root)
+    for name, section in _PYTEST_CONFIGS:
+        path = root / name
+        if not path.is_file():
+            continue
+        if name == "pyproject.toml":
+            if tomllib is None:
+                continue
+            try:
+                data = tomllib.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            options = data.get("tool", {}).get("pytest", {}).get("ini_options")
+            if options is None:
+                continue
+            return path, {
+                key: [value] if isinstance(value, str) else [str(item) for item in value]
+                for key, value in options.items()
+                if isinstance(value, (str, list))
+            }
+        parser = configparser.ConfigParser(interpolation=None)
+        try:
+            parser.read(path, encoding="utf-8")
+        except (OSError, configparser.Error):
+            continue
+        if parser.has_section(section):
+            return path, {key: value.split() for key, value in parser.items(section)}
+        if name.endswith("pytest.ini"):
+            return path, {}  # pytest.ini is the config even without a [pytest] section
+    return None, {}
+
+
+@dataclass
+class TestCaseResult:
+    """One test from a JUnit report."""
+
+    __test__ = False  # not a pytest test class
+
+    nodeid: str
+    outcome: str  # passed | failed | error | skipped
+    duration: float = 0.0
+    message: str = ""
+
+
+@dataclass
+class TestRunResult:
+    """Outcome of a ``TestRunner.run`` call."""
+
+    __test__ = False
+
+    cases: List[TestCaseResult] = field(default_factory=list)
+    duration: float = 0.0
+    workers: int = 1
+    units: int = 0
+    cached_units: int = 0
+    shard_errors: List[str] = field(default_factory=list)
+
+    def _count(self, outcome: str) -> int:
+        return sum(1 for case in self.cases if case.outcome == outcome)
+
+    @property
+    def passed(self) -> int:
+        return self._count("passed")
+
+    @property
+    def failed(self) -> int:
+        return self._count("failed")
+
+    @property
+    def errors(self) -> int:
+        return self._count("error") + len(self.shard_errors)
+
+    @property
+    def skipped(self) -> int:
+        return self._count("skipped")
+
+    @property
+    def ok(self) -> bool:
+        return not (self.failed or self.errors)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "duration": round(self.duration, 3),
+            "workers": self.workers,
+            "units": self.units,
+            "cached_units": self.cached_units,
+            "cases": [asdict(case) for case in self.cases],
+            "shard_errors": list(self.shard_errors),
+        }
+
+    def render(self, slowest: int = 5) -> str:
+        """Compact summary: totals, failures with messages, slowest tests."""
+        lines = [
+            f"{self.passed} passed, {self.failed} failed, {self.errors} errors, {self.skipped} skipped "
+            f"em {self.duration:.2f}s ({self.workers} workers, {self.cached_units}/{self.units} em cache)"
+        ]
+        for case in self.cases:
+            if case.outcome in ("failed", "error"):
+                lines.append(f"\n{case.outcome.upper()} {case.nodeid}\n{case.message}".rstrip())
+        for error in self.shard_errors:
+            lines.append(f"\nERROR\n{error}")
+        timed = sorted((c for c in self.cases if c.duration), key=lambda c: c.duration, reverse=True)
+        if timed[:slowest]:
+            lines.append("\nMais lentos:")
+            lines.extend(f"  {case.duration:.2f}s {case.nodeid}" for case in timed[:slowest])
+        return "\n".join(lines)
+
+
+class TestRunner:
+    """
+    Runs pytest units in parallel shards and caches results per unit.
+    """
+
+    __test__ = False
+
+    def __init__(
+        self,
+        root: Union[str, Path, None] = None,
+        workers: Optional[int] = None,
+        timeout: float = 120.0,
+        command: Optional[str] = None,
+        cache_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            root: Project root (pytest runs from here; default: current dir)
+            workers: Parallel pytest processes (default: ``AGENTS_TEST_WORKERS``,
+                0 = ``min(4, cpu_count)``)
+            timeout: Seconds per shard
+            command: pytest invocation (default: ``AGENTS_TEST_COMMAND``)
+            cache_path: Results cache (default: ``.pytest_cache/agents/results.json``)
+        """
+        settings = get_settings(validate=False)
+        self.root = Path(root or os.getcwd()).resolve()
+        configured = settings.test_workers if workers is None else workers
+        self.workers = configured if configured > 0 else min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.command = command or settings.test_command
+        self.cache_path = cache_path or self.root / CACHE_RELATIVE_PATH
+        self._hashes: Dict[Path, Tuple[int, int, str]] = {}
+        self._imports: Dict[Path, Tuple[int, int, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        targets: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> TestRunResult:
+        """
+        Run ``targets`` (files, directories or node ids; default: the
+        ``testpaths`` of the pytest config, or the root).
+
+        Args:
+            targets: pytest targets relative to the root
+            workers: Override the number of parallel processes
+            use_cache: Reuse results of unchanged units
+
+        Returns:
+            TestRunResult with the cases of every unit (cached or not)
+        """
+        started = time.monotonic()
+        with self._lock:
+            units = self.collect_units(targets or self.default_targets())
+            source_key = self._source_fingerprint(units)
+            cache = self._load_cache()
+            keys = {unit: self._unit_key(unit, source_key) for unit in units}
+
+            result = TestRunResult(units=len(units))
+            pending: List[str] = []
+            for unit in units:
+                entry = cache.get(unit)
+                if use_cache and entry and entry.get("key") == keys[unit]:
+                    result.cases.extend(TestCaseResult(**case) for case in entry["cases"])
+                    result.cached_units += 1
+                else:
+                    pending.append(unit)
+
+            shards = self._split(pending, cache, workers or self.workers)
+            result.workers = max(1, len(shards))
+            if shards:
+                with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="agents-pytest") as pool:
+                    outcomes = list(pool.map(self._run_shard, shards))
+                for shard, (cases, error) in zip(shards, outcomes):
+                    result.cases.extend(cases)
+                    if error is not None:
+                        if error:
+                            result.shard_errors.append(error)
+                        continue
+                    for unit, unit_cases in _group_by_unit(shard, cases).items():
+                        cache[unit] = {
+                            "key": keys[unit],
+                            "duration": sum(case.duration for case in unit_cases),
+                            "cases": [asdict(case) for case in unit_cases],
+                        }
+                self._save_cache(cache)
+
+            result.duration = time.monotonic() - started
+            return result
+
+    def default_targets(self) -> List[str]:
+        """Existing ``testpaths`` of the pytest config (globs expanded), or the root."""
+        _, options = read_pytest_config(self.root)
+        targets: List[str] = []
+        for entry in options.get("testpaths", []):
+            if any(char in entry for char in "*?["):
+                matches = sorted(self.root.glob(entry))
+            else:
+                matches = [self.root / entry]
+            targets.extend(self._relative(path) for path in matches if path.exists())
+        return targets or ["."]
+
+    def collect_units(self, targets: Iterable[str]) -> List[str]:
+        """Expand directories into test files (``python_files``); keep files and node ids."""
+        _, options = read_pytest_config(self.root)
+        patterns = options.get("python_files") or DEFAULT_PYTHON_FILES
+        units: List[str] = []
+        engine = get_search_engine()
+        for target in targets:
+            path_part = target.split("::", 1)[0]
+            path = (self.root / path_part).resolve()
+            if "::" in target or path.is_file():
+                units.append(self._relative(path) + target[len(path_part):])
+            elif path.is_dir():
+                for file_path in engine.walk(path, base=self.root):
+                    if is_test_file(file_path, patterns):
+                        units.append(self._relative(file_path))
+        return list(dict.fromkeys(units))
+
+    def clear_cache(self) -> None:
+        """Forget cached results."""
+        self.cache_path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _run_shard(self, units: List[str]) -> Tuple[List[TestCaseResult], Optional[str]]:
+        """Run one shard; the error is None when its results can be cached."""
+        with tempfile.TemporaryDirectory(prefix="agents-pytest-") as tmp:
+            report = Path(tmp) / "report.xml"
+            command = (
+                f"{self.command} -q -p no:cacheprovider --continue-on-collection-errors -o junit_family=xunit1 "
+                f"--junitxml={shlex.quote(str(report))} -- "
+                + " ".join(shlex.quote(unit) for unit in units)
+            )
+            try:
+                completed = run_captured(command, cwd=str(self.root), timeout=self.timeout, capture=OutputCapture(4096, 8192))
+            except subprocess.TimeoutExpired:
+                return [], f"timeout de {self.timeout:.0f}s: {' '.join(units)}"
+            cases = parse_junit_report(report, self.root) if report.exists() else []
+            # 0 = ok, 1 = failures, 5 = nothing collected
+            if completed.returncode not in (0, 1, 5) or (completed.returncode == 1 and not cases):
+                return cases, f"pytest saiu com código {completed.returncode}: {' '.join(units)}\n{completed.output()}"
+            if any(case.outcome == "error" and "::" not in case.nodeid for case in cases):
+                return cases, ""  # collection errors: reported as cases, never cached
+            return cases, None
+
+    def _split(self, units: List[str], cache: Dict[str, dict], workers: int) -> List[List[str]]:
+        """Longest-processing-time-first assignment of units to shards."""
+        if not units:
+            return []
+        count = max(1, min(workers, len(units)))
+
+        def weight(unit: str) -> float:
+            previous = cache.get(unit, {}).get("duration")
+            if previous is not None:
+                return float(previous)
+            try:
+                # ~1s per 10 KB of test code when there is no history
+                return (self.root / unit.split("::", 1)[0]).stat().st_size / 10_000
+            except OSError:
+                return 0.0
+
+        shards: List[List[str]] = [[] for _ in range(count)]
+        loads = [0.0] * count
+        for unit in sorted(units, key=weight, reverse=True):
+            index = loads.index(min(loads))
+            shards[index].append(unit)
+            loads[index] += weight(unit) or 0.01
+        return [shard for shard in shards if shard]
+
+    def _unit_key(self, unit: str, source_key: str) -> str:
+        digest = hashlib.sha256()
+        for part in (self.command, source_key, unit, self._file_hash(self.root / unit.split("::", 1)[0])):
+            digest.update(part.encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+    def _source_fingerprint(self, units: Sequence[str]) -> str:
+        """
+        Hash of the files ``units`` may depend on besides their own file.
+
+        Covers the pytest config, the non-test files in the units' top-level
+        directories (conftest, helpers, data files) and every file of the
+        root-level packages or modules imported by them, followed through
+        the imports of those packages. A change there invalidates every
+        cached unit; anything else under the root (run artifacts, scripts,
+        docs) is ignored.
+        """
+        config_path, options = read_pytest_config(self.root)
+        patterns = options.get("python_files") or DEFAULT_PYTHON_FILES
+        engine = get_search_engine()
+        files = {config_path} if config_path is not None else set()
+        scan: List[Path] = []
+
+        def include_tree(path: Path, skip_tests: bool) -> None:
+            for file_path in engine.walk(path, base=self.root) if path.is_dir() else [path]:
+                if skip_tests and is_test_file(file_path, patterns):
+                    continue
+                files.add(file_path)
+                if file_path.suffix == ".py":
+                    scan.append(file_path)
+
+        conftest = self.root / "conftest.py"
+        if conftest.is_file():
+            include_tree(conftest, skip_tests=False)
+        seen_tops = set()
+        for unit in units:
+            path = self.root / unit.split("::", 1)[0]
+            scan.append(path)
+            top = path.relative_to(self.root).parts[0] if path.is_relative_to(self.root) else None
+            if top is not None and top not in seen_tops and (self.root / top).is_dir():
+                seen_tops.add(top)
+                include_tree(self.root / top, skip_tests=True)
+
+        seen_modules = set()
+        while scan:
+            for name in self._imported_names(scan.pop()):
+                if name in seen_modules:
+                    continue
+                seen_modules.add(name)
+                for candidate in (self.root / name, self.root / f"{name}.py"):
+                    if candidate.exists() and candidate.name not in seen_tops:
+                        seen_tops.add(candidate.name)
+                        include_tree(candidate, skip_tests=False)
+
+        digest = hashlib.sha256()
+        for path in sorted(files, key=self._relative):
+            digest.update(f"{self._relative(path)}\0{self._file_hash(path)}\0".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _imported_names(self, path: Path) -> Tuple[str, ...]:
+        """Top-level modules imported by a Python file, recomputed only when it changes."""
+        try:
+            stat = path.stat()
+            known = self._imports.get(path)
+            if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                return known[2]
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return ()
+        names = []
+        for from_name, import_list in _IMPORT_RE.findall(text):
+            if from_name:
+                names.append(from_name)
+            else:
+                parts = (part.strip() for part in import_list.split(","))
+                names.extend(part.split(".")[0].split()[0] for part in parts if part)
+        value = tuple(dict.fromkeys(names))
+        self._imports[path] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    def _file_hash(self, path: Path) -> str:
+        """Content hash, recomputed only when size or mtime change."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return "missing"
+        known = self._hashes.get(path)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        value = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _load_cache(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, dict]) -> None:
+        try:
+            atomic_write_text(self.cache_path, json.dumps(cache, ensure_ascii=False))
+        except OSError as e:
+            logger.warning(f"Falha ao salvar cache de testes {self.cache_path}: {e}")
+
+
+def parse_junit_report(path: Union[str, Path], root: Union[str, Path, None] = None) -> List[TestCaseResult]:
+    """
+    Parse a pytest JUnit XML report (``junit_family=xunit1``).
+
+    Node ids are rebuilt from the ``file``/``classname``/``name`` attributes.
+    """
+    root_path = Path(root).resolve() if root is not None else None
+    cases: List[TestCaseResult] = []
+    for element in ET.parse(path).getroot().iter("testcase"):
+        name = element.get("name", "")
+        classname = element.get("classname", "")
+        file_name = element.get("file") or classname.replace(".", "/") + ".py"
+        if root_path is not None and os.path.isabs(file_name):
+            try:
+                file_name = Path(file_name).relative_to(root_path).as_posix()
+            except ValueError:
+                pass
+        module = file_name[:-3].replace("/", ".") if file_name.endswith(".py") else file_name
+        class_part = classname[len(module) + 1 :] if classname.startswith(module + ".") else ""
+        if not classname:
+            # Collection error: reported against the module itself
+            nodeid = file_name
+        else:
+            nodeid = "::".join(part for part in (file_name, class_part.replace(".", "::"), name) if part)
+
+        outcome, message = "passed", ""
+        for tag in ("failure", "error", "skipped"):
+            child = element.find(tag)
+            if child is not None:
+                outcome = {"failure": "failed"}.get(tag, tag)
+                text = (child.text or "").strip() or child.get("message", "")
+                message = text[-_FAILURE_CHARS:]
+                break
+        cases.append(TestCaseResult(nodeid, outcome, float(element.get("time") or 0.0), message))
+    return cases
+
+
+_runners: Dict[Path, TestRunner] = {}
+_runners_guard = threading.Lock()
+
+
+def get_test_runner(root: Union[str, Path, None] = None) -> TestRunner:
+    """Shared runner of a project root (keeps the file-hash memo warm)."""
+    key = Path(root or os.getcwd()).resolve()
+    with _runners_guard:
+        runner = _runners.get(key)
+        if runner is None:
+            runner = _runners[key] = TestRunner(key)
+        return runner
+
+
+def _group_by_unit(units: List[str], cases: List[TestCaseResult]) -> Dict[str, List[TestCaseResult]]:
+    """Assign cases to the unit (file or node id) that produced them."""
+    grouped: Dict[str, List[TestCaseResult]] = {unit: [] for unit in units}
+    # Longest unit first so node ids win over their file
+    ordered = sorted(units, key=len, reverse=True)
+    for case in cases:
+        for unit in ordered:
+            if case.nodeid == unit or case.nodeid.startswith(unit + "::") or (
+                "::" not in unit and case.nodeid.split("::", 1)[0] == unit
+            ):
+                grouped[unit].append(case)
+                break
+    return grouped
+
+
+__all__ = [
+    "DEFAULT_PYTHON_FILES",
+    "TestCaseResult",
+    "TestRunResult",
+    "TestRunner",
+    "get_test_runner",
+    "is_test_file",
+    "parse_junit_report",
+    "read_pytest_config",
+]
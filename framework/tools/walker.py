@@ -0,0 +1,580 @@
+"""
+Percurso paralelo de diretórios com regras de ``.gitignore``.
+
+Base das ferramentas ``grep`` e ``glob``:
+
+- Ignora pastas de ferramentas (``.git``, ``.venv``, ``node_modules``,
+  ``__pycache__``, ...) e respeita os ``.gitignore`` da árvore, inclusive
+  os aninhados (negação ``!``, âncora ``/``, regras só de pasta e ``**``)
+- Lista diretórios com ``os.scandir`` em um pool de threads: as subpastas
+  são listadas antecipadamente, mas os caminhos saem na ordem de
+  ``walk_order_key`` (necessária para a paginação do ``grep``)
+- O consumidor pode parar a qualquer momento (limite de resultados); as
+  listagens pendentes são canceladas
+- ``DirectoryCache`` reaproveita listagens entre chamadas enquanto o mtime
+  da pasta não muda (criar, remover ou renomear entradas altera o mtime)
+
+Links simbólicos para pastas não são seguidos (evita ciclos).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .search import DEFAULT_MAX_RESULTS, GrepResult, grep
+
+logger = logging.getLogger(__name__)
+
+GITIGNORE_FILENAME = ".gitignore"
+
+DEFAULT_IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".eggs",
+        ".cas",
+    }
+)
+DEFAULT_IGNORED_SUFFIXES = (".pyc", ".pyo")
+
+DEFAULT_WALK_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Pastas alteradas há menos que isso não são cacheadas: outra alteração no
+# mesmo "tick" de mtime passaria despercebida (mesma ideia do "racy git")
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+# =============================================================================
+# Regras de ignore
+# =============================================================================
+
+
+def translate_glob(pattern: str) -> str:
+    """
+    Converte um glob no estilo git em regex (sem âncoras).
+
+    ``*`` e ``?`` não atravessam ``/``; ``**/`` casa zero ou mais pastas e
+    ``/**`` final casa todo o conteúdo da pasta.
+    """
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                if at_start and pattern.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) or pattern.startswith("[^", i) else i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+                continue
+        elif char == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """Uma linha de ``.gitignore`` já compilada."""
+
+    pattern: str
+    regex: "re.Pattern[str]"
+    negated: bool = False
+    dir_only: bool = False
+
+    def matches(self, relative: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.fullmatch(relative) is not None
+
+
+def parse_gitignore(text: str) -> Tuple[IgnoreRule, ...]:
+    """
+    Compila o conteúdo de um ``.gitignore``.
+
+    Padrões sem ``/`` (fora o final) casam em qualquer profundidade; os
+    demais são relativos à pasta do arquivo.
+    """
+    rules: List[IgnoreRule] = []
+    for raw in text.splitlines():
+        line = raw.rstrip("\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = translate_glob(line.lstrip("/"))
+        if not anchored:
+            body = "(?:.*/)?" + body
+        try:
+            regex = re.compile(body, re.DOTALL)
+        except re.error:
+            logger.debug(f"Regra de .gitignore inválida ignorada: {raw!r}")
+            continue
+        rules.append(IgnoreRule(raw, regex, negated, dir_only))
+    return tuple(rules)
+
+
+@dataclass(frozen=True)
+class IgnoreStack:
+    """
+    Regras ativas em uma pasta: as de cada ``.gitignore`` ancestral, da raiz
+    para a pasta. A última regra que casa decide (como no git).
+    """
+
+    layers: Tuple[Tuple[str, Tuple[IgnoreRule, ...]], ...] = ()
+
+    def push(self, base: str, rules: Tuple[IgnoreRule, ...]) -> IgnoreStack:
+        """Nova pilha com as regras de ``base/.gitignore`` no topo."""
+        if not rules:
+            return self
+        return IgnoreStack(self.layers + ((base, rules),))
+
+    def is_ignored(self, relative: str, is_dir: bool) -> bool:
+        """
+        Args:
+            relative: Caminho relativo à raiz do percurso (separador ``/``)
+            is_dir: Se o caminho é uma pasta
+        """
+        ignored = False
+        for base, rules in self.layers:
+            if base:
+                if not relative.startswith(base + "/"):
+                    continue
+                local = relative[len(base) + 1 :]
+            else:
+                local = relative
+            for rule in rules:
+                if rule.negated == ignored and rule.matches(local, is_dir):
+                    ignored = not rule.negated
+        return ignored
+
+
+# =============================================================================
+# Cache de listagens
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class DirEntry:
+    """Entrada de uma listagem (``is_dir`` não segue links simbólicos)."""
+
+    name: str
+    is_dir: bool
+    is_file: bool
+
+
+class DirectoryCache:
+    """
+    Listagens de diretório invalidadas pelo mtime da pasta.
+
+    Um ``stat`` por pasta substitui o ``scandir`` completo quando nada mudou.
+    Também guarda as regras de ``.gitignore`` já compiladas.
+    """
+
+    def __init__(self) -> None:
+        self._listings: Dict[str, Tuple[int, Tuple[DirEntry, ...]]] = {}
+        self._ignores: Dict[str, Tuple[int, int, Tuple[IgnoreRule, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def list(self, folder: str) -> Tuple[DirEntry, ...]:
+        """Entradas da pasta ordenadas por nome (vazio se inacessível)."""
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            return ()
+        with self._lock:
+            cached = self._listings.get(folder)
+            if cached is not None and cached[0] == mtime:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        entries: List[DirEntry] = []
+        try:
+            with os.scandir(folder) as iterator:
+                for entry in iterator:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        is_file = not is_dir and entry.is_file()
+                    except OSError:
+                        continue
+                    entries.append(DirEntry(entry.name, is_dir, is_file))
+        except OSError as exc:
+            logger.debug(f"Listagem de {folder} falhou: {exc}")
+            return ()
+        entries.sort(key=lambda item: item.name)
+        listing = tuple(entries)
+        if time.time_ns() - mtime >= _RACY_WINDOW_NS:
+            with self._lock:
+                self._listings[folder] = (mtime, listing)
+        return listing
+
+    def gitignore(self, path: str) -> Tuple[IgnoreRule, ...]:
+        """Regras compiladas de um ``.gitignore`` (invalidadas por mtime/tamanho)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return ()
+        with self._lock:
+            cached = self._ignores.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                return cached[2]
+        try:
+            with open(path, encoding="utf-8", errors="replace") as handle:
+                rules = parse_gitignore(handle.read())
+        except OSError:
+            return ()
+        with self._lock:
+            self._ignores[path] = (st.st_mtime_ns, st.st_size, rules)
+        return rules
+
+    def clear(self) -> None:
+        """Descarta todas as listagens."""
+        with self._lock:
+            self._listings.clear()
+            self._ignores.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# =============================================================================
+# Percurso paralelo
+# =============================================================================
+
+
+@dataclass
+class _Listing:
+    files: List[str] = field(default_factory=list)
+    subdirs: List[Tuple[str, "Future[_Listing]"]] = field(default_factory=list)
+
+
+class _Walk:
+    """Estado de um percurso: pool, sinal de parada e regras."""
+
+    def __init__(self, engine: SearchEngine, include_ignored: bool, max_depth: Optional[int]) -> None:
+        self.engine = engine
+        self.include_ignored = include_ignored
+        self.max_depth = max_depth
+        self.stop = threading.Event()
+        self.pool = ThreadPoolExecutor(max_workers=engine.workers, thread_name_prefix="walk")
+
+    def submit(self, folder: str, relative: str, stack: IgnoreStack, depth: int) -> "Future[_Listing]":
+        return self.pool.submit(self.list, folder, relative, stack, depth)
+
+    def list(self, folder: str, relative: str, stack: IgnoreStack, depth: int) -> _Listing:
+        listing = _Listing()
+        if self.stop.is_set():
+            return listing
+        cache = self.engine.cache
+        entries = cache.list(folder)
+        if not self.include_ignored and any(e.name == GITIGNORE_FILENAME and e.is_file for e in entries):
+            stack = stack.push(relative, cache.gitignore(os.path.join(folder, GITIGNORE_FILENAME)))
+
+        descend = self.max_depth is None or depth < self.max_depth
+        for entry in entries:
+            child = f"{relative}/{entry.name}" if relative else entry.name
+            if entry.is_dir:
+                if not self.include_ignored and (
+                    entry.name in self.engine.ignored_dirs or stack.is_ignored(child, True)
+                ):
+                    continue
+                future: "Future[_Listing]"
+                if descend and not self.stop.is_set():
+                    future = self.submit(os.path.join(folder, entry.name), child, stack, depth + 1)
+                else:
+                    future = Future()
+                    future.set_result(_Listing())
+                listing.subdirs.append((entry.name, future))
+            elif entry.is_file:
+                if not self.include_ignored and (
+                    entry.name.endswith(DEFAULT_IGNORED_SUFFIXES) or stack.is_ignored(child, False)
+                ):
+                    continue
+                listing.files.append(entry.name)
+        return listing
+
+    def close(self) -> None:
+        self.stop.set()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class SearchEngine:
+    """
+    Percurso de arquivos compartilhado por ``grep`` e ``glob``.
+
+    Example:
+        >>> engine = SearchEngine()
+        >>> result = engine.grep("TODO", BASE_PATH / "framework", base=BASE_PATH)
+        >>> engine.glob("**/*.py", BASE_PATH, limit=50).paths[:3]
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+        cache: Optional[DirectoryCache] = None,
+    ) -> None:
+        """
+        Args:
+            workers: Threads de listagem (padrão: min(8, CPUs + 4))
+            ignored_dirs: Nomes de pastas sempre ignoradas
+            cache: Cache de listagens (padrão: um novo)
+        """
+        self.workers = max(1, workers or DEFAULT_WALK_WORKERS)
+        self.ignored_dirs = frozenset(ignored_dirs)
+        self.cache = cache or DirectoryCache()
+
+    def walk(
+        self,
+        root: Path,
+        base: Optional[Path] = None,
+        include_dirs: bool = False,
+        include_ignored: bool = False,
+        max_depth: Optional[int] = None,
+    ) -> Iterator[Path]:
+        """
+        Percorre ``root`` em ``walk_order_key``, respeitando as regras de ignore.
+
+        Fechar o iterador (ou abandoná-lo) cancela as listagens pendentes.
+
+        Args:
+            root: Pasta (ou arquivo) inicial
+            base: Raiz das regras de ``.gitignore`` (padrão: ``root``); os
+                ``.gitignore`` entre ``base`` e ``root`` também valem
+            include_dirs: Também produz as pastas (antes do seu conteúdo)
+            include_ignored: Desliga todas as regras de ignore
+            max_depth: Profundidade máxima abaixo de ``root`` (None = sem limite)
+        """
+        root = Path(root)
+        if root.is_file():
+            yield root
+            return
+        if not root.is_dir():
+            return
+        base = Path(base) if base is not None else root
+        try:
+            relative = root.relative_to(base).as_posix()
+        except ValueError:
+            base, relative = root, "."
+        relative = "" if relative == "." else relative
+
+        stack = IgnoreStack() if include_ignored else self._ancestor_rules(base, relative)
+        if stack is None:
+            return
+
+        walk = _Walk(self, include_ignored, max_depth)
+        try:
+            first = walk.submit(str(root), relative, stack, 1)
+            yield from self._emit(root, first, include_dirs)
+        finally:
+            walk.close()
+
+    def _emit(self, folder: Path, future: "Future[_Listing]", include_dirs: bool) -> Iterator[Path]:
+        listing = future.result()
+        for name in listing.files:
+            yield folder / name
+        for name, child in listing.subdirs:
+            if include_dirs:
+                yield folder / name
+            yield from self._emit(folder / name, child, include_dirs)
+
+    def _ancestor_rules(self, base: Path, relative: str) -> Optional[IgnoreStack]:
+        """Regras dos ``.gitignore`` de ``base`` até a pasta pai de ``root``.
+
+        Returns:
+            None se o próprio ``root`` estiver ignorado
+        """
+        stack = IgnoreStack()
+        if not relative:
+            return stack
+        parts = relative.split("/")
+        current = ""
+        folder = base
+        for part in parts:
+            stack = stack.push(current, self.cache.gitignore(str(folder / GITIGNORE_FILENAME)))
+            current = f"{current}/{part}" if current else part
+            folder = folder / part
+            if part in self.ignored_dirs or stack.is_ignored(current, True):
+                return None
+        return stack
+
+    def iter_files(self, root: Path, base: Optional[Path] = None) -> Iterator[Path]:
+        """Arquivos não ignorados de ``root`` (ver ``walk``)."""
+        return self.walk(root, base=base)
+
+    def grep(
+        self,
+        pattern: str,
+        root: Path,
+        base: Optional[Path] = None,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        ignore_case: bool = False,
+        continuation_token: Optional[str] = None,
+    ) -> GrepResult:
+        """``search.grep`` sobre os arquivos não ignorados de ``root``."""
+        files = self.walk(root, base=base)
+        try:
+            return grep(
+                pattern,
+                root,
+                base=base,
+                max_results=max_results,
+                ignore_case=ignore_case,
+                continuation_token=continuation_token,
+                files=files,
+            )
+        finally:
+            files.close()
+
+    def glob(
+        self,
+        pattern: str,
+        base: Path,
+        limit: int = DEFAULT_MAX_RESULTS,
+        include_ignored: bool = False,
+    ) -> GlobResult:
+        """
+        Caminhos (arquivos e pastas) relativos a ``base`` que casam com ``pattern``.
+
+        O percurso começa no prefixo literal do padrão (``drive/Ctx/**/*.MD``
+        percorre só ``drive/Ctx``) e, sem ``**``, não desce além da
+        profundidade do padrão.
+
+        Args:
+            pattern: Glob relativo a ``base`` (``*``, ``?``, ``[...]``, ``**``)
+            base: Raiz da busca
+            limit: Máximo de caminhos; o percurso para ao atingi-lo
+            include_ignored: Inclui caminhos ignorados
+        """
+        base = Path(base)
+        parts = [part for part in pattern.strip("/").split("/") if part not in ("", ".")]
+        literal: List[str] = []
+        for part in parts:
+            if any(char in part for char in "*?["):
+                break
+            literal.append(part)
+        remaining = parts[len(literal) :]
+        regex = re.compile(translate_glob("/".join(parts)), re.DOTALL)
+        max_depth = None if any("**" in part for part in remaining) else len(remaining)
+
+        result = GlobResult()
+        start = base.joinpath(*literal)
+        if not remaining:
+            if start.exists():
+                result.paths.append("/".join(literal))
+            return result
+
+        walker = self.walk(
+            start, base=base, include_dirs=True, include_ignored=include_ignored, max_depth=max_depth
+        )
+        try:
+            for path in walker:
+                relative = path.relative_to(base).as_posix()
+                if not regex.fullmatch(relative):
+                    continue
+                if len(result.paths) >= limit:
+                    result.truncated = True
+                    break
+                result.paths.append(relative)
+        finally:
+            walker.close()
+        result.paths.sort()
+        return result
+
+
+@dataclass
+class GlobResult:
+    """Resultado de ``SearchEngine.glob``."""
+
+    paths: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+    def render(self) -> str:
+        text = "\n".join(self.paths)
+        if self.truncated:
+            text += f"\n[... limite de {len(self.paths)} resultados atingido; refine o padrão]"
+        return text
+
+
+_default_engine: Optional[SearchEngine] = None
+_default_engine_guard = threading.Lock()
+
+
+def get_search_engine() -> SearchEngine:
+    """Retorna o motor de busca global (cache de listagens compartilhado)."""
+    global _default_engine
+    with _default_engine_guard:
+        if _default_engine is None:
+            _default_engine = SearchEngine()
+        return _default_engine
+
+
+def reset_search_cache() -> None:
+    """Descarta as listagens em cache do motor global."""
+    with _default_engine_guard:
+        if _default_engine is not None:
+            _default_engine.cache.clear()
+
+
+__all__ = [
+    "DEFAULT_IGNORED_DIRS",
+    "DirectoryCache",
+    "GlobResult",
+    "IgnoreRule",
+    "IgnoreStack",
+    "SearchEngine",
+    "get_search_engine",
+    "parse_gitignore",
+    "reset_search_cache",
+    "translate_glob",
+]
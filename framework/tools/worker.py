@@ -0,0 +1,429 @@
+"""
+Persistent shell worker for execution tools.
+
+``subprocess.run(..., shell=True)`` forks the (large) Python process and
+starts a new ``/bin/sh`` for every command. In autonomous loops that run
+dozens of short commands (``git status``, ``git diff``, ``pytest -q``) that
+overhead dominates. ``PersistentShellWorker`` keeps one long-lived
+``/bin/sh`` per thread and feeds it commands over stdin:
+
+- Each command runs as ``( cd -- <cwd> && eval <command> ) < /dev/null``
+  in a subshell, so ``cd``/``export``/``exit`` never leak into the worker and
+  commands cannot read the protocol stream
+- The subshell's stdout and stderr go to two FIFOs created for that command
+  only, so background jobs it leaves behind can never write into the result
+  of a later command. As with ``subprocess.run``, the call returns once
+  every writer (including such jobs) has closed them
+- The exit code is reported on the shell's own stdout after a per-command
+  random sentinel
+- Output is read incrementally into head/tail buffers (``capture``); a
+  timeout or the output kill limit kills the worker's process group and the
+  next call starts a fresh one (reset)
+- Without an explicit ``env`` the shell inherits ``os.environ``; the shell
+  is restarted when ``os.environ`` changes, so commands always see the
+  caller's current environment, like ``subprocess.run``
+- The shell starts under the sandbox profile (rlimits, nice, ionice), which
+  every command inherits; CPU time per command comes from the shell's
+  reaped-children counters (peak RSS is only known on the ``Popen`` path)
+
+The worker is opt-in (``AGENTS_SHELL_WORKER=true``). When it is disabled
+or cannot be used (no POSIX shell, failed start), ``run_shell_command`` falls
+back to ``capture.run_captured`` (one ``Popen`` per command, same bounded
+capture).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import secrets
+import selectors
+import shlex
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+from framework.config import get_settings
+from framework.security.sandbox import (
+    ResourceUsage,
+    SandboxProfile,
+    children_cpu_times,
+    get_sandbox_profile,
+)
+from framework.tools.capture import CommandResult, OutputCapture, run_captured
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHELL = "/bin/sh"
+DEFAULT_MAX_OUTPUT_BYTES = 64 * 1024
+DEFAULT_MAX_COMMANDS = 500
+
+_READ_CHUNK = 64 * 1024
+
+
+class WorkerUnavailableError(RuntimeError):
+    """The persistent worker cannot run commands (use the subprocess fallback)."""
+
+
+class _Collector:
+    """Feeds the shell's stdout into the capture while scanning for the sentinel."""
+
+    def __init__(self, marker: bytes, capture: OutputCapture, stream: str, needs_trailer: bool) -> None:
+        self.marker = marker
+        self.capture = capture
+        self.stream = stream
+        self.needs_trailer = needs_trailer
+        self.trailer = bytearray()
+        self.found = False
+        # Bytes held back because they may be the start of a split sentinel
+        self._carry = b""
+
+    @property
+    def done(self) -> bool:
+        return self.found and (not self.needs_trailer or b"\n" in self.trailer)
+
+    def feed(self, chunk: bytes) -> None:
+        if self.found:
+            self.trailer += chunk
+            return
+        pending = self._carry + chunk
+        index = pending.find(self.marker)
+        if index >= 0:
+            self.capture.write(self.stream, pending[:index])
+            self.trailer += pending[index + len(self.marker) :]
+            self._carry = b""
+            self.found = True
+            return
+        keep = len(self.marker) - 1
+        self.capture.write(self.stream, pending[:-keep])
+        self._carry = pending[-keep:]
+
+    def finish(self) -> None:
+        """Stream ended without a sentinel: keep what was held back."""
+        self.capture.write(self.stream, self._carry)
+        self._carry = b""
+        self.found = True
+
+
+class PersistentShellWorker:
+    """
+    Long-lived ``/bin/sh`` executing commands through a sentinel protocol.
+
+    Not thread-safe by design: use one worker per thread (see
+    ``get_shell_worker``); calls on the same worker are serialized.
+
+    Example:
+        >>> worker = PersistentShellWorker()
+        >>> worker.run("git status --short", cwd="/repo").stdout
+        ' M framework/io/workspace.py\\n'
+    """
+
+    def __init__(
+        self,
+        shell: str = DEFAULT_SHELL,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        max_commands: int = DEFAULT_MAX_COMMANDS,
+        env: Optional[Dict[str, str]] = None,
+        kill_after_bytes: int = 0,
+        profile: Optional[SandboxProfile] = None,
+    ) -> None:
+        """
+        Args:
+            shell: POSIX shell binary
+            max_output_bytes: Bytes retained per stream per command (half
+                from the start, half from the end of the output)
+            max_commands: Recycle the shell after this many commands
+            env: Environment of the shell (default: follow ``os.environ``)
+            kill_after_bytes: Total output that kills the command (0 = never)
+            profile: Sandbox profile of the shell (default: ``AGENTS_SANDBOX_PROFILE``)
+        """
+        self.shell = shell
+        self.max_output_bytes = max_output_bytes
+        self.kill_after_bytes = kill_after_bytes
+        self.max_commands = max_commands
+        self.env = env
+        self.profile = profile or get_sandbox_profile()
+        self.commands_run = 0
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._fifo_dir: Optional[str] = None
+        # os.environ when the shell started (None when ``env`` is explicit)
+        self._environ: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+        _live_workers.add(self)
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Start the shell (no-op if already running)."""
+        if self.alive:
+            return
+        if os.name != "posix" or not os.access(self.shell, os.X_OK) or not hasattr(os, "mkfifo"):
+            raise WorkerUnavailableError(f"Shell not available: {self.shell}")
+        try:
+            self._fifo_dir = tempfile.mkdtemp(prefix="agents-shell-")
+            self._environ = dict(os.environ) if self.env is None else None
+            self._process = subprocess.Popen(
+                [self.shell],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+                env=self.env,
+                start_new_session=True,
+                preexec_fn=self.profile.preexec_fn(),
+            )
+        except OSError as exc:
+            self._remove_fifo_dir()
+            raise WorkerUnavailableError(f"Failed to start {self.shell}: {exc}") from exc
+        self.commands_run = 0
+        logger.debug(f"Shell worker started (pid {self._process.pid})")
+
+    def reset(self) -> None:
+        """Kill the shell (and anything it started); the next call starts a new one."""
+        process, self._process = self._process, None
+        self._remove_fifo_dir()
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        process.wait()
+        self.restarts += 1
+
+    close = reset
+
+    def _remove_fifo_dir(self) -> None:
+        fifo_dir, self._fifo_dir = self._fifo_dir, None
+        if fifo_dir is not None:
+            shutil.rmtree(fifo_dir, ignore_errors=True)
+
+    def run(self, command: str, cwd: Optional[str] = None, timeout: float = 30.0) -> CommandResult:
+        """
+        Execute ``command`` in a subshell of the worker.
+
+        Args:
+            command: Shell command (already validated)
+            cwd: Working directory (default: current directory of the caller)
+            timeout: Seconds before the worker is killed and reset
+
+        Returns:
+            CommandResult (``timed_out`` set when the deadline expired,
+            ``output_limited`` when the output kill limit was reached)
+
+        Raises:
+            WorkerUnavailableError: If the shell cannot be started or died before
+                accepting the command
+        """
+        with self._lock:
+            if self.commands_run >= self.max_commands:
+                self.reset()
+            elif self._environ is not None and self._environ != os.environ:
+                # The shell's environment is fixed at start: follow os.environ
+                self.reset()
+            self.start()
+            return self._run_locked(command, cwd or os.getcwd(), timeout)
+
+    def _run_locked(self, command: str, cwd: str, timeout: float) -> CommandResult:
+        process = self._process
+        assert process is not None and process.stdin and process.stdout and self._fifo_dir
+        token = secrets.token_hex(8)
+        marker = f"__AGENTS_END_{token}__"
+        fifos = {name: os.path.join(self._fifo_dir, f"{token}.{name}") for name in ("stdout", "stderr")}
+        readers: Dict[int, str] = {}
+        writers: List[int] = []
+        try:
+            for name, path in fifos.items():
+                os.mkfifo(path, 0o600)
+                # Our own write end keeps the FIFO from reporting EOF before the
+                # subshell opens it; it is closed once the subshell has exited
+                readers[os.open(path, os.O_RDONLY | os.O_NONBLOCK)] = name
+                writers.append(os.open(path, os.O_WRONLY | os.O_NONBLOCK))
+            return self._run_command(process, command, cwd, timeout, marker, fifos, readers, writers)
+        finally:
+            for fd in [*readers, *writers]:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            for path in fifos.values():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _run_command(
+        self,
+        process: subprocess.Popen,
+        command: str,
+        cwd: str,
+        timeout: float,
+        marker: str,
+        fifos: Dict[str, str],
+        readers: Dict[int, str],
+        writers: List[int],
+    ) -> CommandResult:
+        script = (
+            f"( cd -- {shlex.quote(cwd)} && eval {shlex.quote(command)} ) < /dev/null"
+            f" > {shlex.quote(fifos['stdout'])} 2> {shlex.quote(fifos['stderr'])}\n"
+            f"__agents_rc=$?\n"
+            f"printf '\\n%s %s\\n' '{marker}' \"$__agents_rc\"\n"
+        )
+        cpu_before = children_cpu_times(process.pid)
+        try:
+            process.stdin.write(script.encode("utf-8"))
+        except (BrokenPipeError, OSError) as exc:
+            self.reset()
+            raise WorkerUnavailableError(f"Shell worker is not accepting commands: {exc}") from exc
+        self.commands_run += 1
+
+        head = self.max_output_bytes // 2
+        capture = OutputCapture(head, self.max_output_bytes - head, self.kill_after_bytes)
+        sentinel = _Collector(("\n" + marker).encode("ascii"), capture, "stdout", needs_trailer=True)
+        shell_stdout = process.stdout.fileno()
+        shell_stderr = process.stderr.fileno() if process.stderr else None
+        deadline = capture.started + timeout
+        returncode: Optional[int] = None
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(shell_stdout, selectors.EVENT_READ)
+            if shell_stderr is not None:
+                selector.register(shell_stderr, selectors.EVENT_READ)
+            for fd in readers:
+                selector.register(fd, selectors.EVENT_READ)
+            open_streams = set(readers)
+            while open_streams or not (sentinel.done or returncode is not None):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.reset()
+                    return CommandResult.from_capture(
+                        capture, -signal.SIGKILL, timed_out=True, usage=ResourceUsage()
+                    )
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, _READ_CHUNK)
+                    if key.fd in readers:
+                        if chunk:
+                            capture.write(readers[key.fd], chunk)
+                        else:
+                            selector.unregister(key.fd)
+                            open_streams.discard(key.fd)
+                    elif key.fd == shell_stderr:
+                        # Errors of the worker shell itself (not of the command)
+                        if chunk:
+                            capture.write("stderr", chunk)
+                        else:
+                            selector.unregister(key.fd)
+                    elif chunk:
+                        sentinel.feed(chunk)
+                    else:
+                        # Shell died mid-command (e.g. killed by the command):
+                        # kill whatever it left so the FIFOs reach EOF
+                        for fd in (shell_stdout, shell_stderr):
+                            if fd is not None and fd in selector.get_map():
+                                selector.unregister(fd)
+                        sentinel.finish()
+                        returncode = -1
+                        self.reset()
+                        break
+                if (sentinel.done or returncode is not None) and writers:
+                    # The subshell exited: EOF now only waits for jobs it
+                    # left running with the FIFOs still open
+                    for fd in writers:
+                        os.close(fd)
+                    writers.clear()
+                if capture.limit_exceeded:
+                    self.reset()
+                    return CommandResult.from_capture(capture, -signal.SIGKILL, usage=ResourceUsage())
+
+        if returncode is not None:
+            return CommandResult.from_capture(capture, returncode, usage=ResourceUsage())
+        try:
+            returncode = int(bytes(sentinel.trailer).split()[0])
+        except (IndexError, ValueError):
+            returncode = -1
+        usage = ResourceUsage()
+        cpu_after = children_cpu_times(process.pid)
+        if cpu_before is not None and cpu_after is not None:
+            usage.cpu_user_s = cpu_after[0] - cpu_before[0]
+            usage.cpu_system_s = cpu_after[1] - cpu_before[1]
+        return CommandResult.from_capture(capture, returncode, usage=usage)
+
+
+_live_workers: "weakref.WeakSet[PersistentShellWorker]" = weakref.WeakSet()
+_thread_workers = threading.local()
+
+
+def get_shell_worker() -> PersistentShellWorker:
+    """Worker of the calling thread (each agent thread gets its own shell)."""
+    worker = getattr(_thread_workers, "worker", None)
+    profile = get_sandbox_profile()
+    if worker is not None and worker.profile != profile:
+        # Limits are inherited from the shell: a new profile needs a new shell
+        worker.close()
+        worker = None
+    if worker is None:
+        settings = get_settings(validate=False)
+        worker = PersistentShellWorker(
+            max_output_bytes=settings.command_output_max_bytes,
+            kill_after_bytes=settings.command_output_kill_bytes,
+            profile=profile,
+        )
+        _thread_workers.worker = worker
+    return worker
+
+
+def shutdown_shell_workers() -> None:
+    """Terminate every persistent shell of the process."""
+    for worker in list(_live_workers):
+        worker.reset()
+
+
+atexit.register(shutdown_shell_workers)
+
+
+def run_shell_command(command: str, cwd: Optional[str] = None, timeout: float = 30.0) -> CommandResult:
+    """
+    Run a validated command on the thread's persistent worker, or on its own
+    process (``run_captured``) when the worker is disabled or unavailable.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeds ``timeout``
+    """
+    settings = get_settings(validate=False)
+    if settings.shell_worker_enabled:
+        try:
+            result = get_shell_worker().run(command, cwd=cwd, timeout=timeout)
+        except WorkerUnavailableError as exc:
+            logger.warning(f"Shell worker indisponível, usando subprocess: {exc}")
+        else:
+            if result.timed_out:
+                raise subprocess.TimeoutExpired(command, timeout, output=result.stdout, stderr=result.stderr)
+            return result
+    head = settings.command_output_max_bytes // 2
+    capture = OutputCapture(head, settings.command_output_max_bytes - head, settings.command_output_kill_bytes)
+    return run_captured(command, cwd=cwd, timeout=timeout, capture=capture)
+
+
+__all__ = [
+    "CommandResult",
+    "PersistentShellWorker",
+    "WorkerUnavailableError",
+    "get_shell_worker",
+    "run_shell_command",
+    "shutdown_shell_workers",
+]
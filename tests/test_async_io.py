@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from framework.core.context import AgentContext
+from framework.core.exceptions import FileOperationError
+from framework.io import KnowledgeLoader, ManifestStore, WorkspaceManager, run_io, run_sync
+
+
+class AsyncWorkspaceIOTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.base = Path(self.tmp_dir.name)
+        self.context = AgentContext(
+            context_name="Ctx",
+            context_description="",
+            strategy_name="ZeroUm",
+            base_path=self.base,
+        )
+        self.folder = self.base / "drive" / "Ctx" / "00-TestProcess"
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    async def test_run_io_uses_io_pool(self) -> None:
+        name = await run_io(lambda: threading.current_thread().name)
+
+        self.assertTrue(name.startswith("agents-io"))
+
+    async def test_concurrent_artifacts_get_unique_numbers(self) -> None:
+        manager = WorkspaceManager(self.context)
+
+        paths = await asyncio.gather(
+            *(manager.awrite_artifact(self.folder, f"parte {i}", str(i)) for i in range(8))
+        )
+
+        self.assertEqual(sorted(p.name[:3] for p in paths), [f"{i:02d}-" for i in range(1, 9)])
+        self.assertEqual(len(await manager.alist_artifacts(self.folder)), 8)
+        self.assertEqual(await manager.aread_artifact(paths[0]), "0")
+
+    async def test_errors_match_sync_semantics(self) -> None:
+        manager = WorkspaceManager(self.context)
+        store = ManifestStore(self.base / "_pipeline", index=None)
+
+        with self.assertRaises(FileNotFoundError):
+            await manager.aread_artifact(self.folder / "ausente.MD")
+        with self.assertRaises(FileNotFoundError):
+            await store.adelete("ausente-manifest.json")
+        with self.assertRaises(FileNotFoundError):
+            await store.aread("ausente-manifest.json")
+        (self.base / "_pipeline" / "quebrado-manifest.json").write_text("{", encoding="utf-8")
+        with self.assertRaises(FileOperationError):
+            await store.aread("quebrado-manifest.json")
+
+    async def test_manifest_roundtrip(self) -> None:
+        store = ManifestStore(self.base / "_pipeline", index=None)
+
+        await store.awrite("00-P-manifest.json", {"status": "completed"})
+
+        self.assertTrue(await store.aexists("00-P-manifest.json"))
+        self.assertEqual((await store.aread("00-P-manifest.json"))["status"], "completed")
+        self.assertEqual(await store.alist_manifests(), ["00-P-manifest.json"])
+
+    async def test_knowledge_files_keep_order(self) -> None:
+        (self.base / "a.MD").write_text("A", encoding="utf-8")
+        (self.base / "b.MD").write_text("B", encoding="utf-8")
+        loader = KnowledgeLoader(self.base)
+
+        files = {"b.MD": "Beta", "ausente.MD": None, "a.MD": "Alfa"}
+        content = await loader.aload_files(files)
+
+        self.assertEqual(content, loader.load_files(files))
+        self.assertLess(content.index("## Beta"), content.index("## Alfa"))
+
+
+class RunSyncTests(unittest.TestCase):
+    def test_without_running_loop(self) -> None:
+        self.assertEqual(run_sync(asyncio.sleep(0, result=42)), 42)
+
+    def test_inside_running_loop(self) -> None:
+        async def handler() -> int:
+            # Código síncrono chamado de dentro de um handler async
+            return run_sync(asyncio.sleep(0, result=7))
+
+        self.assertEqual(asyncio.run(handler()), 7)
+
+    def test_propagates_errors(self) -> None:
+        async def fail() -> None:
+            raise ValueError("falhou")
+
+        async def handler() -> None:
+            run_sync(fail())
+
+        with self.assertRaises(ValueError):
+            asyncio.run(handler())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from framework.core.context import AgentContext
+from framework.io import AtomicWriteTransaction, WorkspaceManager, atomic_write_text
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name) / "drive" / "Ctx" / "00-TestProcess"
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_failed_write_keeps_previous_content(self) -> None:
+        target = self.folder / "01-resumo.MD"
+        atomic_write_text(target, "versao 1")
+
+        with patch("framework.io.atomic.os.replace", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                atomic_write_text(target, "versao 2")
+
+        self.assertEqual(target.read_text(encoding="utf-8"), "versao 1")
+        self.assertEqual([p.name for p in self.folder.iterdir()], ["01-resumo.MD"])
+
+    def test_transaction_publishes_only_on_commit(self) -> None:
+        with AtomicWriteTransaction(durability="full") as tx:
+            tx.write_text(self.folder / "a.MD", "A")
+            tx.write_text(self.folder / "b.MD", "B")
+            self.assertEqual(sorted(p.name for p in self.folder.glob("*.MD")), [])
+
+        self.assertEqual((self.folder / "a.MD").read_text(encoding="utf-8"), "A")
+        self.assertEqual((self.folder / "b.MD").read_text(encoding="utf-8"), "B")
+
+    def test_workspace_transaction_numbers_pending_artifacts(self) -> None:
+        context = AgentContext(
+            context_name="Ctx",
+            context_description="",
+            strategy_name="ZeroUm",
+            base_path=Path(self.tmp_dir.name),
+        )
+        manager = WorkspaceManager(context)
+
+        with self.assertRaises(RuntimeError):
+            with manager.transaction():
+                manager.write_artifact(self.folder, "resumo", "x")
+                raise RuntimeError("etapa falhou")
+        self.assertEqual(manager.list_artifacts(self.folder), [])
+
+        with manager.transaction():
+            first = manager.write_artifact(self.folder, "resumo", "x")
+            second = manager.write_artifact(self.folder, "plano", "y")
+
+        # O número reservado pela transação abortada não é reutilizado
+        self.assertEqual(first.name, "02-resumo.MD")
+        self.assertEqual(second.name, "03-plano.MD")
+        self.assertTrue(second.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from framework.core.context import AgentContext
+from framework.io.archive import scan_sources
+from framework.io.cas import ContentStore
+from framework.io.workspace import WorkspaceManager
+
+
+class ContentStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.drive = Path(self.tmp_dir.name) / "drive"
+        self.cas = ContentStore.for_drive(self.drive)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _manager(self, context_name: str) -> WorkspaceManager:
+        context = AgentContext(
+            context_name=context_name,
+            context_description="",
+            strategy_name="ZeroUm",
+            base_path=Path(self.tmp_dir.name),
+        )
+        return WorkspaceManager(context, cas=self.cas)
+
+    def test_identical_artifacts_share_one_blob(self) -> None:
+        first = self._manager("Alpha")
+        second = self._manager("Beta")
+        a = first.write_artifact(first.context.workspace_root / "00-P", "resumo", "Não informado")
+        b = second.write_artifact(second.context.workspace_root / "00-P", "resumo", "Não informado")
+
+        self.assertEqual(a.read_text(encoding="utf-8"), "Não informado")
+        self.assertEqual(first.digest_of(a), second.digest_of(b))
+        self.assertEqual(self.cas.dedup_hits, 1)
+        self.assertEqual(len(list(self.cas.iter_blobs())), 1)
+        if self.cas.link_fallbacks == 0:
+            self.assertEqual(os.stat(a).st_ino, os.stat(b).st_ino)
+            self.assertTrue(ContentStore.is_shared(a))
+
+    def test_transaction_publishes_links_on_commit(self) -> None:
+        manager = self._manager("Alpha")
+        folder = manager.context.workspace_root / "00-P"
+        with manager.transaction():
+            target = manager.write_artifact(folder, "plano", "conteudo")
+            self.assertFalse(target.exists())
+        self.assertEqual(target.read_text(encoding="utf-8"), "conteudo")
+
+    def test_gc_removes_only_unreferenced_blobs(self) -> None:
+        manager = self._manager("Alpha")
+        folder = manager.context.workspace_root / "00-P"
+        kept = manager.write_artifact(folder, "mantido", "fica")
+        dropped = manager.write_artifact(folder, "removido", "sai")
+        if self.cas.link_fallbacks:
+            self.skipTest("Sistema de arquivos sem suporte a hardlink")
+        dropped.unlink()
+
+        self.assertEqual(self.cas.gc(grace_seconds=60).removed, 0)
+        result = self.cas.gc(grace_seconds=0)
+
+        self.assertEqual((result.scanned, result.removed), (2, 1))
+        self.assertTrue(self.cas.contains(manager.digest_of(kept)))
+        self.assertFalse(self.cas.contains(manager.digest_of(dropped)))
+
+    def test_cas_folder_is_not_packaged(self) -> None:
+        manager = self._manager("Alpha")
+        manager.write_artifact(manager.context.workspace_root, "resumo", "x")
+        self.assertEqual(list(scan_sources(self.drive)), ["Alpha/01-resumo.MD"])
+
+
+if __name__ == "__main__":
+    unittest.main()
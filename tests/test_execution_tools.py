@@ -4,14 +4,19 @@ Tests for execution tools.
 Tests security controls and tool functionality.
 """
 
+import threading
+import time
+
 import pytest
 from pathlib import Path
 
 from framework.security.controls import (
     SecurityConfig,
     CommandValidator,
+    FileRateLimitStore,
     PathValidator,
     RateLimiter,
+    split_shell_commands,
 )
 
 
@@ -88,6 +93,70 @@ class TestCommandValidator:
         assert audit_log[0]["action"] == "ALLOWED"
         assert audit_log[1]["action"] == "BLOCKED"
 
+    def test_chained_commands_are_validated_individually(self):
+        """Test that every command in a chain must be whitelisted."""
+        validator = CommandValidator()
+
+        assert validator.validate("git status && ls -la | wc -l")[0] is True
+        assert validator.validate("FOO=1 pytest -q > out.txt 2>&1")[0] is True
+        assert validator.validate("git status; rm x")[0] is False
+        assert validator.validate("ls\nrm x")[0] is False
+        assert validator.validate("(cd src && shred key)")[0] is False
+        assert validator.validate("git commit -m \"$(echo $(id))\"")[0] is False
+        assert validator.validate("cat `whoami`")[0] is False
+        assert validator.validate("git commit -m 'a; b && c'")[0] is True
+        assert validator.validate("git commit -m 'sem fim")[0] is False
+        assert validator.validate("ls `rm x")[0] is False
+
+    @pytest.mark.parametrize(
+        ("command", "inner"),
+        [
+            ("ls;(rm -rf x)", ["rm", "-rf", "x"]),
+            ("ls|(rm x)", ["rm", "x"]),
+            ("ls&&(rm x)", ["rm", "x"]),
+            ("cat <(rm x)", ["rm", "x"]),
+            ("cat >(rm x)", ["rm", "x"]),
+            ("ls;$(rm x)", ["rm", "x"]),
+            ("cat `rm x`", ["rm", "x"]),
+            ("ls;(python -c 1)", ["python", "-c", "1"]),
+        ],
+    )
+    def test_operators_without_spaces_split_commands(self, command, inner):
+        """Test glued operators and substitutions still yield separate commands."""
+        assert inner in split_shell_commands(command)
+        if inner[0] == "rm":
+            assert CommandValidator().validate(command)[0] is False
+
+    def test_redirections_do_not_split_commands(self):
+        """Test I/O redirections stay attached to their command."""
+        assert split_shell_commands("pytest -q 2>&1 >>log &>all") == [
+            ["pytest", "-q", "2", ">&", "1", ">>", "log", "&>", "all"]
+        ]
+
+    def test_verdicts_are_cached_but_audited(self):
+        """Test LRU verdict cache keeps auditing every call."""
+        validator = CommandValidator(cache_size=2)
+
+        for _ in range(3):
+            validator.validate("git status")
+        validator.validate("ls")
+        validator.validate("make")
+        validator.validate("git status")
+
+        assert validator.cache_hits == 2
+        assert validator.cache_misses == 4
+        assert len(validator.get_audit_log()) == 6
+
+    def test_reload_policy(self):
+        """Test policy changes apply after reload_policy."""
+        validator = CommandValidator()
+        validator.validate("terraform plan")
+
+        validator.config.allowed_commands.add("terraform")
+        validator.reload_policy()
+
+        assert validator.validate("terraform plan")[0] is True
+
 
 class TestPathValidator:
     """Tests for PathValidator."""
@@ -128,6 +197,79 @@ class TestPathValidator:
         assert is_safe is False
         assert "important" in reason.lower()
 
+    def test_root_is_blocked_only_exactly(self):
+        """Test that blocking '/' does not block every path."""
+        validator = PathValidator()
+
+        assert validator.validate("/")[0] is False
+        assert validator.validate("/etc")[0] is False
+        assert validator.validate("/tmp/x")[0] is True
+
+    def test_recursive_delete_of_project_root(self, tmp_path):
+        """Test project markers block recursive deletion."""
+        validator = PathValidator()
+        (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+
+        assert validator.validate_delete(str(tmp_path), recursive=True)[0] is False
+        assert validator.validate_delete(str(tmp_path / "pyproject.toml"))[0] is True
+
+    def test_symlink_retarget_is_honored(self, tmp_path):
+        """Test a path is re-resolved after its symlink changes."""
+        validator = PathValidator()
+        safe = tmp_path / "safe"
+        safe.mkdir()
+        (safe / "a.txt").write_text("", encoding="utf-8")
+        link = tmp_path / "link"
+        link.symlink_to(safe)
+
+        assert validator.validate(str(link / "a.txt"))[0] is True
+
+        link.unlink()
+        link.symlink_to("/etc")
+        is_safe, reason = validator.validate(str(link / "a.txt"))
+        assert is_safe is False
+        assert "blocked" in reason.lower()
+
+    def test_symlink_created_on_missing_component(self, tmp_path):
+        """Test a symlink created later on a missing component is honored."""
+        validator = PathValidator()
+        link = tmp_path / "link"
+
+        assert validator.validate(str(link / "passwd"))[0] is True
+        link.symlink_to("/etc")
+
+        is_safe, reason = validator.validate(str(link / "passwd"))
+        assert is_safe is False
+        assert "blocked" in reason.lower()
+
+    def test_directory_replaced_by_symlink(self, tmp_path):
+        """Test replacing a validated directory component with a symlink."""
+        validator = PathValidator()
+        directory = tmp_path / "dir"
+        directory.mkdir()
+        (directory / "passwd").write_text("", encoding="utf-8")
+
+        assert validator.validate(str(directory / "passwd"))[0] is True
+        (directory / "passwd").unlink()
+        directory.rmdir()
+        directory.symlink_to("/etc")
+
+        assert validator.validate(str(directory / "passwd"))[0] is False
+
+    def test_validate_many(self, tmp_path):
+        """Test batch validation."""
+        validator = PathValidator()
+
+        results = validator.validate_many(
+            [str(tmp_path / "a.txt"), "/etc/passwd", str(tmp_path)], operation="write"
+        )
+
+        assert results[str(tmp_path / "a.txt")][0] is True
+        assert results["/etc/passwd"][0] is False
+        assert results[str(tmp_path)][0] is False
+        with pytest.raises(ValueError):
+            validator.validate_many([], operation="chmod")
+
 
 class TestRateLimiter:
     """Tests for RateLimiter."""
@@ -175,6 +317,16 @@ class TestRateLimiter:
         # Should work again
         assert limiter.check_and_record("test") is True
 
+    def test_weighted_operations(self):
+        """Test operations with cost consume the budget proportionally."""
+        limiter = RateLimiter(max_per_minute=1000)
+
+        assert limiter.check_and_record("tokens", cost=600) is True
+        assert limiter.check_and_record("tokens", cost=600) is False
+        assert limiter.check_and_record("tokens", cost=400) is True
+        assert limiter.get_current_rate("tokens") == 1000
+        assert limiter.time_until_available("tokens", cost=1) > 0
+
     def test_different_operation_types(self):
         """Test different operation types have separate limits."""
         limiter = RateLimiter(max_per_minute=2)
@@ -188,6 +340,46 @@ class TestRateLimiter:
         # operation_b still has capacity
         assert limiter.check_and_record("operation_b") is True
 
+    def test_thread_safe_admission(self):
+        """Test concurrent callers never exceed the limit."""
+        limiter = RateLimiter(max_per_minute=100)
+        admitted = []
+
+        def worker():
+            admitted.extend(limiter.check_and_record("burst") for _ in range(50))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert admitted.count(True) == 100
+
+    def test_acquire_waits_for_capacity(self):
+        """Test blocking acquire reserves the next slot."""
+        limiter = RateLimiter(max_per_minute=600)  # one unit every 0.1s
+        for _ in range(600):
+            limiter.check_and_record("op")
+
+        assert limiter.acquire("op", timeout=0.01) is False
+        started = time.monotonic()
+        assert limiter.acquire("op", timeout=1.0) is True
+        assert 0.05 <= time.monotonic() - started < 1.0
+
+    def test_file_store_is_shared(self, tmp_path):
+        """Test limiters on the same file store share one budget."""
+        first = RateLimiter(max_per_minute=3, store=FileRateLimitStore(tmp_path))
+        second = RateLimiter(max_per_minute=3, store=FileRateLimitStore(tmp_path))
+
+        assert first.check_and_record("cmd") is True
+        assert second.check_and_record("cmd") is True
+        assert first.check_and_record("cmd") is True
+        assert second.check_and_record("cmd") is False
+
+        second.reset()
+        assert first.check_and_record("cmd") is True
+
 
 class TestExecutionTools:
     """Tests for execution tools."""
@@ -0,0 +1,127 @@
+"""
+Tests for the cached git repository handle used by the git tools.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from framework.tools.git import (
+    GitCommandError,
+    GitRepository,
+    find_repository_root,
+    mark_worktree_changed,
+    parse_porcelain_status,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+
+
+def _git(root, *args):
+    return subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.name", "Test")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    _git(tmp_path, "add", "a.txt")
+    _git(tmp_path, "commit", "-q", "-m", "Primeiro commit")
+    handle = GitRepository(tmp_path, backend="cli", status_ttl=60)
+    yield handle
+    handle.close()
+
+
+class TestParsePorcelainStatus:
+    """Tests for parse_porcelain_status."""
+
+    def test_parses_branch_changes_and_renames(self):
+        output = "## main...origin/main [ahead 1]\0M  a.py\0 M b.py\0R  new.py\0old.py\0?? c.py\0"
+
+        status = parse_porcelain_status(output)
+
+        assert status.branch == "main"
+        assert status.staged == [("M", "a.py"), ("R", "new.py")]
+        assert status.unstaged == [("M", "b.py")]
+        assert status.untracked == ["c.py"]
+
+
+class TestGitRepository:
+    """Tests for GitRepository (CLI backend)."""
+
+    def test_status_is_cached_until_worktree_changes(self, repo):
+        assert repo.status().clean
+        assert repo.status().clean
+        assert repo.status_hits == 1
+
+        (repo.root / "a.txt").write_text("b\n", encoding="utf-8")
+        assert repo.status().clean  # external write: still cached
+
+        mark_worktree_changed()
+        assert repo.status().render() == "## main\n M a.txt"
+
+    def test_stage_commit_and_log(self, repo):
+        (repo.root / "b.txt").write_text("b\n", encoding="utf-8")
+        mark_worktree_changed()
+        assert repo.status().untracked == ["b.txt"]
+
+        commit = repo.stage_commit(["b.txt"], "Adiciona b")
+
+        assert commit.summary == "Adiciona b"
+        assert commit.sha == _git(repo.root, "rev-parse", "HEAD").strip()
+        assert repo.status().clean
+        assert [c.summary for c in repo.log(5)] == ["Adiciona b", "Primeiro commit"]
+
+    def test_log_matches_git_with_merges(self, repo):
+        _git(repo.root, "checkout", "-q", "-b", "feature")
+        (repo.root / "f.txt").write_text("f\n", encoding="utf-8")
+        _git(repo.root, "add", "f.txt")
+        _git(repo.root, "commit", "-q", "-m", "Feature")
+        _git(repo.root, "checkout", "-q", "main")
+        (repo.root / "m.txt").write_text("m\n", encoding="utf-8")
+        _git(repo.root, "add", "m.txt")
+        _git(repo.root, "commit", "-q", "-m", "Main")
+        _git(repo.root, "merge", "-q", "--no-edit", "feature")
+
+        expected = _git(repo.root, "log", "--format=%H").split()
+
+        assert {c.sha for c in repo.log(10)} == set(expected)
+        assert repo.log(10)[0].sha == expected[0]
+
+    def test_show_reads_blob_at_revision(self, repo):
+        (repo.root / "a.txt").write_text("mudado\n", encoding="utf-8")
+
+        assert repo.show("a.txt") == "a\n"
+        assert repo.show("ausente.txt") is None
+
+    def test_commit_without_changes_raises(self, repo):
+        with pytest.raises(GitCommandError) as excinfo:
+            repo.commit("Nada")
+
+        assert "nothing to commit" in excinfo.value.result.output()
+
+    def test_paths_are_relative_to_cwd(self, repo):
+        sub = repo.root / "sub"
+        sub.mkdir()
+        (sub / "f.txt").write_text("f\n", encoding="utf-8")
+        _git(repo.root, "add", "sub/f.txt")
+        _git(repo.root, "commit", "-q", "-m", "Adiciona f")
+        (sub / "f.txt").write_text("mudado\n", encoding="utf-8")
+        (sub / "g.txt").write_text("g\n", encoding="utf-8")
+
+        assert "+mudado" in repo.diff("f.txt", cwd=str(sub))
+
+        repo.add(["f.txt"], cwd=str(sub))
+        assert repo.status().staged == [("M", "sub/f.txt")]
+
+        commit = repo.stage_commit(["g.txt"], "Adiciona g", cwd=str(sub))
+        assert commit.summary == "Adiciona g"
+        assert repo.status().clean
+
+    def test_find_repository_root(self, repo):
+        (repo.root / "sub").mkdir()
+
+        assert find_repository_root(repo.root / "sub") == repo.root
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+import unittest
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from framework.io import archive as archive_module
+from framework.io.archive import IncrementalArchiver, write_tar_zst
+from framework.io.sequence import SEQUENCE_FILENAME
+
+
+class IncrementalArchiverTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.source = Path(self.tmp_dir.name) / "drive" / "Ctx"
+        (self.source / "00-Process").mkdir(parents=True)
+        (self.source / "00-Process" / "01-resumo.MD").write_text("resumo " * 100, encoding="utf-8")
+        (self.source / "00-Process" / SEQUENCE_FILENAME).write_text("1\n", encoding="utf-8")
+        (self.source / "logo.png").write_bytes(b"\x89PNG" + os.urandom(256))
+        self.archive = self.source / "Ctx_outputs.zip"
+        self.archiver = IncrementalArchiver(durability="none")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _contents(self) -> dict:
+        with zipfile.ZipFile(self.archive) as zf:
+            self.assertIsNone(zf.testzip())
+            return {info.filename: (zf.read(info), info.compress_type) for info in zf.infolist()}
+
+    def test_first_run_builds_archive_without_internal_files(self) -> None:
+        stats = self.archiver.update(self.source, self.archive)
+
+        self.assertEqual(stats.mode, "rebuild")
+        contents = self._contents()
+        self.assertEqual(sorted(contents), ["00-Process/01-resumo.MD", "logo.png"])
+        self.assertEqual(contents["logo.png"][1], zipfile.ZIP_STORED)
+        self.assertEqual(contents["00-Process/01-resumo.MD"][1], zipfile.ZIP_DEFLATED)
+
+    def test_unchanged_run_does_not_touch_archive(self) -> None:
+        self.archiver.update(self.source, self.archive)
+        mtime = self.archive.stat().st_mtime_ns
+
+        stats = self.archiver.update(self.source, self.archive)
+
+        self.assertEqual(stats.mode, "unchanged")
+        self.assertEqual(stats.bytes_read, 0)
+        self.assertEqual(self.archive.stat().st_mtime_ns, mtime)
+
+    def test_appends_replaces_and_removes_entries(self) -> None:
+        self.archiver.update(self.source, self.archive)
+        (self.source / "00-Process" / "02-plano.MD").write_text("plano", encoding="utf-8")
+        (self.source / "00-Process" / "01-resumo.MD").write_text("resumo " * 120, encoding="utf-8")
+
+        stats = self.archiver.update(self.source, self.archive)
+        self.assertEqual(stats.mode, "append")
+        self.assertEqual((stats.added, stats.replaced, stats.unchanged), (1, 1, 1))
+        contents = self._contents()
+        self.assertEqual(contents["00-Process/01-resumo.MD"][0], ("resumo " * 120).encode())
+        self.assertEqual(len(contents), 3)
+
+        (self.source / "logo.png").unlink()
+        stats = self.archiver.update(self.source, self.archive)
+        self.assertEqual(stats.removed, 1)
+        self.assertNotIn("logo.png", self._contents())
+
+    def test_compacts_when_dead_space_exceeds_ratio(self) -> None:
+        archiver = IncrementalArchiver(durability="none", compaction_ratio=0.0)
+        archiver.update(self.source, self.archive)
+        (self.source / "logo.png").write_bytes(b"\x89PNG" + os.urandom(128))
+
+        stats = archiver.update(self.source, self.archive)
+
+        self.assertEqual(stats.mode, "compact")
+        self.assertEqual(len(self._contents()), 2)
+
+    def test_rebuilds_when_archive_modified_externally(self) -> None:
+        self.archiver.update(self.source, self.archive)
+        self.archive.write_bytes(b"corrompido")
+
+        stats = self.archiver.update(self.source, self.archive)
+
+        self.assertEqual(stats.mode, "rebuild")
+        self.assertEqual(len(self._contents()), 2)
+
+    def test_background_submit(self) -> None:
+        stats = self.archiver.submit(self.source, self.archive).result(timeout=10)
+        self.assertEqual(stats.added, 2)
+        self.assertTrue(self.archive.exists())
+
+
+class ParallelPackagingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.source = Path(self.tmp_dir.name) / "Ctx"
+        self.source.mkdir()
+        self.expected = {}
+        for i in range(6):
+            data = (f"linha {i} " * 5000).encode() + os.urandom(1024)
+            (self.source / f"{i:02d}-artefato.MD").write_bytes(data)
+            self.expected[f"{i:02d}-artefato.MD"] = data
+        (self.source / "foto.jpg").write_bytes(os.urandom(2048))
+        self.expected["foto.jpg"] = (self.source / "foto.jpg").read_bytes()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_parallel_deflate_produces_valid_zip(self) -> None:
+        archive = Path(self.tmp_dir.name) / "out.zip"
+        archiver = IncrementalArchiver(durability="none", workers=4, parallel_threshold=0)
+
+        stats = archiver.update(self.source, archive)
+
+        self.assertEqual(stats.workers, 4)
+        self.assertGreater(stats.throughput_mb_s, 0)
+        with zipfile.ZipFile(archive) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.namelist(), sorted(self.expected))
+            for name, data in self.expected.items():
+                self.assertEqual(zf.read(name), data)
+
+        # Atualização incremental sobre um ZIP montado em paralelo
+        (self.source / "07-novo.MD").write_text("novo " * 1000, encoding="utf-8")
+        stats = archiver.update(self.source, archive)
+        self.assertEqual((stats.mode, stats.added), ("append", 1))
+        with zipfile.ZipFile(archive) as zf:
+            self.assertIsNone(zf.testzip())
+
+    @unittest.skipIf(archive_module.zstandard is None, "zstandard não instalado")
+    def test_tar_zst_output(self) -> None:
+        import io
+        import tarfile
+
+        target = Path(self.tmp_dir.name) / "out.tar.zst"
+        stats = write_tar_zst(self.source, target, durability="none")
+
+        self.assertEqual(stats.added, len(self.expected))
+        with open(target, "rb") as handle:
+            reader = archive_module.zstandard.ZstdDecompressor().stream_reader(handle)
+            with tarfile.open(fileobj=io.BytesIO(reader.read()), mode="r") as tar:
+                self.assertEqual(sorted(tar.getnames()), sorted(self.expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the batch execution mode."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from framework.agents import base as agent_base
+from framework.agents.base import BaseAgent
+from framework.config import get_settings
+from framework.core.exceptions import BatchPendingError
+from framework.llm.batch import (
+    BatchRequest,
+    BatchSession,
+    LocalFileBatchBackend,
+    run_batch,
+)
+from framework.llm.factory import build_llm
+from framework.orchestration.graph import OrchestrationGraph
+
+
+def _echo(request: BatchRequest) -> str:
+    return "resp:" + request.body["messages"][-1]["content"]
+
+
+def _two_step_runner(item: str) -> str:
+    llm = build_llm({"model": "gpt-test"})
+    first = llm.invoke(f"etapa 1 {item}").content
+    return llm.invoke([("system", "fixo"), ("human", first)]).content
+
+
+def test_run_batch_resolves_dependent_calls_in_rounds(tmp_path: Path) -> None:
+    backend = LocalFileBatchBackend(tmp_path, responder=_echo)
+    session = BatchSession(tmp_path, backend)
+
+    report = run_batch(["a", "b", "a"], _two_step_runner, session, poll_interval=0)
+
+    assert report.results == {
+        0: "resp:resp:etapa 1 a",
+        1: "resp:resp:etapa 1 b",
+        2: "resp:resp:etapa 1 a",
+    }
+    assert report.rounds == 3
+    assert len(report.jobs) == 2
+    # Prompts idênticos entre itens são deduplicados
+    assert report.submitted_requests == 4
+
+
+def test_results_persist_between_sessions(tmp_path: Path) -> None:
+    calls: List[str] = []
+
+    def responder(request: BatchRequest) -> str:
+        calls.append(request.custom_id)
+        return "ok"
+
+    session = BatchSession(tmp_path, LocalFileBatchBackend(tmp_path, responder=responder))
+    run_batch(["x"], _two_step_runner, session, poll_interval=0)
+
+    resumed = BatchSession(tmp_path, LocalFileBatchBackend(tmp_path, responder=responder))
+    report = run_batch(["x"], _two_step_runner, resumed, poll_interval=0)
+
+    assert report.rounds == 1
+    assert report.results == {0: "ok"}
+    assert len(calls) == 2
+
+
+def test_invoke_without_result_enqueues_request(tmp_path: Path) -> None:
+    session = BatchSession(tmp_path, LocalFileBatchBackend(tmp_path))
+
+    with session.activate():
+        llm = build_llm({"model": "gpt-test", "temperature": 0.2})
+        with pytest.raises(BatchPendingError):
+            llm.invoke("pergunta")
+
+    (request,) = session.pending.values()
+    assert request.body["temperature"] == 0.2
+    assert request.body["messages"] == [{"role": "user", "content": "pergunta"}]
+
+
+def test_graph_logs_pending_batch_as_info(caplog: pytest.LogCaptureFixture) -> None:
+    def pending(state):
+        raise BatchPendingError("req-1")
+
+    graph = OrchestrationGraph.from_handlers({"pending": pending})
+
+    with caplog.at_level(logging.INFO, logger="framework.orchestration.graph"):
+        state = graph.execute(initial_state={})
+
+    assert isinstance(state["_error"], BatchPendingError)
+    assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
+
+
+def test_preflight_skips_throttle_in_batch_mode(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    throttled: List[int] = []
+    monkeypatch.setattr(agent_base, "throttle_tokens", lambda tokens, limit: throttled.append(tokens))
+    monkeypatch.setattr(get_settings(validate=False), "prompt_preflight", "warn")
+    agent = BaseAgent.__new__(BaseAgent)
+    agent.process_name = "00-Teste"
+    agent.llm = SimpleNamespace(model_name="gpt-test", max_tokens=256)
+
+    with BatchSession(tmp_path, LocalFileBatchBackend(tmp_path)).activate():
+        agent._prepare_payload("pergunta", enhance_with_knowledge=False)
+    assert throttled == []
+
+    agent._prepare_payload("pergunta", enhance_with_knowledge=False)
+    assert len(throttled) == 1
@@ -0,0 +1,111 @@
+"""
+Tests for bounded, streaming command output capture.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from framework.observability.monitoring import (
+    MonitoringManager,
+    _current_tool_call,
+    monitor_tool_call,
+)
+from framework.tools.capture import HeadTailBuffer, OutputCapture, run_captured
+from framework.tools.worker import run_shell_command
+
+requires_sh = pytest.mark.skipif(not os.access("/bin/sh", os.X_OK), reason="requires /bin/sh")
+
+
+class TestHeadTailBuffer:
+    """Tests for HeadTailBuffer."""
+
+    def test_small_output_is_kept_whole(self):
+        buffer = HeadTailBuffer(head_bytes=8, tail_bytes=8)
+        buffer.write(b"abc")
+        buffer.write(b"def")
+
+        assert buffer.text() == "abcdef"
+        assert buffer.dropped == 0
+
+    def test_keeps_first_and_last_bytes(self):
+        buffer = HeadTailBuffer(head_bytes=4, tail_bytes=4)
+        for index in range(100):
+            buffer.write(b"%03d" % index)
+
+        assert buffer.head() == b"0000"
+        assert buffer.tail() == b"8099"
+        assert buffer.total == 300
+        assert buffer.dropped == 292
+        assert buffer.text() == "0000\n[... 292 bytes omitidos ...]\n8099"
+
+    def test_memory_is_bounded(self):
+        buffer = HeadTailBuffer(head_bytes=16, tail_bytes=16)
+        for _ in range(1000):
+            buffer.write(b"x" * 100)
+
+        assert len(buffer._head) + len(buffer._tail) <= 16 + 2 * 16
+
+
+@requires_sh
+class TestRunCaptured:
+    """Tests for run_captured (Popen fallback)."""
+
+    def test_captures_both_streams(self, tmp_path):
+        result = run_captured("pwd; echo erro >&2; exit 2", cwd=str(tmp_path))
+
+        assert result.stdout == f"{tmp_path}\n"
+        assert result.stderr == "erro\n"
+        assert result.returncode == 2
+        assert result.via_worker is False
+
+    def test_output_limit_terminates_early(self):
+        capture = OutputCapture(head_bytes=64, tail_bytes=64, kill_after_bytes=256 * 1024)
+
+        result = run_captured("yes", timeout=10, capture=capture)
+
+        assert result.output_limited
+        assert result.stdout.startswith("y\ny\n")
+        assert result.stdout_dropped > 0
+
+    def test_timeout_raises(self):
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_captured("sleep 5", timeout=0.2)
+
+
+@requires_sh
+class TestMonitoringProgress:
+    """Output progress reaches the tool-call event."""
+
+    @pytest.fixture
+    def monitoring(self):
+        manager = MonitoringManager.get_instance()
+        manager.clear()
+        yield manager
+        manager.clear()
+
+    def test_progress_snapshot_while_running(self, monitoring):
+        token = _current_tool_call.set("call-1")
+        try:
+            capture = OutputCapture(head_bytes=8, tail_bytes=8)
+            capture.write("stdout", b"linha 1\nlinha 2\n")
+        finally:
+            _current_tool_call.reset(token)
+
+        snapshot = monitoring.get_active_tool_outputs()[0]
+        assert snapshot["call_id"] == "call-1"
+        assert snapshot["stdout_bytes"] == 16
+        assert snapshot["last_line"] == "linha 2"
+
+    def test_tool_call_event_includes_output_stats(self, monitoring):
+        @monitor_tool_call
+        def fake_tool() -> str:
+            return run_shell_command("printf abc; printf erro >&2").output()
+
+        fake_tool()
+
+        event = monitoring.get_events("tool_call")[-1]
+        assert event.performance["output"]["stdout_bytes"] == 3
+        assert event.performance["output"]["stderr_bytes"] == 4
+        assert monitoring.get_active_tool_outputs() == []
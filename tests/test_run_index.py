@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from framework.io.manifest import ManifestStore
+from framework.io.run_index import RunIndex
+
+
+class RunIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.drive = Path(self.tmp_dir.name) / "drive"
+        self.index = RunIndex(Path(self.tmp_dir.name) / "runs.sqlite")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _store(self, context: str) -> ManifestStore:
+        return ManifestStore(
+            base_folder=self.drive / context / "_pipeline",
+            index=self.index,
+            strategy_name="ZeroUm",
+        )
+
+    def test_write_updates_index(self) -> None:
+        store = self._store("Alpha")
+        store.write(
+            "00-Process-manifest.json",
+            {
+                "process": "00-Process",
+                "status": "completed",
+                "completed_at": datetime.now().isoformat(),
+                "metrics": {"total_tokens": 1200, "cost_usd": 0.02},
+                "artifacts": ["drive/Alpha/00-Process/01-resumo.MD"],
+            },
+        )
+
+        [record] = self.index.query_runs(context="Alpha")
+        self.assertEqual(record.strategy, "ZeroUm")
+        self.assertEqual(record.status, "completed")
+        self.assertEqual(record.total_tokens, 1200)
+        self.assertEqual(record.artifacts, ["drive/Alpha/00-Process/01-resumo.MD"])
+
+        # Reescrever o manifesto substitui a linha (sem duplicar)
+        store.write("00-Process-manifest.json", {"process": "00-Process", "status": "failed"})
+        self.assertEqual(len(self.index.query_runs()), 1)
+        self.assertEqual(self.index.query_runs()[0].artifacts, [])
+
+    def test_failed_runs_since_and_average_cost(self) -> None:
+        now = datetime.now()
+        old = (now - timedelta(days=30)).isoformat()
+        recent = (now - timedelta(days=1)).isoformat()
+        self._store("Alpha").write(
+            "a-manifest.json", {"process": "a", "status": "failed", "completed_at": old, "cost_usd": 0.1}
+        )
+        self._store("Beta").write(
+            "a-manifest.json", {"process": "a", "status": "failed", "completed_at": recent, "cost_usd": 0.3}
+        )
+        self._store("Beta").write(
+            "b-manifest.json", {"process": "b", "status": "completed", "completed_at": recent, "cost_usd": 1.0}
+        )
+
+        failed = self.index.failed_runs(since=now - timedelta(days=7))
+        self.assertEqual([r.context for r in failed], ["Beta"])
+
+        costs = self.index.average_cost_by_process()
+        self.assertEqual(costs["a"]["runs"], 2)
+        self.assertAlmostEqual(costs["a"]["avg_cost_usd"], 0.2)
+        self.assertAlmostEqual(costs["b"]["total_cost_usd"], 1.0)
+
+    def test_delete_and_rebuild(self) -> None:
+        store = self._store("Alpha")
+        store.write("a-manifest.json", {"process": "a", "status": "completed"})
+        store.write("b-manifest.json", {"process": "b", "status": "completed"})
+        store.delete("a-manifest.json")
+        self.assertEqual([r.process for r in self.index.query_runs()], ["b"])
+
+        self.assertEqual(self.index.rebuild(self.drive), 1)
+        [record] = self.index.query_runs()
+        self.assertEqual(record.context, "Alpha")
+
+    def test_index_failure_does_not_fail_delete(self) -> None:
+        store = self._store("Alpha")
+        path = store.write("a-manifest.json", {"process": "a", "status": "completed"})
+
+        def broken_remove(target: Path) -> None:
+            raise RuntimeError("database is locked")
+
+        self.index.remove = broken_remove  # type: ignore[method-assign]
+        with self.assertLogs("framework.io.manifest", level="WARNING"):
+            store.delete("a-manifest.json")
+        self.assertFalse(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
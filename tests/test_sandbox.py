@@ -0,0 +1,140 @@
+"""
+Tests for sandbox profiles and per-agent resource accounting.
+"""
+
+import os
+import resource
+import shlex
+import sys
+
+import pytest
+
+from framework.observability.monitoring import MonitoringManager, monitor_tool_call
+from framework.security.sandbox import (
+    ResourceUsage,
+    SandboxProfile,
+    agent_scope,
+    get_resource_accountant,
+    get_sandbox_profile,
+)
+from framework.tools.capture import run_captured
+from framework.tools.worker import PersistentShellWorker
+
+pytestmark = pytest.mark.skipif(not os.access("/bin/sh", os.X_OK), reason="requires /bin/sh")
+
+BURN_CPU = "python3 -c 'while True: pass'"
+
+
+@pytest.fixture(autouse=True)
+def clean_accounting():
+    get_resource_accountant().reset()
+    MonitoringManager.get_instance().clear()
+    yield
+    get_resource_accountant().reset()
+
+
+class TestSandboxProfile:
+    """Tests for SandboxProfile."""
+
+    def test_limits_and_priority_apply_to_commands(self):
+        profile = SandboxProfile(name="test", open_files=64, nice=3)
+
+        result = run_captured("ulimit -n; cut -d' ' -f19 /proc/self/stat", profile=profile)
+
+        limit, niceness = result.stdout.split()
+        assert limit == "64"
+        assert int(niceness) == os.nice(0) + 3
+
+    def test_cpu_limit_kills_runaway_command(self):
+        profile = SandboxProfile(name="cpu", cpu_seconds=1)
+
+        result = run_captured(BURN_CPU, timeout=20, profile=profile)
+
+        assert result.returncode != 0
+        assert result.resources["cpu_user_s"] + result.resources["cpu_system_s"] >= 0.9
+        assert "limite de CPU excedido" in result.output()
+
+    def test_limits_never_exceed_current_hard_limit(self):
+        _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard == resource.RLIM_INFINITY:
+            pytest.skip("no hard limit on open files")
+        profile = SandboxProfile(name="big", open_files=hard * 2)
+
+        assert run_captured("ulimit -n", profile=profile).stdout.strip() == str(hard)
+
+    def test_default_profile_keeps_address_space(self):
+        soft, _ = resource.getrlimit(resource.RLIMIT_AS)
+        expected = "unlimited" if soft == resource.RLIM_INFINITY else str(soft // 1024)
+
+        result = run_captured("ulimit -v", profile=get_sandbox_profile("default"))
+
+        assert get_sandbox_profile("default").address_space_bytes is None
+        assert result.stdout.strip() == expected
+
+    def test_default_profile_keeps_process_limit(self):
+        soft, _ = resource.getrlimit(resource.RLIMIT_NPROC)
+        command = f"{shlex.quote(sys.executable)} -c " + shlex.quote(
+            "import resource; print(resource.getrlimit(resource.RLIMIT_NPROC)[0])"
+        )
+
+        result = run_captured(command, profile=get_sandbox_profile("default"))
+
+        assert get_sandbox_profile("default").max_processes is None
+        assert get_sandbox_profile("strict").max_processes == 256
+        assert result.stdout.strip() == str(soft)
+
+    def test_unknown_profile(self):
+        with pytest.raises(KeyError):
+            get_sandbox_profile("inexistente")
+
+    def test_unrestricted_has_no_preexec(self):
+        assert get_sandbox_profile("unrestricted").preexec_fn() is None
+
+
+class TestResourceAccounting:
+    """Per-agent accounting and tool-call events."""
+
+    def test_popen_path_records_cpu_and_peak_rss(self):
+        with agent_scope("agente-a"):
+            result = run_captured("python3 -c 'x = bytearray(64 * 1024 * 1024)'")
+
+        usage = get_resource_accountant().usage("agente-a")
+        assert usage.commands == 1
+        assert usage.max_rss_kb >= 64 * 1024
+        assert result.resources["agent"] == "agente-a"
+
+    def test_worker_path_records_cpu(self):
+        worker = PersistentShellWorker(profile=get_sandbox_profile("unrestricted"))
+        try:
+            with agent_scope("agente-b"):
+                result = worker.run("python3 -c 'sum(range(3_000_000))'")
+        finally:
+            worker.close()
+
+        assert result.resources["cpu_user_s"] + result.resources["cpu_system_s"] > 0
+        assert get_resource_accountant().snapshot()["agente-b"]["commands"] == 1
+
+    def test_agents_are_accounted_separately(self):
+        accountant = get_resource_accountant()
+        with agent_scope("a"):
+            accountant.record(ResourceUsage(cpu_user_s=1.0, max_rss_kb=100))
+        with agent_scope("b"):
+            accountant.record(ResourceUsage(cpu_system_s=2.0, max_rss_kb=50))
+        accountant.record(ResourceUsage(cpu_user_s=0.5, max_rss_kb=300), agent="a")
+
+        snapshot = accountant.snapshot()
+        assert snapshot["a"]["cpu_s"] == 1.5
+        assert snapshot["a"]["max_rss_kb"] == 300
+        assert snapshot["b"]["commands"] == 1
+
+    def test_usage_is_attached_to_tool_call_event(self):
+        @monitor_tool_call
+        def fake_tool() -> str:
+            run_captured("true")
+            return run_captured("true").output()
+
+        fake_tool()
+
+        event = MonitoringManager.get_instance().get_events("tool_call")[-1]
+        assert event.performance["resources"]["commands"] == 2
+        assert event.performance["resources"]["agent"] == "default"
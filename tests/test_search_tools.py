@@ -0,0 +1,255 @@
+"""
+Tests for paginated reads and mmap-based grep.
+"""
+
+import os
+import re
+import time
+
+import pytest
+
+from framework.tools.search import (
+    InvalidContinuationTokenError,
+    grep,
+    read_range,
+    walk_order_key,
+)
+from framework.tools.walker import (
+    IgnoreStack,
+    SearchEngine,
+    parse_gitignore,
+    translate_glob,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text(
+        "import os\n\ndef ação():\n    return 'TODO: revisar'\n", encoding="utf-8"
+    )
+    (tmp_path / "src" / "blob.bin").write_bytes(b"TODO\0\x01\x02")
+    (tmp_path / "notes.md").write_text(
+        "".join(f"linha {i} TODO\n" for i in range(1, 11)), encoding="utf-8"
+    )
+    return tmp_path
+
+
+class TestReadRange:
+    """Tests for read_range."""
+
+    def test_small_file_is_returned_whole(self, repo):
+        result = read_range(repo / "src" / "app.py")
+
+        assert result.text == (repo / "src" / "app.py").read_text(encoding="utf-8")
+        assert result.next_token is None
+        assert result.render() == result.text
+
+    def test_line_range(self, repo):
+        result = read_range(repo / "notes.md", start_line=3, end_line=4)
+
+        assert result.text == "linha 3 TODO\nlinha 4 TODO\n"
+
+    def test_pagination_follows_continuation_token(self, repo):
+        path = repo / "notes.md"
+        chunks = []
+        result = read_range(path, max_bytes=40)
+        while True:
+            chunks.append(result.text)
+            assert result.text.endswith("\n")
+            if result.next_token is None:
+                break
+            result = read_range(path, max_bytes=40, continuation_token=result.next_token)
+
+        assert "".join(chunks) == path.read_text(encoding="utf-8")
+
+    def test_byte_range_never_splits_characters(self, repo):
+        path = repo / "src" / "app.py"
+        raw = path.read_bytes()
+        inside_char = raw.index("ç".encode("utf-8")) + 1
+
+        assert read_range(path, offset=0, length=inside_char).text.endswith("a")
+        assert read_range(path, offset=inside_char, length=4).text.startswith("ão")
+
+    def test_token_from_other_file_is_rejected(self, repo):
+        token = read_range(repo / "notes.md", max_bytes=40).next_token
+        with pytest.raises(InvalidContinuationTokenError):
+            read_range(repo / "src" / "app.py", continuation_token=token)
+
+
+class TestGrep:
+    """Tests for grep."""
+
+    def test_skips_binaries_and_reports_lines(self, repo):
+        result = grep("TODO", repo / "src", base=repo)
+
+        assert [m.render() for m in result.matches] == ["src/app.py:4:     return 'TODO: revisar'"]
+        assert result.skipped_binary == 1
+
+    def test_unicode_pattern_uses_text_matching(self, repo):
+        result = grep(r"def \w+\(", repo, ignore_case=True)
+
+        assert [(m.path, m.line_number) for m in result.matches] == [("src/app.py", 3)]
+
+    @pytest.mark.parametrize(
+        ("pattern", "line", "ignore_case"),
+        [
+            ("informa..o", "informação", False),
+            ("^CAF.$", "CAFÉ", False),
+            ("fim$", "linha com fim\r", False),
+            ("STRAS", "straße ſtraſſe", True),
+        ],
+    )
+    def test_matches_like_per_line_text_regex(self, tmp_path, pattern, line, ignore_case):
+        (tmp_path / "a.txt").write_bytes(f"antes\n{line}\ndepois\n".encode("utf-8"))
+
+        result = grep(pattern, tmp_path, ignore_case=ignore_case)
+
+        assert [m.line_number for m in result.matches] == [2]
+
+    @pytest.mark.parametrize("pattern", [r"foo[^x]*bar", r"foo[a-z ]*\s+fim", r"inicio\nfim"])
+    def test_match_never_spans_lines(self, tmp_path, pattern):
+        (tmp_path / "a.txt").write_text("foo inicio\nfim bar\nfoo e bar\n", encoding="utf-8")
+
+        result = grep(pattern, tmp_path)
+
+        assert [m.line_number for m in result.matches] == ([3] if "bar" in pattern else [])
+
+    def test_size_limit(self, repo):
+        result = grep("TODO", repo, max_file_bytes=16)
+
+        assert result.matches == []
+        assert result.skipped_large == 2
+
+    def test_paginates_with_continuation_token(self, repo):
+        seen = []
+        token = None
+        while True:
+            page = grep("TODO", repo, max_results=3, continuation_token=token)
+            seen.extend((m.path, m.line_number) for m in page.matches)
+            token = page.next_token
+            if token is None:
+                break
+
+        expected = [("notes.md", i) for i in range(1, 11)] + [("src/app.py", 4)]
+        assert seen == expected
+
+    def test_token_from_other_query_is_rejected(self, repo):
+        token = grep("TODO", repo, max_results=1).next_token
+        with pytest.raises(InvalidContinuationTokenError):
+            grep("linha", repo, continuation_token=token)
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        ".gitignore": "build/\n*.log\n!keep.log\n/top.txt\n",
+        "top.txt": "TODO raiz\n",
+        "app.py": "TODO app\n",
+        "debug.log": "TODO log\n",
+        "keep.log": "TODO keep\n",
+        "build/out.py": "TODO build\n",
+        ".venv/lib/site.py": "TODO venv\n",
+        "node_modules/pkg/index.js": "TODO node\n",
+        "pkg/__pycache__/mod.cpython.pyc": "TODO pyc\n",
+        "pkg/mod.py": "TODO mod\n",
+        "pkg/.gitignore": "gerado_*.py\n",
+        "pkg/gerado_x.py": "TODO gerado\n",
+        "pkg/sub/top.txt": "TODO sub\n",
+        "docs/a/b/guia.md": "TODO guia\n",
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return tmp_path
+
+
+class TestGitIgnore:
+    """Tests for .gitignore parsing."""
+
+    def test_rules(self):
+        stack = IgnoreStack().push("", parse_gitignore("*.log\n!keep.log\nbuild/\n/top.txt\ndocs/**/tmp\n"))
+
+        assert stack.is_ignored("a/debug.log", False)
+        assert not stack.is_ignored("keep.log", False)
+        assert stack.is_ignored("build", True)
+        assert not stack.is_ignored("build", False)
+        assert stack.is_ignored("top.txt", False)
+        assert not stack.is_ignored("sub/top.txt", False)
+        assert stack.is_ignored("docs/x/y/tmp", True)
+        assert stack.is_ignored("docs/tmp", True)
+
+    def test_translate_glob(self):
+        regex = re.compile(translate_glob("src/**/*.py"))
+
+        assert regex.fullmatch("src/a.py")
+        assert regex.fullmatch("src/x/y/a.py")
+        assert not regex.fullmatch("src/x/a.pyc")
+
+
+class TestSearchEngine:
+    """Tests for the gitignore-aware parallel walker."""
+
+    def test_walk_honors_ignore_rules(self, project):
+        engine = SearchEngine(workers=4)
+
+        found = [p.relative_to(project).as_posix() for p in engine.walk(project)]
+
+        assert found == [
+            ".gitignore",
+            "app.py",
+            "keep.log",
+            "docs/a/b/guia.md",
+            "pkg/.gitignore",
+            "pkg/mod.py",
+            "pkg/sub/top.txt",
+        ]
+        assert found == sorted(found, key=walk_order_key)
+
+    def test_nested_root_uses_ancestor_gitignore(self, project):
+        engine = SearchEngine()
+
+        assert list(engine.walk(project / "build", base=project)) == []
+        found = [p.name for p in engine.walk(project / "pkg", base=project)]
+        assert "gerado_x.py" not in found
+
+    def test_grep_skips_ignored_and_paginates(self, project):
+        engine = SearchEngine()
+
+        first = engine.grep("TODO", project, base=project, max_results=2)
+        second = engine.grep(
+            "TODO", project, base=project, max_results=10, continuation_token=first.next_token
+        )
+
+        paths = [m.path for m in first.matches + second.matches]
+        assert paths == ["app.py", "keep.log", "docs/a/b/guia.md", "pkg/mod.py", "pkg/sub/top.txt"]
+
+    def test_glob(self, project):
+        engine = SearchEngine()
+
+        assert engine.glob("**/*.py", project).paths == ["app.py", "pkg/mod.py"]
+        assert engine.glob("pkg/*", project).paths == ["pkg/.gitignore", "pkg/mod.py", "pkg/sub"]
+        assert engine.glob("*.log", project, include_ignored=True).paths == ["debug.log", "keep.log"]
+
+    def test_glob_stops_at_limit(self, project):
+        result = SearchEngine().glob("**/*", project, limit=3)
+
+        assert len(result.paths) == 3
+        assert result.truncated
+        assert "limite" in result.render()
+
+    def test_directory_cache_invalidated_by_mtime(self, project):
+        old = time.time() - 60
+        for folder in [project, *[p for p in project.rglob("*") if p.is_dir()]]:
+            os.utime(folder, (old, old))
+        engine = SearchEngine()
+
+        list(engine.walk(project))
+        misses = engine.cache.misses
+        list(engine.walk(project))
+        assert engine.cache.misses == misses
+        assert engine.cache.hits > 0
+
+        (project / "novo.py").write_text("TODO novo\n", encoding="utf-8")
+        assert "novo.py" in [p.name for p in engine.walk(project)]
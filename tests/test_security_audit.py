@@ -0,0 +1,92 @@
+"""
+Tests for the buffered, hash-chained audit log.
+"""
+
+import json
+
+from framework.security import AuditWriter, CommandValidator, SecurityConfig, verify_audit_log
+from framework.security.audit import close_audit_writers
+
+
+class TestAuditWriter:
+    """Tests for AuditWriter."""
+
+    def test_entries_are_chained_jsonl(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        writer = AuditWriter(path, flush_interval=10)
+        for i in range(5):
+            writer.write({"action": "ALLOWED", "command": f"ls {i}"})
+        assert writer.flush(timeout=5)
+
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [r["seq"] for r in records] == [1, 2, 3, 4, 5]
+        assert records[1]["prev"] == records[0]["hash"]
+        assert verify_audit_log(path).ok
+        writer.close()
+
+    def test_tampering_is_detected(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        writer = AuditWriter(path)
+        for i in range(3):
+            writer.write({"action": "BLOCKED", "command": f"rm {i}"})
+        writer.close()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        lines[1] = lines[1].replace("BLOCKED", "ALLOWED")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        result = verify_audit_log(path)
+        assert not result.ok
+        assert result.first_invalid_line == 2
+
+    def test_chain_survives_restart_and_rotation(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        writer = AuditWriter(path, max_bytes=400, backup_count=2)
+        for i in range(6):
+            writer.write({"action": "ALLOWED", "command": f"git log {i}"})
+        writer.close()
+        assert writer.rotations > 0
+
+        resumed = AuditWriter(path, max_bytes=0)
+        resumed.write({"action": "ALLOWED", "command": "git status"})
+        resumed.close()
+
+        backup = verify_audit_log(tmp_path / "audit.jsonl.1")
+        current = verify_audit_log(path, prev_hash=backup.last_hash)
+        assert backup.ok and current.ok
+        assert json.loads(path.read_text(encoding="utf-8").splitlines()[-1])["seq"] == 7
+
+
+class TestValidatorAudit:
+    """Tests for CommandValidator audit integration."""
+
+    def test_memory_tail_is_bounded(self):
+        validator = CommandValidator(SecurityConfig(audit_tail_size=3))
+        for i in range(10):
+            validator.validate(f"ls {i}")
+
+        log = validator.get_audit_log()
+        assert [entry["command"] for entry in log] == ["ls 7", "ls 8", "ls 9"]
+
+    def test_validator_writes_through_buffer(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        validator = CommandValidator(SecurityConfig(audit_log_path=path))
+        validator.validate("git status")
+        validator.validate("rm -rf /")
+        validator.flush_audit_log()
+
+        actions = [json.loads(line)["action"] for line in path.read_text(encoding="utf-8").splitlines()]
+        assert actions == ["ALLOWED", "BLOCKED"]
+        assert verify_audit_log(path).ok
+
+    def test_validator_reopens_closed_shared_writer(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        validator = CommandValidator(SecurityConfig(audit_log_path=path))
+        validator.validate("git status")
+        close_audit_writers()
+        validator.validate("ls")
+        validator.flush_audit_log()
+
+        commands = [json.loads(line)["command"] for line in path.read_text(encoding="utf-8").splitlines()]
+        assert commands == ["git status", "ls"]
+        assert verify_audit_log(path).ok
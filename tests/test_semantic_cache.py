@@ -0,0 +1,62 @@
+"""Tests for the semantic response cache."""
+
+from __future__ import annotations
+
+from framework.llm.semantic_cache import SemanticCache, hashed_ngram_embedding, normalize_text
+
+
+def test_exact_hit_ignores_case_accents_and_spacing() -> None:
+    cache = SemanticCache()
+    cache.store("Resumo do Produto  Ágil", "resposta", namespace="resumo")
+
+    assert cache.lookup("resumo do produto agil", namespace="resumo") == "resposta"
+    assert cache.stats.exact_hits == 1
+
+
+def test_near_duplicate_hits_above_threshold() -> None:
+    cache = SemanticCache(threshold=0.85)
+    cache.store(
+        "Plataforma de agendamento online para clínicas odontológicas de pequeno porte",
+        "resposta",
+        namespace="resumo",
+    )
+
+    hit = cache.lookup(
+        "Plataforma de agendamento online para clinicas odontologicas de pequeno porte.",
+        namespace="resumo",
+    )
+    miss = cache.lookup("Marketplace de peças automotivas usadas", namespace="resumo")
+
+    assert hit == "resposta"
+    assert miss is None
+    assert cache.stats.semantic_hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_near_duplicate_with_different_facts_misses() -> None:
+    cache = SemanticCache(threshold=0.85)
+    cache.store("Plano Basico da AgendaFacil por R$ 49 ao mes", "resposta", namespace="resumo")
+
+    assert cache.lookup("Plano Basico da AgendaPro por R$ 59 ao mes", namespace="resumo") is None
+    assert cache.stats.misses == 1
+
+
+def test_namespaces_are_isolated() -> None:
+    cache = SemanticCache()
+    cache.store("mesmo texto", "resposta", namespace="a")
+
+    assert cache.lookup("mesmo texto", namespace="b") is None
+
+
+def test_lru_eviction() -> None:
+    cache = SemanticCache(max_entries=2)
+    for i in range(3):
+        cache.store(f"texto {i}", str(i))
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_embedding_is_unit_length() -> None:
+    vector = hashed_ngram_embedding(normalize_text("Olá mundo"))
+    assert abs(sum(v * v for v in vector) - 1.0) < 1e-9
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import shutil
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from framework.io.sequence import SEQUENCE_FILENAME, SequenceAllocator
+
+
+class SequenceAllocatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name) / "drive" / "Ctx" / "00-TestProcess"
+        self.folder.mkdir(parents=True)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_initializes_from_existing_artifacts(self) -> None:
+        (self.folder / "03-resumo.MD").write_text("x", encoding="utf-8")
+        (self.folder / "notas.MD").write_text("x", encoding="utf-8")
+
+        allocator = SequenceAllocator()
+        self.assertEqual(allocator.allocate(self.folder), 4)
+        self.assertEqual((self.folder / SEQUENCE_FILENAME).read_text().strip(), "4")
+
+    def test_sequence_persists_across_allocators(self) -> None:
+        SequenceAllocator().allocate(self.folder)
+        self.assertEqual(SequenceAllocator().allocate(self.folder), 2)
+
+    def test_observe_skips_explicit_numbers(self) -> None:
+        allocator = SequenceAllocator()
+        allocator.observe(self.folder, 7)
+        allocator.observe(self.folder, 2)
+        self.assertEqual(allocator.allocate(self.folder), 8)
+
+    def test_recreated_folder_restarts_from_disk(self) -> None:
+        allocator = SequenceAllocator()
+        for _ in range(5):
+            allocator.allocate(self.folder)
+
+        shutil.rmtree(self.folder)
+        self.folder.mkdir()
+        (self.folder / "02-resumo.MD").write_text("x", encoding="utf-8")
+
+        self.assertEqual(allocator.allocate(self.folder), 3)
+
+    def test_concurrent_allocation_is_collision_free(self) -> None:
+        allocators = [SequenceAllocator(), SequenceAllocator()]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            numbers = list(pool.map(lambda i: allocators[i % 2].allocate(self.folder), range(200)))
+
+        self.assertEqual(sorted(numbers), list(range(1, 201)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for the persistent shell worker used by the execution tools.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from framework.config import get_settings
+from framework.tools.worker import PersistentShellWorker, run_shell_command, shutdown_shell_workers
+
+pytestmark = pytest.mark.skipif(not os.access("/bin/sh", os.X_OK), reason="requires /bin/sh")
+
+
+@pytest.fixture
+def worker():
+    worker = PersistentShellWorker(max_output_bytes=1024)
+    yield worker
+    worker.close()
+
+
+class TestPersistentShellWorker:
+    """Tests for PersistentShellWorker."""
+
+    def test_runs_commands_on_one_shell(self, worker, tmp_path):
+        (tmp_path / "a.txt").write_text("oi", encoding="utf-8")
+
+        first = worker.run("ls", cwd=str(tmp_path))
+        pid = worker._process.pid
+        second = worker.run("echo erro >&2; exit 3", cwd=str(tmp_path))
+
+        assert first.stdout == "a.txt\n"
+        assert first.returncode == 0
+        assert second.returncode == 3
+        assert second.stderr == "erro\n"
+        assert worker._process.pid == pid
+
+    def test_state_does_not_leak_between_commands(self, worker, tmp_path):
+        worker.run("cd / && export FOO=1", cwd=str(tmp_path))
+
+        result = worker.run('pwd; echo "[$FOO]"', cwd=str(tmp_path))
+
+        assert result.stdout == f"{tmp_path}\n[]\n"
+
+    def test_background_output_stays_with_its_command(self, worker):
+        result = worker.run("(sleep 0.3; echo late) & echo now")
+
+        assert result.stdout == "now\nlate\n"
+        assert worker.run("echo next").stdout == "next\n"
+
+    def test_commands_see_current_environment(self, worker, monkeypatch):
+        worker.run("true")
+        monkeypatch.setenv("AGENTS_WORKER_TEST", "1")
+
+        assert worker.run('echo "[$AGENTS_WORKER_TEST]"').stdout == "[1]\n"
+
+        monkeypatch.delenv("AGENTS_WORKER_TEST")
+        assert worker.run('echo "[$AGENTS_WORKER_TEST]"').stdout == "[]\n"
+
+    def test_shell_killed_by_command_does_not_hang(self, worker):
+        result = worker.run("echo antes; kill -9 $$", timeout=5)
+
+        assert result.returncode == -1
+        assert not result.timed_out
+        assert "antes" in result.stdout
+        assert worker.run("echo ok").stdout == "ok\n"
+
+    def test_output_without_trailing_newline_and_stdin(self, worker):
+        assert worker.run("printf abc").stdout == "abc"
+        assert worker.run("cat").stdout == ""
+
+    def test_syntax_error_does_not_hang(self, worker):
+        result = worker.run("echo 'sem fim", timeout=5)
+
+        assert result.returncode != 0
+        assert not result.timed_out
+        assert worker.run("echo ok").stdout == "ok\n"
+
+    def test_timeout_resets_worker(self, worker):
+        result = worker.run("sleep 5", timeout=0.2)
+
+        assert result.timed_out
+        assert not worker.alive
+        assert worker.run("echo ok").stdout == "ok\n"
+
+    def test_output_keeps_head_and_tail(self, worker):
+        result = worker.run("printf start; head -c 5000 /dev/zero | tr '\\0' x; printf end")
+
+        assert result.stdout.startswith("start")
+        assert result.stdout.endswith("end")
+        assert result.stdout_dropped == 5008 - 1024
+        assert f"[... {5008 - 1024} bytes omitidos ...]" in result.output()
+
+    def test_output_limit_kills_command(self, tmp_path):
+        worker = PersistentShellWorker(max_output_bytes=1024, kill_after_bytes=64 * 1024)
+        try:
+            result = worker.run("yes", timeout=10)
+        finally:
+            worker.close()
+
+        assert result.output_limited
+        assert not result.timed_out
+        assert result.stdout_dropped > 0
+        assert "limite de saída excedido" in result.output()
+
+
+class TestRunShellCommand:
+    """Tests for run_shell_command."""
+
+    def test_timeout_raises(self):
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_shell_command("sleep 5", timeout=0.2)
+
+    def test_subprocess_fallback(self, monkeypatch):
+        monkeypatch.setattr(get_settings(validate=False), "shell_worker_enabled", False)
+
+        result = run_shell_command("echo fallback")
+
+        assert result.stdout == "fallback\n"
+        assert result.via_worker is False
+
+    def test_worker_when_enabled(self, monkeypatch):
+        monkeypatch.setattr(get_settings(validate=False), "shell_worker_enabled", True)
+
+        try:
+            result = run_shell_command("echo worker")
+        finally:
+            shutdown_shell_workers()
+
+        assert result.stdout == "worker\n"
+        assert result.via_worker is True
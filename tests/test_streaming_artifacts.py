@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterator, List
+
+from framework.agents.base import BaseAgent
+from framework.config import get_settings
+from framework.core.exceptions import LLMResponseError
+from framework.io import StreamingArtifactWriter
+
+
+class StreamingArtifactWriterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name) / "drive" / "Ctx" / "00-TestProcess"
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_commit_publishes_streamed_chunks(self) -> None:
+        target = self.folder / "00-consolidado.MD"
+        with StreamingArtifactWriter(target) as writer:
+            writer.write("# Titulo\n")
+            writer.write("conteudo")
+            self.assertFalse(target.exists())
+
+        self.assertEqual(target.read_text(encoding="utf-8"), "# Titulo\nconteudo")
+        self.assertEqual(writer.chunks_written, 2)
+        self.assertEqual(list(self.folder.glob("*.part")), [])
+
+    def test_exception_discards_partial_file(self) -> None:
+        target = self.folder / "00-consolidado.MD"
+        with self.assertRaises(RuntimeError):
+            with StreamingArtifactWriter(target) as writer:
+                writer.write("parcial")
+                raise RuntimeError("stream interrompido")
+
+        self.assertFalse(target.exists())
+        self.assertEqual(list(self.folder.glob("*.part")), [])
+
+    def test_write_file_copies_with_cap_on_utf8_boundary(self) -> None:
+        source = Path(self.tmp_dir.name) / "origem.MD"
+        source.write_text("  ação ação  \n", encoding="utf-8")
+        target = self.folder / "00-consolidado.MD"
+
+        with StreamingArtifactWriter(target) as writer:
+            writer.write("# Titulo")
+            full = writer.write_file(source, strip=True, prefix="\n\n", chunk_size=3)
+            # 6 bytes = 2 espaços + "aç" + primeiro byte de "ã" (descartado)
+            capped = writer.write_file(source, max_bytes=6, strip=True, prefix="\n")
+
+        data = target.read_bytes()
+        self.assertEqual(data.decode("utf-8"), "# Titulo\n\nação ação\naç")
+        self.assertEqual(data[full.offset:full.offset + full.length].decode("utf-8"), "ação ação")
+        self.assertFalse(full.truncated)
+        self.assertTrue(capped.truncated)
+        self.assertEqual(capped.source_bytes, source.stat().st_size)
+
+    def test_write_file_skips_prefix_for_blank_source(self) -> None:
+        source = Path(self.tmp_dir.name) / "vazio.MD"
+        source.write_text(" \n\n", encoding="utf-8")
+        target = self.folder / "00-consolidado.MD"
+
+        with StreamingArtifactWriter(target) as writer:
+            result = writer.write_file(source, strip=True, prefix="\n\n")
+
+        self.assertIsNone(result.offset)
+        self.assertEqual(target.read_text(encoding="utf-8"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class _StreamingLLM:
+    def __init__(self, chunks: List[str]) -> None:
+        self.chunks = chunks
+
+    def stream(self, payload: object) -> Iterator[str]:
+        yield from self.chunks
+
+
+class StreamLLMToDocumentTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.agent = BaseAgent.__new__(BaseAgent)
+        self.agent.process_name = "00-TestProcess"
+        self.agent.strategy_name = "ZeroUm"
+        self.agent.process_dir = Path(self.tmp_dir.name) / "00-TestProcess"
+        self.agent.data_dir = self.agent.process_dir / "_DATA"
+        self.agent.process_dir.mkdir(parents=True)
+        settings = get_settings(validate=False)
+        self._preflight = settings.prompt_preflight
+        settings.prompt_preflight = "off"
+
+    def tearDown(self) -> None:
+        get_settings(validate=False).prompt_preflight = self._preflight
+        self.tmp_dir.cleanup()
+
+    def test_streams_stripped_document(self) -> None:
+        self.agent.llm = _StreamingLLM(["  \n# Titulo", "\nconteudo  ", " \n"])
+
+        path = self.agent.stream_llm_to_document("prompt", "00-doc.MD", enhance_with_knowledge=False)
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "# Titulo\nconteudo\n")
+
+    def test_empty_stream_writes_nothing(self) -> None:
+        self.agent.llm = _StreamingLLM(["", "  \n"])
+
+        with self.assertRaises(LLMResponseError):
+            self.agent.stream_llm_to_document("prompt", "00-doc.MD", enhance_with_knowledge=False)
+
+        self.assertEqual(list(self.agent.process_dir.iterdir()), [])
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import List, Tuple, Union
 
 import pytest
 
@@ -11,6 +11,7 @@ from business.strategies.zeroum.subagents.template_filler import (
     ProcessTemplateFiller,
     TemplateTask,
 )
+from framework.llm.semantic_cache import SemanticCache
 
 
 class _StubLLM:
@@ -22,7 +23,9 @@ class _StubLLM:
         def __init__(self, text: str) -> None:
             self.content = text
 
-    def invoke(self, prompt: str) -> "_StubLLM._Result":
+    def invoke(self, prompt: Union[str, List[Tuple[str, str]]]) -> "_StubLLM._Result":
+        if not isinstance(prompt, str):
+            prompt = "\n\n".join(content for _, content in prompt)
         self.prompts.append(prompt)
         return self._Result(self.response_text)
 
@@ -66,3 +69,87 @@ def test_fill_template_injects_context_in_prompt(tmp_path: Path) -> None:
 
     assert llm.prompts, "Esperava pelo menos uma chamada ao LLM"
     assert "Contexto relevante ABC" in llm.prompts[0]
+
+
+def test_prompt_prefix_is_stable_across_templates(tmp_path: Path) -> None:
+    first = ProcessTemplateFiller._build_prompt(
+        "Template A", "Contexto 1", TemplateTask(template="a.MD")
+    )
+    second = ProcessTemplateFiller._build_prompt(
+        "Template B", "Contexto 2", TemplateTask(template="b.MD", instructions="Outra")
+    )
+
+    assert first.prefix_fingerprint == second.prefix_fingerprint
+    assert "Contexto 1" not in first.prefix
+    role, system = first.to_messages()[0]
+    assert role == "system"
+    assert system == first.prefix
+
+
+def test_semantic_cache_reuses_fill_for_near_identical_context(tmp_path: Path) -> None:
+    llm = _StubLLM("Template preenchido")
+    filler = ProcessTemplateFiller(
+        process_code="00-ProblemHypothesisExpress",
+        output_dir=tmp_path,
+        llm=llm,
+        semantic_cache=SemanticCache(threshold=0.9),
+    )
+    task = TemplateTask(template="log-versoes-feedback.MD")
+
+    filler.fill_templates([task], context="Produto: agenda online para clínicas")
+    filler.fill_templates([task], context="Produto: agenda online para clinicas.")
+
+    assert len(llm.prompts) == 1
+
+
+_ZEROUM_ROOT = Path(__file__).resolve().parents[1] / "process" / "ZeroUm"
+
+
+@pytest.mark.parametrize(
+    ("process_code", "template"),
+    sorted(
+        (path.parent.parent.name, path.name)
+        for path in _ZEROUM_ROOT.glob("*/_DATA/*")
+        if path.is_file()
+    ),
+)
+def test_semantic_cache_misses_for_distinct_contexts(tmp_path: Path, process_code: str, template: str) -> None:
+    llm = _StubLLM("Template preenchido")
+    filler = ProcessTemplateFiller(
+        process_code=process_code,
+        output_dir=tmp_path,
+        llm=llm,
+        semantic_cache=SemanticCache(),
+    )
+    task = TemplateTask(template=template)
+
+    filler.fill_templates([task], context="Produto: agenda online para clínicas odontológicas em São Paulo")
+    filler.fill_templates([task], context="Produto: marketplace de roupas usadas para adolescentes")
+
+    assert len(llm.prompts) == 2
+
+
+def _long_context(product: str, price: str) -> str:
+    paragraph = (
+        f"O {product} atende clínicas odontológicas de pequeno porte que hoje agendam "
+        "consultas por telefone e planilhas. A dor principal é o tempo perdido com "
+        "remarcações e faltas sem aviso, que reduzem o faturamento mensal da clínica. "
+        f"O plano mensal custa {price} e inclui lembretes automáticos por WhatsApp. "
+    )
+    return "\n\n".join(paragraph for _ in range(8))
+
+
+def test_semantic_cache_misses_for_long_contexts_with_other_facts(tmp_path: Path) -> None:
+    llm = _StubLLM("Template preenchido")
+    filler = ProcessTemplateFiller(
+        process_code="00-ProblemHypothesisExpress",
+        output_dir=tmp_path,
+        llm=llm,
+        semantic_cache=SemanticCache(),
+    )
+    task = TemplateTask(template="log-versoes-feedback.MD")
+
+    filler.fill_templates([task], context=_long_context("AgendaFácil", "R$ 49,90"))
+    filler.fill_templates([task], context=_long_context("ConsultaPro", "R$ 79,00"))
+
+    assert len(llm.prompts) == 2
@@ -0,0 +1,168 @@
+"""
+Tests for the parallel, cached pytest runner behind the run_tests tool.
+"""
+
+import pytest
+
+from framework.tools.testing import TestRunner, parse_junit_report, read_pytest_config
+
+PASSING = """
+def test_one():
+    assert 1
+
+
+def test_two():
+    assert 2
+"""
+
+FAILING = """
+class TestMath:
+    def test_wrong(self):
+        assert 1 + 1 == 3, "conta errada"
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_ok.py").write_text(PASSING, encoding="utf-8")
+    (tmp_path / "tests" / "test_fail.py").write_text(FAILING, encoding="utf-8")
+    (tmp_path / "lib.py").write_text("VALUE = 1\n", encoding="utf-8")
+    return tmp_path
+
+
+def _runner(root):
+    return TestRunner(root, workers=2, command="python -m pytest")
+
+
+class TestTestRunner:
+    """Tests for TestRunner."""
+
+    def test_runs_in_parallel_with_structured_results(self, project):
+        result = _runner(project).run(["tests"])
+
+        assert (result.passed, result.failed, result.errors) == (2, 1, 0)
+        assert result.workers == 2
+        failure = next(case for case in result.cases if case.outcome == "failed")
+        assert failure.nodeid == "tests/test_fail.py::TestMath::test_wrong"
+        assert "conta errada" in failure.message
+        assert "FAILED tests/test_fail.py::TestMath::test_wrong" in result.render()
+
+    def test_unchanged_units_are_cached(self, project):
+        runner = _runner(project)
+        runner.run(["tests"])
+
+        again = runner.run(["tests"])
+        assert (again.cached_units, again.units) == (2, 2)
+        assert (again.passed, again.failed) == (2, 1)
+
+        (project / "tests" / "test_fail.py").write_text(PASSING, encoding="utf-8")
+        changed = runner.run(["tests"])
+        assert changed.cached_units == 1
+        assert (changed.passed, changed.failed) == (4, 0)
+
+    def test_source_change_invalidates_every_unit(self, project):
+        (project / "tests" / "test_lib.py").write_text(
+            "import lib\n\ndef test_value():\n    assert lib.VALUE\n", encoding="utf-8"
+        )
+        runner = _runner(project)
+        assert runner.run(["tests"]).passed == 3
+
+        (project / "lib.py").write_text("VALUE = 2\n", encoding="utf-8")
+
+        assert runner.run(["tests"]).cached_units == 0
+
+    def test_data_file_change_invalidates_cache(self, project):
+        (project / "tests" / "data.json").write_text('{"value": 1}', encoding="utf-8")
+        (project / "tests" / "test_data.py").write_text(
+            "import json, pathlib\n\n"
+            "def test_value():\n"
+            "    data = json.loads((pathlib.Path(__file__).parent / 'data.json').read_text())\n"
+            "    assert data['value'] == 1\n",
+            encoding="utf-8",
+        )
+        runner = _runner(project)
+        assert runner.run(["tests/test_data.py"]).passed == 1
+
+        (project / "tests" / "data.json").write_text('{"value": 2}', encoding="utf-8")
+        result = runner.run(["tests/test_data.py"])
+
+        assert result.cached_units == 0
+        assert result.failed == 1
+
+    def test_files_outside_imported_tree_keep_cache(self, project):
+        (project / "drive").mkdir()
+        (project / "drive" / "run.json").write_text("{}", encoding="utf-8")
+        runner = _runner(project)
+        runner.run(["tests"])
+
+        (project / "drive" / "run.json").write_text('{"run": 2}', encoding="utf-8")
+        (project / "lib.py").write_text("VALUE = 2\n", encoding="utf-8")
+
+        assert runner.run(["tests"]).cached_units == 2
+
+    def test_default_targets_follow_pytest_config(self, project):
+        (project / "pytest.ini").write_text(
+            "[pytest]\ntestpaths = tests missing\npython_files = test_*.py check_*.py\n",
+            encoding="utf-8",
+        )
+        (project / "tests" / "check_extra.py").write_text(PASSING, encoding="utf-8")
+        (project / "scripts").mkdir()
+        (project / "scripts" / "test_script.py").write_text(PASSING, encoding="utf-8")
+        runner = _runner(project)
+
+        assert runner.default_targets() == ["tests"]
+        assert sorted(runner.collect_units(runner.default_targets())) == [
+            "tests/check_extra.py",
+            "tests/test_fail.py",
+            "tests/test_ok.py",
+        ]
+
+    def test_pyproject_config(self, project):
+        (project / "pyproject.toml").write_text(
+            '[tool.pytest.ini_options]\ntestpaths = ["tests"]\n', encoding="utf-8"
+        )
+
+        config_path, options = read_pytest_config(project)
+
+        assert config_path == project / "pyproject.toml"
+        assert options["testpaths"] == ["tests"]
+
+    def test_node_id_target(self, project):
+        result = _runner(project).run(["tests/test_ok.py::test_two"])
+
+        assert [case.nodeid for case in result.cases] == ["tests/test_ok.py::test_two"]
+
+    def test_collection_error_is_reported_and_not_cached(self, project):
+        (project / "tests" / "test_broken.py").write_text("import modulo_inexistente\n", encoding="utf-8")
+        runner = _runner(project)
+
+        result = runner.run(["tests"])
+
+        assert any(case.nodeid == "tests/test_broken.py" and case.outcome == "error" for case in result.cases)
+        assert result.passed == 2
+        assert runner.run(["tests"]).cached_units < 3
+
+
+class TestParseJunitReport:
+    """Tests for parse_junit_report."""
+
+    def test_outcomes(self, tmp_path):
+        report = tmp_path / "r.xml"
+        report.write_text(
+            '<testsuites><testsuite>'
+            '<testcase classname="tests.test_a" name="test_ok" file="tests/test_a.py" time="0.5"/>'
+            '<testcase classname="tests.test_a" name="test_skip" file="tests/test_a.py" time="0">'
+            '<skipped message="sem rede"/></testcase>'
+            '</testsuite></testsuites>',
+            encoding="utf-8",
+        )
+
+        cases = parse_junit_report(report)
+
+        assert [(c.nodeid, c.outcome) for c in cases] == [
+            ("tests/test_a.py::test_ok", "passed"),
+            ("tests/test_a.py::test_skip", "skipped"),
+        ]
+        assert cases[0].duration == 0.5
+        assert cases[1].message == "sem rede"
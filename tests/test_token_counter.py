@@ -0,0 +1,58 @@
+"""Tests for local token counting and prompt preflight."""
+
+from __future__ import annotations
+
+from framework.llm.tokens import (
+    TRUNCATION_MARKER,
+    HeuristicTokenizer,
+    TokenCounter,
+)
+
+
+def _heuristic_counter() -> TokenCounter:
+    counter = TokenCounter()
+    counter.register_tokenizer("", lambda model: HeuristicTokenizer())
+    return counter
+
+
+def test_count_messages_includes_overhead() -> None:
+    counter = _heuristic_counter()
+    tokens = counter.count_messages([("system", "a" * 40), ("human", "b" * 80)], "gpt-4o")
+    # 10 + 20 tokens de conteúdo + papéis + overhead por mensagem e resposta
+    assert tokens == 10 + 20 + 2 + 2 + 2 * 4 + 3
+
+
+def test_tokenizer_is_cached_per_model() -> None:
+    counter = _heuristic_counter()
+    assert counter.get_tokenizer("gpt-4o") is counter.get_tokenizer("gpt-4o")
+
+
+def test_context_window_uses_longest_prefix() -> None:
+    assert TokenCounter.context_window("gpt-4o-mini") == 128_000
+    assert TokenCounter.context_window("gpt-4-0613") == 8_192
+    assert TokenCounter.context_window("modelo-desconhecido") == 128_000
+
+
+def test_preflight_warns_without_changing_prompt() -> None:
+    counter = _heuristic_counter()
+    messages = [("system", "fixo"), ("human", "x" * 20_000)]
+    result = counter.preflight(messages, "gpt-4", max_output_tokens=4_096, policy="warn")
+
+    assert result.action == "warn"
+    assert result.messages == messages
+
+
+def test_preflight_truncates_variable_message_keeping_head_and_tail() -> None:
+    counter = _heuristic_counter()
+    body = "INICIO" + "x" * 40_000 + "FIM"
+    result = counter.preflight(
+        [("system", "regras"), ("human", body)], "gpt-4", max_output_tokens=4_096, policy="truncate"
+    )
+
+    assert result.action == "truncated"
+    assert result.input_tokens <= result.budget
+    assert result.messages[0] == ("system", "regras")
+    truncated = result.messages[1][1]
+    assert truncated.startswith("INICIO")
+    assert truncated.endswith("FIM")
+    assert TRUNCATION_MARKER in truncated
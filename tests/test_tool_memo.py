@@ -0,0 +1,140 @@
+"""Testes da memoização de ferramentas por execução (ToolRunMemo)."""
+
+import functools
+import os
+from pathlib import Path
+
+import pytest
+
+from framework.tools.registry import ToolEffect, ToolRunMemo, get_tool_policy
+
+
+def _counting(func):
+    calls = []
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        calls.append((args, kwargs))
+        return func(*args, **kwargs)
+
+    wrapper.calls = calls
+    return wrapper
+
+
+class TestToolPolicy:
+    def test_known_and_unknown_tools(self):
+        assert get_tool_policy("read_file").effect == ToolEffect.READ_ONLY
+        assert get_tool_policy("markdown_summarizer").effect == ToolEffect.PURE
+        assert get_tool_policy("write_file").effect == ToolEffect.MUTATING
+        assert get_tool_policy("ferramenta_nova").effect == ToolEffect.MUTATING
+
+
+class TestToolRunMemo:
+    def _read_file(self, tmp_path: Path):
+        def read_file(path: str, offset: int = 0) -> str:
+            return (tmp_path / path).read_text()[offset:]
+
+        return _counting(read_file)
+
+    def test_repeated_read_is_served_from_memory(self, tmp_path):
+        (tmp_path / "a.txt").write_text("alpha")
+        memo = ToolRunMemo(base_path=tmp_path)
+        read_file = self._read_file(tmp_path)
+        memoized = memo.wrap("read_file", read_file)
+
+        assert memoized("a.txt") == "alpha"
+        # Mesmos argumentos (posicional x nomeado, default explícito)
+        assert memoized(path="a.txt", offset=0) == "alpha"
+        assert len(read_file.calls) == 1
+        assert memo.stats()["hits"] == 1
+
+        assert memoized("a.txt", offset=1) == "lpha"
+        assert len(read_file.calls) == 2
+
+    def test_external_change_is_detected_by_stamp(self, tmp_path):
+        target = tmp_path / "a.txt"
+        target.write_text("alpha")
+        memo = ToolRunMemo(base_path=tmp_path)
+        read_file = self._read_file(tmp_path)
+        memoized = memo.wrap("read_file", read_file)
+
+        memoized("a.txt")
+        target.write_text("alpha beta")
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert memoized("a.txt") == "alpha beta"
+        assert len(read_file.calls) == 2
+
+    def test_mutating_call_invalidates_overlapping_entries(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        memo = ToolRunMemo(base_path=tmp_path)
+        read_file = self._read_file(tmp_path)
+        memoized = memo.wrap("read_file", read_file)
+        ls = _counting(lambda path=".": sorted(os.listdir(tmp_path / path)))
+        memoized_ls = memo.wrap("ls", ls)
+
+        memoized("src/a.txt")
+        memoized("b.txt")
+        memoized_ls("src")
+        write = memo.wrap("write_file", lambda path, content: (tmp_path / path).write_text(content))
+        write("src/a.txt", "a")  # mesmo tamanho: só a invalidação garante a releitura
+
+        memoized("src/a.txt")
+        memoized("b.txt")
+        memoized_ls("src")
+        assert len(read_file.calls) == 3
+        assert len(ls.calls) == 2
+        assert memo.stats()["invalidations"] == 2
+
+    def test_unscoped_mutation_invalidates_everything(self, tmp_path):
+        (tmp_path / "a.txt").write_text("a")
+        memo = ToolRunMemo(base_path=tmp_path)
+        memo.wrap("read_file", self._read_file(tmp_path))("a.txt")
+
+        memo.wrap("run_command", lambda command: "")("make")
+
+        assert memo.stats()["entries"] == 0
+
+    def test_git_mutation_invalidates_git_entries(self, tmp_path):
+        memo = ToolRunMemo(base_path=tmp_path)
+        status = _counting(lambda cwd=None: "clean")
+        memoized_status = memo.wrap("git_status", status)
+
+        memoized_status()
+        memoized_status()
+        memo.wrap("git_add", lambda files, cwd=None: "ok")(["x"])
+        memoized_status()
+
+        assert len(status.calls) == 2
+
+    def test_errors_are_not_cached_and_mutation_invalidates_on_error(self, tmp_path):
+        (tmp_path / "a.txt").write_text("a")
+        memo = ToolRunMemo(base_path=tmp_path)
+        read_file = self._read_file(tmp_path)
+        memoized = memo.wrap("read_file", read_file)
+
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                memoized("ausente.txt")
+        assert len(read_file.calls) == 2
+
+        memoized("a.txt")
+
+        def failing_write(path, content):
+            raise OSError("disco cheio")
+
+        with pytest.raises(OSError):
+            memo.wrap("write_file", failing_write)("a.txt", "x")
+        assert memo.stats()["entries"] == 0
+
+    def test_lru_bound(self, tmp_path):
+        memo = ToolRunMemo(max_entries=2, base_path=tmp_path)
+        summarize = memo.wrap("markdown_summarizer", lambda text: text.upper())
+
+        for text in ("a", "b", "c"):
+            summarize(text)
+
+        assert memo.stats()["entries"] == 2